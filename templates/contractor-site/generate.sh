@@ -307,6 +307,16 @@ with open('$OUTPUT', 'w') as f:
     f.write(content)
 "
 
+# ──────────────────────────────────────
+# Optimize: SVG sprites, unused CSS, minify (tools/page_optimizer.py)
+# Fails if the page is over its size budget; PROSPECT_OPTIMIZE=off skips
+# ──────────────────────────────────────
+case "${PROSPECT_OPTIMIZE:-}" in
+    0|off) ;;
+    *) python3 "$SCRIPT_DIR/../../tools/page_optimizer.py" optimize "$OUTPUT" --budget contractor-site \
+           || { rm -f "$OUTPUT"; exit 1; } ;;
+esac
+
 echo ""
 echo "✅ Site generated successfully!"
 echo "📁 Output: $OUTPUT_DIR/index.html"
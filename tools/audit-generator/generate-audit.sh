@@ -261,6 +261,13 @@ with open('$TMPFILE', 'w') as f:
     f.write(content)
 "
 
+# --- Optimize: SVG sprites, unused CSS, minify; fails if over budget ---
+case "${PROSPECT_OPTIMIZE:-}" in
+    0|off) ;;
+    *) python3 "$SCRIPT_DIR/../page_optimizer.py" optimize "$TMPFILE" --budget growth-audit >/dev/null \
+           || { rm -f "$TMPFILE"; exit 1; } ;;
+esac
+
 # --- Output ---
 SLUG=$(slugify "$BUSINESS_NAME")
 OUTPUT_DIR="$SCRIPT_DIR/output"
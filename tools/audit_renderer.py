@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Growth Audit Renderer
+
+In-process replacement for tools/audit-generator/generate-audit.sh. The
+template is loaded and split once into literal segments and slots. After
+that, rendering an audit dict (what generate_audit returns, or an audit JSON
+file) is one join. It writes to the path you name, not a shared output/ dir,
+and one process can render any number of audits.
+
+render_audit's output is byte-identical to generate-audit.sh. That includes its quirks:
+bash's ${var//pattern/value} handling of `&` and backslashes in scalar
+values, bc's 2-decimal truncation for the score ring, and the Python
+string-literal escape handling its embedded python step applies to the
+categories, competitors and recommendations HTML.
+
+Usage:
+  python3 audit_renderer.py <audit.json> -o growth-audit.html
+  python3 audit_renderer.py a.json b.json ... --out-dir DIR   # DIR/<slug>-growth-audit.html
+
+  from audit_renderer import render_audit, write_audit
+  html = render_audit(audit)
+
+write_audit then runs the page through page_optimizer.py and fails if it's
+over the growth-audit budget.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+from decimal import ROUND_DOWN, Decimal, InvalidOperation
+
+from page_optimizer import finish_page, optimizer_version
+from prospect_metrics import metrics, metrics_path_from_env
+from site_renderer import _jq, _jq_text, _universal_newlines
+
+
+AUDIT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audit-generator")
+TEMPLATE = os.path.join(AUDIT_DIR, "audit-template.html")
+GENERATOR = os.path.join(AUDIT_DIR, "generate-audit.sh")
+OUTPUT_DIR = os.path.join(AUDIT_DIR, "output")
+
+DEFAULT_SUMMARY = ("We conducted a comprehensive audit of your website, online presence, and lead "
+                   "generation systems. Several critical issues were identified that are likely "
+                   "costing you qualified leads every month.")
+
+# Placeholders in generate-audit.sh's replacement order
+SCALARS = [
+    "BUSINESS_NAME", "AUDIT_DATE", "OVERALL_SCORE", "SCORE_COLOR", "SCORE_LABEL", "SCORE_SUBTITLE",
+    "SCORE_DASH_OFFSET", "EXECUTIVE_SUMMARY", "CURRENT_CONVERSION", "POTENTIAL_CONVERSION",
+    "LOST_LEADS", "AVG_JOB_VALUE", "ANNUAL_REVENUE_LOST",
+]
+BLOCKS = ["CATEGORIES_HTML", "COMPETITORS_HTML", "RECOMMENDATIONS_HTML"]
+
+CIRCUMFERENCE = Decimal("565.48")
+CENT = Decimal("0.01")
+
+# ──────────────────────────────────────
+# Shell parity helpers
+# ──────────────────────────────────────
+
+def _test_int(text):
+    """The integer `[ "$x" -lt N ]` sees, or None where test errors (and the if falls through)."""
+    m = re.fullmatch(r"\s*([+-]?\d+)\s*", text)
+    return int(m.group(1)) if m else None
+
+
+def _arith_int(text, what):
+    """An integer operand of $(( )); anything else aborts generate-audit.sh."""
+    value = _test_int(text)
+    if value is None:
+        raise ValueError(f"{what} must be an integer, got {text!r}")
+    return value
+
+
+def _patsub_replacement(value, placeholder):
+    """A value as bash 5.2's ${var//pattern/value} inserts it: & is the match, \\ escapes \\ and &."""
+    if "&" not in value and "\\" not in value:
+        return value
+    out = []
+    i = 0
+    while i < len(value):
+        c = value[i]
+        if c == "&":
+            out.append(placeholder)
+        elif c == "\\" and value[i + 1:i + 2] in ("\\", "&"):
+            i += 1
+            out.append(value[i])
+        else:
+            out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def _python_literal(html):
+    """What a '''...''' literal in generate-audit.sh's python3 -c evaluates to."""
+    if "\\" not in html and "'" not in html and "\r" not in html:
+        return html
+    try:
+        return ast.literal_eval("'''" + html + "'''")
+    except (SyntaxError, ValueError) as e:
+        raise ValueError(f"generate-audit.sh can't embed this HTML in its python step: {e}") from None
+
+
+def score_color(score):
+    if score is None or score >= 70:
+        return "#22c55e"
+    return "#ef4444" if score < 40 else "#f59e0b"
+
+
+def score_label(score):
+    if score is None or score >= 85:
+        return "Excellent — Well Optimized"
+    for limit, label in [(25, "Critical — Immediate Action Needed"),
+                         (40, "Poor — Significant Issues Found"),
+                         (55, "Below Average — Room for Improvement"),
+                         (70, "Average — Some Gaps to Address"),
+                         (85, "Good — Minor Optimizations Needed")]:
+        if score < limit:
+            return label
+
+
+def score_subtitle(score):
+    if score is not None and score < 40:
+        return ("Your website is underperforming in key areas. You're likely losing leads to "
+                "competitors with stronger online presence.")
+    if score is not None and score < 70:
+        return ("Your site has some strengths, but critical gaps are costing you leads. "
+                "Targeted fixes can make a big difference.")
+    return ("Your online presence is solid. A few strategic improvements could help you "
+            "dominate your market.")
+
+
+def bar_class(score):
+    return "bar-danger" if score <= 3 else "bar-warning" if score <= 6 else "bar-success"
+
+
+def badge_class(score):
+    return "score-low" if score <= 3 else "score-mid" if score <= 6 else "score-high"
+
+
+def dash_offset(score_text):
+    """`echo "scale=2; 565.48 * (1 - $SCORE / 100)" | bc`"""
+    if re.fullmatch(r"[a-z][a-z0-9_]*", score_text):
+        score = Decimal(0)  # e.g. null: an unset bc variable
+    else:
+        if not re.fullmatch(r"-?(\d+\.?\d*|\.\d+)", score_text):
+            raise ValueError(f"overallScore must be a number, got {score_text!r}")
+        try:
+            score = Decimal(score_text)
+        except InvalidOperation:
+            raise ValueError(f"overallScore must be a number, got {score_text!r}") from None
+    ratio = (score / 100).quantize(CENT, rounding=ROUND_DOWN)
+    offset = (CIRCUMFERENCE * (1 - ratio)).quantize(CENT, rounding=ROUND_DOWN)
+    if offset == 0:
+        return "0"
+    sign = "-" if offset < 0 else ""
+    whole, frac = f"{abs(offset):.2f}".split(".")
+    return f"{sign}{whole if whole != '0' else ''}.{frac}"
+
+
+def _items(value, what):
+    """A JSON array as the script's `length` + index loop walks it."""
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"{what} must be an array")
+    return value
+
+
+def slugify(text):
+    """echo "$1" | tr '[:upper:]' '[:lower:]' | sed -E 's/[^a-z0-9]+/-/g; s/^-|-$//g'"""
+    lines = []
+    for line in text.split("\n"):
+        line = re.sub(r"[^a-z0-9]+", "-", re.sub(r"[A-Z]+", lambda m: m.group().lower(), line))
+        lines.append(re.sub(r"^-|-$", "", line))
+    return "\n".join(lines)
+
+
+# ──────────────────────────────────────
+# Compiled template
+# ──────────────────────────────────────
+
+class AuditTemplate:
+    """audit-template.html split once into literal segments and slot names."""
+
+    def __init__(self, template=TEMPLATE):
+        with open(template, "r") as f:
+            # $(cat) drops trailing newlines, echo adds one back
+            self.source = _universal_newlines(f.read().rstrip("\n") + "\n")
+        slot_re = re.compile(r"\{\{(%s)\}\}" % "|".join(SCALARS + BLOCKS))
+        self.parts = []
+        pos = 0
+        for m in slot_re.finditer(self.source):
+            self.parts.append(self.source[pos:m.start()])
+            self.parts.append((m.group(1),))
+            pos = m.end()
+        self.parts.append(self.source[pos:])
+
+    # -- values --
+
+    def scalar_values(self, audit):
+        score_text = _jq(audit, ("overallScore",))
+        score = _test_int(score_text)
+        return {
+            "BUSINESS_NAME": _jq(audit, ("businessName",)),
+            "AUDIT_DATE": _jq(audit, ("date",)),
+            "OVERALL_SCORE": score_text,
+            "SCORE_COLOR": score_color(score),
+            "SCORE_LABEL": score_label(score),
+            "SCORE_SUBTITLE": score_subtitle(score),
+            "SCORE_DASH_OFFSET": dash_offset(score_text),
+            "EXECUTIVE_SUMMARY": _jq(audit, ("executiveSummary",), DEFAULT_SUMMARY),
+            "CURRENT_CONVERSION": _jq(audit, ("revenueImpact", "currentConversion"), "under 1%"),
+            "POTENTIAL_CONVERSION": _jq(audit, ("revenueImpact", "potentialConversion"), "5-8%"),
+            "LOST_LEADS": _jq(audit, ("revenueImpact", "lostLeadsPerMonth"), "10-20"),
+            "AVG_JOB_VALUE": _jq(audit, ("avgJobValue",)),
+            "ANNUAL_REVENUE_LOST": _jq(audit, ("revenueImpact", "annualRevenueLost"), "$100K+"),
+        }
+
+    def block_values(self, audit):
+        categories = []
+        for i, cat in enumerate(_items(audit.get("categories"), "categories")):
+            cat = cat if isinstance(cat, dict) else {}
+            score_text = _jq(cat, ("score",))
+            max_text = _jq(cat, ("maxScore",))
+            score = _arith_int(score_text, f"categories[{i}].score")
+            max_score = _arith_int(max_text, f"categories[{i}].maxScore")
+            if max_score == 0:
+                raise ValueError(f"categories[{i}].maxScore is 0")
+            fill = abs(score * 100) // abs(max_score) * (1 if (score < 0) == (max_score < 0) else -1)
+            issues = "".join(f"                    <li>{_jq_text(issue)}</li>\n"
+                             for issue in _items(cat.get("issues"), f"categories[{i}].issues"))
+            categories.append(f"""
+            <div class="category">
+                <div class="category-header">
+                    <div class="category-name">
+                        <div class="category-icon">{_jq(cat, ("icon",), "📋")}</div>
+                        <div class="category-title">{_jq(cat, ("name",))}</div>
+                    </div>
+                    <div class="category-score-badge {badge_class(score)}">{score_text}/{max_text}</div>
+                </div>
+                <div class="category-bar-container">
+                    <div class="category-bar-fill {bar_class(score)}" style="--fill-width: {fill}%"></div>
+                </div>
+                <ul class="category-issues">
+{issues}                </ul>
+                <div class="category-benchmark">
+                    <strong>What good looks like:</strong> {_jq(cat, ("benchmark",))}
+                </div>
+            </div>
+""")
+
+        competitors = [f"""
+            <div class="competitor-item">
+                <div class="competitor-icon">⚠️</div>
+                <div class="competitor-text">{_jq_text(comp)}</div>
+            </div>
+""" for comp in _items(audit.get("competitors"), "competitors")]
+
+        recommendations = []
+        for i, rec in enumerate(_items(audit.get("recommendations"), "recommendations")):
+            if i < 2:
+                priority = '<span class="rec-priority priority-high">High Impact</span>'
+            elif i < 4:
+                priority = '<span class="rec-priority priority-medium">Medium Impact</span>'
+            else:
+                priority = ""
+            recommendations.append(f"""
+                <li class="recommendation-item">
+                    <div class="rec-number"></div>
+                    <div class="rec-content">{_jq_text(rec)} {priority}</div>
+                </li>
+""")
+
+        return {
+            "CATEGORIES_HTML": _python_literal("".join(categories)),
+            "COMPETITORS_HTML": _python_literal("".join(competitors)),
+            "RECOMMENDATIONS_HTML": _python_literal("".join(recommendations)),
+        }
+
+    # -- render --
+
+    def render(self, audit):
+        if not isinstance(audit, dict):
+            raise ValueError("audit must be a JSON object")
+        raw = self.scalar_values(audit)
+        values = {name: _patsub_replacement(raw[name], "{{%s}}" % name) for name in SCALARS}
+        values.update(self.block_values(audit))
+        if any("{" in v or "}" in v or "\r" in v for v in values.values()):
+            return self._render_sequential(values)
+        return "".join(part if isinstance(part, str) else values[part[0]] for part in self.parts)
+
+    def _render_sequential(self, values):
+        """The script's own order: each bash substitution over the whole page, then the python step.
+
+        Only needed when a value could form or hide a placeholder.
+        """
+        content = self.source
+        for name in SCALARS:
+            content = content.replace("{{%s}}" % name, values[name])
+        content = _universal_newlines(content)
+        for name in BLOCKS:
+            content = content.replace("{{%s}}" % name, values[name])
+        return content
+
+
+_template = None
+_version = None
+
+
+def renderer_version():
+    """Hash of everything a written audit depends on besides its data."""
+    global _version
+    if _version is None:
+        digest = hashlib.sha256()
+        for path in (os.path.abspath(__file__), TEMPLATE, GENERATOR):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        digest.update(optimizer_version().encode())
+        _version = digest.hexdigest()
+    return _version
+
+
+def get_template():
+    """The compiled template, built on first use and shared by later renders."""
+    global _template
+    if _template is None:
+        _template = AuditTemplate()
+    return _template
+
+
+def render_audit(audit):
+    """Render an audit dict to the growth audit page's HTML text."""
+    return get_template().render(audit)
+
+
+def write_audit(audit, out_path):
+    """Render and optimize audit to out_path; returns the path.
+    Raises BudgetError (nothing written) if the page is over budget."""
+    html = finish_page("growth-audit", render_audit(audit))
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w") as f:
+        f.write(html)
+    return out_path
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Audit Renderer")
+    parser.add_argument("audits", nargs="+", help="Audit JSON file(s)")
+    parser.add_argument("-o", "--out", help="Output HTML path (one audit only)")
+    parser.add_argument("--out-dir", default=OUTPUT_DIR,
+                        help="Write <slug>-growth-audit.html here (default: audit-generator/output)")
+    args = parser.parse_args()
+    if args.out and len(args.audits) > 1:
+        parser.error("--out takes a single audit; use --out-dir for several")
+    metrics.configure(metrics_path_from_env(), "audit-renderer")
+
+    failed = 0
+    for path in args.audits:
+        try:
+            with open(path, "r") as f:
+                audit = json.load(f)
+            out = args.out or os.path.join(args.out_dir, f"{slugify(_jq(audit, ('businessName',)))}-growth-audit.html")
+            with metrics.phase("render-audit") as phase:
+                phase["bytes"] = os.path.getsize(write_audit(audit, out))
+            print(f"✅ Audit generated: {out}")
+        except (OSError, ValueError) as e:
+            print(f"❌ {path}: {e}", file=sys.stderr)
+            failed += 1
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
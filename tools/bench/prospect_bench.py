@@ -0,0 +1,767 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Prospect Analyzer Benchmarks
+
+Measures prospect-analyzer.py on a fixed corpus and checks its output against
+golden JSON, so a speedup that changes any field or score is caught.
+
+Corpus:
+  corpus/*.html        — small anonymized pages, checked in
+  generated cases      — large pages built deterministically at run time
+                         (5MB page-builder dump, tag-heavy page, minified
+                         one-line page, 7-page fixed-path merge, 4-page
+                         crawl bundle)
+  golden/<case>.json   — expected research / audit / site-config per case
+
+For each case and function (extract_text, extract_business_info,
+generate_audit, generate_site_config) it reports pages/s, MB/s of page HTML
+(for the two functions that parse it) and peak traced memory.
+
+`hostile` is the adversarial suite, quick enough for CI: pages built to make
+backtracking patterns blow up must each scan within a time limit with the
+scan budget off, the budget must cut a scan short, and a seeded fuzz checks
+the one-pass matchers against the regexes they stand in for.
+
+`fetch` runs prospect_fetch.py's crawler against a small site served from
+127.0.0.1: robots.txt rules, sitemap discovery, a redirect, and a second
+crawl that must be answered entirely by 304s from the page cache.
+
+Usage:
+  python3 prospect_bench.py run                       # goldens + timings
+  python3 prospect_bench.py run --case pagebuilder --repeat 7
+  python3 prospect_bench.py run --save before.json
+  python3 prospect_bench.py run --baseline before.json --max-slowdown 10
+  python3 prospect_bench.py check                     # goldens only
+  python3 prospect_bench.py update-golden             # after an intended output change
+  python3 prospect_bench.py hostile                   # adversarial pages + matcher fuzz
+  python3 prospect_bench.py fetch                     # crawler against a local site
+"""
+
+import argparse
+import asyncio
+import contextlib
+import fnmatch
+import hashlib
+import http.server
+import importlib.util
+import json
+import os
+import platform
+import random
+import re
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCH_DIR, "corpus")
+GOLDEN_DIR = os.path.join(BENCH_DIR, "golden")
+TOOLS_DIR = os.path.dirname(BENCH_DIR)
+ANALYZER = os.path.join(TOOLS_DIR, "prospect-analyzer.py")
+
+# Fields that change from run to run and aren't compared
+VOLATILE = {("audit", "date")}
+
+# Minimum wall time per timing sample; fast functions are looped to reach it
+MIN_SAMPLE = 0.05
+
+
+def load_analyzer():
+    """Import prospect-analyzer.py (its file name isn't a module name)."""
+    sys.path.insert(0, os.path.dirname(ANALYZER))
+    spec = importlib.util.spec_from_file_location("prospect_analyzer", ANALYZER)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so its functions pickle by name for the analyzer's page processes
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# ──────────────────────────────────────
+# Corpus
+# ──────────────────────────────────────
+
+# Checked-in pages: file → (url, city)
+CORPUS = {
+    "brochure-plumber.html": ("https://brightlineplumbing.test", "Carmel"),
+    "brochure-roofer-minimal.html": ("http://davesroofing.test", "Indianapolis"),
+    "wordpress-hvac.html": ("https://northsidecomfortair.test", "Fishers"),
+    "multipage-electrician.html": ("https://voltbrotherselectric.test", "Zionsville"),
+}
+
+
+def _read(name):
+    with open(os.path.join(CORPUS_DIR, name), "r") as f:
+        return f.read()
+
+
+def gen_pagebuilder(target=5 * 1024 * 1024):
+    """A page-builder export: big inline CSS, a minified script on one line
+    longer than the scanner window, and deeply nested sections carrying
+    data-settings JSON."""
+    css = "".join(
+        f".elementor-element-{i:05x}>.elementor-widget-container{{margin:{i % 40}px {i % 17}px;"
+        f"padding:{i % 23}px;background-color:#{(i * 2654435761) & 0xffffff:06x};}}"
+        for i in range(3000))
+    script = "var ElementorFrontendConfig=" + json.dumps(
+        {"i18n": {f"k{i}": f"label {i}" for i in range(6000)},
+         "kit": {"active_breakpoints": ["viewport_mobile", "viewport_tablet"], "global_image_lightbox": "yes"}},
+        separators=(",", ":")) + ";"
+    head = ("<!DOCTYPE html>\n<html lang=\"en-US\"><head><meta charset=\"UTF-8\">\n"
+            "<title>Summit Ridge Landscaping &#8211; Lawn Care, Hardscapes &amp; Irrigation</title>\n"
+            "<meta name=\"description\" content=\"Full-service landscaping in Westfield: lawn care, "
+            "patios, retaining walls and irrigation.\">\n"
+            "<style>:root{--e-global-color-primary:#2e7d32;--e-global-color-accent:#c0a062;"
+            "--brand-primary:#2e7d32;--accent-gold:#c0a062}\n" + css + "</style>\n"
+            "<script>" + script + "</script>\n</head>\n"
+            "<body class=\"elementor-default elementor-kit-5\">\n"
+            "<a class=\"elementor-button\" href=\"tel:3175550188\">Call (317) 555-0188</a>\n")
+    services = ["Lawn Mowing", "Patio Installation", "Retaining Walls", "Irrigation Repair",
+                "Mulching", "Snow Removal", "Landscape Lighting", "Tree Trimming"]
+    parts = [head]
+    size = len(head)
+    i = 0
+    while size < target:
+        settings = json.dumps({"background_background": "classic", "motion_fx_range": f"{i % 100}",
+                               "_animation": "fadeInUp", "id": f"{i:07x}"}).replace('"', "&quot;")
+        service = services[i % len(services)]
+        alt = 'alt="Finished project" ' if i % 3 else ""
+        block = (
+            f"<section class=\"elementor-section elementor-top-section elementor-element-{i:05x}\" "
+            f"data-id=\"{i:07x}\" data-element_type=\"section\" data-settings=\"{settings}\">\n"
+            "<div class=\"elementor-container elementor-column-gap-default\">"
+            "<div class=\"elementor-column elementor-col-50\"><div class=\"elementor-widget-wrap\">"
+            "<div class=\"elementor-widget elementor-widget-heading\"><div class=\"elementor-widget-container\">"
+            f"<h3 class=\"elementor-heading-title\">{service}</h3></div></div>"
+            "<div class=\"elementor-widget elementor-widget-text-editor\"><div class=\"elementor-widget-container\">"
+            f"<p>Our crews handle {service.lower()} for homes and HOAs across Hamilton County. "
+            "Free estimates, licensed and insured, and a satisfaction guarantee on every job.</p>"
+            "</div></div>"
+            f"<img decoding=\"async\" width=\"800\" height=\"533\" src=\"/wp-content/uploads/{i}.webp\" "
+            f"{alt}loading=\"lazy\">"
+            "</div></div></div></section>\n")
+        if i % 50 == 25:
+            block += ("<div class=\"elementor-testimonial\"><p>\"Best landscaping crew we've hired, "
+                      "five stars.\"</p><cite>Verified review</cite></div>\n")
+        parts.append(block)
+        size += len(block)
+        i += 1
+    parts.append("<footer><a href=\"https://facebook.com/summitridge.test\">Facebook</a>"
+                 "<p>hello@summitridgelandscaping.test</p></footer>\n"
+                 "<script src=\"//code.tidio.co/placeholder.js\"></script>\n</body></html>\n")
+    return "".join(parts)
+
+
+def gen_tag_heavy(images=500, forms=200):
+    """Gallery-style page: hundreds of <img> and <form> tags."""
+    parts = ["<!DOCTYPE html>\n<html><head><title>Precision Concrete | Gallery</title>\n"
+             "<meta name=\"description\" content=\"Driveways, patios and foundations.\"></head>\n<body>\n"
+             "<h2>Stamped Concrete</h2><h2>Driveway Replacement</h2><h2>Foundation Repair</h2>\n"]
+    for i in range(images):
+        alt = f" alt=\"Project {i}\"" if i % 4 else ""
+        parts.append(f"<img src=\"/gallery/{i:04d}.jpg\"{alt} width=\"320\" height=\"240\">\n")
+    for i in range(forms):
+        parts.append(f"<form class=\"quote-form\" id=\"quote-{i}\" action=\"/quote\" method=\"post\">"
+                     "<input type=\"text\" name=\"name\"><input type=\"tel\" name=\"phone\">"
+                     "<button class=\"btn\">Get Quote</button></form>\n")
+    parts.append("<p>Call 317-555-0166 or email bids@precisionconcrete.test</p>\n</body></html>\n")
+    return "".join(parts)
+
+
+def gen_minified():
+    """The page-builder dump minified onto a single line."""
+    return gen_pagebuilder(2 * 1024 * 1024).replace("\n", "")
+
+
+def gen_multipage():
+    """Homepage plus the six extra pages fetch_site merges, back to back."""
+    home = _read("brochure-plumber.html")
+    pages = [home]
+    for page in ["about", "about-us", "contact", "contact-us", "services", "our-services"]:
+        title = page.replace("-", " ").title()
+        pages.append(home.replace("<title>Brightline Plumbing |", f"<title>{title} |")
+                     .replace("Fast, Honest Plumbing Repairs", f"{title} — Brightline Plumbing"))
+    return "".join(pages)
+
+
+def gen_crawl():
+    """A page bundle as prospect_fetch.py's crawl writes it: homepage, contact, service and gallery pages."""
+    base = "http://davesroofing.test"
+    contact = ("<html><head><title>Contact | Dave's Roofing</title></head><body><h1>Contact Us</h1>"
+               "<form action=\"/quote\"><input name=\"phone\"><button>Get a Free Estimate</button></form>"
+               "<p>Email dave@davesroofing.test or call <a href=\"tel:+13175550188\">(317) 555-0188</a>.</p>"
+               "<p>4410 Shadeland Ave, Indianapolis, IN 46226</p></body></html>\n")
+    services = ("<html><head><title>Roof Replacement | Dave's Roofing</title></head><body>"
+                "<h2>Roof Replacement</h2><p>Tear-off and architectural shingles.</p>"
+                "<h2>Storm Damage Repair</h2><p>Insurance claims handled, reviews from 200 neighbors.</p>"
+                "<h2>Gutter Installation</h2>" + "<p>Seamless aluminum gutters in 20 colors.</p>" * 40 +
+                "</body></html>\n")
+    gallery = ("<html><head><title>Gallery | Dave's Roofing</title></head><body><h2>Recent Projects</h2>"
+               + "".join(f"<img src=\"/img/job{i}.jpg\" alt=\"Roof {i}\">" for i in range(14)) +
+               "<a href=\"https://facebook.com/davesroofing\">Facebook</a></body></html>\n")
+    pages = [("", _read("brochure-roofer-minimal.html")), ("/contact", contact),
+             ("/roof-replacement", services), ("/gallery", gallery)]
+    return "".join(f"<!-- ace-page: {base}{path or '/'} -->\n{html}" for path, html in pages)
+
+
+# Generated pages: case → (builder, url, city)
+GENERATED = {
+    "pagebuilder-5mb": (gen_pagebuilder, "https://summitridgelandscaping.test", "Westfield"),
+    "tag-heavy": (gen_tag_heavy, "https://precisionconcrete.test", "Indianapolis"),
+    "minified-oneline": (gen_minified, "https://summitridgelandscaping.test", "Westfield"),
+    "multipage-7": (gen_multipage, "https://brightlineplumbing.test", "Carmel"),
+    "crawl-bundle": (gen_crawl, "http://davesroofing.test", "Indianapolis"),
+}
+
+
+def cases(pattern=None):
+    """[(name, html, url, city)] for every case matching the glob pattern."""
+    out = []
+    for name, (url, city) in CORPUS.items():
+        case = name[:-len(".html")]
+        if not pattern or fnmatch.fnmatch(case, f"*{pattern}*"):
+            out.append((case, _read(name), url, city))
+    for case, (build, url, city) in GENERATED.items():
+        if not pattern or fnmatch.fnmatch(case, f"*{pattern}*"):
+            out.append((case, build(), url, city))
+    return out
+
+
+# ──────────────────────────────────────
+# Golden outputs
+# ──────────────────────────────────────
+
+def outputs(analyzer, html, url, city):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        research, audit, config = analyzer.analyze(html, url, city)
+    result = {"research": research, "audit": audit, "site-config": config}
+    for stage, field in VOLATILE:
+        result[stage].pop(field, None)
+    return json.loads(json.dumps(result))
+
+
+def diff(expected, actual, path=""):
+    """Paths where two JSON values differ."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in sorted(set(expected) | set(actual)):
+            sub = f"{path}.{key}" if path else key
+            if key not in actual:
+                yield f"{sub}: missing"
+            elif key not in expected:
+                yield f"{sub}: unexpected"
+            else:
+                yield from diff(expected[key], actual[key], sub)
+    elif isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            yield f"{path}: {len(expected)} items → {len(actual)}"
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            yield from diff(e, a, f"{path}[{i}]")
+    elif expected != actual:
+        yield f"{path}: {json.dumps(expected)[:60]} → {json.dumps(actual)[:60]}"
+
+
+def golden_path(case):
+    return os.path.join(GOLDEN_DIR, f"{case}.json")
+
+
+def check_goldens(analyzer, corpus):
+    """Compare every case with its golden file; returns the number that differ."""
+    failed = 0
+    for case, html, url, city in corpus:
+        try:
+            with open(golden_path(case), "r") as f:
+                expected = json.load(f)
+        except OSError:
+            print(f"  ⚠️  {case}: no golden file (run update-golden)")
+            failed += 1
+            continue
+        problems = list(diff(expected, outputs(analyzer, html, url, city)))
+        if problems:
+            failed += 1
+            print(f"  ❌ {case}: {len(problems)} field(s) differ")
+            for p in problems[:20]:
+                print(f"     {p}")
+        else:
+            print(f"  ✅ {case}")
+    return failed
+
+
+def update_goldens(analyzer, corpus):
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    for case, html, url, city in corpus:
+        with open(golden_path(case), "w") as f:
+            json.dump(outputs(analyzer, html, url, city), f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"  ✅ {case} → golden/{case}.json")
+
+
+# ──────────────────────────────────────
+# Timing
+# ──────────────────────────────────────
+
+FUNCTIONS = ["extract_text", "extract_business_info", "generate_audit", "generate_site_config"]
+# Functions that read the page HTML (the others work from research JSON)
+HTML_FUNCTIONS = {"extract_text", "extract_business_info"}
+
+
+def calls(analyzer, html, url, city):
+    """A zero-argument call per benchmarked function, on this case's inputs."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        research = analyzer.extract_business_info(html, url)
+    return {
+        "extract_text": lambda: analyzer.extract_text(html),
+        "extract_business_info": lambda: analyzer.extract_business_info(html, url),
+        "generate_audit": lambda: analyzer.generate_audit(research),
+        "generate_site_config": lambda: analyzer.generate_site_config(research, city),
+    }
+
+
+def time_call(fn, repeat):
+    """Seconds per call: (median, best) over `repeat` samples."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SAMPLE or number >= 1 << 16:
+            break
+        number *= 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples), min(samples)
+
+
+def peak_memory(fn):
+    """Peak bytes allocated by Python during one call."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(analyzer, corpus, repeat, functions):
+    results = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for case, html, url, city in corpus:
+            size = len(html.encode())
+            for name, fn in calls(analyzer, html, url, city).items():
+                if name not in functions:
+                    continue
+                median, best = time_call(fn, repeat)
+                results.append({
+                    "case": case,
+                    "function": name,
+                    "bytes": size,
+                    "seconds": median,
+                    "best": best,
+                    "pages_per_s": 1 / median,
+                    "mb_per_s": size / median / 1e6 if name in HTML_FUNCTIONS else None,
+                    "peak_bytes": peak_memory(fn),
+                })
+    return results
+
+
+def print_results(results, baseline=None):
+    base = {(r["case"], r["function"]): r for r in (baseline or [])}
+    header = f"  {'case':<28} {'size':>8}  {'function':<22} {'pages/s':>10} {'MB/s':>8} {'peak MB':>8}"
+    if base:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("  " + "─" * (len(header) - 2))
+    for r in results:
+        mb_per_s = "—" if r["mb_per_s"] is None else f"{r['mb_per_s']:.2f}"
+        line = (f"  {r['case']:<28} {r['bytes'] / 1024:>7.0f}K  {r['function']:<22} "
+                f"{r['pages_per_s']:>10.1f} {mb_per_s:>8} {r['peak_bytes'] / 1e6:>8.2f}")
+        old = base.get((r["case"], r["function"]))
+        if old:
+            line += f" {(r['seconds'] / old['seconds'] - 1) * 100:>+7.1f}%"
+        print(line)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"\n  Peak RSS: {rss / 1024:.0f} MB")
+
+
+def slowdowns(results, baseline, limit):
+    """(case, function, percent) for every function slower than baseline by more than limit%."""
+    base = {(r["case"], r["function"]): r for r in baseline}
+    out = []
+    for r in results:
+        old = base.get((r["case"], r["function"]))
+        if old:
+            pct = (r["seconds"] / old["seconds"] - 1) * 100
+            if pct > limit:
+                out.append((r["case"], r["function"], pct))
+    return out
+
+
+# ──────────────────────────────────────
+# Hostile pages
+# ──────────────────────────────────────
+
+# Default size of each hostile page, and the seconds each may take to analyze
+HOSTILE_SIZE = 512 * 1024
+HOSTILE_LIMIT = 10.0
+
+# Page builders: size → markup aimed at one pattern's worst case
+HOSTILE = {
+    "street-runs": lambda n: "<p>1 A" + " St  A" * (n // 6) + "</p>",
+    "street-digits": lambda n: "<p>" + "1 Main St  Carmel " * (n // 18) + "</p>",
+    "street-spaces": lambda n: "<p>" + ("1 AB St" + " " * 16) * (n // 23) + "</p>",
+    "address-tokens": lambda n: "<p>1 a " + "a.b," * (n // 4) + "</p>",
+    "cta-no-close": lambda n: "<div class=\"" + "get free call " * (n // 14) + "\"></div>",
+    "chat-no-widget": lambda n: "<div>" + "chat hubspot google " * (n // 20) + "</div>",
+    "email-no-domain": lambda n: "<p>" + "a" * (n // 2) + "@" * (n // 2) + "</p>",
+    "email-word": lambda n: "<p>" + "a" * n + "</p>",
+    "base64-at": lambda n: "<img src=\"data:image/png;base64," + "QUFB@" * (n // 5) + "\">",
+    "og-title-tag": lambda n: "<meta property=\"og:title\" " + "og:title" * (n // 8),
+    "meta-tag": lambda n: "<meta " + "name=\"description\" " * (n // 19),
+    "open-headings": lambda n: "<h2" * (n // 3),
+    "open-titles": lambda n: "<title" * (n // 6),
+    "open-tags": lambda n: "<" * n,
+    "css-vars": lambda n: "<style>" + "--primary" * (n // 9) + "</style>",
+    "open-scripts": lambda n: "<script>" * (n // 8),
+    "open-comments": lambda n: "<!--" * (n // 4),
+}
+
+# The unbounded patterns the analyzer's bounded ones replaced, for the fuzz
+REFERENCE_ADDRESS_RES = [
+    re.compile(r'\d{1,5}\s+[A-Z][a-zA-Z\s]+(?:Street|St|Avenue|Ave|Boulevard|Blvd|Drive|Dr|Road|Rd|Lane|Ln|Court|Ct|Way|Circle|Cir|Place|Pl)\.?[\s,]+(?:Suite|Ste|#|Apt\.?)?\s*\d*[\s,]+[A-Z][a-zA-Z\s]+,?\s*[A-Z]{2}\s+\d{5}'),
+    re.compile(r'\d{1,5}\s+\S+\s+\S+[.,]\s*\S+[.,]?\s*[A-Z]{2}\s+\d{5}'),
+]
+REFERENCE_BLOCK_RE = re.compile(r'<(script|style|noscript|svg)\b.*?</\1\s*>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+REFERENCE_TAG_RE = re.compile(r'<[^>]*>')
+
+# Fuzz alphabets: pieces that start, end or break each pattern
+FUZZ_MARKUP = ["get", "quote", "free", "estimate", "contact", "us", "call", "now", "book", "btn", "button",
+               "cta", "schedule", "chat", "widget", "hubspot", "google", "business", "tawk", "\n", " ",
+               "a", "x9", ".", "-", "+", "@", "@@", "b.co", "mail.org", "com", "<", ">", "<script>",
+               "</SCRIPT >", "<style>", "</style>", "<!--", "-->", "<svg", "</svg>", "<p>"]
+# An address, slot by slot; each slot is filled from its list or, now and then, from any
+ADDRESS_SLOTS = [["1", "4410", "12345", "7"], [" ", "  ", "\n  "], ["Main", "Shadeland", "W Oak", "a.b"],
+                 [" "], ["St", "Ave", "Dr", "Street", "x,"], [".", ",", ""], [" ", ", "],
+                 ["Suite 12", "# 4", "Apt. 3", "", ""], [" ", ", "], ["Carmel", "North Salt Lake", "Zionsville"],
+                 [",", ""], [" ", ""], ["IN", "In", "IND"], [" ", "\n"], ["46032", "4603", "46032-1234"]]
+ADDRESS_ANY = [piece for slot in ADDRESS_SLOTS for piece in slot]
+
+
+def fuzz_address(rng):
+    """Something shaped like an address, within the bounded patterns' limits."""
+    pieces = [rng.choice(slot if rng.random() > 0.15 else ADDRESS_ANY) for slot in ADDRESS_SLOTS]
+    if rng.random() < 0.3:
+        pieces.insert(0, rng.choice(["Call ", "123 ", "Visit us at "]))
+    return "".join(pieces)
+
+
+def hostile_pages(analyzer, size, limit):
+    """Time every hostile page through the scan and the near-duplicate path; returns failures."""
+    failed = 0
+    os.environ["PROSPECT_SCAN_BUDGET"] = "off"
+    with open(os.devnull, "w") as devnull:
+        for name, build in HOSTILE.items():
+            html = build(size)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(devnull):
+                analyzer.extract_business_info(html, "")
+            scanned = time.perf_counter()
+            _, text = analyzer.page_simhash(html)
+            analyzer.extract_contact_info(html, text, "")
+            elapsed = time.perf_counter() - start
+            ok = elapsed <= limit
+            failed += not ok
+            print(f"  {'✅' if ok else '❌'} {name:<16} {len(html) / 1024:>6.0f}K  "
+                  f"scan {scanned - start:6.3f}s  dedupe {elapsed - (scanned - start):6.3f}s")
+    return failed
+
+
+def budget_cut(analyzer, name, html, budget=0.05, slack=1.0):
+    """Whether a scan budget stops a page in time, marked partial."""
+    os.environ["PROSPECT_SCAN_BUDGET"] = str(budget)
+    try:
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            research = analyzer.extract_business_info(html, "")
+        elapsed = time.perf_counter() - start
+    finally:
+        del os.environ["PROSPECT_SCAN_BUDGET"]
+    ok = research.get("partial") is True and elapsed <= budget + slack
+    print(f"  {'✅' if ok else '❌'} {budget}s budget on {name}: stopped after {elapsed:.3f}s, "
+          f"partial={research.get('partial', False)}")
+    return 0 if ok else 1
+
+
+def fuzz_matchers(analyzer, rounds, seed):
+    """Compare each one-pass matcher with its regex on random inputs; returns mismatches."""
+    rng = random.Random(seed)
+    a = analyzer
+    checks = {
+        "count_ctas": lambda s: (a.count_ctas(s.lower()), len(a.CTA_RE.findall(s.lower()))),
+        "line_has chat": lambda s: (a.line_has(s, a.CHAT_WORDS, a.CHAT_PAIRS), bool(a.CHAT_RE.search(s))),
+        "line_has social": lambda s: (a.line_has(s, a.SOCIAL_WORDS, a.SOCIAL_PAIRS), bool(a.SOCIAL_RE.search(s))),
+        "iter_emails": lambda s: ([m.span() for m in a.iter_emails(s)], [m.span() for m in a.EMAIL_RE.finditer(s)]),
+        "strip_blocks": lambda s: (a.strip_blocks(s), REFERENCE_BLOCK_RE.sub(" ", s)),
+        "tag cut": lambda s: (REFERENCE_TAG_RE.sub(" ", s[:s.rfind(">") + 1]) + s[s.rfind(">") + 1:],
+                              REFERENCE_TAG_RE.sub(" ", s)),
+    }
+    address = {f"ADDRESS_RES[{i}]": (pat, ref) for i, (pat, ref) in
+               enumerate(zip(a.ADDRESS_RES, REFERENCE_ADDRESS_RES))}
+    mismatches = {name: [] for name in [*checks, *address]}
+    for _ in range(rounds):
+        markup = "".join(rng.choice(FUZZ_MARKUP) for _ in range(rng.randint(1, 40)))
+        for name, check in checks.items():
+            got, want = check(markup)
+            if got != want:
+                mismatches[name].append(markup)
+        text = fuzz_address(rng)
+        for name, (pat, ref) in address.items():
+            got, want = pat.search(text), ref.search(text)
+            if (got and got.group()) != (want and want.group()):
+                mismatches[name].append(text)
+    for name, bad in mismatches.items():
+        print(f"  {'✅' if not bad else '❌'} {name:<16} {rounds} inputs"
+              + (f", {len(bad)} differ, e.g. {bad[0]!r}" if bad else ""))
+    return sum(1 for bad in mismatches.values() if bad)
+
+
+# ──────────────────────────────────────
+# Fetcher against a local site
+# ──────────────────────────────────────
+
+# Paths the crawl must end up with; /old-contact redirects to /contact, and
+# /private is disallowed by robots.txt though the homepage and sitemap link it
+FETCH_PAGES = ["/", "/about", "/services", "/contact", "/gallery"]
+# Chunked bodies are sent this many bytes a chunk; /chunked-cut closes halfway
+FETCH_CHUNK = 100
+FETCH_LINKS = {"/": ["/about", "/gallery", "/private/notes"], "/about": ["/private/plan"]}
+FETCH_SITEMAP = ["/services", "/old-contact", "/private/plan"]
+
+
+def fetch_site_page(path):
+    links = "".join(f'<a href="{link}">{link}</a>\n' for link in FETCH_LINKS.get(path, []))
+    filler = "<p>Family-owned plumbing, drain and water heater service since 1998.</p>\n" * 12
+    return f"<html><head><title>Fixture {path}</title></head><body>\n{links}{filler}</body></html>\n".encode()
+
+
+class FetchSite(http.server.BaseHTTPRequestHandler):
+    """The fixture site; every response is logged as (path, status) on the server."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        base = f"http://{self.headers['Host']}"
+        path = self.path
+        if path == "/robots.txt":
+            body, ctype = f"User-agent: *\nDisallow: /private\nSitemap: {base}/sitemap.xml\n".encode(), "text/plain"
+        elif path == "/sitemap.xml":
+            locs = "".join(f"<url><loc>{base}{p}</loc></url>" for p in FETCH_SITEMAP)
+            body = f'<?xml version="1.0"?><urlset>{locs}</urlset>'.encode()
+            ctype = "application/xml"
+        elif path == "/old-contact":
+            return self.reply(301, b"", {"Location": "/contact"})
+        elif path in ("/chunked", "/chunked-cut"):
+            return self.reply_chunked(fetch_site_page("/"), cut=path == "/chunked-cut")
+        elif path in FETCH_PAGES or path.startswith("/private/"):
+            body, ctype = fetch_site_page(path), "text/html"
+        else:
+            return self.reply(404, b"not found", {"Content-Type": "text/plain"})
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            return self.reply(304, b"", {"ETag": etag})
+        self.reply(200, body, {"Content-Type": ctype, "ETag": etag})
+
+    def reply(self, status, body, headers):
+        self.server.log.append((self.path, status))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def reply_chunked(self, body, cut):
+        self.server.log.append((self.path, 200))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunks = [body[i:i + FETCH_CHUNK] for i in range(0, len(body), FETCH_CHUNK)]
+        for chunk in chunks[:len(chunks) // 2] if cut else chunks:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        if cut:
+            self.close_connection = True
+        else:
+            self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+def fetch_check(name, ok, detail):
+    print(f"  {'✅' if ok else '❌'} {name:<12} {detail}")
+    return 0 if ok else 1
+
+
+def fetch_local():
+    """Crawl the fixture site twice through a fresh page cache; returns failures."""
+    sys.path.insert(0, TOOLS_DIR)
+    from prospect_cache import ProspectCache
+    from prospect_fetch import fetch_prospect
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FetchSite)
+    server.log = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    failed = 0
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ProspectCache(cache_dir)
+            _, first = asyncio.run(fetch_prospect(base + "/", log=lambda *a: None, cache=cache))
+            first_log, server.log = server.log, []
+            _, second = asyncio.run(fetch_prospect(base + "/", log=lambda *a: None, cache=cache))
+            second_log, server.log = server.log, []
+        chunked = asyncio.run(fetch_chunked(base))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    got = [re.sub(r"^http://[^/]+", "", url) for url in re.findall(rb"<!-- ace-page: (\S+) -->", first)
+           for url in [url.decode()]]
+    failed += fetch_check("crawl", sorted(got) == sorted(FETCH_PAGES) and got[0] == "/",
+                          f"{len(got)} pages: {' '.join(got)}")
+    private = [path for path, _ in first_log + second_log if path.startswith("/private")]
+    failed += fetch_check("robots", not private, f"{len(private)} disallowed request(s)")
+    failed += fetch_check("sitemap", ("/sitemap.xml", 200) in first_log and "/services" in got,
+                          "sitemap read, /services found only there")
+    failed += fetch_check("redirect", ("/old-contact", 301) in first_log and "/contact" in got,
+                          "/old-contact → /contact")
+    refetched = [path for path, status in second_log if status == 200]
+    failed += fetch_check("revalidate", second == first and not refetched,
+                          f"{sum(status == 304 for _, status in second_log)} × 304, "
+                          f"{len(refetched)} refetched, bundle {'unchanged' if second == first else 'changed'}")
+    whole, cut, capped = chunked
+    failed += fetch_check("chunked", whole == fetch_site_page("/"), f"{len(whole)} bytes in {FETCH_CHUNK}-byte chunks")
+    failed += fetch_check("chunked-cut", cut is None, cut or "closed halfway: read error, not a short page")
+    failed += fetch_check("chunked-cap", capped, f"max_body {'stops' if capped else 'misses'} a chunked body")
+    return failed
+
+
+async def fetch_chunked(base):
+    """(whole chunked body, None if a cut one raised else what it read, whether max_body stopped one)."""
+    from prospect_fetch import BodyTooLarge, Fetcher, FetchError
+    async with Fetcher() as fetcher:
+        whole = (await fetcher.get(base + "/chunked")).body
+        try:
+            cut = f"read as a {len((await fetcher.get(base + '/chunked-cut')).body)}-byte page"
+        except (asyncio.IncompleteReadError, FetchError):
+            cut = None
+        try:
+            await fetcher.get(base + "/chunked", max_body=2 * FETCH_CHUNK)
+            capped = False
+        except BodyTooLarge:
+            capped = True
+    return whole, cut, capped
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Prospect Analyzer Benchmarks")
+    parser.add_argument("command", choices=["run", "check", "update-golden", "hostile", "fetch"])
+    parser.add_argument("--case", help="Only cases whose name contains this (glob allowed)")
+    parser.add_argument("--function", action="append", choices=FUNCTIONS,
+                        help="Only this function (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing samples per function (default: 5)")
+    parser.add_argument("--save", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Compare timings with results saved by --save")
+    parser.add_argument("--max-slowdown", type=float,
+                        help="With --baseline, fail if any function is more than this %% slower")
+    parser.add_argument("--skip-golden", action="store_true", help="run: time without checking goldens")
+    parser.add_argument("--size", type=int, default=HOSTILE_SIZE, help="hostile: bytes per page (default: 512K)")
+    parser.add_argument("--limit", type=float, default=HOSTILE_LIMIT,
+                        help="hostile: seconds each page may take (default: 10)")
+    parser.add_argument("--fuzz", type=int, default=3000, help="hostile: fuzz inputs per matcher (default: 3000)")
+    parser.add_argument("--seed", type=int, default=1, help="hostile: fuzz seed")
+    args = parser.parse_args()
+
+    if args.command == "fetch":
+        print("🌐 Crawler against a local site")
+        failed = fetch_local()
+        print()
+        if failed:
+            print(f"  ❌ {failed} fetch check(s) failed")
+            sys.exit(1)
+        print("  ✅ All fetch checks passed")
+        return
+
+    analyzer = load_analyzer()
+    if args.command == "hostile":
+        print("☠️  Hostile pages (scan budget off)")
+        failed = hostile_pages(analyzer, args.size, args.limit)
+        print("\n⏱️  Scan budget")
+        failed += budget_cut(analyzer, "pagebuilder-5mb", gen_pagebuilder())
+        # Long enough that the phone/address searches alone outrun the budget
+        failed += budget_cut(analyzer, "street-spaces-4mb", HOSTILE["street-spaces"](8 * args.size))
+        print("\n🎲 Matchers vs. their regexes")
+        failed += fuzz_matchers(analyzer, args.fuzz, args.seed)
+        print()
+        if failed:
+            print(f"  ❌ {failed} hostile check(s) failed")
+            sys.exit(1)
+        print("  ✅ All hostile checks passed")
+        return
+
+    corpus = cases(args.case)
+    if not corpus:
+        print(f"  ❌ No cases match {args.case!r}")
+        sys.exit(1)
+
+    if args.command == "update-golden":
+        update_goldens(analyzer, corpus)
+        return
+
+    if args.command == "check" or not args.skip_golden:
+        print("🔍 Golden outputs")
+        failed = check_goldens(analyzer, corpus)
+        print()
+        if failed:
+            print(f"  ❌ {failed} case(s) changed output — fix them or run update-golden if intended")
+            sys.exit(1)
+        if args.command == "check":
+            return
+
+    print(f"⏱️  Timings (median of {args.repeat}, Python {platform.python_version()})")
+    print()
+    results = run_benchmarks(analyzer, corpus, args.repeat, args.function or FUNCTIONS)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "time": time.time(), "results": results}, f, indent=2)
+        print(f"  ✅ Saved {args.save}")
+
+    if baseline and args.max_slowdown is not None:
+        slow = slowdowns(results, baseline, args.max_slowdown)
+        for case, name, pct in slow:
+            print(f"  ❌ {case} {name}: {pct:+.1f}% vs baseline")
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,11 @@
 
   const VERSION = '1.0.0';
   const STORAGE_KEY = 'ace_chatbot_leads';
+  const OUTBOX_KEY = 'ace_chatbot_outbox';
+  const SESSION_KEY = 'ace_chatbot_session';
+  const RETRY_MIN_MS = 2000;
+  const RETRY_MAX_MS = 5 * 60 * 1000;
+  const OUTBOX_BATCH = 20;
 
   /* ─── Default Config ─── */
   const defaults = {
@@ -22,6 +27,7 @@
     phone: '(555) 123-4567',
     services: ['Kitchen Remodel', 'Bathroom Remodel', 'Roofing', 'Siding', 'Windows & Doors', 'Flooring', 'Painting', 'General Contracting'],
     webhookUrl: '',
+    batchWebhook: false,
     accentColor: '#C49A6C',
     darkBg: '#1a1a2e',
     darkerBg: '#12121f',
@@ -82,25 +88,117 @@
     }
   }
 
-  async function sendWebhook(lead) {
-    if (!config.webhookUrl) return;
+  function sessionId() {
     try {
-      await fetch(config.webhookUrl, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          source: 'ace-chatbot',
-          version: VERSION,
-          timestamp: new Date().toISOString(),
-          company: config.companyName,
-          lead: lead,
-        }),
-      });
+      let id = sessionStorage.getItem(SESSION_KEY);
+      if (!id) {
+        id = 'sess_' + Date.now() + '_' + Math.random().toString(36).substr(2, 8);
+        sessionStorage.setItem(SESSION_KEY, id);
+      }
+      return id;
+    } catch {
+      return '';
+    }
+  }
+
+  /* ─── Webhook Outbox ─── */
+  // Every lead waits in the outbox until the webhook takes it; failed posts
+  // are retried together with backoff, on the next page load, and when the
+  // browser comes back online.
+  let outboxSending = false;
+  let retryTimer = null;
+  let retryDelay = RETRY_MIN_MS;
+
+  function readOutbox() {
+    try {
+      return JSON.parse(localStorage.getItem(OUTBOX_KEY) || '[]');
+    } catch {
+      return [];
+    }
+  }
+
+  function writeOutbox(entries) {
+    try {
+      if (entries.length) localStorage.setItem(OUTBOX_KEY, JSON.stringify(entries));
+      else localStorage.removeItem(OUTBOX_KEY);
     } catch (e) {
-      console.warn('[AceChatbot] Webhook failed:', e);
+      console.warn('[AceChatbot] Outbox save failed:', e);
+    }
+  }
+
+  function webhookPayload(lead) {
+    return {
+      source: 'ace-chatbot',
+      version: VERSION,
+      timestamp: new Date().toISOString(),
+      company: config.companyName,
+      lead: lead,
+    };
+  }
+
+  async function postWebhook(body) {
+    const res = await fetch(config.webhookUrl, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body),
+    });
+    // 408/429/5xx mean "not now"; any other refusal won't change on a retry
+    if (res.ok || (res.status < 500 && res.status !== 408 && res.status !== 429)) {
+      if (!res.ok) console.warn('[AceChatbot] Webhook refused lead:', res.status);
+      return { done: true };
+    }
+    const retryAfter = parseInt(res.headers.get('Retry-After') || '', 10);
+    return { done: false, retryAfterMs: retryAfter > 0 ? retryAfter * 1000 : 0 };
+  }
+
+  function scheduleRetry(minDelayMs) {
+    if (retryTimer) return;
+    const delay = Math.max(retryDelay, minDelayMs || 0);
+    // Jitter keeps every page that saw the same outage from retrying in step
+    retryTimer = setTimeout(() => {
+      retryTimer = null;
+      flushOutbox();
+    }, delay / 2 + Math.random() * delay / 2);
+    retryDelay = Math.min(retryDelay * 2, RETRY_MAX_MS);
+  }
+
+  async function flushOutbox() {
+    if (!config.webhookUrl || outboxSending) return;
+    outboxSending = true;
+    try {
+      let entries = readOutbox();
+      while (entries.length) {
+        const batch = entries.slice(0, config.batchWebhook ? OUTBOX_BATCH : 1);
+        let result;
+        try {
+          result = await postWebhook(config.batchWebhook ? { leads: batch } : batch[0]);
+        } catch (e) {
+          console.warn('[AceChatbot] Webhook failed, will retry:', e);
+          result = { done: false };
+        }
+        if (!result.done) {
+          scheduleRetry(result.retryAfterMs);
+          return;
+        }
+        const sent = new Set(batch.map((p) => p.lead.id));
+        // Re-read: another tab may have queued leads meanwhile
+        entries = readOutbox().filter((p) => !sent.has(p.lead.id));
+        writeOutbox(entries);
+      }
+      retryDelay = RETRY_MIN_MS;
+    } finally {
+      outboxSending = false;
     }
   }
 
+  function sendWebhook(lead) {
+    if (!config.webhookUrl) return;
+    const entries = readOutbox();
+    entries.push(webhookPayload(lead));
+    writeOutbox(entries);
+    flushOutbox();
+  }
+
   /* ─── Inject Styles ─── */
   function injectStyles() {
     const accent = config.accentColor;
@@ -932,6 +1030,7 @@
       ...chatState.data,
       timestamp: new Date().toISOString(),
       afterHours: isAfterHours(),
+      session: sessionId(),
       page: window.location.href,
       userAgent: navigator.userAgent,
     };
@@ -939,7 +1038,7 @@
     // Save to localStorage
     saveLeadToStorage(lead);
 
-    // Send webhook
+    // Send webhook (queued in the outbox until it's delivered)
     sendWebhook(lead);
 
     // Show success
@@ -969,6 +1068,9 @@
   window.AceChatbot = {
     init: function (userConfig) {
       config = Object.assign({}, defaults, userConfig);
+      // Deliver anything a previous page left in the outbox
+      window.addEventListener('online', flushOutbox);
+      setTimeout(flushOutbox, 1000);
       if (document.readyState === 'loading') {
         document.addEventListener('DOMContentLoaded', () => {
           injectStyles();
@@ -995,6 +1097,11 @@
     clearLeads: function () {
       localStorage.removeItem(STORAGE_KEY);
     },
+    // Leads not yet delivered to the webhook
+    getPendingLeads: function () {
+      return readOutbox().map((p) => p.lead);
+    },
+    flush: flushOutbox,
     version: VERSION,
   };
 })();
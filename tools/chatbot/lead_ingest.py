@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Lead Ingest
+
+A small asyncio HTTP server for ace-chatbot.js to post leads to (set the
+widget's webhookUrl to https://<host>/leads and batchWebhook: true), so a
+burst of leads from every client site we host lands in one durable place:
+
+  - each lead is checked (id, company, name, and a phone or email) and
+    deduped: a retry of the same lead id, another lead from the same chat
+    session, or the same phone or email at the same company within
+    --dedupe-days counts as a repeat of the first, not a new lead
+  - leads are buffered in a bounded queue and group-committed to SQLite by
+    one writer (a transaction per batch, whatever queued up while the last
+    one was syncing); a POST is answered only once its leads are on disk
+  - when the queue is full a POST waits for room, and after --max-wait it
+    is answered 503 with Retry-After. Nothing is dropped: the widget keeps
+    the lead in its outbox and retries, and ids make the retry idempotent
+  - GET /leads?after=<cursor> returns committed leads in order for the
+    notification jobs; wait=<seconds> long-polls for the next one
+
+Reads need Authorization: Bearer $LEAD_INGEST_TOKEN, or a loopback client
+when no token is set. Leads live in $LEAD_DB (default
+~/.local/share/ace-growth/leads.db).
+
+Usage:
+  python3 lead_ingest.py serve --port 8787
+  python3 lead_ingest.py serve --host 0.0.0.0 --origin https://procontractors.com
+  python3 lead_ingest.py tail --after 120                # committed leads as JSON lines
+  python3 lead_ingest.py stats
+"""
+
+import argparse
+import asyncio
+import datetime
+import hmac
+import ipaddress
+import json
+import os
+import re
+import signal
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+
+DEFAULT_DB = os.path.expanduser("~/.local/share/ace-growth/leads.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    seq          INTEGER PRIMARY KEY AUTOINCREMENT,  -- the read cursor
+    id           TEXT NOT NULL UNIQUE,               -- the widget's lead id
+    company      TEXT NOT NULL,
+    session      TEXT,
+    name         TEXT NOT NULL,
+    phone        TEXT,                               -- digits only, for dedupe
+    email        TEXT,                               -- lowercased, for dedupe
+    received_at  REAL NOT NULL,
+    repeats      INTEGER NOT NULL DEFAULT 0,         -- later submissions deduped onto this lead
+    payload      TEXT NOT NULL                       -- the posted payload as JSON
+);
+CREATE INDEX IF NOT EXISTS idx_leads_session ON leads (company, session);
+CREATE INDEX IF NOT EXISTS idx_leads_phone ON leads (company, phone);
+CREATE INDEX IF NOT EXISTS idx_leads_email ON leads (company, email);
+
+-- Each repeat and when it came in; leads.repeats counts them per lead
+CREATE TABLE IF NOT EXISTS lead_repeats (
+    seq          INTEGER NOT NULL,                   -- the lead repeated
+    received_at  REAL NOT NULL,
+    by           TEXT NOT NULL                       -- session, phone or email
+);
+CREATE INDEX IF NOT EXISTS idx_lead_repeats_seq ON lead_repeats (seq);
+
+-- Leads per company per day, kept by the triggers below as leads commit, so
+-- monthly client reports never read the log itself. A repeat counts on the
+-- day it came in, not its lead's day.
+CREATE TABLE IF NOT EXISTS lead_daily (
+    day          TEXT NOT NULL,                      -- UTC
+    company      TEXT NOT NULL,
+    leads        INTEGER NOT NULL DEFAULT 0,
+    repeats      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, company)
+);
+CREATE TRIGGER IF NOT EXISTS leads_daily AFTER INSERT ON leads BEGIN
+    INSERT INTO lead_daily (day, company, leads) VALUES (date(NEW.received_at, 'unixepoch'), NEW.company, 1)
+        ON CONFLICT (day, company) DO UPDATE SET leads = leads + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS lead_repeats_daily AFTER INSERT ON lead_repeats BEGIN
+    INSERT INTO lead_daily (day, company, repeats)
+        SELECT date(NEW.received_at, 'unixepoch'), company, 1 FROM leads WHERE seq = NEW.seq
+        ON CONFLICT (day, company) DO UPDATE SET repeats = repeats + 1;
+END;
+"""
+
+MAX_HEAD = 16 * 1024
+MAX_BODY = 1024 * 1024
+MAX_LEADS = 50        # per POST
+MAX_FIELD = 2000      # characters in any one lead field
+IDLE_TIMEOUT = 30     # seconds a keep-alive connection may sit quiet
+MAX_POLL = 30         # longest GET /leads?wait=
+
+LEAD_ID_RE = re.compile(r"^[\w.:-]{1,100}$")
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+REASONS = {
+    200: "OK", 204: "No Content", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+    405: "Method Not Allowed", 408: "Request Timeout", 411: "Length Required",
+    413: "Payload Too Large", 422: "Unprocessable Entity", 503: "Service Unavailable",
+}
+
+
+def db_path_from_env():
+    return os.path.expanduser(os.environ.get("LEAD_DB") or DEFAULT_DB)
+
+
+def iso(ts):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+# ────────────────────────────────────────────────────
+# Validation
+# ────────────────────────────────────────────────────
+
+class InvalidLead(ValueError):
+    pass
+
+
+def _text(value, field, required=False):
+    if value is None or value == "":
+        if required:
+            raise InvalidLead(f"{field} is required")
+        return ""
+    if not isinstance(value, str):
+        raise InvalidLead(f"{field} must be a string")
+    if len(value) > MAX_FIELD:
+        raise InvalidLead(f"{field} is longer than {MAX_FIELD} characters")
+    return value.strip()
+
+
+def phone_key(phone):
+    """Digits of a phone number, without a leading US country code."""
+    digits = re.sub(r"\D", "", phone)
+    return digits[1:] if len(digits) == 11 and digits.startswith("1") else digits
+
+
+def check_payload(payload):
+    """A webhook payload ({company, lead, ...}) as the row fields the log stores.
+
+    Raises InvalidLead. The widget's own checks are looser than a CRM's (7+
+    digits, an @ and a dot), and these match them so no lead the widget
+    accepted is refused here.
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("lead"), dict):
+        raise InvalidLead("expected {company, lead}")
+    lead = payload["lead"]
+    lead_id = _text(lead.get("id"), "lead.id", required=True)
+    if not LEAD_ID_RE.match(lead_id):
+        raise InvalidLead("lead.id may only hold letters, digits and . _ : -")
+    company = _text(payload.get("company"), "company", required=True)
+    name = _text(lead.get("name"), "lead.name", required=True)
+    phone = phone_key(_text(lead.get("phone"), "lead.phone"))
+    email = _text(lead.get("email"), "lead.email").lower()
+    for field in ("service", "description", "page", "userAgent", "session", "timestamp"):
+        _text(lead.get(field), f"lead.{field}")
+    if len(phone) < 7 and "@" not in email:
+        raise InvalidLead("a phone number or email is required")
+    return {
+        "id": lead_id,
+        "company": company,
+        "session": _text(lead.get("session"), "lead.session") or None,
+        "name": name,
+        "phone": phone if len(phone) >= 7 else None,
+        "email": email if EMAIL_RE.match(email) else None,
+        "payload": json.dumps(payload, separators=(",", ":")),
+    }
+
+
+def payloads_from_body(body):
+    """The webhook payloads in a POST body: one payload, or {"leads": [payload, ...]}."""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise InvalidLead("body is not JSON")
+    if isinstance(data, dict) and "leads" in data:
+        payloads = data["leads"]
+        if not isinstance(payloads, list) or not payloads:
+            raise InvalidLead("leads must be a non-empty list")
+        if len(payloads) > MAX_LEADS:
+            raise InvalidLead(f"at most {MAX_LEADS} leads per request")
+        return payloads
+    return [data]
+
+
+# ────────────────────────────────────────────────────
+# Lead log
+# ────────────────────────────────────────────────────
+
+class LeadLog:
+    """The SQLite lead log. Only ever touched from one thread at a time."""
+
+    def __init__(self, path=DEFAULT_DB, dedupe_days=30):
+        self.path = path
+        self.dedupe_window = dedupe_days * 86400
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        # WAL lets the readers and `tail` run while the writer commits; FULL
+        # syncs every commit, which group commit makes affordable
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=FULL")
+        # The trigger before lead_repeats dated repeats by the clock, not commit()'s `now`
+        self.db.execute("DROP TRIGGER IF EXISTS leads_daily_repeats")
+        self.db.executescript(SCHEMA)
+        # A log from before lead_daily: count its history once
+        if (self.db.execute("SELECT 1 FROM leads LIMIT 1").fetchone()
+                and not self.db.execute("SELECT 1 FROM lead_daily LIMIT 1").fetchone()):
+            self.rebuild_rollups()
+
+    def rebuild_rollups(self):
+        """Recount lead_daily from the whole log, as the triggers count it: leads on the
+        day they came in, repeats on the day they came in. Repeats logged before
+        lead_repeats (counted in leads.repeats only) land on their lead's day."""
+        with self.db:
+            self.db.execute("DELETE FROM lead_daily")
+            self.db.execute("INSERT INTO lead_daily (day, company, leads, repeats) "
+                            "SELECT date(received_at, 'unixepoch'), company, COUNT(*), "
+                            "SUM(repeats - (SELECT COUNT(*) FROM lead_repeats r WHERE r.seq = leads.seq)) "
+                            "FROM leads GROUP BY 1, 2")
+            self.db.execute("INSERT INTO lead_daily (day, company, repeats) "
+                            "SELECT date(r.received_at, 'unixepoch'), l.company, COUNT(*) "
+                            "FROM lead_repeats r JOIN leads l USING (seq) WHERE true GROUP BY 1, 2 "
+                            "ON CONFLICT (day, company) DO UPDATE SET repeats = repeats + excluded.repeats")
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _original(self, row, now):
+        """(seq, reason) of the lead `row` repeats, or None when it's new."""
+        found = self.db.execute("SELECT seq FROM leads WHERE id = ?", (row["id"],)).fetchone()
+        if found:
+            return found["seq"], "id"
+        if row["session"]:
+            found = self.db.execute("SELECT seq FROM leads WHERE company = ? AND session = ? LIMIT 1",
+                                    (row["company"], row["session"])).fetchone()
+            if found:
+                return found["seq"], "session"
+        since = now - self.dedupe_window
+        for field in ("phone", "email"):
+            if row[field]:
+                found = self.db.execute(f"SELECT seq FROM leads WHERE company = ? AND {field} = ? "
+                                        "AND received_at >= ? ORDER BY seq LIMIT 1",
+                                        (row["company"], row[field], since)).fetchone()
+                if found:
+                    return found["seq"], field
+        return None
+
+    def commit(self, rows, now=None):
+        """Append `rows` (from check_payload) in one transaction.
+
+        Returns one result per row: {"status": "accepted", "cursor": seq} or
+        {"status": "duplicate", "of": seq, "by": "id" | "session" | "phone" | "email"}.
+        Rows are deduped against each other too, in order.
+        """
+        now = time.time() if now is None else now
+        results = []
+        with self.db:
+            for row in rows:
+                original = self._original(row, now)
+                if original:
+                    seq, reason = original
+                    # A retried POST is the same submission; anything else is the visitor again
+                    if reason != "id":
+                        self.db.execute("UPDATE leads SET repeats = repeats + 1 WHERE seq = ?", (seq,))
+                        self.db.execute("INSERT INTO lead_repeats (seq, received_at, by) VALUES (?, ?, ?)",
+                                        (seq, now, reason))
+                    results.append({"status": "duplicate", "of": seq, "by": reason})
+                    continue
+                cursor = self.db.execute(
+                    "INSERT INTO leads (id, company, session, name, phone, email, received_at, payload) "
+                    "VALUES (:id, :company, :session, :name, :phone, :email, :received_at, :payload)",
+                    {**row, "received_at": now})
+                results.append({"status": "accepted", "cursor": cursor.lastrowid})
+        return results
+
+    def read(self, after=0, limit=100, company=None):
+        """Committed leads after cursor `after`, oldest first."""
+        sql = "SELECT seq, company, received_at, repeats, payload FROM leads WHERE seq > ?"
+        params = [after]
+        if company:
+            sql += " AND company = ?"
+            params.append(company)
+        sql += " ORDER BY seq LIMIT ?"
+        params.append(limit)
+        return [{"cursor": r["seq"], "receivedAt": iso(r["received_at"]), "company": r["company"],
+                 "repeats": r["repeats"], **json.loads(r["payload"])}
+                for r in self.db.execute(sql, params)]
+
+    def lead_days(self, start, end):
+        """lead_daily rows for days from `start` up to but not including `end` (YYYY-MM-DD)."""
+        return [dict(row) for row in self.db.execute(
+            "SELECT * FROM lead_daily WHERE day >= ? AND day < ?", (start, end))]
+
+    def last_cursor(self):
+        return self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM leads").fetchone()[0]
+
+    def stats(self):
+        return self.db.execute(
+            "SELECT company, COUNT(*), SUM(repeats), MAX(received_at) FROM leads "
+            "GROUP BY company ORDER BY COUNT(*) DESC").fetchall()
+
+
+# ────────────────────────────────────────────────────
+# HTTP server
+# ────────────────────────────────────────────────────
+
+class HttpError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class IngestServer:
+    """Accepts POST /leads into a bounded queue that one writer group-commits."""
+
+    def __init__(self, path, queue_size=1000, batch_max=500, max_wait=5.0, token=None, origins=(),
+                 dedupe_days=30):
+        self.path = path
+        self.dedupe_days = dedupe_days
+        self.queue_size = queue_size
+        self.batch_max = batch_max
+        self.max_wait = max_wait
+        self.token = token
+        self.origins = set(origins)
+        # One thread owns the writer connection, another the reader's, so
+        # long reads never hold up a commit
+        self.write_pool = ThreadPoolExecutor(1, thread_name_prefix="lead-writer")
+        self.read_pool = ThreadPoolExecutor(1, thread_name_prefix="lead-reader")
+        self.stats = {"accepted": 0, "duplicate": 0, "invalid": 0, "busy": 0, "batches": 0,
+                      "largest_batch": 0}
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(self.queue_size)
+        self.committed = asyncio.Event()
+        self.writer_log = await loop.run_in_executor(self.write_pool, LeadLog, self.path, self.dedupe_days)
+        self.reader_log = await loop.run_in_executor(self.read_pool, LeadLog, self.path, self.dedupe_days)
+        self.writer_task = asyncio.create_task(self.write_loop())
+
+    async def stop(self):
+        """Commit whatever is still queued, then close the log."""
+        await self.queue.join()
+        self.writer_task.cancel()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.write_pool, self.writer_log.close)
+        await loop.run_in_executor(self.read_pool, self.reader_log.close)
+        self.write_pool.shutdown()
+        self.read_pool.shutdown()
+
+    # -- group commit --
+
+    async def write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            # Everything that queued while the last batch was syncing goes in this one
+            while len(batch) < self.batch_max and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            rows = [row for row, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.write_pool, self.writer_log.commit, rows)
+            except Exception as e:
+                print(f"  ❌ Commit of {len(rows)} leads failed: {e}", file=sys.stderr)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(HttpError(503, "lead log unavailable", {"Retry-After": "5"}))
+            else:
+                for (_, future), result in zip(batch, results):
+                    self.stats[result["status"]] += 1
+                    if not future.done():
+                        future.set_result(result)
+                self.stats["batches"] += 1
+                self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+                # Wake the long-polling readers
+                self.committed.set()
+                self.committed = asyncio.Event()
+            for _ in batch:
+                self.queue.task_done()
+
+    async def submit(self, body):
+        """Queue the leads in a POST body and wait for their commit; (status, response)."""
+        payloads = payloads_from_body(body)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        results = [None] * len(payloads)
+        waiting = []
+        for i, payload in enumerate(payloads):
+            try:
+                row = check_payload(payload)
+            except InvalidLead as e:
+                self.stats["invalid"] += 1
+                results[i] = {"status": "invalid", "error": str(e)}
+                continue
+            future = loop.create_future()
+            try:
+                await asyncio.wait_for(self.queue.put((row, future)), max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                # Leads queued so far still commit; the retry finds them by id
+                self.stats["busy"] += 1
+                raise HttpError(503, "busy, retry shortly", {"Retry-After": "2"})
+            waiting.append((i, future))
+        for i, future in waiting:
+            results[i] = await future
+        ok = any(r["status"] != "invalid" for r in results)
+        return (200 if ok else 422), {"results": results}
+
+    # -- reads --
+
+    async def read(self, query, peer, headers):
+        if self.token:
+            given = headers.get("authorization", "").removeprefix("Bearer ").strip()
+            if not hmac.compare_digest(given.encode(), self.token.encode()):
+                raise HttpError(401, "bad or missing token")
+        elif not _loopback(peer):
+            raise HttpError(401, "set LEAD_INGEST_TOKEN to read from another host")
+        try:
+            after = max(int(query.get("after", ["0"])[0]), 0)
+            limit = min(max(int(query.get("limit", ["100"])[0]), 1), 500)
+            wait = min(max(float(query.get("wait", ["0"])[0]), 0), MAX_POLL)
+        except ValueError:
+            raise HttpError(400, "after, limit and wait must be numbers")
+        company = query.get("company", [None])[0]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while True:
+            # Take the event before reading, so a commit in between still wakes us
+            committed = self.committed
+            leads = await loop.run_in_executor(self.read_pool, self.reader_log.read, after, limit, company)
+            remaining = deadline - loop.time()
+            if leads or remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(committed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        return 200, {"leads": leads, "cursor": leads[-1]["cursor"] if leads else after}
+
+    # -- HTTP --
+
+    def cors_headers(self, headers):
+        origin = headers.get("origin")
+        if not self.origins:
+            return {"Access-Control-Allow-Origin": "*"}
+        if origin in self.origins:
+            return {"Access-Control-Allow-Origin": origin, "Vary": "Origin"}
+        return {}
+
+    async def route(self, method, target, headers, body, peer):
+        url = urlsplit(target)
+        if url.path == "/leads":
+            if method == "OPTIONS":
+                return 204, None, {"Access-Control-Allow-Methods": "POST, GET, OPTIONS",
+                                   "Access-Control-Allow-Headers": "Content-Type, Authorization",
+                                   "Access-Control-Max-Age": "86400"}
+            if method == "POST":
+                try:
+                    status, data = await self.submit(body)
+                except InvalidLead as e:
+                    self.stats["invalid"] += 1
+                    raise HttpError(400, str(e))
+                return status, data, {}
+            if method == "GET":
+                status, data = await self.read(parse_qs(url.query), peer, headers)
+                return status, data, {}
+            raise HttpError(405, "use POST or GET", {"Allow": "POST, GET, OPTIONS"})
+        if url.path == "/health" and method == "GET":
+            return 200, {"ok": True, "queued": self.queue.qsize(), **self.stats}, {}
+        raise HttpError(404, "not found")
+
+    async def handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+                        ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close")
+                extra = self.cors_headers(headers)
+                try:
+                    if "chunked" in headers.get("transfer-encoding", "").lower():
+                        raise HttpError(411, "send a Content-Length")
+                    length = int(headers.get("content-length") or 0)
+                    if length > MAX_BODY:
+                        keep_alive = False
+                        raise HttpError(413, f"body over {MAX_BODY} bytes")
+                    body = await asyncio.wait_for(reader.readexactly(length), IDLE_TIMEOUT)
+                    status, data, more = await self.route(method, target, headers, body, peer)
+                    extra.update(more)
+                except HttpError as e:
+                    status, data = e.status, {"error": str(e)}
+                    extra.update(e.headers)
+                except (ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    status, data, keep_alive = 400, {"error": "malformed request"}, False
+                writer.write(response(status, data, extra, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _loopback(peer):
+    try:
+        return ipaddress.ip_address(peer[0]).is_loopback
+    except (TypeError, ValueError, IndexError):
+        return False
+
+
+def response(status, data, headers, keep_alive):
+    body = b"" if data is None else json.dumps(data).encode()
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+    if data is not None:
+        lines.append("Content-Type: application/json")
+    lines.append(f"Content-Length: {len(body)}")
+    lines.append("Connection: " + ("keep-alive" if keep_alive else "close"))
+    lines.extend(f"{k}: {v}" for k, v in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def serve(args):
+    ingest = IngestServer(args.db, args.queue_size, args.batch_max, args.max_wait,
+                          os.environ.get("LEAD_INGEST_TOKEN"), args.origin, args.dedupe_days)
+    await ingest.start()
+    server = await asyncio.start_server(ingest.handle, args.host, args.port, limit=MAX_HEAD)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    print(f"  ✅ Lead ingest on http://{args.host}:{args.port}/leads → {args.db}", flush=True)
+    await stop.wait()
+    server.close()
+    await ingest.stop()
+    print(f"  ✅ Stopped: {ingest.stats['accepted']} accepted, {ingest.stats['duplicate']} duplicate, "
+          f"{ingest.stats['batches']} commits", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Lead Ingest")
+    parser.add_argument("--db", default=db_path_from_env(),
+                        help="Lead log (default: $LEAD_DB or ~/.local/share/ace-growth/leads.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    srv = sub.add_parser("serve", help="Accept leads over HTTP")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8787)
+    srv.add_argument("--origin", action="append", default=[],
+                     help="Allowed CORS origin, repeatable (default: any)")
+    srv.add_argument("--queue-size", type=int, default=1000, help="Leads buffered before POSTs wait")
+    srv.add_argument("--batch-max", type=int, default=500, help="Most leads in one commit")
+    srv.add_argument("--max-wait", type=float, default=5.0,
+                     help="Seconds a POST waits for queue room before a 503 (default: 5)")
+    srv.add_argument("--dedupe-days", type=float, default=30,
+                     help="Same phone or email at a company within this many days is a repeat (default: 30)")
+
+    tail = sub.add_parser("tail", help="Print committed leads as JSON lines")
+    tail.add_argument("--after", type=int, default=0, help="Cursor to read after (default: from the start)")
+    tail.add_argument("--limit", type=int, default=100)
+    tail.add_argument("--company")
+
+    sub.add_parser("stats", help="Leads and repeats per company")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        if args.queue_size < 1 or args.batch_max < 1:
+            parser.error("--queue-size and --batch-max must be at least 1")
+        asyncio.run(serve(args))
+        return
+    if not os.path.exists(args.db):
+        print(f"  ❌ No lead log at {args.db}")
+        sys.exit(1)
+    with LeadLog(args.db) as log:
+        if args.command == "tail":
+            for lead in log.read(args.after, args.limit, args.company):
+                print(json.dumps(lead))
+        else:
+            for company, count, repeats, last in log.stats():
+                print(f"  {company:<30} {count:>6} leads  {repeats:>4} repeats   last {iso(last)}")
+            print(f"\n  Cursor: {log.last_cursor()}")
+
+
+if __name__ == "__main__":
+    main()
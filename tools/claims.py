@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Work Claims
+
+Claim tokens for the SQLite work queues (review-automation's follow-up queue,
+prospect_orchestrator.py's job queue). A row is claimed by writing a token
+naming the claiming process; a later run treats the claim as abandoned once
+that process is gone (same host) or the queue's lease runs out (any host).
+
+  host:pid:random   e.g. "ops-1:4121:9f2c01ab"
+"""
+
+import os
+import secrets
+import socket
+
+
+def new_claim():
+    """A claim token naming this process, so a later run can tell whether it is still alive."""
+    return f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+
+
+def claim_alive(claim):
+    host, _, rest = (claim or "").partition(":")
+    pid = rest.partition(":")[0]
+    if host != socket.gethostname() or not pid.isdigit():
+        return True  # another machine's claim; only the lease can expire it
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
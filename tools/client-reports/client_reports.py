@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Client Reports
+
+Fills in docs/REPORT-TEMPLATE.md for every client from daily rollups the
+tools already keep as they write:
+
+  review-automation/data/review-tracker.db   client_daily — review requests,
+      follow-ups, SMS/emails sent and reviews marked, per company per day
+  $LEAD_DB (chatbot lead log)                lead_daily — new and repeat
+      leads per company per day
+
+A month's reports read only those rows for the month and the one before it, in
+one pass, so generating them costs about clients × 62 days of rows, however
+much history the tracker and lead log hold. Companies are matched across the
+two by name, ignoring case and punctuation.
+
+What the tools can't see (traffic, GBP, rankings, content, ROI) is left as the
+template's placeholders, to fill in by hand as before.
+
+Usage:
+  python3 client_reports.py render                         # last month, every client
+  python3 client_reports.py render --month 2026-09 --client "Acme Roofing"
+  python3 client_reports.py summary [--month 2026-09] [--json]
+  python3 client_reports.py rebuild                        # recount rollups from full history
+"""
+
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOLS_DIR = os.path.dirname(SCRIPT_DIR)
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, os.path.join(TOOLS_DIR, "review-automation"))
+sys.path.insert(0, os.path.join(TOOLS_DIR, "chatbot"))
+
+from lead_ingest import LeadLog, db_path_from_env
+from tracker_store import (BLUE, BOLD, GOLD, GREEN, NC, RED, TRACKER_CSV, TRACKER_DB,
+                           TrackerStore, banner)
+
+
+TEMPLATE = os.path.join(REPO_ROOT, "docs", "REPORT-TEMPLATE.md")
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "output")
+
+TRACKER_FIELDS = ("requests", "followups", "sms_sent", "email_sent", "reviews")
+LEAD_FIELDS = ("leads", "repeats")
+
+# Rows of the template's Reviews section this fills in, above the per-platform table
+REVIEW_ROWS = [
+    ("Review Requests Sent", "requests"),
+    ("Follow-ups Sent", "followups"),
+    ("Texts Delivered", "sms_sent"),
+    ("Emails Delivered", "email_sent"),
+    ("Reviews Confirmed", "reviews"),
+]
+
+
+def client_key(company):
+    """Company name as both logs are matched on: "Acme Roofing, LLC" → "acme-roofing-llc"."""
+    return re.sub(r"[^a-z0-9]+", "-", (company or "").lower()).strip("-")
+
+
+def month_bounds(month):
+    """(start of the month before, start of `month`, start of the month after) for "YYYY-MM"."""
+    start = datetime.date.fromisoformat(month + "-01")
+    before = (start - datetime.timedelta(days=1)).replace(day=1)
+    after = (start + datetime.timedelta(days=31)).replace(day=1)
+    return before.isoformat(), start.isoformat(), after.isoformat()
+
+
+def last_month():
+    return (datetime.date.today().replace(day=1) - datetime.timedelta(days=1)).strftime("%Y-%m")
+
+
+def change(this, last):
+    if this is None or last is None:
+        return "[+/-X%]"
+    if not last:
+        return "—" if not this else "new"
+    return f"{(this - last) / last * 100:+.0f}%"
+
+
+# ──────────────────────────────────────
+# Rollups
+# ──────────────────────────────────────
+
+class Client:
+    """One client's counts for the report month and the month before."""
+
+    def __init__(self, key):
+        self.key = key
+        self.names = {}
+        self.this = dict.fromkeys(TRACKER_FIELDS + LEAD_FIELDS, 0)
+        self.last = dict.fromkeys(TRACKER_FIELDS + LEAD_FIELDS, 0)
+
+    @property
+    def name(self):
+        # The spelling most of its activity was logged under
+        return max(self.names, key=self.names.get)
+
+    def add(self, row, fields, this_month):
+        counts = self.this if this_month else self.last
+        for field in fields:
+            counts[field] += row[field] or 0
+        self.names[row["company"]] = self.names.get(row["company"], 0) + sum(row[f] or 0 for f in fields)
+
+
+def load_clients(tracker, leads, month):
+    """{client key: Client} from both rollups' rows for `month` and the month before."""
+    before, start, after = month_bounds(month)
+    clients = {}
+    sources = [(tracker.client_days(before, after), TRACKER_FIELDS)]
+    if leads is not None:
+        sources.append((leads.lead_days(before, after), LEAD_FIELDS))
+    for rows, fields in sources:
+        for row in rows:
+            key = client_key(row["company"])
+            if not key:
+                continue
+            if key not in clients:
+                clients[key] = Client(key)
+            clients[key].add(row, fields, row["day"] >= start)
+    return clients
+
+
+# ──────────────────────────────────────
+# Rendering
+# ──────────────────────────────────────
+
+def render_report(template, client, month, has_leads, today=None):
+    """The report template with what the rollups know filled in."""
+    today = today or datetime.date.today()
+    period = datetime.date.fromisoformat(month + "-01").strftime("%B %Y")
+    out = []
+    for line in template.splitlines():
+        if line.startswith("## Client: "):
+            line = f"## Client: {client.name}"
+        elif line.startswith("## Report Period: "):
+            line = f"## Report Period: {period}"
+        elif line.startswith("## Date: "):
+            line = f"## Date: {today.strftime('%B')} {today.day}, {today.year}"
+        elif line.startswith("| Form Submissions |") and has_leads:
+            this, last = client.this["leads"], client.last["leads"]
+            line = f"| Form Submissions (chat widget) | {this} | {last} | {change(this, last)} |"
+        elif line.startswith("### Lead Quality Notes") and has_leads and client.this["repeats"]:
+            out.append(line)
+            line = (f"- {client.this['repeats']} repeat contact(s) from visitors who had already reached out "
+                    f"(not counted as new leads)")
+        out.append(line)
+        if line == "## Reviews":
+            out += ["", "### Review Requests", "",
+                    "| Metric | This Month | Last Month | Change |",
+                    "|--------|-----------|------------|--------|"]
+            for label, field in REVIEW_ROWS:
+                this, last = client.this[field], client.last[field]
+                out.append(f"| {label} | {this} | {last} | {change(this, last)} |")
+            out += ["", "### Review Platforms"]
+    return "\n".join(out) + "\n"
+
+
+def write_report(path, text):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# ──────────────────────────────────────
+# Commands
+# ──────────────────────────────────────
+
+def open_leads(path):
+    if not os.path.exists(path):
+        print(f"  {GOLD}⚠️  No lead log at {path} — lead counts left blank{NC}")
+        return None
+    return LeadLog(path)
+
+
+def selected(clients, names):
+    if not names:
+        return sorted(clients.values(), key=lambda c: c.name.lower())
+    picked = []
+    for name in names:
+        client = clients.get(client_key(name))
+        if client is None:
+            print(f"  {RED}❌ No activity for {name} in this period{NC}")
+        else:
+            picked.append(client)
+    return picked
+
+
+def cmd_render(tracker, leads, args):
+    month = args.month or last_month()
+    with open(TEMPLATE, "r") as f:
+        template = f.read()
+    clients = selected(load_clients(tracker, leads, month), args.client)
+    out_dir = os.path.join(args.out_dir or OUTPUT_DIR, month)
+    os.makedirs(out_dir, exist_ok=True)
+    banner(f"📈 Client Reports — {month}")
+    for client in clients:
+        path = os.path.join(out_dir, f"{client.key}.md")
+        write_report(path, render_report(template, client, month, leads is not None))
+        print(f"  {GREEN}✅ {client.name}{NC} → {path}")
+    print()
+    print(f"  {BLUE}{len(clients)} report(s) written{NC}")
+    print()
+    return 0 if clients or not args.client else 1
+
+
+def cmd_summary(tracker, leads, args):
+    month = args.month or last_month()
+    clients = selected(load_clients(tracker, leads, month), args.client)
+    if args.json:
+        for client in clients:
+            print(json.dumps({"client": client.name, "month": month, "thisMonth": client.this,
+                              "lastMonth": client.last}))
+        return 0
+    banner(f"📈 Client Activity — {month}", wide=True)
+    if not clients:
+        print(f"  {GOLD}No client activity this month.{NC}")
+        print()
+        return 0
+    print(f"  {BOLD}{'Client':<28} {'Requests':>9} {'Follow-ups':>11} {'Reviews':>8} {'Leads':>6} {'vs last':>8}{NC}")
+    for client in clients:
+        t = client.this
+        leads_text = str(t["leads"]) if leads is not None else "—"
+        trend = change(t["leads"], client.last["leads"]) if leads is not None else "—"
+        print(f"  {client.name[:28]:<28} {t['requests']:>9} {t['followups']:>11} {t['reviews']:>8} "
+              f"{leads_text:>6} {trend:>8}")
+    print()
+    return 0
+
+
+def cmd_rebuild(tracker, leads, args):
+    tracker.rebuild_rollups()
+    print(f"  {GREEN}✅ Review tracker rollups recounted{NC}")
+    if leads is not None:
+        leads.rebuild_rollups()
+        print(f"  {GREEN}✅ Lead rollups recounted{NC}")
+    return 0
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Client Reports")
+    parser.add_argument("--tracker-db", default=TRACKER_DB, help="Review tracker database")
+    parser.add_argument("--tracker-csv", default=TRACKER_CSV, help="Review tracker CSV log")
+    parser.add_argument("--lead-db", default=db_path_from_env(),
+                        help="Chatbot lead log (default: LEAD_DB or ~/.local/share/ace-growth/leads.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    render = sub.add_parser("render", help="Write each client's monthly report")
+    render.add_argument("--out-dir", default=None, help="Reports go in OUT_DIR/<month>/ (default: output/)")
+    summary = sub.add_parser("summary", help="One line per client for the month")
+    summary.add_argument("--json", action="store_true", help="One JSON line per client")
+    for p in (render, summary):
+        p.add_argument("--month", default=None, help="YYYY-MM (default: last month)")
+        p.add_argument("--client", action="append", default=[], help="Only this client (repeatable)")
+    sub.add_parser("rebuild", help="Recount the rollups from the tracker's and lead log's full history")
+    args = parser.parse_args()
+    if getattr(args, "month", None):
+        try:
+            if not re.match(r"^\d{4}-\d{2}$", args.month):
+                raise ValueError
+            datetime.date.fromisoformat(args.month + "-01")
+        except ValueError:
+            parser.error(f"--month takes YYYY-MM, got {args.month!r}")
+
+    commands = {"render": cmd_render, "summary": cmd_summary, "rebuild": cmd_rebuild}
+    leads = open_leads(args.lead_db)
+    try:
+        with TrackerStore(args.tracker_db, args.tracker_csv) as tracker:
+            sys.exit(commands[args.command](tracker, leads, args))
+    finally:
+        if leads is not None:
+            leads.close()
+
+
+if __name__ == "__main__":
+    main()
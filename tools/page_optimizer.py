@@ -0,0 +1,869 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Page Optimizer
+
+Post-render size pass for the generated pages (demo sites, growth audits,
+and the realty/landing templates), which prospects open on their phones
+over cellular. On a rendered page it:
+
+  1. Dedupes repeated inline SVGs (service icons, review stars, badges) into
+     one hidden <symbol> sprite per shape, referenced with <use>
+  2. Drops CSS rules whose selectors name a class, id or element that
+     appears nowhere in the page or its scripts (e.g. testimonial styles on
+     a site with no testimonials)
+  3. Minifies: HTML comments and whitespace runs, CSS whitespace and
+     comments, JS comments and indentation (newlines are kept, so automatic
+     semicolon insertion is untouched), JSON-LD
+
+Each step is conservative: anything it can't parse with certainty is left
+as it was. The result is then checked against the original. The element
+tree outside the SVGs and the visible text must match, or the original page
+is returned.
+
+Each template has a size budget (page_budgets.json, optimized bytes and
+gzipped bytes). The renderers check every page they write against it and
+fail when a page is over, so a template that grows past its budget breaks
+the build. `report` prints the sizes of each template's sample render.
+
+PROSPECT_OPTIMIZE=off turns the pass (and the budget check) off.
+
+Usage:
+  python3 page_optimizer.py report                    # sizes vs budgets; exit 1 if over
+  python3 page_optimizer.py report --update           # reset budgets to sample size + 25%
+  python3 page_optimizer.py optimize page.html [-o out.html] [--budget realty-site]
+
+  from page_optimizer import optimize_html
+  html = optimize_html(html)
+"""
+
+import argparse
+import gzip
+import hashlib
+import html.parser
+import json
+import math
+import os
+import re
+import sys
+
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+BUDGETS_FILE = os.path.join(TOOLS_DIR, "page_budgets.json")
+
+# Template → (template file, sample data it's rendered with for `report`)
+TEMPLATES = {
+    "contractor-site": ("templates/contractor-site/index.html", "templates/contractor-site/config.json"),
+    "growth-audit": ("tools/audit-generator/audit-template.html", "tools/audit-generator/sample-audit.json"),
+    "realty-site": ("templates/realty-site/index.html", None),
+    "landing-page": ("templates/landing-page/index.html", None),
+}
+
+# Budgets written by `report --update`: sample size plus this much
+HEADROOM = 1.25
+
+# Elements a browser adds to any page, whether or not the markup has them
+IMPLIED_TAGS = {"html", "head", "body", "tbody"}
+
+SVG_CHILD_TAGS = {"path", "circle", "rect", "line", "polyline", "polygon", "ellipse", "g", "text", "use"}
+
+# Shapes smaller than this stay inline; the <use> would save next to nothing
+MIN_SPRITE = 48
+
+
+def optimize_from_env():
+    return os.environ.get("PROSPECT_OPTIMIZE", "") not in ("0", "off")
+
+
+class BudgetError(ValueError):
+    pass
+
+
+# ──────────────────────────────────────
+# HTML tokens
+# ──────────────────────────────────────
+
+TOKEN_RE = re.compile(r"""
+    (?P<comment><!--.*?-->)
+  | (?P<raw><(?P<rawtag>script|style|textarea|pre)\b(?P<rawattrs>(?:[^>"']|"[^"]*"|'[^']*')*)>
+        (?P<rawbody>.*?)</(?P=rawtag)\s*>)
+  | (?P<tag></?(?P<name>[a-zA-Z][^\s/>]*)(?:[^>"']|"[^"]*"|'[^']*')*>)
+  | (?P<decl><![^>]*>)
+""", re.S | re.I | re.X)
+
+ATTR_RE = re.compile(r"""([^\s=/>"']+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>]+))?""")
+WORD_RE = re.compile(r"[A-Za-z_][\w-]*")
+SPACE_RE = re.compile(r"[ \t\n\r\f]+")
+
+
+def tokenize(page):
+    """[(kind, text, match)]: kind is comment, raw, tag, decl or text."""
+    tokens = []
+    pos = 0
+    for m in TOKEN_RE.finditer(page):
+        if m.start() > pos:
+            tokens.append(("text", page[pos:m.start()], None))
+        tokens.append((m.lastgroup if m.lastgroup in ("comment", "decl") else
+                       "raw" if m.group("raw") else "tag", m.group(), m))
+        pos = m.end()
+    if pos < len(page):
+        tokens.append(("text", page[pos:], None))
+    return tokens
+
+
+def tag_attrs(tag):
+    """{name: value} of a start tag (values unquoted, names lowercased)."""
+    inner = re.sub(r"^<[^\s/>]+", "", tag)[:-1]
+    attrs = {}
+    for name, value in ATTR_RE.findall(inner):
+        if value[:1] in ("'", '"'):
+            value = value[1:-1]
+        attrs.setdefault(name.lower(), value)
+    return attrs
+
+
+def script_kind(attrs):
+    kind = attrs.get("type", "").strip().lower()
+    if kind in ("", "text/javascript", "application/javascript", "module"):
+        return "js"
+    return "json" if kind in ("application/ld+json", "application/json") else None
+
+
+# ──────────────────────────────────────
+# CSS
+# ──────────────────────────────────────
+
+CSS_TOKEN_RE = re.compile(r"""("(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|url\([^)]*\)|/\*.*?\*/)""", re.S)
+CONDITIONAL_AT = ("@media", "@supports", "@layer", "@container")
+PSEUDO_RE = re.compile(r"::?[a-zA-Z-]+(?:\((?:[^()]|\([^()]*\))*\))?")
+ATTR_SELECTOR_RE = re.compile(r"\[[^\]]*\]")
+CLASS_RE = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+ID_RE = re.compile(r"#(-?[_a-zA-Z][\w-]*)")
+TYPE_RE = re.compile(r"(?:^|[\s>+~(,])([a-zA-Z][\w-]*)")
+# Rule preludes: only tried right after a brace, so the scan stays linear
+PRELUDE_RE = re.compile(r"(?:^|(?<=[{}]))([^{}]+)\{")
+
+
+def css_protect(css):
+    """Comments removed and strings/url() swapped for placeholders; returns (css, saved)."""
+    saved = []
+
+    def keep(m):
+        text = m.group()
+        if text.startswith("/*"):
+            return " "
+        saved.append(text)
+        return f"\0{len(saved) - 1}\0"
+
+    return CSS_TOKEN_RE.sub(keep, css), saved
+
+
+def css_restore(css, saved):
+    return re.sub(r"\0(\d+)\0", lambda m: saved[int(m.group(1))], css)
+
+
+def css_blocks(css):
+    """Split a stylesheet into (prelude, body) items; body None for `@x ...;` statements.
+    Returns None if the braces don't balance."""
+    items = []
+    pos = 0
+    while pos < len(css):
+        brace = css.find("{", pos)
+        semi = css.find(";", pos)
+        if brace < 0:
+            rest = css[pos:].strip()
+            if rest:
+                if not rest.startswith("@"):
+                    return None
+                items.extend((s.strip(), None) for s in rest.split(";") if s.strip())
+            break
+        prelude = css[pos:brace]
+        if prelude.lstrip().startswith("@") and 0 <= semi < brace:
+            items.append((css[pos:semi].strip(), None))
+            pos = semi + 1
+            continue
+        depth = 0
+        for end in range(brace, len(css)):
+            if css[end] == "{":
+                depth += 1
+            elif css[end] == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+        else:
+            return None
+        items.append((prelude.strip(), css[brace + 1:end]))
+        pos = end + 1
+    return items
+
+
+def split_top(text, sep):
+    parts, depth, start = [], 0, 0
+    for i, c in enumerate(text):
+        if c in "([":
+            depth += 1
+        elif c in ")]":
+            depth -= 1
+        elif c == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def selector_used(selector, present):
+    """False only when the selector needs a class, id or element the page never has."""
+    if "\\" in selector or "\0" in selector:
+        return True
+    s = ATTR_SELECTOR_RE.sub(" ", PSEUDO_RE.sub(" ", selector))
+    for cls in CLASS_RE.findall(s):
+        if cls not in present["classes"]:
+            return False
+    for ident in ID_RE.findall(s):
+        if ident not in present["ids"]:
+            return False
+    for tag in TYPE_RE.findall(s):
+        if tag.lower() not in present["tags"]:
+            return False
+    return True
+
+
+def minify_selector(selector):
+    selector = SPACE_RE.sub(" ", selector).strip()
+    return re.sub(r"\s*([>,~])\s*", r"\1", selector)
+
+
+def minify_declarations(body):
+    decls = []
+    for decl in split_top(body, ";"):
+        decl = SPACE_RE.sub(" ", decl).strip()
+        if not decl:
+            continue
+        name, colon, value = decl.partition(":")
+        if not colon:
+            decls.append(decl)
+            continue
+        value = re.sub(r"\s*,\s*", ",", value.strip())
+        value = re.sub(r"\s*!\s*important$", "!important", value)
+        decls.append(f"{name.strip()}:{value}")
+    return ";".join(decls)
+
+
+def css_rules(items, present):
+    """Minified text of parsed items, with unused rules dropped."""
+    out = []
+    for prelude, body in items:
+        if body is None:
+            out.append(SPACE_RE.sub(" ", prelude) + ";")
+        elif prelude.startswith("@"):
+            head = SPACE_RE.sub(" ", prelude)
+            head = re.sub(r":\s+", ":", head)
+            if head.lower().startswith(CONDITIONAL_AT):
+                inner = css_blocks(body)
+                inner = css_rules(inner, present) if inner is not None else SPACE_RE.sub(" ", body).strip()
+                if inner:
+                    out.append(f"{head}{{{inner}}}")
+            elif "{" in body:
+                # @keyframes and friends: nested blocks, kept whole
+                inner = css_blocks(body)
+                inner = ("".join(f"{minify_selector(p)}{{{minify_declarations(b or '')}}}" for p, b in inner)
+                         if inner is not None else SPACE_RE.sub(" ", body).strip())
+                out.append(f"{head}{{{inner}}}")
+            else:
+                out.append(f"{head}{{{minify_declarations(body)}}}")
+        elif "{" in body:
+            # Nested rules: keep as written
+            out.append(f"{SPACE_RE.sub(' ', prelude)}{{{SPACE_RE.sub(' ', body).strip()}}}")
+        else:
+            used = [minify_selector(s) for s in split_top(prelude, ",") if selector_used(s, present)]
+            if used:
+                out.append(f"{','.join(used)}{{{minify_declarations(body)}}}")
+    return "".join(out)
+
+
+def optimize_css(css, present):
+    """A stylesheet minified with unused rules dropped; unchanged if it won't parse."""
+    if "{{" in css or "}}" in css:
+        return css
+    protected, saved = css_protect(css)
+    items = css_blocks(protected)
+    if items is None:
+        return css
+    return css_restore(css_rules(items, present), saved)
+
+
+# ──────────────────────────────────────
+# JavaScript
+# ──────────────────────────────────────
+
+REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_KEYWORDS = {"return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw",
+                  "case", "do", "else", "yield", "await"}
+TIGHT = set("{}()[];,:=<>?!&|*%^~")
+JS_WORD_RE = re.compile(r"[\w$]+")
+
+
+class JSParseError(Exception):
+    pass
+
+
+def _scan_string(src, i):
+    quote = src[i]
+    j = i + 1
+    while j < len(src):
+        c = src[j]
+        if c == "\\":
+            j += 2
+            continue
+        if c == quote:
+            return j + 1
+        if c == "\n":
+            break
+        j += 1
+    raise JSParseError("unterminated string")
+
+
+def _scan_regex(src, i):
+    j = i + 1
+    in_class = False
+    while j < len(src):
+        c = src[j]
+        if c == "\\":
+            j += 2
+            continue
+        if c == "\n":
+            break
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            j += 1
+            while j < len(src) and (src[j].isalnum() or src[j] == "_"):
+                j += 1
+            return j
+        j += 1
+    raise JSParseError("unterminated regex")
+
+
+def minify_js(src):
+    """Comments and indentation removed; strings, templates and regexes kept verbatim."""
+    out = []
+    # One entry per open template literal: the brace depth of its current ${...}
+    templates = []
+    depth = 0
+    last = ""        # last significant character of code
+    last_word = ""
+    i, n = 0, len(src)
+    while i < n:
+        c = src[i]
+        if templates and templates[-1] is None:
+            # Inside template literal text
+            j = i
+            while j < n and src[j] != "`" and not src.startswith("${", j):
+                j += 2 if src[j] == "\\" else 1
+            if j >= n:
+                raise JSParseError("unterminated template")
+            if src[j] == "`":
+                out.append(src[i:j + 1])
+                templates.pop()
+                i, last, last_word = j + 1, "`", ""
+            else:
+                out.append(src[i:j + 2])
+                templates[-1] = depth
+                depth += 1
+                i, last, last_word = j + 2, "{", ""
+            continue
+        if c in "\"'":
+            j = _scan_string(src, i)
+            out.append(src[i:j])
+            i, last, last_word = j, c, ""
+        elif c == "`":
+            out.append(c)
+            templates.append(None)
+            i += 1
+        elif src.startswith("//", i):
+            j = src.find("\n", i)
+            i = n if j < 0 else j
+        elif src.startswith("/*", i):
+            j = src.find("*/", i + 2)
+            if j < 0:
+                raise JSParseError("unterminated comment")
+            out.append("\n" if "\n" in src[i:j] else " ")
+            i = j + 2
+        elif c == "/" and (not last or last in REGEX_AFTER or last_word in REGEX_KEYWORDS):
+            j = _scan_regex(src, i)
+            out.append(src[i:j])
+            i, last, last_word = j, "/", ""
+        elif c in " \t\n\r\f\v":
+            j = i
+            while j < n and src[j] in " \t\n\r\f\v":
+                j += 1
+            out.append("\n" if "\n" in src[i:j] else " ")
+            i = j
+        else:
+            if c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+                if templates and templates[-1] == depth:
+                    out.append(c)
+                    templates[-1] = None
+                    i += 1
+                    continue
+            m = JS_WORD_RE.match(src, i)
+            if m:
+                word = m.group()
+                out.append(word)
+                i += len(word)
+                last, last_word = word[-1], word
+            else:
+                out.append(c)
+                i += 1
+                last, last_word = c, ""
+    if templates:
+        raise JSParseError("unterminated template")
+    return _tighten("".join(out))
+
+
+def _tighten(code):
+    """Drop spaces next to punctuation and newlines where ASI can't depend on them.
+
+    Runs after minify_js has reduced every gap outside literals to one space or
+    one newline; literals are skipped by re-scanning them."""
+    out = []
+    i, n = 0, len(code)
+    last = ""
+    last_word = ""
+    while i < n:
+        c = code[i]
+        if c in "\"'`" or (c == "/" and (not last or last in REGEX_AFTER or last_word in REGEX_KEYWORDS)):
+            j = _literal_end(code, i)
+            out.append(code[i:j])
+            i, last, last_word = j, code[j - 1], ""
+            continue
+        if c in " \n":
+            prev = out[-1][-1] if out and out[-1] else ""
+            nxt = code[i + 1] if i + 1 < n else ""
+            if c == " " and (not prev or not nxt or prev in TIGHT or nxt in TIGHT or nxt == "\n"):
+                i += 1
+                continue
+            if c == "\n" and (not prev or not nxt or prev in "{(,;[" or nxt in ")]},;" or nxt == "\n"):
+                i += 1
+                continue
+            out.append(c)
+            i += 1
+            continue
+        word = JS_WORD_RE.match(code, i)
+        if word:
+            out.append(word.group())
+            i += len(word.group())
+            last, last_word = word.group()[-1], word.group()
+        else:
+            out.append(c)
+            i += 1
+            last, last_word = c, ""
+    return "".join(out)
+
+
+def _literal_end(code, i):
+    """End of the string, template or regex literal starting at i (already minified code)."""
+    c = code[i]
+    if c == "/":
+        return _scan_regex(code, i)
+    if c != "`":
+        return _scan_string(code, i)
+    # Templates: copy through, tracking ${ } nesting and inner literals
+    j, stack = i + 1, [0]
+    while j < len(code):
+        ch = code[j]
+        if stack[-1] == 0:
+            if ch == "\\":
+                j += 2
+                continue
+            if ch == "`":
+                stack.pop()
+                if not stack:
+                    return j + 1
+                j += 1
+                continue
+            if code.startswith("${", j):
+                stack.append(1)
+                j += 2
+                continue
+            j += 1
+        else:
+            if ch in "\"'":
+                j = _scan_string(code, j)
+            elif ch == "`":
+                stack.append(0)
+                j += 1
+            elif ch == "{":
+                stack[-1] += 1
+                j += 1
+            elif ch == "}":
+                stack[-1] -= 1
+                if stack[-1] == 0:
+                    stack.pop()
+                j += 1
+            else:
+                j += 1
+    raise JSParseError("unterminated template")
+
+
+def optimize_js(src):
+    try:
+        return minify_js(src).strip()
+    except JSParseError:
+        return src
+
+
+def optimize_json(src):
+    try:
+        packed = json.dumps(json.loads(src), ensure_ascii=False, separators=(",", ":"))
+    except ValueError:
+        return src
+    return src if "</" in packed or "<!--" in packed else packed
+
+
+# ──────────────────────────────────────
+# SVG sprites
+# ──────────────────────────────────────
+
+def svg_spans(tokens):
+    """(open index, close index) of each outermost <svg> element in the token list."""
+    spans, depth, start = [], 0, None
+    for k, (kind, text, m) in enumerate(tokens):
+        if kind != "tag":
+            continue
+        name = m.group("name").lower()
+        if name != "svg" or text.endswith("/>"):
+            continue
+        if text.startswith("</"):
+            depth -= 1
+            if depth == 0 and start is not None:
+                spans.append((start, k))
+                start = None
+        else:
+            if depth == 0:
+                start = k
+            depth += 1
+    return spans
+
+
+def sprite_svgs(tokens, present, css_tags):
+    """Replace repeated SVG bodies with <use> references; returns the sprite sheet or ""."""
+    spans = svg_spans(tokens)
+    shapes = {}
+    for start, end in spans:
+        body = "".join(text for _, text, _ in tokens[start + 1:end])
+        view_box = tag_attrs(tokens[start][1]).get("viewbox")
+        if (len(body) < MIN_SPRITE or re.search(r"\b(?:id|class|href|xlink:href)\s*=|url\(#|<style|<script", body, re.I)
+                or {t.lower() for t in re.findall(r"<([a-zA-Z][\w-]*)", body)} & css_tags):
+            continue
+        shapes.setdefault((view_box, SPACE_RE.sub(" ", body).strip()), []).append((start, end))
+
+    symbols = []
+    taken = present["ids"]
+    for (view_box, body), uses in shapes.items():
+        if len(uses) < 2:
+            continue
+        n = len(symbols)
+        while f"i{n}" in taken:
+            n += 1000
+        sid = f"i{n}"
+        taken.add(sid)
+        vb = f' viewBox="{view_box}"' if view_box else ""
+        symbols.append(f'<symbol id="{sid}"{vb}>{body}</symbol>')
+        for start, end in uses:
+            tokens[start + 1] = ("sprite", f'<use href="#{sid}"></use>', None)
+            for k in range(start + 2, end):
+                tokens[k] = ("sprite", "", None)
+    if not symbols:
+        return ""
+    return ('<svg xmlns="http://www.w3.org/2000/svg" style="display:none" aria-hidden="true">'
+            + "".join(symbols) + "</svg>")
+
+
+# ──────────────────────────────────────
+# Page
+# ──────────────────────────────────────
+
+def page_inventory(tokens):
+    """Classes, ids and element names the page has or its scripts could add."""
+    classes, ids, tags = set(), set(), set(IMPLIED_TAGS)
+    for kind, text, m in tokens:
+        if kind in ("tag", "raw"):
+            name = (m.group("name") if kind == "tag" else m.group("rawtag")).lower()
+            tags.add(name)
+            if text.startswith("</"):
+                continue
+            attrs = tag_attrs(text if kind == "tag" else text[:len(m.group("rawtag")) + 1] + m.group("rawattrs") + ">")
+            classes.update(attrs.get("class", "").split())
+            if "id" in attrs:
+                ids.add(attrs["id"])
+            # Handlers and data attributes can toggle classes too
+            for name, value in attrs.items():
+                if name.startswith(("on", "data-")):
+                    words = set(WORD_RE.findall(value))
+                    classes |= words
+                    ids |= words
+            if kind == "raw" and name == "script":
+                words = set(WORD_RE.findall(m.group("rawbody")))
+                classes |= words
+                ids |= words
+                tags |= {w.lower() for w in words}
+    return {"classes": classes, "ids": ids, "tags": tags}
+
+
+def css_type_selectors(tokens):
+    """Element names used as type selectors in the page's stylesheets."""
+    names = set()
+    for kind, text, m in tokens:
+        if kind == "raw" and m.group("rawtag").lower() == "style":
+            css, _ = css_protect(m.group("rawbody"))
+            for prelude in PRELUDE_RE.findall(css):
+                names |= {t.lower() for t in TYPE_RE.findall(PSEUDO_RE.sub(" ", prelude))}
+    return names
+
+
+def collapse_text(text):
+    return SPACE_RE.sub(lambda m: "\n" if "\n" in m.group() else " ", text)
+
+
+def rebuild_raw(m, body):
+    tag = m.group("rawtag")
+    return f"<{tag}{m.group('rawattrs')}>{body}</{tag}>"
+
+
+def optimize_tokens(page):
+    """(optimized page, sprite sheet it added)"""
+    tokens = tokenize(page)
+    present = page_inventory(tokens)
+    css_tags = css_type_selectors(tokens) & SVG_CHILD_TAGS
+    pre_css = any(kind == "raw" and m.group("rawtag").lower() == "style"
+                  and re.search(r"white-space\s*:\s*(?:pre|break-spaces)", m.group("rawbody"))
+                  for kind, _, m in tokens)
+
+    sheet = sprites = sprite_svgs(tokens, present, css_tags)
+    out = []
+    pending = []  # text either side of a dropped comment collapses as one run
+    for kind, text, m in tokens:
+        if kind == "text" or (kind == "comment" and not text.startswith("<!--[")):
+            pending.append(text if kind == "text" else "")
+            continue
+        if pending:
+            out.append("".join(pending) if pre_css else collapse_text("".join(pending)))
+            pending = []
+        if kind == "raw":
+            tag = m.group("rawtag").lower()
+            if tag == "style":
+                out.append(rebuild_raw(m, optimize_css(m.group("rawbody"), present)))
+            elif tag == "script":
+                lang = script_kind(tag_attrs("<script" + m.group("rawattrs") + ">"))
+                body = m.group("rawbody")
+                if lang == "js":
+                    body = optimize_js(body)
+                elif lang == "json":
+                    body = optimize_json(body)
+                out.append(rebuild_raw(m, body))
+            else:
+                out.append(text)
+        else:
+            out.append(text)
+            if sheet and kind == "tag" and m.group("name").lower() == "body" and not text.startswith("</"):
+                out.append(sheet)
+                sheet = ""
+    if pending:
+        out.append("".join(pending) if pre_css else collapse_text("".join(pending)))
+    if sheet:
+        return page, ""
+    return "".join(out), sprites
+
+
+class _Outline(html.parser.HTMLParser):
+    """Start tags (with attributes) outside SVGs and visible text, for comparing pages."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items = []
+        self.text = []
+        self.svg = 0
+        self.raw = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.svg:
+            self.svg += tag == "svg"
+            return
+        if tag == "svg":
+            self.svg = 1
+            self.items.append((tag, tuple(attrs)))
+            return
+        if tag in ("script", "style"):
+            self.raw = tag
+        self.items.append((tag, tuple(attrs)))
+
+    def handle_startendtag(self, tag, attrs):
+        if not self.svg:
+            self.items.append((tag, tuple(attrs)))
+
+    def handle_endtag(self, tag):
+        if self.svg:
+            self.svg -= tag == "svg"
+            return
+        if tag == self.raw:
+            self.raw = None
+        self.items.append(("/" + tag,))
+
+    def handle_data(self, data):
+        if not self.svg and not self.raw:
+            self.text.append(data)
+
+    def outline(self):
+        return self.items, SPACE_RE.sub(" ", "".join(self.text)).strip()
+
+
+def outline(page):
+    parser = _Outline()
+    parser.feed(page)
+    parser.close()
+    return parser.outline()
+
+
+def optimize_html(page):
+    """The page optimized, or unchanged if the result wouldn't have the same elements and text."""
+    optimized, sprites = optimize_tokens(page)
+    if optimized == page:
+        return page
+    return optimized if outline(optimized.replace(sprites, "", 1)) == outline(page) else page
+
+
+# ──────────────────────────────────────
+# Budgets
+# ──────────────────────────────────────
+
+def page_sizes(page):
+    data = page.encode("utf-8")
+    return {"raw": len(data), "gzip": len(gzip.compress(data, 9, mtime=0))}
+
+
+def load_budgets(path=BUDGETS_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def check_budget(name, page, budgets=None):
+    """Raise BudgetError if a page is over its template's budget."""
+    budget = (budgets if budgets is not None else load_budgets()).get(name)
+    if not budget:
+        return
+    sizes = page_sizes(page)
+    over = [f"{key} {sizes[key]:,} > {budget[key]:,} bytes" for key in ("raw", "gzip")
+            if key in budget and sizes[key] > budget[key]]
+    if over:
+        raise BudgetError(f"{name} page is over budget: {', '.join(over)} (page_budgets.json)")
+
+
+def finish_page(name, page):
+    """What the renderers write: the page optimized and checked against its budget,
+    or as rendered when PROSPECT_OPTIMIZE is off."""
+    if not optimize_from_env():
+        return page
+    page = optimize_html(page)
+    check_budget(name, page)
+    return page
+
+
+def optimizer_version():
+    """Hash of what an optimized page depends on besides its HTML."""
+    if not optimize_from_env():
+        return "off"
+    digest = hashlib.sha256()
+    for path in (os.path.abspath(__file__), BUDGETS_FILE):
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def sample_page(name):
+    """A template's sample render (or the template itself, for the hand-filled ones)."""
+    template, sample = TEMPLATES[name]
+    if sample is None:
+        with open(os.path.join(REPO_ROOT, template)) as f:
+            return f.read()
+    with open(os.path.join(REPO_ROOT, sample)) as f:
+        data = json.load(f)
+    if name == "contractor-site":
+        from site_renderer import render_site
+        return render_site(data)
+    from audit_renderer import render_audit
+    return render_audit(data)
+
+
+def cmd_report(args):
+    budgets = load_budgets()
+    over = 0
+    print(f"  {'template':<17}{'rendered':>10}{'optimized':>11}{'gzip':>9}{'budget (raw/gzip)':>22}")
+    for name in TEMPLATES:
+        page = sample_page(name)
+        optimized = optimize_html(page)
+        before, after = page_sizes(page), page_sizes(optimized)
+        budget = budgets.get(name, {})
+        if args.update:
+            budget = {key: int(math.ceil(after[key] * HEADROOM / 1024) * 1024) for key in after}
+            budgets[name] = budget
+        ok = all(after[key] <= budget[key] for key in budget)
+        over += not ok
+        limits = f"{budget.get('raw', 0):,}/{budget.get('gzip', 0):,}" if budget else "none"
+        print(f"  {name:<17}{before['raw']:>10,}{after['raw']:>11,}{after['gzip']:>9,}{limits:>22}  "
+              f"{'✅' if ok else '❌ over budget'}")
+    if args.update:
+        with open(BUDGETS_FILE, "w") as f:
+            json.dump(budgets, f, indent=2)
+            f.write("\n")
+        print(f"\n  Budgets written to {os.path.relpath(BUDGETS_FILE, REPO_ROOT)}")
+    return 1 if over else 0
+
+
+def cmd_optimize(args):
+    with open(args.page) as f:
+        page = f.read()
+    optimized = optimize_html(page)
+    if args.budget:
+        try:
+            check_budget(args.budget, optimized)
+        except BudgetError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+    out = args.out or args.page
+    with open(out, "w") as f:
+        f.write(optimized)
+    before, after = page_sizes(page), page_sizes(optimized)
+    print(f"✅ {out}: {before['raw']:,} → {after['raw']:,} bytes ({after['gzip']:,} gzipped)")
+    return 0
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Page Optimizer")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="Each template's sample page size against its budget")
+    report.add_argument("--update", action="store_true",
+                        help=f"Set budgets to the current sizes plus {round((HEADROOM - 1) * 100)}%%")
+    optimize = sub.add_parser("optimize", help="Optimize an HTML page (in place unless -o)")
+    optimize.add_argument("page")
+    optimize.add_argument("-o", "--out", help="Write here instead of over the page")
+    optimize.add_argument("--budget", choices=sorted(TEMPLATES), help="Fail if over this template's budget")
+    args = parser.parse_args()
+    sys.exit(cmd_report(args) if args.command == "report" else cmd_optimize(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,16 +8,44 @@ Reads a fetched HTML file and produces:
   3. site-config.json — demo site configuration
 
 All in one shot, no shell quoting issues.
+
+`prospect-analyzer.py serve` keeps a warm copy running for prospect_client.py
+(see "Resident worker" below).
 """
 
 import argparse
+import bisect
+import contextlib
+import hashlib
+import io
 import json
+import multiprocessing
 import re
 import os
+import signal
+import socket
+import socketserver
 import sys
+import threading
+import time
+import traceback
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from html import unescape
 from html.parser import HTMLParser
 
+from prospect_cache import ProspectCache, cache_dir_from_env, content_hash
+from prospect_metrics import metrics, metrics_path_from_env, profiled
+import audit_renderer
+import site_renderer
+from page_optimizer import BUDGETS_FILE
+from prospect_client import socket_path_from_env
+from prospect_store import SIMHASH_BANDS, ProspectStore, db_path_from_env, prospect_row, site_key, slugify
+from prospect_stages import (ANALYZER_STAGES, RENDER_STAGES, BuildState, fingerprint, run_file_stage,
+                             run_json_stage, section_versions)
+
 
 # ──────────────────────────────────────
 # HTML text extraction
@@ -58,178 +86,1466 @@ def extract_text(html):
     return extractor.get_text()
 
 
+# ──────────────────────────────────────
+# Single-pass page scanner
+# ──────────────────────────────────────
+
+# Raw markup is scanned in newline-aligned windows of about this many
+# characters, lowercased one window at a time as the parser consumes them.
+SCAN_WINDOW = 64 * 1024
+
+# Seconds a page's scan may take ($PROSPECT_SCAN_BUDGET, 0 = no limit). Past
+# it the scan stops where it is: fields not found by then are "Not found",
+# counts are what was counted, and the research is marked partial.
+SCAN_BUDGET = 20.0
+
+# Field patterns are tried at each of their anchors, so every run in them
+# that could backtrack is bounded: one attempt costs at most a few thousand
+# steps however the page is built, and a scan stays linear in its length.
+# A real tag's attributes, CSS variable name or street address fits easily.
+TAG_SPAN = 1024
+
+TITLE_RE = re.compile(r'<title[^>]{0,%d}>([^<]+)</title>' % TAG_SPAN, re.IGNORECASE)
+OG_TITLE_RE = re.compile(r'property=["\']og:title["\'][^>]{0,%d}content=["\']([^"\']+)' % TAG_SPAN,
+                         re.IGNORECASE)
+TEL_HREF_RE = re.compile(r'href=["\']tel:([^"\']+)', re.IGNORECASE)
+META_DESC_RE = re.compile(r'name=["\']description["\'][^>]{0,%d}content=["\']([^"\']+)' % TAG_SPAN,
+                          re.IGNORECASE)
+OG_DESC_RE = re.compile(r'property=["\']og:description["\'][^>]{0,%d}content=["\']([^"\']+)' % TAG_SPAN,
+                        re.IGNORECASE)
+HEADING_RE = re.compile(r'<h[2-4][^>]{0,%d}>([^<]{3,60})</h[2-4]>' % TAG_SPAN, re.IGNORECASE)
+HEADING_OPEN_RE = re.compile(r'<h[2-4]')
+# Matched only at the head of the run before an @ (see iter_emails)
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+EMAIL_LOCAL_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-')
+EMAIL_SKIP_DOMAINS = ['example.', 'placeholder.', 'sentry.', 'wixpress.', 'w3.org', 'schema.org',
+                      'domain.', 'email.', 'yoursite.', 'test.']
+PRIMARY_COLOR_RE = re.compile(r'--(?:primary|brand|main)[^:]{0,128}:\s*(#[0-9a-fA-F]{3,8})')
+ACCENT_COLOR_RE = re.compile(r'--(?:accent|secondary|highlight)[^:]{0,128}:\s*(#[0-9a-fA-F]{3,8})')
+PRIMARY_COLOR_OPEN_RE = re.compile(r'--(?:primary|brand|main)')
+ACCENT_COLOR_OPEN_RE = re.compile(r'--(?:accent|secondary|highlight)')
+
+# Line-scoped checks on lowercased markup. These regexes define them, but
+# a greedy pair like get.*quote rescans the rest of its line for every
+# "get" without a "quote" after it, so count_ctas() and line_has() match
+# them in one pass instead.
+CTA_RE = re.compile(r'btn|button|cta|get.*quote|free.*estimate|contact.*us|call.*now|schedule|book.*now')
+CHAT_RE = re.compile(r'livechat|tawk|intercom|drift|crisp|zendesk|hubspot.*chat|chat.*widget|messenger')
+SOCIAL_RE = re.compile(r'facebook|instagram|twitter|linkedin|youtube|yelp|google.*business|bbb\.org')
+
+# Visible-text check: every hit is a review signal, review/testimonial
+# hits are also counted as mentions
+REVIEW_RE = re.compile(r'review|testimonial|rating|stars')
+
+# Visible-text fields, in priority order: the first pattern with a match wins
+PHONE_TEXT_RES = [
+    re.compile(r'\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}'),
+    re.compile(r'\d{3}[\s.-]\d{3}[\s.-]\d{4}'),
+]
+# The street address is written so no two adjacent runs share characters:
+# the separators after the street type are one run unless a unit number or
+# "Suite" splits them, and the city ends on a letter, so trailing spaces
+# belong to the separator before the state. Adjacent overlapping runs
+# (\s{1,16}\s{0,16}[\s,]{1,16}) multiply the ways a failing attempt can be
+# split, and a page of near-addresses backtracks for seconds.
+ADDRESS_RES = [
+    re.compile(r'\d{1,5}\s{1,16}[A-Z][a-zA-Z\s]{1,80}'
+               r'(?:Street|St|Avenue|Ave|Boulevard|Blvd|Drive|Dr|Road|Rd|Lane|Ln|Court|Ct|Way|Circle|Cir|Place|Pl)\.?'
+               r'(?:[\s,]{1,32}\d{1,6}[\s,]{1,16}'
+               r'|[\s,]{1,16}(?:Suite|Ste|#|Apt\.?)(?:\s{0,16}\d{1,6}[\s,]{1,16}|[\s,]{1,32})'
+               r'|[\s,]{2,48})'
+               r'[A-Z](?:[a-zA-Z\s]{0,59}[a-zA-Z](?:\s{0,16},)?\s{0,16}|\s{1,16}(?:,\s{0,16})?)[A-Z]{2}\s{1,16}\d{5}'),
+    re.compile(r'\d{1,5}\s{1,16}\S{1,40}\s{1,16}\S{1,40}[.,]\s{0,16}\S{1,40}[.,]?\s{0,16}[A-Z]{2}\s{1,16}\d{5}'),
+]
+
+# The same checks split into literals for lines longer than SCAN_WINDOW,
+# which are walked in pieces instead of being lowercased whole.
+CTA_START_RE = re.compile(r'btn|button|cta|get|free|contact|call|schedule|book')
+CTA_GREEDY = {"get": "quote", "free": "estimate", "contact": "us", "call": "now", "book": "now"}
+CHAT_WORDS = ['livechat', 'tawk', 'intercom', 'drift', 'crisp', 'zendesk', 'messenger']
+CHAT_PAIRS = [('hubspot', 'chat'), ('chat', 'widget')]
+SOCIAL_WORDS = ['facebook', 'instagram', 'twitter', 'linkedin', 'youtube', 'yelp', 'bbb.org']
+SOCIAL_PAIRS = [('google', 'business')]
+SCHEMA_WORDS = ['application/ld+json', 'schema.org', 'itemtype']
+LONGEST_WORD = len('application/ld+json')
+
+
+class ScanTimeout(Exception):
+    """Raised into the parser to stop a scan that ran out of time."""
+
+
+def scan_budget_from_env():
+    """The per-page scan budget from PROSPECT_SCAN_BUDGET, in seconds; 0 when off."""
+    value = os.environ.get("PROSPECT_SCAN_BUDGET", "")
+    if value in ("off", "none"):
+        return 0
+    if not value.strip():
+        return SCAN_BUDGET
+    try:
+        return float(value)
+    except ValueError:
+        if value not in _bad_budgets_warned:
+            _bad_budgets_warned.add(value)
+            print(f"  ⚠️ PROSPECT_SCAN_BUDGET={value!r} isn't a number of seconds — using {SCAN_BUDGET:g}s")
+        return SCAN_BUDGET
+
+
+# Each bad PROSPECT_SCAN_BUDGET is warned about once, not once per page
+_bad_budgets_warned = set()
+
+
+# Every phone and address match starts at a digit or "(", so searching for
+# one is trying the pattern at each of those in turn, with the clock checked
+# every TEXT_CLOCK_EVERY tries.
+TEXT_START_RE = re.compile(r'[(\d]')
+TEXT_CLOCK_EVERY = 64
+
+
+def search_text(pat, text, deadline=None):
+    """pat.search(text) for a phone/address pattern, raising ScanTimeout once
+    time.monotonic() passes `deadline`."""
+    for n, start in enumerate(TEXT_START_RE.finditer(text), 1):
+        if deadline is not None and n % TEXT_CLOCK_EVERY == 0 and time.monotonic() > deadline:
+            raise ScanTimeout()
+        m = pat.match(text, start.start())
+        if m:
+            return m
+    return None
+
+
+def first_text_match(text, patterns, deadline=None):
+    """The first match of the first pattern that matches `text`, or None."""
+    for pat in patterns:
+        m = search_text(pat, text, deadline)
+        if m:
+            return m.group(0)
+    return None
+
+
+def _lower(chunk):
+    """Lowercase without shifting offsets (U+0130 lowercases to two chars)."""
+    low = chunk.lower()
+    if len(low) != len(chunk):
+        low = chunk.replace('İ', '\x00').lower()
+    return low
+
+
+def count_ctas(low):
+    """len(CTA_RE.findall(low)) in one pass over whole lines.
+
+    A greedy pair like get.*quote matches up to the last "quote" on its
+    line, so each line's last close word is found once, and a start word
+    with no close after it is skipped instead of rescanning the line.
+    """
+    count = 0
+    pos = 0
+    line_start = line_end = -1
+    last = {}
+    while True:
+        m = CTA_START_RE.search(low, pos)
+        if not m:
+            return count
+        close = CTA_GREEDY.get(m.group())
+        if close is None:
+            count += 1
+            pos = m.end()
+            continue
+        if m.start() > line_end:
+            line_start = m.start()
+            line_end = low.find('\n', line_start)
+            if line_end < 0:
+                line_end = len(low)
+            last = {}
+        if close not in last:
+            last[close] = low.rfind(close, line_start, line_end)
+        if last[close] >= m.end():
+            count += 1
+            pos = last[close] + len(close)
+        else:
+            pos = m.start() + 1
+
+
+def line_has(low, words, pairs):
+    """Whether `low` holds any of `words`, or a pair's first word and then its
+    second on the same line: CHAT_RE/SOCIAL_RE.search(low), in one pass."""
+    if any(word in low for word in words):
+        return True
+    for first, then in pairs:
+        k = low.find(first)
+        while k >= 0:
+            # The first occurrence on a line leaves the most of it for `then`
+            end = low.find('\n', k)
+            if end < 0:
+                end = len(low)
+            if low.find(then, k + len(first), end) >= 0:
+                return True
+            k = low.find(first, end)
+    return False
+
+
+def iter_emails(text, start=0, end=None, floor=0):
+    """EMAIL_RE.finditer(text) over text[start:end], in one pass.
+
+    A match holds exactly one @ and starts at the head of the run of local
+    characters before it, so the pattern is only tried there, once per @.
+    The run isn't followed back past `floor` (where the previous match
+    ended, or the previous @), which keeps the walk linear too.
+    """
+    end = len(text) if end is None else end
+    at = text.find('@', start, end)
+    while at >= 0:
+        head = at
+        while head > floor and text[head - 1] in EMAIL_LOCAL_CHARS:
+            head -= 1
+        m = EMAIL_RE.match(text, head) if head < at else None
+        if m:
+            floor = m.end()
+            yield m
+        else:
+            floor = at + 1
+        at = text.find('@', max(at + 1, floor), end)
+
+
+class PageScanner(TextExtractor):
+    """Collects text, business fields and site-check counters in one pass.
+
+    The parser drives the pass: as it consumes markup, the consumed span is
+    scanned in lowercased windows for the counters and the literal anchors of
+    each field pattern, and field patterns are only matched where an anchor
+    was found. Results are identical to matching each pattern against the
+    whole document.
+
+    With a `budget` (seconds), a scan that runs past it stops early and
+    sets `timed_out`.
+    """
+
+    def __init__(self, budget=0):
+        super().__init__()
+        self.budget = budget
+        self.timed_out = False
+        self._deadline = None
+        self._doc = ""
+        self._text = None
+        self._scanned = 0
+        self._line_checked = 0
+        self._next_advance = SCAN_WINDOW
+        self._email_floor = 0
+
+        self.title = None
+        self.og_title = None
+        self.tel = None
+        self.email = None
+        self.meta_description = None
+        self.og_description = None
+        self.headings = []
+        self.primary_color = None
+        self.accent_color = None
+
+        self.has_viewport = False
+        self.has_h1 = False
+        self.has_tel = False
+        self.has_schema = False
+        self.has_chat = False
+        self.has_social = False
+        self.form_count = 0
+        self.image_count = 0
+        self.cta_count = 0
+
+    def scan(self, html):
+        """Scan a whole page. A scanner instance handles one page."""
+        self._doc = html
+        self._start_clock()
+        try:
+            self.feed(html)
+        except:
+            pass
+        # Whatever the parser left buffered still counts as markup
+        self._advance(len(html), final=True)
+        return self
+
+    # -- visible text --
+
+    def get_text(self):
+        if self._text is None:
+            self._text = super().get_text()
+        return self._text
+
+    def text_stats(self):
+        """(length, review hits, review/testimonial mentions) of the visible text."""
+        text = self.get_text()
+        hits = mentions = 0
+        for m in REVIEW_RE.finditer(text.lower()):
+            hits += 1
+            if m.group() in ('review', 'testimonial'):
+                mentions += 1
+        return len(text), hits, mentions
+
+    def text_phone(self):
+        return self._text_match(PHONE_TEXT_RES)
+
+    def text_address(self):
+        return self._text_match(ADDRESS_RES)
+
+    def _text_match(self, patterns):
+        try:
+            return first_text_match(self.get_text(), patterns, self._deadline)
+        except ScanTimeout:
+            self.timed_out = True
+            return None
+
+    # -- parser hooks --
+
+    def updatepos(self, i, j):
+        # ParserBase calls this exactly once per consumed span, in order, so
+        # it follows the parser through the page. Offsets index self.rawdata,
+        # which is the page itself because scan() feeds it in one call.
+        # getpos() isn't used here, so the line bookkeeping is skipped.
+        if j >= self._next_advance:
+            self._advance(j)
+            if self.timed_out:
+                raise ScanTimeout()
+        return j
+
+    # -- time budget --
+
+    def _start_clock(self):
+        if self.budget:
+            self._deadline = time.monotonic() + self.budget
+
+    def _out_of_time(self):
+        if self._deadline is not None and not self.timed_out and time.monotonic() > self._deadline:
+            self.timed_out = True
+        return self.timed_out
+
+    # -- window scanning --
+
+    def _advance(self, upto, final=False):
+        doc = self._doc
+        while self._scanned < upto:
+            # Checked once a window, which costs a bounded time to scan
+            if self._out_of_time():
+                return
+            start = self._scanned
+            stop = min(start + SCAN_WINDOW, upto)
+            if final and stop == upto:
+                self._scan_window(start, upto)
+                self._scanned = upto
+                continue
+            nl = -1
+            if self._line_checked <= start:
+                nl = doc.rfind('\n', start, stop)
+                if nl < 0 and stop - start < SCAN_WINDOW:
+                    # Not a full window yet; wait for the parser
+                    break
+            if nl >= 0:
+                self._scan_window(start, nl + 1)
+                self._scanned = nl + 1
+                continue
+            # The line at `start` is longer than a window; wait for its end
+            nl = doc.find('\n', max(stop, self._line_checked), upto)
+            if nl < 0 and not final:
+                self._line_checked = upto
+                break
+            end = nl + 1 if nl >= 0 else upto
+            self._scan_long_line(start, end)
+            self._scanned = end
+        self._next_advance = max(self._scanned, self._line_checked) + SCAN_WINDOW
+
+    def _scan_window(self, start, end):
+        """Scan whole lines doc[start:end]."""
+        low = _lower(self._doc[start:end])
+        self._scan_anchors(low, start, len(low))
+        self.cta_count += count_ctas(low)
+        if not self.has_chat:
+            self.has_chat = line_has(low, CHAT_WORDS, CHAT_PAIRS)
+        if not self.has_social:
+            self.has_social = line_has(low, SOCIAL_WORDS, SOCIAL_PAIRS)
+
+    def _scan_long_line(self, start, end):
+        """Scan a single line doc[start:end] in SCAN_WINDOW pieces."""
+        doc = self._doc
+        pieces = []
+        for s in range(start, end, SCAN_WINDOW):
+            e = min(s + SCAN_WINDOW, end)
+            pieces.append((s, e, min(e + LONGEST_WORD - 1, end)))
+
+        # A greedy CTA like get.*quote runs to the last "quote" on the line
+        last = {}
+        for s, e, over in pieces:
+            low = _lower(doc[s:over])
+            for word in set(CTA_GREEDY.values()):
+                k = low.rfind(word, 0, e - s + len(word) - 1)
+                if k >= 0:
+                    last[word] = s + k
+
+        cursor = start
+        pair_ends = {}
+        for s, e, over in pieces:
+            low = _lower(doc[s:over])
+            limit = e - s
+            self._scan_anchors(low, s, limit)
+
+            pos = max(cursor - s, 0)
+            while pos < limit:
+                m = CTA_START_RE.search(low, pos, min(limit + 7, len(low)))
+                if not m or m.start() >= limit:
+                    break
+                word = m.group()
+                close = CTA_GREEDY.get(word)
+                if close is None:
+                    self.cta_count += 1
+                    pos = m.end()
+                elif last.get(close, -1) >= s + m.end():
+                    self.cta_count += 1
+                    pos = last[close] + len(close) - s
+                else:
+                    pos = m.start() + 1
+            cursor = s + pos
+
+            if not self.has_chat:
+                self.has_chat = self._line_has(low, s, limit, CHAT_WORDS, CHAT_PAIRS, pair_ends)
+            if not self.has_social:
+                self.has_social = self._line_has(low, s, limit, SOCIAL_WORDS, SOCIAL_PAIRS, pair_ends)
+
+    @staticmethod
+    def _line_has(low, s, limit, words, pairs, pair_ends):
+        for word in words:
+            if low.find(word, 0, limit + len(word) - 1) >= 0:
+                return True
+        for first, then in pairs:
+            if first not in pair_ends:
+                k = low.find(first, 0, limit + len(first) - 1)
+                if k >= 0:
+                    pair_ends[first] = s + k + len(first)
+            if first in pair_ends:
+                k = low.find(then, max(pair_ends[first] - s, 0), limit + len(then) - 1)
+                if k >= 0:
+                    return True
+        return False
+
+    def _scan_anchors(self, low, base, limit):
+        """Counters and field anchors in one lowercased window.
+
+        Only occurrences starting before `limit` belong to this window; the
+        rest of `low` is overlap with the next one.
+        """
+        def bound(word):
+            return min(limit + len(word) - 1, len(low))
+
+        def offsets(word):
+            k = low.find(word, 0, bound(word))
+            while k >= 0:
+                yield base + k
+                k = low.find(word, k + 1, bound(word))
+
+        doc = self._doc
+        self.form_count += low.count('<form', 0, bound('<form'))
+        self.image_count += low.count('<img', 0, bound('<img'))
+        if not self.has_viewport:
+            self.has_viewport = low.find('viewport', 0, bound('viewport')) >= 0
+        if not self.has_h1:
+            self.has_h1 = low.find('<h1', 0, bound('<h1')) >= 0
+        if not self.has_schema:
+            self.has_schema = any(low.find(w, 0, bound(w)) >= 0 for w in SCHEMA_WORDS)
+
+        if low.find('tel:', 0, bound('tel:')) >= 0:
+            self.has_tel = True
+            if self.tel is None:
+                for k in offsets('tel:'):
+                    m = TEL_HREF_RE.match(doc, k - 6) if k >= 6 else None
+                    if m:
+                        self.tel = m.group(1)
+                        break
+
+        if self.title is None:
+            for k in offsets('<title'):
+                m = TITLE_RE.match(doc, k)
+                if m:
+                    self.title = m.group(1)
+                    break
+        if self.og_title is None:
+            for k in offsets('og:title'):
+                m = OG_TITLE_RE.match(doc, k - 10) if k >= 10 else None
+                if m:
+                    self.og_title = m.group(1)
+                    break
+        if self.meta_description is None:
+            for k in offsets('description'):
+                m = META_DESC_RE.match(doc, k - 6) if k >= 6 else None
+                if m:
+                    self.meta_description = m.group(1)
+                    break
+        if self.og_description is None:
+            for k in offsets('og:description'):
+                m = OG_DESC_RE.match(doc, k - 10) if k >= 10 else None
+                if m:
+                    self.og_description = m.group(1)
+                    break
+
+        for m in HEADING_OPEN_RE.finditer(low, 0, bound('<h2')):
+            if m.start() < limit:
+                h = HEADING_RE.match(doc, base + m.start())
+                if h:
+                    self.headings.append(h.group(1))
+
+        window_end = base + limit
+        if self.email is None:
+            self._scan_emails(base, window_end)
+        if self.primary_color is None:
+            self.primary_color = self._first_color(PRIMARY_COLOR_OPEN_RE, PRIMARY_COLOR_RE, base, window_end)
+        if self.accent_color is None:
+            self.accent_color = self._first_color(ACCENT_COLOR_OPEN_RE, ACCENT_COLOR_RE, base, window_end)
+
+    def _scan_emails(self, start, end):
+        emails = iter_emails(self._doc, start, end, self._email_floor)
+        for m in emails:
+            self._email_floor = m.end()
+            em = m.group()
+            if not any(d in em.lower() for d in EMAIL_SKIP_DOMAINS):
+                self.email = em
+                return
+        # Past every @ in the window, matched or not
+        at = self._doc.rfind('@', start, end)
+        self._email_floor = max(self._email_floor, at + 1)
+
+    def _first_color(self, open_re, color_re, start, end):
+        doc = self._doc
+        for m in open_re.finditer(doc, start, min(end + 12, len(doc))):
+            if m.start() >= end:
+                break
+            c = color_re.match(doc, m.start())
+            if c:
+                return c.group(1)
+        return None
+
+
+def scan_page(html):
+    """Scan a page once for text, fields and site checks.
+
+    `html` is the page itself, or a PageFile to scan from disk in chunks.
+    """
+    budget = scan_budget_from_env()
+    if isinstance(html, PageFile):
+        return StreamScanner(html.page_budget, budget).scan_file(html.path)
+    return PageScanner(budget).scan(html)
+
+
+# ──────────────────────────────────────
+# Streaming page scanner
+# ──────────────────────────────────────
+
+# Markup is read this many characters at a time
+STREAM_CHUNK = 256 * 1024
+# Markup kept past the scanned point so field patterns can finish matching,
+# and before it for the patterns that start a few characters ahead of their anchor
+STREAM_LOOKAHEAD = 16 * 1024
+STREAM_LOOKBEHIND = 256
+# A line longer than this is scanned in pieces, as if it had line breaks
+STREAM_MAX_LINE = 4 * 1024 * 1024
+# Visible text kept for phone/address matches that straddle a chunk
+TEXT_OVERLAP = 4096
+PAGE_END_RE = re.compile(r'</html\s*>', re.IGNORECASE)
+
+# generate_audit's top thresholds: counts past these can't change a score
+SATURATED = {"forms": 2, "images": 11, "ctas": 4, "mentions": 6, "text": 10001, "services": 15}
+
+
+class PageFile:
+    """A fetched page left on disk, scanned in chunks by StreamScanner (--stream)."""
+
+    def __init__(self, path, page_budget=0):
+        self.path = path
+        self.page_budget = page_budget
+        self.size = os.path.getsize(path)
+
+    def __len__(self):
+        return self.size
+
+    def fingerprint(self):
+        """Hash of the file's bytes and of the budget, which can change the result."""
+        h = hashlib.sha256()
+        with open(self.path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(block)
+        return fingerprint("stream", h.hexdigest(), self.page_budget)
+
+
+class StreamScanner(PageScanner):
+    """PageScanner over a file read in chunks, in memory that doesn't grow with the file.
+
+    Only a window of the markup is held at a time, and visible text is
+    counted and searched as it's parsed instead of being kept. Each page of a
+    merged fetch (pages end at </html>) is scanned for at most `page_budget`
+    characters (0 = all of it), and reading stops once every field has been
+    found and every counter is past the point where more could change the
+    audit — so the counts in research.json are lower bounds after an early stop.
+    Otherwise the result is the same as PageScanner's, except for lines
+    longer than STREAM_MAX_LINE, which are split.
+    """
+
+    def __init__(self, page_budget=0, budget=0):
+        super().__init__(budget)
+        self.page_budget = page_budget
+        self.chars_scanned = 0
+        self.pages_truncated = 0
+        self.stopped_early = False
+        self._parsing = True
+        self._unparsed = ""
+        self._text_length = 0
+        self._text_parts = 0
+        self._review_hits = 0
+        self._review_mentions = 0
+        self._text_tail = ""
+        self._phone = [None] * len(PHONE_TEXT_RES)
+        self._address = [None] * len(ADDRESS_RES)
+
+    def scan_file(self, path):
+        page_used = 0
+        skipping = False
+        carry = ""
+        self._start_clock()
+        with open(path, 'r', errors='replace') as f:
+            while True:
+                if self.complete() or self._out_of_time():
+                    self.stopped_early = bool(f.read(1))
+                    break
+                chunk = f.read(STREAM_CHUNK)
+                if not chunk and not carry:
+                    break
+                chunk = carry + chunk
+                carry = ""
+                # Hold back a partial tag so </html> is never split across chunks
+                lt = chunk.rfind('<', max(len(chunk) - 8, 0))
+                if lt >= 0 and '>' not in chunk[lt:] and len(chunk) > STREAM_CHUNK // 2:
+                    chunk, carry = chunk[:lt], chunk[lt:]
+                pos = 0
+                while pos < len(chunk):
+                    end = PAGE_END_RE.search(chunk, pos)
+                    stop = end.end() if end else len(chunk)
+                    if not skipping:
+                        room = self.page_budget - page_used if self.page_budget else stop - pos
+                        if stop - pos > room:
+                            self._feed_markup(chunk[pos:pos + room])
+                            self._cut_page()
+                            skipping = True
+                        else:
+                            self._feed_markup(chunk[pos:stop])
+                            page_used += stop - pos
+                    if end:
+                        page_used = 0
+                        skipping = False
+                    pos = stop
+        if not self.timed_out:
+            self._parse("", final=True)
+            self._advance(len(self._doc), final=True)
+        self._search_text(final=True)
+        return self
+
+    # -- parser hooks --
+
+    def updatepos(self, i, j):
+        # Offsets here index the parser's buffer, not self._doc; scan_file
+        # moves the window scan along instead
+        return j
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        text = data.strip()
+        if not text:
+            return
+        if self._text_parts:
+            text = ' ' + text
+        self._text_parts += 1
+        self._text_length += len(text)
+        for m in REVIEW_RE.finditer(text.lower()):
+            self._review_hits += 1
+            if m.group() in ('review', 'testimonial'):
+                self._review_mentions += 1
+        self._text_tail += text
+        if len(self._text_tail) >= 4 * TEXT_OVERLAP:
+            self._search_text()
+
+    # -- markup window --
+
+    def _parse(self, markup, final=False):
+        """Feed the parser up to the last '<', so a text run is never split in two
+        handle_data() calls (a whole-page feed would see it in one)."""
+        if not self._parsing:
+            return
+        pending = self._unparsed + markup
+        cut = len(pending) if final or len(pending) > STREAM_MAX_LINE else pending.rfind('<')
+        if cut <= 0:
+            self._unparsed = pending
+            return
+        self._unparsed = pending[cut:]
+        try:
+            self.feed(pending[:cut])
+        except:
+            self._parsing = False
+
+    def _feed_markup(self, markup):
+        self._parse(markup)
+        self._doc += markup
+        self.chars_scanned += len(markup)
+        upto = len(self._doc) - STREAM_LOOKAHEAD
+        self._advance(upto, final=upto - self._scanned > STREAM_MAX_LINE)
+        cut = self._scanned - STREAM_LOOKBEHIND
+        if cut >= STREAM_CHUNK:
+            self._doc = self._doc[cut:]
+            self._scanned -= cut
+            self._line_checked = max(self._line_checked - cut, 0)
+            self._email_floor = max(self._email_floor - cut, 0)
+        if len(self.headings) > 4 * SATURATED["services"]:
+            # Only the first services make it into research.json
+            self.headings = service_headings(self.headings)[:SATURATED["services"]]
+
+    def _cut_page(self):
+        """Drop the rest of a page over budget; the next page starts from a clean parser."""
+        self._parse("", final=True)
+        self._advance(len(self._doc), final=True)
+        self._doc = ""
+        self._scanned = self._line_checked = self._email_floor = 0
+        self.pages_truncated += 1
+        if self._parsing:
+            self.reset()
+            self._skip_depth = 0
+
+    # -- visible text --
+
+    def _search_text(self, final=False):
+        """First phone/address matches in the text seen so far. A match counts once
+        TEXT_OVERLAP more text has followed it (more text could still extend it)."""
+        tail = self._text_tail
+        settled = len(tail) if final else len(tail) - TEXT_OVERLAP
+        keep = settled
+        for found, patterns in ((self._phone, PHONE_TEXT_RES), (self._address, ADDRESS_RES)):
+            if found[0] is not None:
+                continue
+            for i, pat in enumerate(patterns):
+                if found[i] is not None:
+                    continue
+                try:
+                    m = search_text(pat, tail, self._deadline)
+                except ScanTimeout:
+                    self.timed_out = True
+                    self._text_tail = ""
+                    return
+                if m and m.end() <= settled:
+                    found[i] = m.group(0)
+                elif m:
+                    keep = min(keep, m.start())
+        self._text_tail = tail[max(keep, 0):]
+
+    def text_stats(self):
+        return self._text_length, self._review_hits, self._review_mentions
+
+    def text_phone(self):
+        return next((m for m in self._phone if m is not None), None)
+
+    def text_address(self):
+        return next((m for m in self._address if m is not None), None)
+
+    def complete(self):
+        """Whether every field is found and every counter saturated.
+
+        Fields with a fallback need the preferred source: a <title> (og:title
+        only stands in for an empty one) and a tel: link (text only stands in
+        for a short one).
+        """
+        name = self.title is not None and (clean_title(self.title) or (self.og_title or "").strip())
+        phone = self.tel is not None and (len(re.sub(r'[^\d]', '', self.tel)) >= 7 or self._phone[0] is not None)
+        return bool(
+            name and phone and self.email and self._address[0] is not None
+            and (self.meta_description or "").strip()
+            and self.primary_color and self.accent_color
+            and self.has_viewport and self.has_h1 and self.has_tel and self.has_schema
+            and self.has_chat and self.has_social
+            and self.form_count >= SATURATED["forms"] and self.image_count >= SATURATED["images"]
+            and self.cta_count >= SATURATED["ctas"] and self._review_mentions >= SATURATED["mentions"]
+            and self._text_length >= SATURATED["text"]
+            and len(service_headings(self.headings)) >= SATURATED["services"])
+
+
+# ──────────────────────────────────────
+# Keyword index
+# ──────────────────────────────────────
+
+def _trie_pattern(words):
+    """Regex for a set of words with shared prefixes factored out, longest match first."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:%s)" % "|".join(alts)
+        return "(?:%s)?" % body if "" in node else body
+
+    return build(trie)
+
+
+class KeywordIndex:
+    """Substring keyword lookup compiled once, for labelled keyword groups.
+
+    `groups` maps a label to its keywords, in priority order. One regex scan
+    finds every keyword occurrence in a (lowercased) text, including ones
+    that overlap: each match is the longest keyword at that position, and it
+    also counts for every keyword that is a prefix of it ("lawn" is "law" too).
+    """
+
+    def __init__(self, groups):
+        self.labels = list(groups)
+        owners = {}
+        for i, keywords in enumerate(groups.values()):
+            for kw in keywords:
+                owners.setdefault(kw, []).append(i)
+        self.credits = {kw: [i for other in owners if kw.startswith(other) for i in owners[other]]
+                        for kw in owners}
+        self.pattern = re.compile("(?=(%s))" % _trie_pattern(owners))
+
+    def counts(self, text):
+        """{label: hits} for the labels with at least one keyword in text."""
+        hits = {}
+        for m in self.pattern.finditer(text):
+            for i in self.credits[m.group(1)]:
+                hits[i] = hits.get(i, 0) + 1
+        return {self.labels[i]: n for i, n in sorted(hits.items())}
+
+    def first(self, text, default=None):
+        """The highest-priority label with a keyword anywhere in text."""
+        best = len(self.labels)
+        for m in self.pattern.finditer(text):
+            best = min(best, *self.credits[m.group(1)])
+            if best == 0:
+                break
+        return self.labels[best] if best < len(self.labels) else default
+
+    def matching(self, texts):
+        """Indexes of the texts that contain any keyword, in one scan over all of them."""
+        joined = "\n".join(texts)  # keywords never span a newline
+        starts = [0]
+        for t in texts[:-1]:
+            starts.append(starts[-1] + len(t) + 1)
+        found = set()
+        for m in self.pattern.finditer(joined):
+            found.add(bisect.bisect_right(starts, m.start()) - 1)
+        return found
+
+
 # ──────────────────────────────────────
 # Research: extract business info
 # ──────────────────────────────────────
 
-def extract_business_info(html, url):
-    """Extract business details from HTML."""
-    text = extract_text(html)
-    html_lower = html.lower()
+# Headings containing any of these aren't services
+SKIP_HEADING_WORDS = KeywordIndex({"skip": [
+    'welcome', 'hello', 'click', 'learn more', 'read more', 'view', 'see',
+    'our team', 'meet', 'get started', 'sign up', 'log in', 'subscribe',
+    'menu', 'navigation', 'footer', 'header', 'copyright', 'cookie', 'privacy',
+]})
 
-    # Business name from <title>
-    title_match = re.search(r'<title[^>]*>([^<]+)</title>', html, re.IGNORECASE)
+
+def clean_title(title):
+    """A <title> without its common suffixes ("Acme Plumbing | Indianapolis")."""
+    return re.split(r'\s*[|–—\-]\s*', title.strip())[0].strip()
+
+
+def service_headings(headings):
+    """The h2-h4 headings that name services, in page order."""
+    headings = [h.strip() for h in headings]
+    skipped = SKIP_HEADING_WORDS.matching([h.lower() for h in headings])
+    return [h for i, h in enumerate(headings) if h and i not in skipped]
+
+
+def business_name(title, og_title, url):
+    """Name from the <title>, else og:title, else the domain."""
     biz_name = ""
-    if title_match:
-        biz_name = title_match.group(1).strip()
-        # Clean up common title suffixes
-        biz_name = re.split(r'\s*[|–—\-]\s*', biz_name)[0].strip()
+    if title is not None:
+        biz_name = clean_title(title)
 
     if not biz_name:
         # Try og:title
-        og_match = re.search(r'property=["\']og:title["\'][^>]*content=["\']([^"\']+)', html, re.IGNORECASE)
-        if og_match:
-            biz_name = og_match.group(1).strip()
+        if og_title:
+            biz_name = og_title.strip()
 
     if not biz_name and url:
         # Derive from URL
         domain = re.sub(r'https?://(www\.)?', '', url).split('/')[0].split('.')[0]
         biz_name = domain.replace('-', ' ').replace('_', ' ').title()
+    return biz_name
 
-    # Phone number
+
+def format_phone(tel, text_phone):
+    """Phone from the first tel: link, else text_phone() (the first number in the visible text)."""
     phone = "Not found"
     # First check tel: links
-    tel_match = re.search(r'href=["\']tel:([^"\']+)', html, re.IGNORECASE)
-    if tel_match:
-        raw = re.sub(r'[^\d]', '', tel_match.group(1))
+    if tel is not None:
+        raw = re.sub(r'[^\d]', '', tel)
         if len(raw) == 11 and raw[0] == '1':
             raw = raw[1:]
         if len(raw) == 10:
             phone = f"({raw[:3]}) {raw[3:6]}-{raw[6:]}"
         elif len(raw) >= 7:
-            phone = tel_match.group(1).strip()
+            phone = tel.strip()
 
     if phone == "Not found":
         # Search text for phone patterns
-        phone_patterns = [
-            r'\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}',
-            r'\d{3}[\s.-]\d{3}[\s.-]\d{4}',
-        ]
-        for pat in phone_patterns:
-            m = re.search(pat, text)
-            if m:
-                raw_phone = m.group(0)
-                digits = re.sub(r'[^\d]', '', raw_phone)
-                if len(digits) == 10:
-                    phone = f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-                else:
-                    phone = raw_phone
-                break
+        raw_phone = text_phone()
+        if raw_phone:
+            digits = re.sub(r'[^\d]', '', raw_phone)
+            if len(digits) == 10:
+                phone = f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+            else:
+                phone = raw_phone
+    return phone
+
+
+def meta_description(meta, og_description):
+    """The meta description, else og:description, cut to 500 characters."""
+    meta_desc = ""
+    if meta:
+        meta_desc = meta.strip()
+    if not meta_desc and og_description:
+        meta_desc = og_description.strip()
+    if not meta_desc:
+        meta_desc = "No meta description found"
+    return meta_desc[:500]
+
+
+def extract_business_info(html, url):
+    """Extract business details from HTML: one page, a PageFile to stream, or
+    a crawled site's page bundle (see "Site pages")."""
+    pages = split_pages(html)
+    if pages is None:
+        return extract_page_info(html, url)
+    with metrics.phase("site-pages", len(html)):
+        # The homepage stands for the site: its URL is the one given
+        pages[0] = (url or pages[0][0], pages[0][1])
+        return merge_pages(scan_pages(pages), url)
+
+
+@metrics.timed("extract_business_info", size_arg=0)
+def extract_page_info(html, url):
+    """Business details and site checks of one page (a string, or a PageFile to stream)."""
+    lap = metrics.laps("extract_business_info")
+    page = scan_page(html)
+    lap("scan", len(html))
+
+    text_length, review_hits, review_mentions = page.text_stats()
+    has_reviews = review_hits > 0
+    lap("reviews", text_length)
+
+    # Business name from <title>
+    biz_name = business_name(page.title, page.og_title, url)
+    lap("name")
+
+    # Phone number
+    phone = format_phone(page.tel, page.text_phone)
+    lap("phone")
 
     # Email
-    email = "Not found"
-    email_matches = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', html)
-    skip_domains = ['example.', 'placeholder.', 'sentry.', 'wixpress.', 'w3.org', 'schema.org',
-                    'domain.', 'email.', 'yoursite.', 'test.']
-    for em in email_matches:
-        if not any(d in em.lower() for d in skip_domains):
-            email = em
-            break
+    email = page.email or "Not found"
+    lap("email")
 
     # Address — look for structured patterns
-    address = "Not found"
-    addr_patterns = [
-        r'\d{1,5}\s+[A-Z][a-zA-Z\s]+(?:Street|St|Avenue|Ave|Boulevard|Blvd|Drive|Dr|Road|Rd|Lane|Ln|Court|Ct|Way|Circle|Cir|Place|Pl)\.?[\s,]+(?:Suite|Ste|#|Apt\.?)?\s*\d*[\s,]+[A-Z][a-zA-Z\s]+,?\s*[A-Z]{2}\s+\d{5}',
-        r'\d{1,5}\s+\S+\s+\S+[.,]\s*\S+[.,]?\s*[A-Z]{2}\s+\d{5}',
-    ]
-    for pat in addr_patterns:
-        m = re.search(pat, text)
-        if m:
-            address = m.group(0).strip()
-            break
+    address = page.text_address()
+    address = address.strip() if address else "Not found"
+    lap("address")
+    # The phone and address searches run on the scan's clock too
+    if page.timed_out:
+        print(f"  ⚠️ Scan of {url or 'page'} ran past its {page.budget:g}s budget — "
+              "fields not reached are Not found")
 
     # Meta description
-    meta_desc = ""
-    meta_match = re.search(r'name=["\']description["\'][^>]*content=["\']([^"\']+)', html, re.IGNORECASE)
-    if meta_match:
-        meta_desc = meta_match.group(1).strip()
-    if not meta_desc:
-        og_desc = re.search(r'property=["\']og:description["\'][^>]*content=["\']([^"\']+)', html, re.IGNORECASE)
-        if og_desc:
-            meta_desc = og_desc.group(1).strip()
-    if not meta_desc:
-        meta_desc = "No meta description found"
+    meta_desc = meta_description(page.meta_description, page.og_description)
+    lap("meta")
 
     # Service headings — extract h2/h3 content
-    headings = re.findall(r'<h[2-4][^>]*>([^<]{3,60})</h[2-4]>', html, re.IGNORECASE)
-    skip_words = ['welcome', 'hello', 'click', 'learn more', 'read more', 'view', 'see',
-                  'our team', 'meet', 'get started', 'sign up', 'log in', 'subscribe',
-                  'menu', 'navigation', 'footer', 'header', 'copyright', 'cookie', 'privacy']
-    service_headings = []
-    for h in headings:
-        h = h.strip()
-        if h and not any(sw in h.lower() for sw in skip_words):
-            service_headings.append(h)
+    services = service_headings(page.headings)
+    lap("headings")
 
     # Site quality checks
     checks = {
-        "hasViewport": bool(re.search(r'viewport', html_lower)),
-        "hasForms": bool(re.search(r'<form', html_lower)),
-        "hasSchema": bool(re.search(r'application/ld\+json|schema\.org|itemtype', html_lower)),
-        "hasReviews": bool(re.search(r'review|testimonial|rating|stars', text.lower())),
-        "hasCTA": bool(re.search(r'btn|button|cta|get.*quote|free.*estimate|contact.*us|call.*now|schedule|book.*now', html_lower)),
-        "hasH1": bool(re.search(r'<h1', html_lower)),
-        "hasClickablePhone": bool(re.search(r'tel:', html_lower)),
-        "hasChat": bool(re.search(r'livechat|tawk|intercom|drift|crisp|zendesk|hubspot.*chat|chat.*widget|messenger', html_lower)),
+        "hasViewport": page.has_viewport,
+        "hasForms": page.form_count > 0,
+        "hasSchema": page.has_schema,
+        "hasReviews": has_reviews,
+        "hasCTA": page.cta_count > 0,
+        "hasH1": page.has_h1,
+        "hasClickablePhone": page.has_tel,
+        "hasChat": page.has_chat,
         "hasSSL": url.startswith('https://') if url else False,
-        "hasTitleTag": bool(title_match),
-        "hasImages": len(re.findall(r'<img', html_lower)) > 3,
-        "hasSocial": bool(re.search(r'facebook|instagram|twitter|linkedin|youtube|yelp|google.*business|bbb\.org', html_lower)),
-        "contentLength": len(text),
-        "reviewMentions": len(re.findall(r'review|testimonial', text.lower())),
-        "ctaCount": len(re.findall(r'btn|button|cta|get.*quote|free.*estimate|contact.*us|call.*now|schedule|book.*now', html_lower)),
-        "formCount": len(re.findall(r'<form', html_lower)),
-        "imageCount": len(re.findall(r'<img', html_lower)),
+        "hasTitleTag": page.title is not None,
+        "hasImages": page.image_count > 3,
+        "hasSocial": page.has_social,
+        "contentLength": text_length,
+        "reviewMentions": review_mentions,
+        "ctaCount": page.cta_count,
+        "formCount": page.form_count,
+        "imageCount": page.image_count,
     }
 
-    # Try to extract brand colors
-    primary_color = "#1a2332"
-    accent_color = "#ff6b35"
-
-    color_vars = re.findall(r'--(?:primary|brand|main)[^:]*:\s*(#[0-9a-fA-F]{3,8})', html)
-    if color_vars:
-        primary_color = color_vars[0]
-
-    accent_vars = re.findall(r'--(?:accent|secondary|highlight)[^:]*:\s*(#[0-9a-fA-F]{3,8})', html)
-    if accent_vars:
-        accent_color = accent_vars[0]
+    # Brand colors, if the site declares them as CSS variables
+    primary_color = page.primary_color or "#1a2332"
+    accent_color = page.accent_color or "#ff6b35"
+    lap("checks")
 
-    return {
+    research = {
         "url": url or "",
         "businessName": biz_name,
         "phone": phone,
         "email": email,
         "address": address,
-        "metaDescription": meta_desc[:500],
-        "serviceHeadings": service_headings[:15],
+        "metaDescription": meta_desc,
+        "serviceHeadings": services[:15],
         "siteChecks": checks,
         "colors": {
             "primary": primary_color,
             "accent": accent_color,
         }
     }
+    if page.timed_out:
+        research["partial"] = True
+    return research
+
+
+# ──────────────────────────────────────
+# Site pages
+# ──────────────────────────────────────
+
+# prospect_fetch.py writes a crawled site as a bundle: each page after a
+# marker line, homepage first. Each page is analyzed as its own document and
+# the results are merged by merge_pages(). A file without markers (a single
+# page, or an older merged fetch) is analyzed as one page, and so is any
+# file streamed from disk.
+PAGE_MARK_RE = re.compile(r'^<!-- ace-page: (\S+) -->\n', re.MULTILINE)
+PAGE_MARK_START = "<!-- ace-page: "
+
+# Bundles bigger than this are scanned a page per process, when this
+# process isn't already a batch or resident-worker process
+PARALLEL_PAGES_ABOVE = 512 * 1024
+
+# What a page's research holds for a field it didn't find
+NOT_FOUND = {"phone": "Not found", "email": "Not found", "address": "Not found",
+             "metaDescription": "No meta description found"}
+DEFAULT_COLORS = {"primary": "#1a2332", "accent": "#ff6b35"}
+
+# How site checks merge across pages. Any page: the site has it somewhere.
+# Best page: the audit's thresholds were set for one page, so the
+# strongest page counts, not the sum of nav and footer markup every page
+# repeats. Sum: the site's indexable text. The rest (hasViewport, hasH1,
+# hasSSL, hasTitleTag) are the homepage's, the audit's first impression.
+ANY_PAGE_CHECKS = ("hasForms", "hasSchema", "hasReviews", "hasCTA", "hasClickablePhone", "hasChat",
+                   "hasImages", "hasSocial")
+BEST_PAGE_CHECKS = ("reviewMentions", "ctaCount", "formCount", "imageCount")
+SUM_CHECKS = ("contentLength",)
+
+_page_pool = None
+
+
+def split_pages(html):
+    """[(url, markup)] of a page bundle, or None when `html` is one page."""
+    if not isinstance(html, str) or not html.startswith(PAGE_MARK_START):
+        return None
+    marks = list(PAGE_MARK_RE.finditer(html))
+    ends = [m.start() for m in marks[1:]] + [len(html)]
+    return [(m.group(1), html[m.end():end]) for m, end in zip(marks, ends)]
+
+
+def home_page(html):
+    """The homepage of a page bundle; `html` itself when it's one page."""
+    if not isinstance(html, str) or not html.startswith(PAGE_MARK_START):
+        return html
+    first = PAGE_MARK_RE.match(html)
+    if first is None:
+        return html
+    following = PAGE_MARK_RE.search(html, first.end())
+    return html[first.end():following.start() if following else len(html)]
+
+
+def _page_info(page):
+    url, markup = page
+    return extract_page_info(markup, url)
+
+
+def scan_pages(pages):
+    """extract_page_info() of each (url, markup), in parallel processes for big bundles."""
+    global _page_pool
+    size = sum(len(markup) for _, markup in pages)
+    if (len(pages) > 1 and size > PARALLEL_PAGES_ABOVE and (os.cpu_count() or 1) > 1
+            and multiprocessing.parent_process() is None):
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(os.cpu_count() or 1)
+        return list(_page_pool.map(_page_info, pages))
+    return [_page_info(page) for page in pages]
+
+
+def merge_pages(results, url):
+    """One site's research from its pages' research, homepage first.
+
+    Name and URL are the homepage's. Phone, email, address, meta
+    description and colors are the homepage's, else the first page's that
+    has one. Service headings are every page's, deduped, in page order.
+    Site checks merge as ANY_PAGE_CHECKS / BEST_PAGE_CHECKS / SUM_CHECKS
+    say, and research.pages lists the pages.
+    """
+    home = results[0]
+    research = dict(home, url=url or home["url"])
+    for field, missing in NOT_FOUND.items():
+        research[field] = next((r[field] for r in results if r[field] != missing), missing)
+    research["colors"] = {key: next((r["colors"][key] for r in results if r["colors"][key] != default), default)
+                          for key, default in DEFAULT_COLORS.items()}
+
+    services, seen = [], set()
+    for r in results:
+        for heading in r["serviceHeadings"]:
+            if heading.lower() not in seen:
+                seen.add(heading.lower())
+                services.append(heading)
+    research["serviceHeadings"] = services[:15]
+
+    checks = [r["siteChecks"] for r in results]
+    merged = {}
+    for name, value in checks[0].items():
+        if name in ANY_PAGE_CHECKS:
+            value = any(c[name] for c in checks)
+        elif name in BEST_PAGE_CHECKS:
+            value = max(c[name] for c in checks)
+        elif name in SUM_CHECKS:
+            value = sum(c[name] for c in checks)
+        merged[name] = value
+    research["siteChecks"] = merged
+    research["pages"] = [r["url"] for r in results]
+    research.pop("partial", None)
+    if any(r.get("partial") for r in results):
+        research["partial"] = True
+    return research
+
+
+# ──────────────────────────────────────
+# Near-duplicate detection
+# ──────────────────────────────────────
+#
+# Franchise and page-builder template sites differ mostly in the business's
+# own details. A page's SimHash (64 bits over word shingles of its visible
+# text and tag/class shingles of its markup) lands within a few bits of its
+# template siblings' (unrelated sites are 20+ bits apart), and the prospect
+# store indexes every one it has seen,
+# so a near duplicate reuses the first sibling's research and only reads its
+# own name, phone, email, address and meta description from the page.
+
+# Pages are fingerprinted on their first this-many characters
+SIMHASH_LIMIT = 1024 * 1024
+# Most bits two fingerprints may differ by to count as near duplicates
+# (up to SIMHASH_BANDS - 1, which the store's index finds every match for)
+DUP_DISTANCE = 6
+
+# <(script|style|noscript|svg)\b.*?</\1\s*>|<!--.*?--> blocks, found by strip_blocks()
+BLOCK_OPEN_RE = re.compile(r'<(script|style|noscript|svg)\b|<!--', re.IGNORECASE)
+BLOCK_CLOSE_RES = {name: re.compile(r'</%s\s*>' % name, re.IGNORECASE)
+                   for name in ("script", "style", "noscript", "svg")}
+START_TAG_RE = re.compile(r'<([a-zA-Z][\w-]*)([^>]*)>')
+CLASS_ATTR_RE = re.compile(r'\bclass\s*=\s*["\']([^"\']*)', re.IGNORECASE)
+ANY_TAG_RE = re.compile(r'<[^>]*>')
+WORD_TOKEN_RE = re.compile(r'\w+')
+
+
+def dedupe_from_env():
+    """Near-duplicate distance from PROSPECT_DEDUPE, or None when it's off."""
+    value = os.environ.get("PROSPECT_DEDUPE", "")
+    if value in ("off", "none"):
+        return None
+    return int(value) if value.strip() else DUP_DISTANCE
+
+
+def strip_blocks(markup):
+    """Scripts, styles, SVGs and comments replaced with a space.
+
+    A block left open (an opener with no closer after it) is skipped, and
+    so is every later opener of its kind, so each closer is searched for
+    once instead of from every opener.
+    """
+    parts, pos, at = [], 0, 0
+    unclosed = set()
+    while True:
+        m = BLOCK_OPEN_RE.search(markup, at)
+        if not m:
+            break
+        kind = (m.group(1) or "").lower()
+        end = -1
+        if kind not in unclosed:
+            if kind:
+                close = BLOCK_CLOSE_RES[kind].search(markup, m.end())
+                end = close.end() if close else -1
+            else:
+                end = markup.find('-->', m.end())
+                end = end + 3 if end >= 0 else -1
+        if end < 0:
+            unclosed.add(kind)
+            at = m.start() + 1
+            continue
+        parts += [markup[pos:m.start()], " "]
+        pos = at = end
+    parts.append(markup[pos:])
+    return "".join(parts)
+
+
+def page_sample(html):
+    """The part of a page that's fingerprinted, read from disk for a PageFile;
+    a crawled site's homepage stands for the site."""
+    if isinstance(html, PageFile):
+        with open(html.path, 'r', errors='replace') as f:
+            return f.read(SIMHASH_LIMIT)
+    return home_page(html)[:SIMHASH_LIMIT]
+
+
+# Odd multipliers that mix three token hashes into one order-sensitive shingle hash
+SHINGLE_MIX = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9)
+MASK64 = (1 << 64) - 1
+_BIT_TABLES = [bytes(v >> bit & 1 for v in range(256)) for bit in range(8)]
+
+
+def shingle_hashes(tokens):
+    """64-bit hashes of every run of 3 tokens (of each token, when there are fewer)."""
+    token_hash = {t: int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "little")
+                  for t in set(tokens)}
+    hashes = [token_hash[t] for t in tokens]
+    if len(hashes) < 3:
+        return hashes
+    a, b, c = SHINGLE_MIX
+    return [(x * a ^ y * b ^ z * c) & MASK64 for x, y, z in zip(hashes, hashes[1:], hashes[2:])]
+
+
+def simhash(hashes):
+    """64-bit SimHash of 64-bit feature hashes; repeated features weigh more."""
+    if not hashes:
+        return 0
+    packed = array("Q", hashes)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    blob = packed.tobytes()
+    half = len(hashes) / 2
+    value = 0
+    # Votes are counted at C speed: map each byte to its bit, then count
+    # the ones at each byte position
+    for bit, table in enumerate(_BIT_TABLES):
+        ones = blob.translate(table)
+        for byte in range(8):
+            if ones[byte::8].count(1) > half:
+                value |= 1 << (byte * 8 + bit)
+    return value
+
+
+def page_simhash(sample):
+    """(SimHash, visible text) of a page sample.
+
+    The business's own words (those in its <title> and og:title), numbers and
+    email addresses are masked in the text, so siblings differing only in
+    them hash alike.
+    """
+    titles = [m.group(1) for m in (TITLE_RE.search(sample), OG_TITLE_RE.search(sample)) if m]
+    own = set(WORD_TOKEN_RE.findall(unescape(" ".join(titles)).lower()))
+    markup = strip_blocks(sample)
+    # No tag starts after the last '>', and a '<' with no '>' to end it
+    # would otherwise be retried to the end of the sample
+    closed = markup.rfind('>') + 1
+    text = " ".join(unescape(ANY_TAG_RE.sub(" ", markup[:closed]) + markup[closed:]).split())
+    masked, pos = [], 0
+    for m in iter_emails(text):
+        masked += [text[pos:m.start()], " @ "]
+        pos = m.end()
+    masked.append(text[pos:])
+    words = ["#" if w.isdigit() else "*" if w in own else w
+             for w in WORD_TOKEN_RE.findall("".join(masked).lower())]
+    tags = []
+    for m in START_TAG_RE.finditer(markup, 0, closed):
+        cls = CLASS_ATTR_RE.search(m.group(2))
+        tags.append("<" + m.group(1).lower() + ("." + ".".join(cls.group(1).split()) if cls else ""))
+    return simhash(shingle_hashes(words) + shingle_hashes(tags)), text
+
+
+def extract_contact_info(sample, text, url):
+    """The fields a template sibling doesn't share, found the way extract_business_info()
+    finds them, from a page sample and its visible text.
+
+    Raises ScanTimeout if the phone/address searches run past the scan budget.
+    """
+    budget = scan_budget_from_env()
+    deadline = time.monotonic() + budget if budget else None
+    title = TITLE_RE.search(sample)
+    og_title = OG_TITLE_RE.search(sample)
+    tel = TEL_HREF_RE.search(sample)
+    meta = META_DESC_RE.search(sample)
+    og_description = OG_DESC_RE.search(sample)
+    email = next((m.group() for m in iter_emails(sample)
+                  if not any(d in m.group().lower() for d in EMAIL_SKIP_DOMAINS)), None)
+    address = first_text_match(text, ADDRESS_RES, deadline)
+    return {
+        "businessName": business_name(title.group(1) if title else None,
+                                      og_title.group(1) if og_title else None, url),
+        "phone": format_phone(tel.group(1) if tel else None, lambda: first_text_match(text, PHONE_TEXT_RES, deadline)),
+        "email": email or "Not found",
+        "address": address.strip() if address else "Not found",
+        "metaDescription": meta_description(meta.group(1) if meta else None,
+                                            og_description.group(1) if og_description else None),
+    }
+
+
+class Deduper:
+    """Near-duplicate lookups in the prospect store, one page at a time."""
+
+    def __init__(self, store, max_distance=DUP_DISTANCE):
+        self.store = store
+        self.max_distance = max_distance
+        self._page = None
+        self._fingerprint = None
+
+    def fingerprint(self, html):
+        """(SimHash, sample, visible text) of a page, computed once per page."""
+        if self._page is not html:
+            with metrics.phase("simhash"):
+                sample = page_sample(html)
+                value, text = page_simhash(sample)
+            self._page, self._fingerprint = html, (value, sample, text)
+        return self._fingerprint
+
+    def reuse(self, html, url="", override_name=""):
+        """Research for a near duplicate of a stored prospect, or None to analyze the page in full."""
+        value, sample, text = self.fingerprint(html)
+        matches = self.store.near_duplicates(value, stage_version("research"), self.max_distance)
+        if not matches:
+            return None
+        try:
+            contact = extract_contact_info(sample, text, url)
+        except ScanTimeout:
+            return None
+        site = site_key(url, slugify(override_name or contact["businessName"]))
+        # The same site re-analyzed gets a fresh analysis, not its old one
+        match = next((m for m in matches if m["site"] != site), None)
+        if match is None:
+            return None
+        research = json.loads(match["research"])
+        research.pop("pages", None)
+        research.update(contact, url=url or "")
+        research["siteChecks"]["hasSSL"] = url.startswith('https://') if url else False
+        research["duplicateOf"] = {"slug": match["slug"], "distance": match["distance"]}
+        return research
 
 
 # ──────────────────────────────────────
 # Audit: score and generate audit JSON
 # ──────────────────────────────────────
 
-def generate_audit(research):
-    """Generate audit JSON from research data."""
+# Category scores. Each starts at its base and adds, for every rule, the
+# points of the rule's first tier that holds; then it's capped at
+# MAX_CATEGORY_SCORE. A tier is (points, check) for a flag, or
+# (points, check, n) for a counter that must be over n. Checks are
+# siteChecks plus hasMetaDescription. prospect_cohort.py scores whole
+# cohorts with the same rubric.
+SCORE_RUBRIC = [
+    ("First Impressions", 3, [
+        [(2, "hasH1")],
+        [(2, "ctaCount", 2), (1, "hasCTA")],
+        [(2, "imageCount", 5), (1, "hasImages")],
+        [(1, "contentLength", 5000)],
+    ]),
+    ("Mobile Experience", 3, [
+        [(3, "hasViewport")],
+        [(2, "hasClickablePhone")],
+        [(1, "hasSSL")],
+        [(1, "hasCTA")],
+    ]),
+    ("Trust & Credibility", 2, [
+        [(3, "reviewMentions", 5), (1, "reviewMentions", 0)],
+        [(2, "hasSocial")],
+        [(2, "imageCount", 10), (1, "hasImages")],
+        [(1, "hasSchema")],
+    ]),
+    ("Lead Capture", 2, [
+        [(3, "formCount", 1), (2, "hasForms")],
+        [(2, "hasClickablePhone")],
+        [(2, "hasChat")],
+        [(1, "ctaCount", 3)],
+    ]),
+    ("SEO & Visibility", 2, [
+        [(2, "hasTitleTag")],
+        [(2, "hasSchema")],
+        [(2, "contentLength", 10000), (1, "contentLength", 3000)],
+        [(1, "hasSSL")],
+        [(1, "hasMetaDescription")],
+    ]),
+]
+MAX_CATEGORY_SCORE = 10
+
+
+def scoring_checks(research):
+    """The checks SCORE_RUBRIC reads: siteChecks plus hasMetaDescription."""
+    meta = research.get("metaDescription", "")
+    return dict(research["siteChecks"], hasMetaDescription=bool(meta and meta != "No meta description found"))
+
+
+def tier_holds(checks, tier):
+    value = checks.get(tier[1], 0)
+    return value > tier[2] if len(tier) == 3 else bool(value)
+
+
+def score_categories(checks):
+    """{category: score} for one prospect's scoring_checks()."""
+    scores = {}
+    for category, base, rules in SCORE_RUBRIC:
+        score = base
+        for rule in rules:
+            score += next((tier[0] for tier in rule if tier_holds(checks, tier)), 0)
+        scores[category] = min(score, MAX_CATEGORY_SCORE)
+    return scores
+
+
+def cohort_benchmarker(db, city):
+    """A run_stages benchmarker ranking each prospect among those in the store at
+    `db` (prospect_cohort, which needs NumPy); None when NumPy isn't installed."""
+    try:
+        from prospect_cohort import Cohort
+    except ImportError:
+        print("  ⚠️ Cohort benchmarks need NumPy (pip install numpy) — using the generic ones")
+        return None
+    cohorts = []
+
+    def benchmarker(research):
+        if not cohorts:
+            with metrics.phase("cohort-load"):
+                cohorts.append(Cohort.load(db, SCORE_RUBRIC, MAX_CATEGORY_SCORE))
+        # An earlier analysis of this same business isn't its own competition
+        return cohorts[0].benchmarks(score_categories(scoring_checks(research)), detect_industry(research),
+                                     city, exclude=site_key(research.get("url"), slugify(research["businessName"])))
+    return benchmarker
+
+
+def audit_date():
+    """The date an audit is dated: the day it's rendered, not the day it was first scored."""
+    return datetime.now().strftime("%B %d, %Y")
+
+
+@metrics.timed("generate_audit")
+def generate_audit(research, benchmarks=None):
+    """Generate audit JSON from research data.
+
+    `benchmarks` (from prospect_cohort's Cohort.benchmarks()) adds where the
+    prospect ranks among the prospects analyzed like it; without it the
+    benchmark text is the generic one.
+    """
     checks = research["siteChecks"]
     biz_name = research["businessName"]
     phone = research["phone"]
     website = research["url"]
+    scores = score_categories(scoring_checks(research))
 
     # --- First Impressions (0-10) ---
-    fi_score = 3
-    if checks.get("hasH1"): fi_score += 2
-    if checks.get("ctaCount", 0) > 2: fi_score += 2
-    elif checks.get("hasCTA"): fi_score += 1
-    if checks.get("imageCount", 0) > 5: fi_score += 2
-    elif checks.get("hasImages"): fi_score += 1
-    if checks.get("contentLength", 0) > 5000: fi_score += 1
-    fi_score = min(fi_score, 10)
+    fi_score = scores["First Impressions"]
 
     fi_issues = []
     if not checks.get("hasH1"):
@@ -244,12 +1560,7 @@ def generate_audit(research):
         fi_issues.append("Homepage could benefit from a stronger hero section and visual hierarchy")
 
     # --- Mobile Experience (0-10) ---
-    mob_score = 3
-    if checks.get("hasViewport"): mob_score += 3
-    if checks.get("hasClickablePhone"): mob_score += 2
-    if checks.get("hasSSL"): mob_score += 1
-    if checks.get("hasCTA"): mob_score += 1
-    mob_score = min(mob_score, 10)
+    mob_score = scores["Mobile Experience"]
 
     mob_issues = []
     if not checks.get("hasViewport"):
@@ -263,15 +1574,8 @@ def generate_audit(research):
         mob_issues.append("Key information may be hidden below the fold on mobile")
 
     # --- Trust & Credibility (0-10) ---
-    trust_score = 2
+    trust_score = scores["Trust & Credibility"]
     review_mentions = checks.get("reviewMentions", 0)
-    if review_mentions > 5: trust_score += 3
-    elif review_mentions > 0: trust_score += 1
-    if checks.get("hasSocial"): trust_score += 2
-    if checks.get("imageCount", 0) > 10: trust_score += 2
-    elif checks.get("hasImages"): trust_score += 1
-    if checks.get("hasSchema"): trust_score += 1
-    trust_score = min(trust_score, 10)
 
     trust_issues = []
     if review_mentions < 3:
@@ -284,13 +1588,7 @@ def generate_audit(research):
         trust_issues.append("License and insurance information not prominently displayed")
 
     # --- Lead Capture (0-10) ---
-    lead_score = 2
-    if checks.get("formCount", 0) > 1: lead_score += 3
-    elif checks.get("hasForms"): lead_score += 2
-    if checks.get("hasClickablePhone"): lead_score += 2
-    if checks.get("hasChat"): lead_score += 2
-    if checks.get("ctaCount", 0) > 3: lead_score += 1
-    lead_score = min(lead_score, 10)
+    lead_score = scores["Lead Capture"]
 
     lead_issues = []
     if not checks.get("hasForms") or checks.get("formCount", 0) < 2:
@@ -303,15 +1601,8 @@ def generate_audit(research):
         lead_issues.append("Contact form could be simplified to reduce friction")
 
     # --- SEO & Visibility (0-10) ---
-    seo_score = 2
-    if checks.get("hasTitleTag"): seo_score += 2
-    if checks.get("hasSchema"): seo_score += 2
-    if checks.get("contentLength", 0) > 10000: seo_score += 2
-    elif checks.get("contentLength", 0) > 3000: seo_score += 1
-    if checks.get("hasSSL"): seo_score += 1
+    seo_score = scores["SEO & Visibility"]
     meta = research.get("metaDescription", "")
-    if meta and meta != "No meta description found": seo_score += 1
-    seo_score = min(seo_score, 10)
 
     seo_issues = []
     if not checks.get("hasTitleTag"):
@@ -370,7 +1661,7 @@ def generate_audit(research):
         "ownerName": "Owner",
         "website": website or "Not found",
         "phone": phone,
-        "date": datetime.now().strftime("%B %d, %Y"),
+        "date": audit_date(),
         "avgJobValue": "$15,000",
         "overallScore": overall,
         "executiveSummary": summary,
@@ -428,6 +1719,15 @@ def generate_audit(research):
         "recommendations": recommendations[:5]
     }
 
+    if benchmarks:
+        # Where the site ranks leads the competitor notes and follows each generic benchmark
+        competitors.insert(0, benchmarks["overall"])
+        for category in audit["categories"]:
+            ranked = benchmarks["categories"].get(category["name"])
+            if ranked:
+                category["benchmark"] = category["benchmark"].rstrip(".") + f". {ranked}"
+        audit["cohort"] = benchmarks["cohort"]
+
     print(f"  Overall Score: {overall}/100")
     print(f"  First Impressions: {fi_score}/10")
     print(f"  Mobile: {mob_score}/10")
@@ -442,37 +1742,52 @@ def generate_audit(research):
 # Site config: generate demo site config
 # ──────────────────────────────────────
 
-def detect_industry(research):
-    """Guess the industry from available text."""
+INDUSTRY_KEYWORDS = KeywordIndex({
+    "real_estate": ["real estate", "realty", "realtor", "property", "homes for sale", "mls", "broker"],
+    "plumbing": ["plumb", "drain", "pipe", "water heater", "sewer"],
+    "electrical": ["electric", "wiring", "panel", "circuit", "outlet"],
+    "roofing": ["roof", "shingle", "gutter", "storm damage"],
+    "hvac": ["hvac", "heating", "cooling", "air condition", "furnace", "ac repair"],
+    "cleaning": ["clean", "maid", "janitorial", "pressure wash"],
+    "landscaping": ["landscap", "lawn", "garden", "tree", "mow", "irrigation"],
+    "painting": ["paint", "stain", "finish", "coating"],
+    "auto": ["auto", "car", "vehicle", "mechanic", "repair shop", "tire", "brake"],
+    "dental": ["dental", "dentist", "teeth", "orthodont", "oral"],
+    "legal": ["law", "attorney", "legal", "lawyer", "counsel"],
+    "wraps": ["wrap", "vinyl", "graphic", "signage", "print"],
+    "remodeling": ["remodel", "renovation", "kitchen", "bathroom", "basement", "contractor"],
+    "moving": ["moving", "movers", "relocation", "hauling"],
+    "pest": ["pest", "exterminator", "termite", "bug"],
+    "insurance": ["insurance", "coverage", "policy", "claim"],
+})
+
+ICON_KEYWORDS = KeywordIndex({
+    "kitchen": ["kitchen"], "bathroom": ["bathroom", "bath"], "basement": ["basement"],
+    "painting": ["paint"], "flooring": ["floor"], "deck": ["deck", "outdoor", "patio"],
+    "roofing": ["roof"], "windows": ["window"], "doors": ["door"], "siding": ["siding"],
+    "addition": ["addition"], "plumbing": ["plumb"], "electrical": ["electric", "wiring"],
+})
+
+
+def rank_industries(research):
+    """Industries by keyword hits in the meta description, name and headings.
+
+    Returns [(industry, hits, confidence)], best first; confidence is the
+    industry's share of all hits. Ties go to the industry listed first.
+    """
     meta = research.get("metaDescription", "").lower()
     name = research["businessName"].lower()
     headings = " ".join(research.get("serviceHeadings", [])).lower()
-    all_text = f"{meta} {name} {headings}"
-
-    industries = {
-        "real_estate": ["real estate", "realty", "realtor", "property", "homes for sale", "mls", "broker"],
-        "plumbing": ["plumb", "drain", "pipe", "water heater", "sewer"],
-        "electrical": ["electric", "wiring", "panel", "circuit", "outlet"],
-        "roofing": ["roof", "shingle", "gutter", "storm damage"],
-        "hvac": ["hvac", "heating", "cooling", "air condition", "furnace", "ac repair"],
-        "cleaning": ["clean", "maid", "janitorial", "pressure wash"],
-        "landscaping": ["landscap", "lawn", "garden", "tree", "mow", "irrigation"],
-        "painting": ["paint", "stain", "finish", "coating"],
-        "auto": ["auto", "car", "vehicle", "mechanic", "repair shop", "tire", "brake"],
-        "dental": ["dental", "dentist", "teeth", "orthodont", "oral"],
-        "legal": ["law", "attorney", "legal", "lawyer", "counsel"],
-        "wraps": ["wrap", "vinyl", "graphic", "signage", "print"],
-        "remodeling": ["remodel", "renovation", "kitchen", "bathroom", "basement", "contractor"],
-        "moving": ["moving", "movers", "relocation", "hauling"],
-        "pest": ["pest", "exterminator", "termite", "bug"],
-        "insurance": ["insurance", "coverage", "policy", "claim"],
-    }
+    hits = INDUSTRY_KEYWORDS.counts(f"{meta} {name} {headings}")
+    total = sum(hits.values())
+    ranked = sorted(hits.items(), key=lambda kv: -kv[1])
+    return [(industry, n, round(n / total, 2)) for industry, n in ranked]
 
-    for industry, keywords in industries.items():
-        if any(kw in all_text for kw in keywords):
-            return industry
 
-    return "general"
+def detect_industry(research):
+    """Guess the industry from available text."""
+    ranked = rank_industries(research)
+    return ranked[0][0] if ranked else "general"
 
 
 def get_industry_services(industry):
@@ -566,21 +1881,10 @@ def get_industry_services(industry):
 
 def get_icon(name):
     """Map service name to an icon key."""
-    name_lower = name.lower()
-    icon_map = {
-        "kitchen": "kitchen", "bathroom": "bathroom", "bath": "bathroom",
-        "basement": "basement", "paint": "painting", "floor": "flooring",
-        "deck": "deck", "outdoor": "deck", "patio": "deck",
-        "roof": "roofing", "window": "windows", "door": "doors",
-        "siding": "siding", "addition": "addition", "plumb": "plumbing",
-        "electric": "electrical", "wiring": "electrical",
-    }
-    for keyword, icon in icon_map.items():
-        if keyword in name_lower:
-            return icon
-    return "general"
+    return ICON_KEYWORDS.first(name.lower(), "general")
 
 
+@metrics.timed("generate_site_config")
 def generate_site_config(research, city="Indianapolis"):
     """Generate demo site config from research."""
     biz_name = research["businessName"]
@@ -591,8 +1895,9 @@ def generate_site_config(research, city="Indianapolis"):
     primary = research["colors"]["primary"]
     accent = research["colors"]["accent"]
 
-    industry = detect_industry(research)
-    print(f"  Detected industry: {industry}")
+    ranked = rank_industries(research)
+    industry, _, confidence = ranked[0] if ranked else ("general", 0, 0.0)
+    print(f"  Detected industry: {industry} ({confidence:.0%} of keyword hits)")
 
     # Build services from headings or defaults
     service_headings = research.get("serviceHeadings", [])
@@ -629,6 +1934,8 @@ def generate_site_config(research, city="Indianapolis"):
 
     config = {
         "businessName": biz_name,
+        "industry": industry,
+        "industryConfidence": confidence,
         "tagline": f"{biz_name} — Your Trusted Local Partner",
         "phone": phone,
         "email": email,
@@ -680,61 +1987,780 @@ def generate_site_config(research, city="Indianapolis"):
     return config
 
 
+# ──────────────────────────────────────
+# Analyze one page
+# ──────────────────────────────────────
+
+STREAM_ABOVE = 8 * 1024 * 1024
+
+
+def stream_above_from_env():
+    value = os.environ.get("PROSPECT_STREAM_ABOVE", "")
+    return int(value) if value.strip() else STREAM_ABOVE
+
+
+def read_html(path, stream_above=STREAM_ABOVE, page_budget=0):
+    """The page at `path` as a string, or as a PageFile to stream when it's bigger
+    than `stream_above` bytes (always when negative, never when 0)."""
+    if stream_above and os.path.getsize(path) > stream_above:
+        return PageFile(path, page_budget)
+    with open(path, 'r', errors='replace') as f:
+        return f.read()
+
+
+def analyze(html, url="", city="Indianapolis", override_name=""):
+    """Run all three phases on one page. Returns (research, audit, config)."""
+    research = extract_business_info(html, url)
+    if override_name:
+        research["businessName"] = override_name
+    audit = generate_audit(research)
+    config = generate_site_config(research, city)
+    return research, audit, config
+
+
+# Source sections each stage's output depends on; editing any other part
+# of this file doesn't make the stage stale
+STAGE_SECTIONS = {
+    "research": ["HTML text extraction", "Single-pass page scanner", "Streaming page scanner",
+                 "Keyword index", "Research: extract business info", "Site pages",
+                 "Near-duplicate detection"],
+    "audit": ["Audit: score and generate audit JSON"],
+    "site-config": ["Keyword index", "Site config: generate demo site config"],
+}
+
+_stage_versions = None
+
+
+def stage_version(stage):
+    """Code version of a stage: hash of the source sections it depends on."""
+    global _stage_versions
+    if _stage_versions is None:
+        sections = section_versions(os.path.abspath(__file__))
+        _stage_versions = {name: fingerprint([sections.get(t) for t in titles])
+                           for name, titles in STAGE_SECTIONS.items()}
+    return _stage_versions[stage]
+
+
+def stage_fingerprints(html, research=None, url="", city="Indianapolis", override_name="", benchmarks=None):
+    """Fingerprint of research, and of audit/site-config once research is known."""
+    source = html.fingerprint() if isinstance(html, PageFile) else content_hash(html)
+    fps = {"research": fingerprint("research", source, stage_version("research"), url, override_name)}
+    if research is not None:
+        research_fp = fingerprint(research)
+        # Cohort benchmarks are an audit input too, when there are any
+        fps["audit"] = fingerprint("audit", research_fp, stage_version("audit"), *([benchmarks] if benchmarks else []))
+        fps["site-config"] = fingerprint("site-config", research_fp, stage_version("site-config"), city)
+    return fps
+
+
+def run_stages(html, url="", city="Indianapolis", override_name="", outputs=None,
+               cache=None, state=None, force=(), on_stage=None, dedupe=None, benchmarker=None):
+    """analyze(), recomputing only the stages whose inputs, code or params changed.
+
+    `outputs` maps stage name to the JSON path it's written to, and
+    optionally "audit-html" / "demo-site" to the HTML page to render from the
+    audit / site config; `state` is the BuildState for those paths, `cache` a ProspectCache shared
+    across builds. on_stage(stage, data, how) is called after each stage.
+    With `dedupe` (a Deduper), a page that's a near duplicate of a stored
+    prospect reuses its research instead of being scanned. With
+    `benchmarker`, benchmarker(research) gives generate_audit's cohort
+    benchmarks (None when the cohort is too small).
+    Returns (research, audit, config, {stage: "fresh"|"cached"|"built"}).
+    """
+    outputs = outputs or {}
+    hows = {}
+
+    def step(stage, fp, compute):
+        with metrics.phase(f"stage.{stage}"):
+            data, hows[stage] = run_json_stage(stage, fp, compute, outputs.get(stage), state, cache, force)
+        if stage == "audit" and hows[stage] != "built" and data.get("date") != audit_date():
+            # A reused audit keeps its scores but not the day they were first worked out
+            data["date"] = audit_date()
+            if outputs.get(stage):
+                with open(outputs[stage], "w") as f:
+                    json.dump(data, f, indent=2)
+                if state and not data.get("partial"):
+                    state.record(stage, fp, [outputs[stage]])
+        if on_stage:
+            on_stage(stage, data, hows[stage])
+        return data
+
+    def research_stage():
+        research = dedupe.reuse(html, url, override_name) if dedupe else None
+        if research is None:
+            research = extract_business_info(html, url)
+        if override_name:
+            research["businessName"] = override_name
+        return research
+
+    fps = stage_fingerprints(html, url=url, city=city, override_name=override_name)
+    research = step("research", fps["research"], research_stage)
+    benchmarks = benchmarker(research) if benchmarker else None
+    fps = stage_fingerprints(html, research, url, city, override_name, benchmarks)
+    audit = step("audit", fps["audit"], lambda: generate_audit(research, benchmarks))
+    config = step("site-config", fps["site-config"], lambda: generate_site_config(research, city))
+
+    renders = {
+        "audit-html": (audit, audit_renderer, lambda path: audit_renderer.write_audit(audit, path)),
+        "demo-site": (config, site_renderer, lambda path: site_renderer.write_site(config, os.path.dirname(path))),
+    }
+    for stage in RENDER_STAGES:
+        data, renderer, render = renders[stage]
+        if outputs.get(stage):
+            fp = fingerprint(stage, fingerprint(data), renderer.renderer_version())
+            with metrics.phase(f"stage.{stage}"):
+                hows[stage] = run_file_stage(stage, fp, render, outputs[stage], state, force)
+            if on_stage:
+                on_stage(stage, outputs[stage], hows[stage])
+    return research, audit, config, hows
+
+
+
+# ──────────────────────────────────────
+# Batch mode
+# ──────────────────────────────────────
+
+def read_manifest(path):
+    """Yield (line_no, record) from a JSONL manifest.
+
+    Each record is an object with "html" (path to the fetched page, relative
+    to the manifest) and optional "url", "city", "overrideName" and "id".
+    Lines that don't parse are yielded as an error string instead of a dict.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"bad JSON: {e}"
+                continue
+            if not isinstance(record, dict) or not record.get("html"):
+                yield line_no, "record needs an \"html\" path"
+                continue
+            record["html"] = os.path.join(base, record["html"])
+            yield line_no, record
+
+
+def record_id(record, line_no):
+    """Stable, filesystem-safe id for a manifest record."""
+    rid = str(record.get("id") or record.get("overrideName") or "")
+    if not rid and record.get("url"):
+        rid = re.sub(r'https?://(www\.)?', '', record["url"]).split('/')[0]
+    rid = re.sub(r'[^a-z0-9]+', '-', rid.lower()).strip('-')
+    return rid or f"record-{line_no}"
+
+
+def _batch_job(job):
+    """Worker: analyze one manifest record. Never raises."""
+    line_no, record, out_dir, cache_dir, force, renders, db, stream, dedupe = job
+    if not isinstance(record, dict):
+        return {"id": f"record-{line_no}", "line": line_no, "ok": False, "error": record}
+
+    rid = record_id(record, line_no)
+    result = {"id": rid, "line": line_no, "html": record["html"]}
+    try:
+        html = read_html(record["html"], *stream)
+        cache = ProspectCache(cache_dir) if cache_dir else None
+        deduper = Deduper(worker_store(db), dedupe) if db and dedupe is not None else None
+        outputs, state = {}, None
+        if out_dir:
+            rec_dir = os.path.join(out_dir, rid)
+            os.makedirs(rec_dir, exist_ok=True)
+            outputs = {stage: os.path.join(rec_dir, f"{stage}.json") for stage in ANALYZER_STAGES}
+            if "audit-html" in renders:
+                outputs["audit-html"] = os.path.join(rec_dir, "growth-audit.html")
+            if "demo-site" in renders:
+                outputs["demo-site"] = os.path.join(rec_dir, "demo-site", "index.html")
+            state = BuildState(os.path.join(rec_dir, "stages.json"))
+            result["outDir"] = rec_dir
+        # The phases print progress for the single-page CLI; keep workers quiet
+        city = record.get("city") or "Indianapolis"
+        with contextlib.redirect_stdout(io.StringIO()):
+            research, audit, config, result["stages"] = run_stages(
+                html,
+                url=record.get("url", ""),
+                city=city,
+                override_name=record.get("overrideName", ""),
+                outputs=outputs, cache=cache, state=state, force=force, dedupe=deduper,
+            )
+        if research.get("duplicateOf"):
+            result["duplicateOf"] = research["duplicateOf"]
+        if db:
+            result["row"] = prospect_row(research, audit, config, city,
+                                         simhash=deduper.fingerprint(html)[0] if deduper else None,
+                                         version=stage_version("research"))
+        if not out_dir:
+            result["research"] = research
+            result["audit"] = audit
+            result["siteConfig"] = config
+        result["ok"] = True
+    except Exception as e:
+        result["ok"] = False
+        result["error"] = f"{type(e).__name__}: {e}"
+    # Pool workers exit without running atexit handlers
+    metrics.flush()
+    return result
+
+
+STORE_CHUNK = 500  # rows per prospect store transaction
+
+_worker_stores = {}
+
+
+def worker_store(path):
+    """This process's read connection to the prospect store at `path`."""
+    if path not in _worker_stores:
+        _worker_stores[path] = ProspectStore(path)
+    return _worker_stores[path]
+
+
+def run_batch(manifest, out_dir=None, jsonl_out=None, workers=None, chunksize=8, cache_dir=None,
+              force=(), renders=(), db=None, stream=(None, 0), dedupe=None):
+    """Analyze every record in a manifest on a process pool.
+
+    With out_dir, each record gets <out_dir>/<id>/{research,audit,site-config}.json
+    and the JSONL (if any) only carries status lines. Without it, the JSONL
+    carries the full research/audit/siteConfig for each record. Results are
+    written in manifest order as they complete. Only stale stages are
+    recomputed: with out_dir, per-record build state says what's current,
+    and with cache_dir, stage results are shared across runs. `force` names
+    stages to recompute regardless. `renders` (needs out_dir) adds pages per
+    record: "audit-html" → <id>/growth-audit.html, "demo-site" →
+    <id>/demo-site/index.html. Each worker compiles the templates once and
+    reuses them for every record it gets. With db, every analyzed record is
+    upserted into the prospect store from this process, STORE_CHUNK rows per
+    transaction, and with dedupe (a SimHash distance) too, records that are
+    near duplicates of one already in the store reuse its research. `stream`
+    is read_html()'s (stream_above, page_budget). Returns (ok, failed).
+    """
+    jobs = ((line_no, record, out_dir, cache_dir, tuple(force), tuple(renders), db, tuple(stream), dedupe)
+            for line_no, record in read_manifest(manifest))
+    out = open(jsonl_out, 'w') if jsonl_out else None
+    store = ProspectStore(db) if db else None
+    rows = []
+    ok = failed = 0
+    metrics.flush()  # forked workers would write anything still buffered again
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(_batch_job, jobs, chunksize=max(1, chunksize)):
+                if result["ok"]:
+                    ok += 1
+                else:
+                    failed += 1
+                    print(f"  ⚠️ {result['id']} (line {result['line']}): {result['error']}")
+                if "row" in result:
+                    rows.append(result.pop("row"))
+                    if len(rows) >= STORE_CHUNK:
+                        store.upsert(rows)
+                        rows = []
+                if out:
+                    out.write(json.dumps(result) + "\n")
+    finally:
+        if out:
+            out.close()
+        if store:
+            store.upsert(rows)
+            store.close()
+    if cache_dir:
+        ProspectCache(cache_dir).prune()
+    return ok, failed
+
+
+# ──────────────────────────────────────
+# Resident worker
+# ──────────────────────────────────────
+#
+# `serve` imports everything, compiles the regexes, templates and stage
+# versions once, then forks a process pool that inherits all of it. Requests
+# are JSON lines, answered as JSON lines in completion order (match them up
+# by "id"), several at a time:
+#
+#   {"id": 1, "argv": [...], "cwd": "/path", "env": {"PROSPECT_...": ...}}
+#       run the CLI with these arguments, as prospect_client.py sends it;
+#       → {"id", "ok", "exit", "stdout", "stderr", "research", "audit", "siteConfig"}
+#   {"id": 2, "html": "page.html", "url": ..., "city": ..., "overrideName": ...}
+#       a batch manifest record; → its batch result with research/audit/siteConfig
+#   {"op": "ping"}  → {"ok", "pid", "workers", "served", "stale"}
+#
+# Once any source file or template changes on disk, requests are answered
+# {"stale": true} and a socket worker shuts down, so new code is never
+# half-loaded; clients fall back to a cold run until the worker is restarted.
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+WARM_PAGE = ("<html><head><title>Warm Up Roofing | Indianapolis Roofer</title></head><body>"
+             "<h1>Warm Up Roofing</h1><h2>Roof Repair</h2><h2>Gutter Installation</h2>"
+             "<p>Call (317) 555-0100 or email info@example.com</p>"
+             "<p>123 Main St, Indianapolis, IN 46204</p><p>Great service! 5 stars</p></body></html>")
+
+_optimize_seen = os.environ.get("PROSPECT_OPTIMIZE")
+
+
+def serve_log(message):
+    # stdout carries responses in --stdio mode
+    print(message, file=sys.stderr, flush=True)
+
+
+def source_mtimes():
+    """Modification times of the code and templates a warm worker has loaded."""
+    paths = {os.path.abspath(__file__), audit_renderer.TEMPLATE, audit_renderer.GENERATOR,
+             site_renderer.TEMPLATE, site_renderer.GENERATOR, BUDGETS_FILE}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == TOOLS_DIR:
+            paths.add(os.path.abspath(path))
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def warm_up():
+    """Do one analysis and compile everything later requests would compile."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyze(WARM_PAGE, "https://example.com")
+    audit_renderer.get_template()
+    site_renderer.get_template()
+    for stage in STAGE_SECTIONS:
+        stage_version(stage)
+
+
+def _serve_worker_init():
+    # Ctrl-C reaches the whole process group; the parent shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def _serve_ready(_):
+    return os.getpid()
+
+
+def _serve_env(env):
+    """Make the PROSPECT_* environment the client's."""
+    global _optimize_seen
+    for key in [k for k in os.environ if k.startswith("PROSPECT_") and k not in env]:
+        del os.environ[key]
+    os.environ.update({k: str(v) for k, v in env.items() if k.startswith("PROSPECT_")})
+    if os.environ.get("PROSPECT_OPTIMIZE") != _optimize_seen:
+        # Written pages' versions include whether they were optimized
+        _optimize_seen = os.environ.get("PROSPECT_OPTIMIZE")
+        audit_renderer._version = site_renderer._version = None
+
+
+def _serve_argv(argv):
+    parser = build_parser()
+    args = parse_args(parser, argv)
+    if args.batch:
+        parser.error("--batch isn't served; run it without the worker")
+    metrics.configure(args.metrics_out, "analyzer", at_exit=False)
+    with metrics.phase("request"), profiled(args.profile_out):
+        return run_single(parser, args)
+
+
+def _serve_job(request):
+    """Pool worker: answer one analyze request the way a cold run would. Never raises."""
+    _serve_env(request.get("env") or {})
+    if "argv" not in request:
+        metrics.configure(metrics_path_from_env(), "analyzer", at_exit=False)
+        result = _batch_job((request.get("line", 1), request, None, cache_dir_from_env(), (), (), None,
+                             (stream_above_from_env(), int(os.environ.get("PROSPECT_PAGE_BUDGET") or 0)),
+                             None))
+        result["id"] = request.get("id", result["id"])
+        return result
+
+    response = {"id": request.get("id"), "exit": 0}
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            os.chdir(request.get("cwd") or "/")
+            research, audit, config = _serve_argv([str(a) for a in request["argv"]])
+            response.update(research=research, audit=audit, siteConfig=config)
+        except SystemExit as e:
+            if isinstance(e.code, str):
+                print(e.code, file=sys.stderr)
+            response["exit"] = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            traceback.print_exc()
+            response["exit"] = 1
+        finally:
+            metrics.flush()
+    response.update(ok=response["exit"] == 0, stdout=out.getvalue(), stderr=err.getvalue())
+    return response
+
+
+class AnalyzerService:
+    """The warm process pool behind `serve`, shared by every connection."""
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        started = time.perf_counter()
+        warm_up()
+        self.sources = source_mtimes()
+        self.served = 0
+        self.stale = False
+        self.on_stale = None
+        self._lock = threading.Lock()
+        self.pool = self._new_pool()
+        self.warm_s = time.perf_counter() - started
+
+    def _new_pool(self):
+        metrics.flush()  # forked workers would write anything still buffered again
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_serve_worker_init)
+        # Fork every worker now, from the warm parent, before any handler thread runs
+        list(pool.map(_serve_ready, range(self.workers)))
+        return pool
+
+    def is_stale(self):
+        if not self.stale and source_mtimes() != self.sources:
+            self.stale = True
+            serve_log("  ⚠️ Analyzer code or templates changed on disk; answering stale until restarted")
+            if self.on_stale:
+                self.on_stale()
+        return self.stale
+
+    def handle(self, line):
+        """One request line in, one response dict out."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("not a JSON object")
+        except ValueError as e:
+            return {"ok": False, "error": f"bad request: {e}"}
+        if request.get("op") == "ping":
+            return {"id": request.get("id"), "ok": True, "pid": os.getpid(), "workers": self.workers,
+                    "served": self.served, "stale": self.is_stale()}
+        if self.is_stale():
+            return {"id": request.get("id"), "ok": False, "stale": True,
+                    "error": "analyzer changed since this worker started"}
+        for attempt in (1, 2):
+            pool = self.pool
+            try:
+                response = pool.submit(_serve_job, request).result()
+                break
+            except BrokenProcessPool:
+                # A worker died mid-request (OOM, signal); start a fresh pool and retry once
+                with self._lock:
+                    if self.pool is pool:
+                        serve_log("  ⚠️ Analyzer worker died; restarting the pool")
+                        self.pool = self._new_pool()
+                if attempt == 2:
+                    return {"id": request.get("id"), "ok": False, "error": "worker process died"}
+        with self._lock:
+            self.served += 1
+        if not response.get("ok"):
+            serve_log(f"  ⚠️ Request {response.get('id')} failed (exit {response.get('exit', 1)})")
+        return response
+
+    def answer_lines(self, lines, write):
+        """Answer each line in `lines` on its own thread, passing responses to write()
+        as they finish; returns once every request is answered."""
+        write_lock = threading.Lock()
+        threads = []
+
+        def answer(line):
+            data = (json.dumps(self.handle(line)) + "\n").encode()
+            with write_lock:
+                try:
+                    write(data)
+                except OSError:
+                    pass  # client went away
+
+        for line in lines:
+            if line.strip():
+                thread = threading.Thread(target=answer, args=(line,), daemon=True)
+                thread.start()
+                threads = [t for t in threads if t.is_alive()] + [thread]
+        for thread in threads:
+            thread.join()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+class _ServeHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        def write(data):
+            self.wfile.write(data)
+            self.wfile.flush()
+        self.server.service.answer_lines(self.rfile, write)
+
+
+class _ServeServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def claim_socket(path):
+    """Clear a dead worker's socket at `path`; False if a live worker is on it."""
+    if not os.path.exists(path):
+        return True
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return False
+    except OSError:
+        os.unlink(path)
+        return True
+    finally:
+        probe.close()
+
+
+def serve_socket(service, path):
+    umask = os.umask(0o077)  # only this user may connect
+    try:
+        server = _ServeServer(path, _ServeHandler)
+    finally:
+        os.umask(umask)
+    server.service = service
+
+    def stop(*_):
+        # shutdown() waits for serve_forever(), so it can't run on the main thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    service.on_stale = stop
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, stop)
+    serve_log(f"  ✅ Analyzer worker {os.getpid()} ready on {path} "
+              f"({service.workers} workers, warmed up in {service.warm_s:.2f}s)")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+    serve_log(f"  Analyzer worker stopped after {service.served} requests")
+    return 0
+
+
+def serve_stdio(service):
+    serve_log(f"  ✅ Analyzer worker {os.getpid()} reading stdin "
+              f"({service.workers} workers, warmed up in {service.warm_s:.2f}s)")
+    out = sys.stdout.buffer
+
+    def write(data):
+        out.write(data)
+        out.flush()
+    service.answer_lines(sys.stdin.buffer, write)
+    return 0
+
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1 (--workers, --chunksize)."""
+    try:
+        n = int(value)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be a whole number ≥ 1, not {value!r}")
+    return n
+
+
+def serve_main(argv):
+    parser = argparse.ArgumentParser(prog="prospect-analyzer.py serve",
+                                     description="Ace Growth Prospect Analyzer — resident worker")
+    parser.add_argument("--socket", default=socket_path_from_env(),
+                        help="Unix socket to serve on (default: $PROSPECT_ANALYZER_SOCKET or "
+                             "~/.cache/ace-growth/analyzer.sock)")
+    parser.add_argument("--stdio", action="store_true",
+                        help="Read requests from stdin and answer on stdout instead of a socket")
+    parser.add_argument("--workers", type=positive_int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    if not args.stdio and not args.socket:
+        parser.error("PROSPECT_ANALYZER_SOCKET is off: pass --socket PATH or --stdio")
+
+    if not args.stdio:
+        os.makedirs(os.path.dirname(os.path.abspath(args.socket)), mode=0o700, exist_ok=True)
+        if not claim_socket(args.socket):
+            serve_log(f"  ⚠️ An analyzer worker is already serving {args.socket}")
+            sys.exit(1)
+
+    service = AnalyzerService(args.workers)
+    try:
+        sys.exit(serve_stdio(service) if args.stdio else serve_socket(service, args.socket))
+    finally:
+        service.close()
+
+
 # ──────────────────────────────────────
 # Main
 # ──────────────────────────────────────
 
-def main():
-    parser = argparse.ArgumentParser(description="Ace Growth Prospect Analyzer")
-    parser.add_argument("--html", required=True, help="Path to fetched HTML file")
+def build_parser():
+    parser = argparse.ArgumentParser(description="Ace Growth Prospect Analyzer",
+                                     epilog="Resident worker: prospect-analyzer.py serve --help")
+    parser.add_argument("--html", help="Path to fetched HTML file")
     parser.add_argument("--url", default="", help="Original URL")
-    parser.add_argument("--research-out", required=True, help="Output path for research JSON")
-    parser.add_argument("--audit-out", required=True, help="Output path for audit JSON")
-    parser.add_argument("--site-config-out", required=True, help="Output path for site config JSON")
+    parser.add_argument("--research-out", help="Output path for research JSON")
+    parser.add_argument("--audit-out", help="Output path for audit JSON")
+    parser.add_argument("--site-config-out", help="Output path for site config JSON")
     parser.add_argument("--override-name", default="", help="Override business name")
     parser.add_argument("--city", default="Indianapolis", help="City for service areas")
-    args = parser.parse_args()
+    parser.add_argument("--cache-dir", default=cache_dir_from_env(),
+                        help="Reuse analyses of unchanged pages from this cache (default: $PROSPECT_CACHE_DIR)")
+    parser.add_argument("--db", default=db_path_from_env(),
+                        help="Prospect store to record results in (default: $PROSPECT_DB; 'off' to skip)")
+    parser.add_argument("--dedupe-distance", type=int, default=dedupe_from_env(), metavar="BITS",
+                        help="Reuse the research of a stored prospect whose page SimHash is within BITS "
+                             f"(0-{SIMHASH_BANDS - 1}) of this one's (default: $PROSPECT_DEDUPE or {DUP_DISTANCE})")
+    parser.add_argument("--no-dedupe", dest="dedupe_distance", action="store_const", const=None,
+                        help="Analyze every page in full (or PROSPECT_DEDUPE=off)")
+    parser.add_argument("--cohort-benchmarks", action="store_true",
+                        default=os.environ.get("PROSPECT_COHORT", "") in ("1", "on"),
+                        help="Rank the audit against the stored prospects in the same industry and city; "
+                             "single pages only, needs NumPy (default: $PROSPECT_COHORT=on)")
+    parser.add_argument("--state", help="Build state file; stages whose outputs are current are skipped")
+    parser.add_argument("--force-stage", action="append", default=[], choices=ANALYZER_STAGES + RENDER_STAGES + ["all"],
+                        help="Recompute this stage even if current (repeatable)")
+    parser.add_argument("--audit-html-out", help="Also render the growth audit page to this path")
+    parser.add_argument("--demo-out", help="Also render the demo site to DEMO_OUT/index.html")
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--batch", metavar="MANIFEST", help="JSONL manifest of records to analyze")
+    batch.add_argument("--out-dir", help="Write per-record outputs to OUT_DIR/<id>/")
+    batch.add_argument("--jsonl-out", help="Write one combined JSONL of results")
+    batch.add_argument("--workers", type=positive_int, default=None, help="Worker processes (default: CPU count)")
+    batch.add_argument("--chunksize", type=positive_int, default=8, help="Records handed to a worker at a time")
+    batch.add_argument("--render-audit", action="store_true", help="Render OUT_DIR/<id>/growth-audit.html too")
+    batch.add_argument("--render-demo", action="store_true", help="Render OUT_DIR/<id>/demo-site/index.html too")
+    parser.add_argument("--stream", action="store_true",
+                        help="Scan the HTML from disk in chunks instead of reading it whole")
+    parser.add_argument("--stream-above", type=int, default=stream_above_from_env(), metavar="BYTES",
+                        help="Stream files bigger than this (default: $PROSPECT_STREAM_ABOVE or 8 MB; 0 = never)")
+    parser.add_argument("--page-budget", type=int, default=int(os.environ.get("PROSPECT_PAGE_BUDGET") or 0),
+                        metavar="BYTES", help="When streaming, scan at most this much of each page "
+                        "(default: $PROSPECT_PAGE_BUDGET or no limit)")
+    parser.add_argument("--metrics-out", default=metrics_path_from_env(),
+                        help="Append per-phase timings as JSON lines here (default: $PROSPECT_METRICS)")
+    parser.add_argument("--profile-out", default=os.environ.get("PROSPECT_PROFILE") or None,
+                        help="Write a cProfile dump of this run here (default: $PROSPECT_PROFILE)")
+    return parser
+
+
+def parse_args(parser, argv=None):
+    args = parser.parse_args(argv)
+    if args.db in ("", "0", "off"):
+        args.db = None
+    if args.stream:
+        args.stream_above = -1
+    if args.dedupe_distance is not None and not 0 <= args.dedupe_distance < SIMHASH_BANDS:
+        parser.error(f"--dedupe-distance must be 0-{SIMHASH_BANDS - 1}")
+    return args
+
+
+def main():
+    if sys.argv[1:2] == ["serve"]:
+        serve_main(sys.argv[2:])
+        return
+    parser = build_parser()
+    args = parse_args(parser)
+    metrics.configure(args.metrics_out, "analyzer")
+
+    with profiled(args.profile_out):
+        run(parser, args)
+
+
+def run(parser, args):
+    if args.batch:
+        if not args.out_dir and not args.jsonl_out:
+            parser.error("--batch needs --out-dir and/or --jsonl-out")
+        renders = [stage for stage, flag in (("audit-html", args.render_audit), ("demo-site", args.render_demo))
+                   if flag]
+        if renders and not args.out_dir:
+            parser.error("--render-audit/--render-demo need --out-dir")
+        print(f"  Batch: {args.batch}")
+        ok, failed = run_batch(args.batch, args.out_dir, args.jsonl_out,
+                               workers=args.workers, chunksize=args.chunksize,
+                               cache_dir=args.cache_dir, force=args.force_stage,
+                               renders=renders, db=args.db, stream=(args.stream_above, args.page_budget),
+                               dedupe=args.dedupe_distance)
+        print(f"  ✅ Batch done: {ok} analyzed, {failed} failed")
+        sys.exit(1 if failed else 0)
+    run_single(parser, args)
+
+
+def run_single(parser, args):
+    """One page, as the CLI runs it; returns (research, audit, config)."""
+    missing = [opt for opt, val in (("--html", args.html), ("--research-out", args.research_out),
+                                    ("--audit-out", args.audit_out),
+                                    ("--site-config-out", args.site_config_out)) if not val]
+    if missing:
+        parser.error(f"the following arguments are required: {', '.join(missing)}")
 
     # Read HTML
     print("  Reading HTML...")
     try:
-        with open(args.html, 'r', errors='replace') as f:
-            html = f.read()
+        with metrics.phase("read-html"):
+            html = read_html(args.html, args.stream_above, args.page_budget)
+        if isinstance(html, PageFile):
+            print(f"  Streaming {len(html) // 1024} KB from disk"
+                  + (f" (at most {args.page_budget // 1024} KB per page)" if args.page_budget else ""))
     except Exception as e:
         print(f"  ⚠️ Could not read HTML: {e}")
         html = "<html><head><title>Unknown</title></head><body></body></html>"
 
-    # Phase 1: Research
-    print("  Extracting business info...")
-    research = extract_business_info(html, args.url)
-
-    if args.override_name:
-        research["businessName"] = args.override_name
-
-    print(f"  Business: {research['businessName']}")
-    print(f"  Phone: {research['phone']}")
-    print(f"  Email: {research['email']}")
-    print(f"  Address: {research['address']}")
-
-    with open(args.research_out, 'w') as f:
-        json.dump(research, f, indent=2)
-    print(f"  ✅ Research saved: {args.research_out}")
-
-    # Phase 2: Audit
-    print("\n  Scoring website...")
-    audit = generate_audit(research)
-
-    with open(args.audit_out, 'w') as f:
-        json.dump(audit, f, indent=2)
-    print(f"  ✅ Audit saved: {args.audit_out}")
-
-    # Phase 3: Site config
-    print("\n  Generating site config...")
-    config = generate_site_config(research, args.city)
-
-    with open(args.site_config_out, 'w') as f:
-        json.dump(config, f, indent=2)
-    print(f"  ✅ Site config saved: {args.site_config_out}")
+    cache = ProspectCache(args.cache_dir) if args.cache_dir else None
+    state = BuildState(args.state) if args.state else None
+    store = ProspectStore(args.db) if args.db else None
+    deduper = Deduper(store, args.dedupe_distance) if store and args.dedupe_distance is not None else None
+    benchmarker = None
+    if args.cohort_benchmarks and not args.db:
+        print("  ⚠️ --cohort-benchmarks needs the prospect store (--db) — using the generic benchmarks")
+    elif args.cohort_benchmarks and os.path.exists(args.db):
+        benchmarker = cohort_benchmarker(args.db, args.city)
+    outputs = {"research": args.research_out, "audit": args.audit_out, "site-config": args.site_config_out}
+    if args.audit_html_out:
+        outputs["audit-html"] = args.audit_html_out
+    if args.demo_out:
+        outputs["demo-site"] = os.path.join(args.demo_out, "index.html")
+    stages = [stage for stage in ANALYZER_STAGES + RENDER_STAGES if outputs.get(stage)]
+    titles = {"research": "Extracting business info", "audit": "Scoring website",
+              "site-config": "Generating site config", "audit-html": "Rendering growth audit",
+              "demo-site": "Rendering demo site"}
+    saved = {"research": "Research", "audit": "Audit", "site-config": "Site config",
+             "audit-html": "Growth audit", "demo-site": "Demo site"}
+
+    def before(stage):
+        print(("\n" if stage != "research" else "") + f"  {titles[stage]}...")
+
+    def after(stage, data, how):
+        if stage == "research":
+            if data.get("duplicateOf") and how == "built":
+                dup = data["duplicateOf"]
+                print(f"  ♻️  Near duplicate of {dup['slug']} ({dup['distance']} bits apart): reusing its analysis")
+            print(f"  Business: {data['businessName']}")
+            print(f"  Phone: {data['phone']}")
+            print(f"  Email: {data['email']}")
+            print(f"  Address: {data['address']}")
+        if how == "built":
+            print(f"  ✅ {saved[stage]} saved: {outputs[stage]}")
+        else:
+            print(f"  ✅ {saved[stage]} unchanged ({how}): {outputs[stage]}")
+        nxt = stages.index(stage) + 1
+        if nxt < len(stages):
+            before(stages[nxt])
+
+    # Phase 1: Research, Phase 2: Audit, Phase 3: Site config
+    before("research")
+    research, audit, config, _ = run_stages(html, args.url, args.city, args.override_name, outputs=outputs,
+                                            cache=cache, state=state, force=args.force_stage, on_stage=after,
+                                            dedupe=deduper, benchmarker=benchmarker)
+
+    if store:
+        with metrics.phase("store"), store:
+            store.upsert([prospect_row(research, audit, config, args.city,
+                                       simhash=deduper.fingerprint(html)[0] if deduper else None,
+                                       version=stage_version("research"))])
+        print(f"  ✅ Stored in {args.db}")
+
+    if cache:
+        cache.prune()
+    return research, audit, config
 
 
 if __name__ == "__main__":
@@ -8,8 +8,8 @@ set -uo pipefail
 #   1. Researches the business (scrape site, extract info)
 #   2. Generates a growth audit
 #   3. Generates a demo website
-#   4. Deploys both to acegrowth.net/demos/[slug]/
-#   5. Outputs a call brief for Kae
+#   4. Outputs a call brief for Kae
+#   5. Deploys all three to acegrowth.net/demos/[slug]/
 #
 # Usage:
 #   ./prospect-pipeline.sh https://example.com
@@ -21,12 +21,28 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 REPO_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
 AUDIT_GENERATOR="$REPO_ROOT/tools/audit-generator/generate-audit.sh"
 SITE_GENERATOR="$REPO_ROOT/templates/contractor-site/generate.sh"
-DEPLOY_ROOT="/var/www/acemanagement.so/demos"
+SITE_RENDERER="$SCRIPT_DIR/site_renderer.py"
+AUDIT_RENDERER="$SCRIPT_DIR/audit_renderer.py"
+OPTIMIZER="$SCRIPT_DIR/page_optimizer.py"
+PAGE_BUDGETS="$SCRIPT_DIR/page_budgets.json"
+AUDIT_TEMPLATE="$REPO_ROOT/tools/audit-generator/audit-template.html"
+SITE_TEMPLATE="$REPO_ROOT/templates/contractor-site/index.html"
+STAGES="$SCRIPT_DIR/prospect_stages.py"
+DEPLOYER="$SCRIPT_DIR/prospect_deploy.py"
+BRIEF="$SCRIPT_DIR/prospect_brief.py"
+# Uses a running `prospect-analyzer.py serve` worker if there is one, else runs cold
+ANALYZER_CLIENT="$SCRIPT_DIR/prospect_client.py"
+DEPLOY_ROOT="${PROSPECT_DEPLOY_ROOT:-/var/www/acemanagement.so/demos}"
 TMP_DIR="/tmp/prospect-pipeline-$$"
-RESEARCH_FILE="$TMP_DIR/research.json"
-AUDIT_FILE="$TMP_DIR/audit.json"
-SITE_CONFIG="$TMP_DIR/site-config.json"
 HTML_FILE="$TMP_DIR/website.html"
+# Per-prospect build outputs; set by setup_build_dir
+BUILD_DIR=""
+RESEARCH_FILE=""
+AUDIT_FILE=""
+SITE_CONFIG=""
+STAGE_STATE=""
+# Fetched pages and analyses persist here across runs (see prospect_cache.py)
+export PROSPECT_CACHE_DIR="${PROSPECT_CACHE_DIR:-$HOME/.cache/ace-growth/prospects}"
 
 # Colors for output
 RED='\033[0;31m'
@@ -55,6 +71,13 @@ usage() {
     echo "  --no-deploy    Generate but don't deploy"
     echo "  --audit-only   Only generate the audit"
     echo "  --demo-only    Only generate the demo site"
+    echo "  --no-cache     Refetch and reanalyze even if nothing changed"
+    echo "  --no-optimize  Write pages as rendered (no minify/sprites, no size budget)"
+    echo "  --force-stage=STAGE  Rebuild a stage even if it's current (repeatable):"
+    echo "                 research, audit, site-config, audit-html, demo-site, all"
+    echo "  --metrics-out=FILE   Append per-phase timings (JSON lines) to FILE"
+    echo "  --profile-out=FILE   Write a cProfile dump of the analyzer to FILE"
+    echo "  --page-budget=BYTES  Scan at most BYTES of each page of an oversized fetch"
     exit 1
 }
 
@@ -67,14 +90,63 @@ slugify() {
     echo "$1" | tr '[:upper:]' '[:lower:]' | sed -E 's/[^a-z0-9]+/-/g; s/^-|-$//g'
 }
 
+# ──────────────────────────────────────
+# Phase metrics
+# With PROSPECT_METRICS (or --metrics-out) set, each phase
+# appends a JSON line there; the Python tools add their own
+# lines, tagged with the phase that ran them.
+# See prospect_metrics.py report
+# ──────────────────────────────────────
+
+PHASE_WALL_US=0
+PHASE_CPU_MS=0
+
+# Sets CLOCK_US (wall clock, µs) and CPU_MS (this shell and its children, user + sys)
+read_clock() {
+    CLOCK_US="${EPOCHREALTIME//[!0-9]/}"
+    [ -n "$CLOCK_US" ] || CLOCK_US="$(date +%s%6N)"
+    CPU_MS=0
+    local t m sec
+    times > "$TMP_DIR/.times"
+    for t in $(< "$TMP_DIR/.times"); do
+        # XmY.ZZZs
+        m="${t%%m*}"; sec="${t#*m}"; sec="${sec%s}"
+        CPU_MS=$(( CPU_MS + m * 60000 + 10#${sec%.*} * 1000 + 10#${sec#*.} ))
+    done
+}
+
+phase_begin() {
+    [ -n "${PROSPECT_METRICS:-}" ] || return 0
+    export PROSPECT_METRICS_PHASE="$1"
+    read_clock
+    PHASE_WALL_US=$CLOCK_US
+    PHASE_CPU_MS=$CPU_MS
+}
+
+# phase_end <phase> [file]: record the phase; the file's size is its bytes
+phase_end() {
+    [ -n "${PROSPECT_METRICS:-}" ] || return 0
+    read_clock
+    local wall=$(( CLOCK_US - PHASE_WALL_US )) cpu=$(( CPU_MS - PHASE_CPU_MS )) bytes=null
+    if [ -n "${2:-}" ] && [ -f "$2" ]; then
+        bytes=$(wc -c < "$2")
+        bytes="${bytes//[!0-9]/}"
+    fi
+    printf '{"run": "%s", "source": "pipeline", "phase": "%s", "parent": null, "wall_s": %d.%06d, "cpu_s": %d.%03d, "bytes": %s, "max_rss_kb": null, "time": %d.%06d, "pid": %d}\n' \
+        "$PROSPECT_METRICS_RUN" "$1" $(( wall / 1000000 )) $(( wall % 1000000 )) \
+        $(( cpu / 1000 )) $(( cpu % 1000 )) "$bytes" \
+        $(( CLOCK_US / 1000000 )) $(( CLOCK_US % 1000000 )) $$ >> "$PROSPECT_METRICS"
+    unset PROSPECT_METRICS_PHASE
+}
+
 cleanup() {
-    cp "$TMP_DIR"/*.json /tmp/ 2>/dev/null || true
+    cp "$RESEARCH_FILE" "$AUDIT_FILE" "$SITE_CONFIG" /tmp/ 2>/dev/null || true
     rm -rf "$TMP_DIR"
 }
 trap cleanup EXIT
 
 check_deps() {
-    for cmd in curl jq python3; do
+    for cmd in jq python3; do
         if ! command -v "$cmd" &>/dev/null; then
             if [ "$cmd" = "jq" ]; then
                 echo "Installing jq..."
@@ -99,6 +171,10 @@ BUSINESS_CITY="Indianapolis"
 DO_DEPLOY=true
 AUDIT_ONLY=false
 DEMO_ONLY=false
+FORCE_STAGES=()
+# Pages this run rendered or found fresh; only these are deployed
+AUDIT_READY=false
+DEMO_READY=false
 
 parse_input() {
     [ $# -lt 1 ] && usage
@@ -109,6 +185,12 @@ parse_input() {
             --no-deploy) DO_DEPLOY=false ;;
             --audit-only) AUDIT_ONLY=true ;;
             --demo-only) DEMO_ONLY=true ;;
+            --no-cache) export PROSPECT_CACHE_DIR=off ;;
+            --no-optimize) export PROSPECT_OPTIMIZE=off ;;
+            --force-stage=*) FORCE_STAGES+=("${arg#--force-stage=}") ;;
+            --metrics-out=*) export PROSPECT_METRICS="${arg#--metrics-out=}" ;;
+            --profile-out=*) export PROSPECT_PROFILE="${arg#--profile-out=}" ;;
+            --page-budget=*) export PROSPECT_PAGE_BUDGET="${arg#--page-budget=}" ;;
             --help|-h) usage ;;
             *) positional+=("$arg") ;;
         esac
@@ -126,6 +208,52 @@ parse_input() {
     fi
 }
 
+# ──────────────────────────────────────
+# Build state
+# Each prospect keeps its outputs and stage fingerprints
+# in a build dir, so re-runs only redo stale stages
+# ──────────────────────────────────────
+
+setup_build_dir() {
+    case "$PROSPECT_CACHE_DIR" in
+        ""|0|off) BUILD_DIR="$TMP_DIR" ;;
+        *) BUILD_DIR="$PROSPECT_CACHE_DIR/builds/$(slugify "${WEBSITE_URL:-$BUSINESS_SEARCH_NAME $BUSINESS_CITY}")" ;;
+    esac
+    mkdir -p "$BUILD_DIR"
+    RESEARCH_FILE="$BUILD_DIR/research.json"
+    AUDIT_FILE="$BUILD_DIR/audit.json"
+    SITE_CONFIG="$BUILD_DIR/site-config.json"
+    AUDIT_HTML="$BUILD_DIR/growth-audit.html"
+    STAGE_STATE="$BUILD_DIR/stages.json"
+}
+
+# --force-stage flags for prospect_stages.py
+stage_args() {
+    local s
+    for s in "${FORCE_STAGES[@]}"; do
+        echo "--force-stage=$s"
+    done
+}
+
+# --param for the render stages: whether page_optimizer.py runs changes the page
+optimize_param() {
+    case "${PROSPECT_OPTIMIZE:-}" in
+        0|off) echo "--param=optimize=off" ;;
+        *) echo "--param=optimize=on" ;;
+    esac
+}
+
+# stage_fresh <stage> [--input F]... [--output F]...: exit 0 if the stage can be skipped
+stage_fresh() {
+    local stage="$1"; shift
+    python3 "$STAGES" check --state "$STAGE_STATE" --stage "$stage" $(stage_args) "$@"
+}
+
+stage_record() {
+    local stage="$1"; shift
+    python3 "$STAGES" record --state "$STAGE_STATE" --stage "$stage" "$@"
+}
+
 # ──────────────────────────────────────
 # Phase 1: Research (fetch HTML)
 # ──────────────────────────────────────
@@ -134,34 +262,8 @@ fetch_website() {
     local url="$1"
     log_step "PHASE 1: RESEARCH — $url"
 
-    echo "  Fetching website..."
-    local status_code
-    status_code=$(curl -sS -L -o "$HTML_FILE" -w "%{http_code}" \
-        --max-time 30 \
-        --user-agent "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36" \
-        "$url" 2>/dev/null) || true
-
-    if [ ! -f "$HTML_FILE" ] || [ "$(wc -c < "$HTML_FILE")" -lt 100 ]; then
-        log_warn "Could not fetch website (HTTP $status_code). Using defaults."
-        echo "<html><head><title>Unknown Business</title></head><body></body></html>" > "$HTML_FILE"
-    else
-        log_ok "Fetched website (HTTP $status_code, $(wc -c < "$HTML_FILE" | tr -d ' ') bytes)"
-    fi
-
-    # Try fetching additional pages
-    local base_url
-    base_url=$(echo "$url" | sed -E 's|(https?://[^/]+).*|\1|')
-
-    for page in about about-us contact contact-us services our-services; do
-        local page_file="$TMP_DIR/${page}.html"
-        curl -sS -L -o "$page_file" --max-time 15 \
-            --user-agent "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36" \
-            "${base_url}/${page}" 2>/dev/null || true
-        if [ -f "$page_file" ] && [ "$(wc -c < "$page_file")" -gt 500 ]; then
-            echo "  Found /${page} page"
-            cat "$page_file" >> "$HTML_FILE"
-        fi
-    done
+    # Homepage, then a robots/sitemap-driven crawl within a page and byte budget
+    python3 "$SCRIPT_DIR/prospect_fetch.py" --url "$url" --out "$HTML_FILE"
 }
 
 research_by_name() {
@@ -169,44 +271,10 @@ research_by_name() {
     local city="$2"
     log_step "PHASE 1: RESEARCH — $name ($city)"
 
-    local search_slug
-    search_slug=$(echo "$name" | tr '[:upper:]' '[:lower:]' | sed -E 's/[^a-z0-9]+/-/g; s/^-|-$//g')
-
-    local found_url=""
-    for domain_suffix in ".com" ".net" ".org" ".biz"; do
-        local try_url="https://${search_slug}${domain_suffix}"
-        local http_code
-        http_code=$(curl -sS -o /dev/null -w "%{http_code}" --max-time 10 -L "$try_url" 2>/dev/null) || true
-        if [ "$http_code" = "200" ] || [ "$http_code" = "301" ] || [ "$http_code" = "302" ]; then
-            found_url="$try_url"
-            echo "  Found website: $found_url"
-            break
-        fi
-    done
-
-    if [ -z "$found_url" ]; then
-        local no_hyphen
-        no_hyphen=$(echo "$name" | tr '[:upper:]' '[:lower:]' | tr -d ' ')
-        for domain_suffix in ".com" ".net" ".org"; do
-            local try_url="https://${no_hyphen}${domain_suffix}"
-            local http_code
-            http_code=$(curl -sS -o /dev/null -w "%{http_code}" --max-time 10 -L "$try_url" 2>/dev/null) || true
-            if [ "$http_code" = "200" ] || [ "$http_code" = "301" ] || [ "$http_code" = "302" ]; then
-                found_url="$try_url"
-                echo "  Found website: $found_url"
-                break
-            fi
-        done
-    fi
-
-    if [ -n "$found_url" ]; then
-        WEBSITE_URL="$found_url"
-        fetch_website "$found_url"
-    else
-        log_warn "Could not find website. Creating minimal research."
-        WEBSITE_URL=""
-        echo "<html><head><title>$name</title></head><body></body></html>" > "$HTML_FILE"
-    fi
+    # Probes every domain guess at once, then fetches the site it finds
+    python3 "$SCRIPT_DIR/prospect_fetch.py" --name "$name" \
+        --out "$HTML_FILE" --url-out "$TMP_DIR/website-url.txt"
+    WEBSITE_URL="$(cat "$TMP_DIR/website-url.txt" 2>/dev/null)"
 }
 
 # ──────────────────────────────────────
@@ -218,12 +286,21 @@ research_by_name() {
 run_analysis() {
     log_step "ANALYZING WEBSITE & GENERATING DATA"
 
-    python3 "$SCRIPT_DIR/prospect-analyzer.py" \
+    local force=() s
+    for s in "${FORCE_STAGES[@]}"; do
+        case "$s" in
+            research|audit|site-config|all) force+=(--force-stage "$s") ;;
+        esac
+    done
+
+    python3 "$ANALYZER_CLIENT" \
         --html "$HTML_FILE" \
         --url "$WEBSITE_URL" \
         --research-out "$RESEARCH_FILE" \
         --audit-out "$AUDIT_FILE" \
         --site-config-out "$SITE_CONFIG" \
+        --state "$STAGE_STATE" \
+        "${force[@]}" \
         ${BUSINESS_SEARCH_NAME:+--override-name "$BUSINESS_SEARCH_NAME"} \
         ${BUSINESS_CITY:+--city "$BUSINESS_CITY"}
 }
@@ -234,9 +311,26 @@ run_analysis() {
 
 generate_audit_html() {
     log_step "GENERATING AUDIT HTML"
-    echo "  Running audit generator..."
-    bash "$AUDIT_GENERATOR" "$AUDIT_FILE" 2>&1 | sed 's/^/  /'
-    log_ok "Audit HTML generated"
+
+    local io=(--input "$AUDIT_FILE" --input "$AUDIT_RENDERER" --input "$AUDIT_GENERATOR"
+              --input "$AUDIT_TEMPLATE" --input "$OPTIMIZER" --input "$PAGE_BUDGETS"
+              "$(optimize_param)" --output "$AUDIT_HTML")
+
+    if stage_fresh audit-html "${io[@]}"; then
+        log_ok "Audit HTML unchanged — skipped"
+        AUDIT_READY=true
+        return
+    fi
+    echo "  Rendering audit template..."
+    rm -f "$AUDIT_HTML"
+    python3 "$AUDIT_RENDERER" "$AUDIT_FILE" -o "$AUDIT_HTML" 2>&1 | sed 's/^/  /'
+    if [ -f "$AUDIT_HTML" ]; then
+        stage_record audit-html "${io[@]}"
+        AUDIT_READY=true
+        log_ok "Audit HTML generated"
+    else
+        log_err "Audit HTML not generated"
+    fi
 }
 
 # ──────────────────────────────────────
@@ -245,134 +339,97 @@ generate_audit_html() {
 
 generate_demo_site() {
     log_step "GENERATING DEMO SITE"
-    local demo_output="$TMP_DIR/demo-site"
+    local demo_output="$BUILD_DIR/demo-site"
     mkdir -p "$demo_output"
-    echo "  Running site generator..."
-    bash "$SITE_GENERATOR" "$SITE_CONFIG" "$demo_output" 2>&1 | sed 's/^/  /'
-    log_ok "Demo site generated"
-}
-
-# ──────────────────────────────────────
-# Phase 4: Deploy
-# ──────────────────────────────────────
-
-deploy() {
-    log_step "DEPLOYING TO PRODUCTION"
-
-    local biz_name slug
-    biz_name=$(jq -r '.businessName' "$RESEARCH_FILE")
-    slug=$(slugify "$biz_name")
-
-    local deploy_dir="$DEPLOY_ROOT/$slug"
-    mkdir -p "$deploy_dir"
-
-    # Deploy audit
-    local audit_output
-    audit_output=$(find "$REPO_ROOT/tools/audit-generator/output" -name "${slug}*audit*.html" -type f 2>/dev/null | sort | tail -1)
-    if [ -z "$audit_output" ]; then
-        audit_output=$(find "$REPO_ROOT/tools/audit-generator/output" -name "*.html" -newer "$AUDIT_FILE" -type f 2>/dev/null | head -1)
-    fi
-    if [ -n "$audit_output" ] && [ -f "$audit_output" ]; then
-        cp "$audit_output" "$deploy_dir/growth-audit.html"
-        chmod 644 "$deploy_dir/growth-audit.html"
-        log_ok "Audit deployed"
-    else
-        log_warn "Audit HTML not found for deployment"
+    local io=(--input "$SITE_CONFIG" --input "$SITE_RENDERER" --input "$SITE_GENERATOR"
+              --input "$SITE_TEMPLATE" --input "$OPTIMIZER" --input "$PAGE_BUDGETS"
+              "$(optimize_param)" --output "$demo_output/index.html")
+
+    if stage_fresh demo-site "${io[@]}"; then
+        log_ok "Demo site unchanged — skipped"
+        DEMO_READY=true
+        return
     fi
-
-    # Deploy demo site
-    local demo_site="$TMP_DIR/demo-site/index.html"
-    if [ -f "$demo_site" ]; then
-        cp "$demo_site" "$deploy_dir/index.html"
-        chmod 644 "$deploy_dir/index.html"
-        log_ok "Demo site deployed"
+    echo "  Rendering site template..."
+    rm -f "$demo_output/index.html"
+    python3 "$SITE_RENDERER" "$SITE_CONFIG" "$demo_output" 2>&1 | sed 's/^/  /'
+    if [ -f "$demo_output/index.html" ]; then
+        stage_record demo-site "${io[@]}"
+        DEMO_READY=true
+        log_ok "Demo site generated"
     else
-        log_warn "Demo site not found for deployment"
+        log_err "Demo site not generated"
     fi
-
-    chmod 755 "$deploy_dir"
-
-    echo ""
-    echo -e "  ${GREEN}🌐 Audit: https://acegrowth.net/demos/$slug/growth-audit.html${NC}"
-    echo -e "  ${GREEN}🌐 Demo:  https://acegrowth.net/demos/$slug/${NC}"
 }
 
 # ──────────────────────────────────────
-# Phase 5: Call Brief
+# Phase 4: Call Brief
 # ──────────────────────────────────────
 
 output_brief() {
     log_step "CALL BRIEF"
 
-    local biz_name phone email address website slug overall_score
-    biz_name=$(jq -r '.businessName // "Unknown"' "$RESEARCH_FILE" 2>/dev/null || echo "Unknown")
-    phone=$(jq -r '.phone // "Not found"' "$RESEARCH_FILE" 2>/dev/null || echo "Not found")
-    email=$(jq -r '.email // "Not found"' "$RESEARCH_FILE" 2>/dev/null || echo "Not found")
-    address=$(jq -r '.address // "Not found"' "$RESEARCH_FILE" 2>/dev/null || echo "Not found")
-    website=$(jq -r '.url // ""' "$RESEARCH_FILE" 2>/dev/null || echo "")
-    slug=$(slugify "$biz_name")
-    overall_score=$(jq -r '.overallScore // "?"' "$AUDIT_FILE" 2>/dev/null || echo "?")
-
-    local issues
-    issues=$(jq -r '[.categories[].issues[0]] | .[:3] | .[]' "$AUDIT_FILE" 2>/dev/null || echo "Issues analysis pending")
-
-    local lost_leads annual_lost
-    lost_leads=$(jq -r '.revenueImpact.lostLeadsPerMonth // "10-25"' "$AUDIT_FILE" 2>/dev/null || echo "10-25")
-    annual_lost=$(jq -r '.revenueImpact.annualRevenueLost // "$100K+"' "$AUDIT_FILE" 2>/dev/null || echo '$100K+')
-
+    # Same brief prospect_orchestrator.py writes; deploy publishes it with the pages
     echo ""
     echo -e "${BOLD}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
     echo ""
-    echo -e "${BOLD}♠️  PROSPECT READY: ${biz_name}${NC}"
-    echo ""
-    echo "📞 Phone: $phone"
-    echo "📧 Email: $email"
-    echo "📍 Address: $address"
-    echo "🌐 Website: $website"
-    echo "📊 Score: ${overall_score}/100"
-    echo ""
-    echo "🔍 AUDIT: https://acegrowth.net/demos/$slug/growth-audit.html"
-    echo "🎨 DEMO:  https://acegrowth.net/demos/$slug/"
-    echo ""
-    echo "📋 KEY TALKING POINTS:"
-    echo "$issues" | while IFS= read -r issue; do
-        [ -n "$issue" ] && echo "  • $issue"
-    done
-    echo ""
-    echo "💰 REVENUE IMPACT:"
-    echo "  • Losing an estimated $lost_leads leads per month"
-    echo "  • Potential annual revenue lost: $annual_lost"
-    echo "  • Fixing these issues = more calls, more customers"
-    echo ""
-    echo -e "${BOLD}Ready to call. Go get it. ♠️${NC}"
+    python3 "$BRIEF" "$RESEARCH_FILE" "$AUDIT_FILE" -o "$BUILD_DIR/call-brief.txt"
     echo ""
     echo -e "${BOLD}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
+}
 
-    # Save brief
-    if [ -d "$DEPLOY_ROOT/$slug" ]; then
-        cat > "$DEPLOY_ROOT/$slug/call-brief.txt" << BRIEF
-♠️ PROSPECT READY: $biz_name
+# ──────────────────────────────────────
+# Phase 5: Deploy
+# Publishes the pages this run built (or found fresh) as a new
+# release (see prospect_deploy.py); pages it skipped, e.g. the demo
+# on --audit-only, carry over from the live release. Goes live in
+# one rename
+# ──────────────────────────────────────
 
-📞 Phone: $phone
-📧 Email: $email
-📍 Address: $address
-🌐 Website: $website
-📊 Score: ${overall_score}/100
+deploy() {
+    log_step "DEPLOYING TO PRODUCTION"
 
-🔍 AUDIT: https://acegrowth.net/demos/$slug/growth-audit.html
-🎨 DEMO:  https://acegrowth.net/demos/$slug/
+    local biz_name slug
+    biz_name=$(jq -r '.businessName' "$RESEARCH_FILE")
+    slug=$(slugify "$biz_name")
 
-📋 KEY TALKING POINTS:
-$(echo "$issues" | while IFS= read -r issue; do [ -n "$issue" ] && echo "  • $issue"; done)
+    # Placeholder names (the site couldn't be fetched) would all deploy over
+    # the same demos/<slug>/
+    case "$slug" in
+        ""|unknown|unknown-business)
+            log_err "No business name to deploy under (would be demos/$slug/) — run by name instead"
+            return 1 ;;
+    esac
+
+    # The build dir outlives the run, so a page left by an earlier
+    # run (built from older data) is never picked up here
+    local artifacts=()
+    if [ "$AUDIT_READY" = true ]; then
+        artifacts+=("growth-audit.html=$AUDIT_HTML")
+    elif [ "$DEMO_ONLY" = false ]; then
+        log_warn "Audit HTML not found for deployment"
+    fi
 
-💰 REVENUE IMPACT:
-  • Losing an estimated $lost_leads leads per month
-  • Potential annual revenue lost: $annual_lost
+    if [ "$DEMO_READY" = true ]; then
+        artifacts+=("index.html=$BUILD_DIR/demo-site/index.html")
+    elif [ "$AUDIT_ONLY" = false ]; then
+        log_warn "Demo site not found for deployment"
+    fi
+
+    [ -f "$BUILD_DIR/call-brief.txt" ] && artifacts+=("call-brief.txt=$BUILD_DIR/call-brief.txt")
 
-Ready to call. Go get it. ♠️
-BRIEF
-        chmod 644 "$DEPLOY_ROOT/$slug/call-brief.txt"
+    if [ ${#artifacts[@]} -eq 0 ]; then
+        log_err "Nothing to deploy"
+        return 1
     fi
+    if ! python3 "$DEPLOYER" --root "$DEPLOY_ROOT" deploy "$slug" "${artifacts[@]}" 2>&1 | sed 's/^/  /'; then
+        log_err "Deploy failed — the live pages were not changed"
+        return 1
+    fi
+
+    echo ""
+    echo -e "  ${GREEN}🌐 Audit: https://acegrowth.net/demos/$slug/growth-audit.html${NC}"
+    echo -e "  ${GREEN}🌐 Demo:  https://acegrowth.net/demos/$slug/${NC}"
 }
 
 # ──────────────────────────────────────
@@ -388,35 +445,53 @@ main() {
     parse_input "$@"
     check_deps
     mkdir -p "$TMP_DIR"
+    case "${PROSPECT_METRICS:-}" in
+        ""|0|off) unset PROSPECT_METRICS ;;
+        *)  mkdir -p "$(dirname "$PROSPECT_METRICS")"
+            export PROSPECT_METRICS_RUN="$(date +%Y%m%dT%H%M%S)-$$" ;;
+    esac
+    setup_build_dir
 
     # Phase 1: Fetch
+    phase_begin fetch
     if [ -n "$WEBSITE_URL" ]; then
         fetch_website "$WEBSITE_URL"
     else
         research_by_name "$BUSINESS_SEARCH_NAME" "$BUSINESS_CITY"
     fi
+    phase_end fetch "$HTML_FILE"
 
     # Analysis: research + audit JSON + site config (all in Python)
+    phase_begin analyze
     run_analysis
+    phase_end analyze "$HTML_FILE"
 
     # Phase 2: Audit HTML
     if [ "$DEMO_ONLY" = false ]; then
+        phase_begin audit-html
         generate_audit_html
+        phase_end audit-html "$AUDIT_HTML"
     fi
 
     # Phase 3: Demo site
     if [ "$AUDIT_ONLY" = false ]; then
+        phase_begin demo-site
         generate_demo_site
+        phase_end demo-site "$BUILD_DIR/demo-site/index.html"
     fi
 
-    # Phase 4: Deploy
+    # Phase 4: Brief
+    phase_begin brief
+    output_brief
+    phase_end brief
+
+    # Phase 5: Deploy
     if [ "$DO_DEPLOY" = true ]; then
+        phase_begin deploy
         deploy
+        phase_end deploy
     fi
 
-    # Phase 5: Brief
-    output_brief
-
     # Copy to /tmp for reference
     cp "$RESEARCH_FILE" /tmp/prospect-research.json 2>/dev/null || true
     cp "$AUDIT_FILE" /tmp/prospect-audit.json 2>/dev/null || true
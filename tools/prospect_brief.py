@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Call Brief
+
+The call brief for a prospect, from its research and audit JSON: contact
+details, score, the demo links, the top talking points and the revenue
+impact. prospect-pipeline.sh and prospect_orchestrator.py both write it with
+this, and deploy publishes it next to the pages as call-brief.txt.
+
+Usage:
+  python3 prospect_brief.py research.json audit.json               # print it
+  python3 prospect_brief.py research.json audit.json -o call-brief.txt
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from prospect_store import slugify
+
+
+# Talking points: the top issue of each of the first few categories that has one
+TALKING_POINTS = 3
+
+
+def field(data, key, default):
+    value = data.get(key)
+    return default if value is None else value
+
+
+def read_json(path):
+    """The JSON object at `path`, or {} if it's missing or unreadable (defaults fill in)."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def call_brief(research, audit):
+    """The brief's text."""
+    biz_name = field(research, "businessName", "Unknown")
+    slug = slugify(biz_name)
+    issues = [c["issues"][0] for c in audit.get("categories", []) if c.get("issues")][:TALKING_POINTS]
+    impact = audit.get("revenueImpact") or {}
+    talking_points = "\n".join(f"  • {issue}" for issue in issues) or "  • Issues analysis pending"
+    return f"""♠️ PROSPECT READY: {biz_name}
+
+📞 Phone: {field(research, "phone", "Not found")}
+📧 Email: {field(research, "email", "Not found")}
+📍 Address: {field(research, "address", "Not found")}
+🌐 Website: {field(research, "url", "")}
+📊 Score: {field(audit, "overallScore", "?")}/100
+
+🔍 AUDIT: https://acegrowth.net/demos/{slug}/growth-audit.html
+🎨 DEMO:  https://acegrowth.net/demos/{slug}/
+
+📋 KEY TALKING POINTS:
+{talking_points}
+
+💰 REVENUE IMPACT:
+  • Losing an estimated {field(impact, "lostLeadsPerMonth", "10-25")} leads per month
+  • Potential annual revenue lost: {field(impact, "annualRevenueLost", "$100K+")}
+
+Ready to call. Go get it. ♠️
+"""
+
+
+def write_brief(path, text):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Call Brief")
+    parser.add_argument("research", help="Research JSON")
+    parser.add_argument("audit", help="Audit JSON")
+    parser.add_argument("-o", "--out", default=None, help="Also save the brief here")
+    args = parser.parse_args()
+
+    text = call_brief(read_json(args.research), read_json(args.audit))
+    if args.out:
+        write_brief(args.out, text)
+    sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Prospect Cache
+
+Persistent on-disk cache shared by prospect_fetch.py and prospect-analyzer.py,
+so re-running the pipeline on a prospect we've already seen is nearly free.
+
+Layout under the cache root:
+  pages/<url-key>.json     — per normalized URL: ETag, Last-Modified, content hash
+  blobs/<sha256>.html      — raw page bodies, content-addressed
+  results/<fingerprint>.json — analyzer stage results, keyed by stage fingerprint
+                             (inputs, code version, params; see prospect_stages.py)
+
+Entries expire after a TTL, and the whole cache is kept under a size budget
+by evicting least-recently-used files first. Every write is a temp file +
+rename, so concurrent pipeline runs and batch workers can share one root.
+
+Usage:
+  python3 prospect_cache.py stats
+  python3 prospect_cache.py prune [--ttl-days N] [--max-mb N]
+  python3 prospect_cache.py clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/ace-growth/prospects")
+DEFAULT_TTL = 14 * 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+SUBDIRS = ("pages", "blobs", "results")
+
+
+def cache_dir_from_env():
+    """The cache root from PROSPECT_CACHE_DIR, or None when caching is off."""
+    value = os.environ.get("PROSPECT_CACHE_DIR", "")
+    return None if value in ("", "0", "off") else os.path.expanduser(value)
+
+
+def normalize_url(url):
+    """Canonical form of a URL for cache keys.
+
+    Lowercases scheme and host, drops default ports, fragments and empty
+    paths, and sorts query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != {"http": 80, "https": 443}.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def content_hash(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    return hashlib.sha256(data).hexdigest()
+
+
+class ProspectCache:
+    def __init__(self, root=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        for sub in SUBDIRS:
+            os.makedirs(os.path.join(root, sub), exist_ok=True)
+
+    # -- files --
+
+    def _path(self, sub, name):
+        return os.path.join(self.root, sub, name)
+
+    def _write(self, path, data):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _read(self, path):
+        """Read a live entry and mark it used; expired entries read as missing."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        now = time.time()
+        if self.ttl and now - st.st_mtime > self.ttl:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        # atime is the LRU clock; many mounts don't update it on read
+        try:
+            os.utime(path, (now, st.st_mtime))
+        except OSError:
+            pass
+        return data
+
+    # -- pages --
+
+    def _page_key(self, url):
+        return content_hash(normalize_url(url))[:32] + ".json"
+
+    def get_page(self, url):
+        """Cached page for url: dict with body, etag, lastModified, contentHash, status."""
+        raw = self._read(self._path("pages", self._page_key(url)))
+        if raw is None:
+            return None
+        try:
+            meta = json.loads(raw)
+        except ValueError:
+            return None
+        body = self._read(self._path("blobs", meta["contentHash"] + ".html"))
+        if body is None:
+            return None
+        meta["body"] = body
+        return meta
+
+    def put_page(self, url, body, status=200, etag=None, last_modified=None):
+        """Store a fetched page; returns its content hash."""
+        digest = content_hash(body)
+        blob = self._path("blobs", digest + ".html")
+        if os.path.exists(blob):
+            os.utime(blob)
+        else:
+            self._write(blob, body)
+        meta = {
+            "url": normalize_url(url),
+            "status": status,
+            "etag": etag,
+            "lastModified": last_modified,
+            "contentHash": digest,
+            "fetchedAt": time.time(),
+        }
+        self._write(self._path("pages", self._page_key(url)), json.dumps(meta).encode())
+        return digest
+
+    def touch_page(self, url):
+        """A successful revalidation (HTTP 304) renews the entry's TTL."""
+        meta = self.get_page(url)
+        if meta:
+            for path in (self._path("pages", self._page_key(url)),
+                         self._path("blobs", meta["contentHash"] + ".html")):
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+
+    # -- analyzer results --
+
+    def get_result(self, key):
+        raw = self._read(self._path("results", key + ".json"))
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def put_result(self, key, data):
+        self._write(self._path("results", key + ".json"), json.dumps(data).encode())
+
+    # -- eviction --
+
+    def _entries(self):
+        for sub in SUBDIRS:
+            with os.scandir(os.path.join(self.root, sub)) as it:
+                for entry in it:
+                    if entry.is_file():
+                        yield entry.path, entry.stat()
+
+    def prune(self):
+        """Drop expired entries, then least-recently-used ones until under max_bytes.
+
+        Returns (files_removed, bytes_remaining).
+        """
+        now = time.time()
+        live = []
+        removed = 0
+        for path, st in self._entries():
+            expired = self.ttl and now - st.st_mtime > self.ttl
+            stale_tmp = os.path.basename(path).startswith(".tmp-") and now - st.st_mtime > 3600
+            if expired or stale_tmp:
+                removed += self._unlink(path)
+            else:
+                live.append((max(st.st_atime, st.st_mtime), st.st_size, path))
+
+        total = sum(size for _, size, _ in live)
+        if self.max_bytes and total > self.max_bytes:
+            live.sort()
+            for _, size, path in live:
+                if total <= self.max_bytes:
+                    break
+                if self._unlink(path):
+                    removed += 1
+                    total -= size
+        return removed, total
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.unlink(path)
+            return 1
+        except OSError:
+            return 0
+
+    def stats(self):
+        counts = {sub: 0 for sub in SUBDIRS}
+        total = 0
+        for path, st in self._entries():
+            counts[os.path.basename(os.path.dirname(path))] += 1
+            total += st.st_size
+        return counts, total
+
+    def clear(self):
+        for sub in SUBDIRS:
+            shutil.rmtree(os.path.join(self.root, sub), ignore_errors=True)
+            os.makedirs(os.path.join(self.root, sub), exist_ok=True)
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Prospect Cache")
+    parser.add_argument("command", choices=["stats", "prune", "clear"])
+    parser.add_argument("--cache-dir", default=cache_dir_from_env() or DEFAULT_CACHE_DIR,
+                        help="Cache root (default: $PROSPECT_CACHE_DIR or ~/.cache/ace-growth/prospects)")
+    parser.add_argument("--ttl-days", type=float, default=DEFAULT_TTL / 86400, help="Entry lifetime in days")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_BYTES / 2**20, help="Total size budget in MB")
+    args = parser.parse_args()
+
+    cache = ProspectCache(args.cache_dir, ttl=args.ttl_days * 86400, max_bytes=int(args.max_mb * 2**20))
+    if args.command == "prune":
+        removed, total = cache.prune()
+        print(f"  ✅ Pruned {removed} files, {total / 2**20:.1f} MB left")
+    elif args.command == "clear":
+        cache.clear()
+        print(f"  ✅ Cleared {args.cache_dir}")
+    counts, total = cache.stats()
+    print(f"  {args.cache_dir}: {counts['pages']} pages, {counts['blobs']} blobs, "
+          f"{counts['results']} results, {total / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Analyzer Client
+
+Runs prospect-analyzer.py through its resident worker (`prospect-analyzer.py
+serve`) when one is listening, and as a normal cold run when not: same
+arguments, same output, same exit status. The worker is found at
+PROSPECT_ANALYZER_SOCKET (default ~/.cache/ace-growth/analyzer.sock; "off"
+always runs cold). A worker whose code has changed since it started answers
+"stale", and the run falls back to cold too.
+
+Only the standard library's socket/json are imported here, so a served run
+costs a bare interpreter start plus the analysis itself.
+
+Usage:
+  python3 prospect_client.py --html page.html --research-out r.json ...   # any analyzer arguments
+  python3 prospect_client.py --ping                                        # is a worker up?
+"""
+
+import json
+import os
+import socket
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYZER = os.path.join(TOOLS_DIR, "prospect-analyzer.py")
+DEFAULT_SOCKET = "~/.cache/ace-growth/analyzer.sock"
+
+# A live worker accepts at once; anything slower means it's wedged
+CONNECT_TIMEOUT = 2.0
+
+
+def socket_path_from_env():
+    """The worker socket from PROSPECT_ANALYZER_SOCKET, or None when it's off."""
+    value = os.environ.get("PROSPECT_ANALYZER_SOCKET", "")
+    if value in ("0", "off"):
+        return None
+    return os.path.expanduser(value or DEFAULT_SOCKET)
+
+
+def request(path, payload, timeout=None):
+    """Send one request to the worker at `path`; its response, or None if no worker answered."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(path)
+            sock.settimeout(timeout)
+            sock.sendall((json.dumps(payload) + "\n").encode())
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError:
+        return None
+    try:
+        return json.loads(line) if line else None
+    except ValueError:
+        return None
+
+
+def run_cold(argv):
+    """Replace this process with a cold prospect-analyzer.py run."""
+    sys.stdout.flush()
+    os.execv(sys.executable, [sys.executable, ANALYZER] + argv)
+
+
+def main():
+    argv = sys.argv[1:]
+    path = socket_path_from_env()
+    if argv == ["--ping"]:
+        response = request(path, {"op": "ping"}, timeout=CONNECT_TIMEOUT) if path else None
+        if not response:
+            print(f"  ⚠️ No analyzer worker on {path or '(socket off)'}")
+            sys.exit(1)
+        state = "stale — restart it" if response.get("stale") else "ready"
+        print(f"  ✅ Analyzer worker {response['pid']} on {path}: {state}, "
+              f"{response['workers']} workers, {response['served']} served")
+        return
+
+    response = None
+    # Batch runs bring their own process pool; only single pages are served
+    if path and "--batch" not in argv and os.path.exists(path):
+        env = {k: v for k, v in os.environ.items() if k.startswith("PROSPECT_")}
+        response = request(path, {"id": os.getpid(), "argv": argv, "cwd": os.getcwd(), "env": env})
+    if not response or response.get("stale") or "exit" not in response:
+        run_cold(argv)
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(response.get("stderr", ""))
+    sys.exit(response["exit"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Prospect Cohorts
+
+Scores every prospect in the store at once and ranks each against the others
+like it. The site checks SCORE_RUBRIC reads are loaded into one int32 column
+per check; each category score is then a handful of vectorized passes over
+the whole corpus instead of a loop per prospect, so re-scoring tens of
+thousands of prospects after a rubric change takes milliseconds. The numbers
+are the same ones prospect-analyzer.py's score_categories() gives one at a
+time.
+
+A prospect's cohort is the others in its industry and city, or its whole
+industry when the city has fewer than MIN_COHORT of them. The analyzer's
+--cohort-benchmarks puts where a site ranks ("bottom 20% of Indianapolis
+roofers") into its audit.
+
+Needs NumPy (pip install numpy); nothing else in the pipeline does.
+
+Usage:
+  python3 prospect_cohort.py rescore                      # score the corpus, time it
+  python3 prospect_cohort.py rescore --write              # ...and update the stored scores
+  python3 prospect_cohort.py percentiles --industry roofing
+  python3 prospect_cohort.py benchmark acme-roofing
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+from prospect_store import CATEGORY_COLUMNS, DEFAULT_DB, ProspectStore, db_path_from_env
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYZER = os.path.join(TOOLS_DIR, "prospect-analyzer.py")
+
+# Fewest other prospects a ranking is made against
+MIN_COHORT = 10
+
+# Checks that aren't in siteChecks, as SQL over the stored row (see scoring_checks())
+DERIVED_CHECKS = {
+    "hasMetaDescription": "COALESCE(json_extract(research, '$.metaDescription'), '') "
+                          "NOT IN ('', 'No meta description found')",
+}
+
+# Industry → what its businesses are called in a ranking
+INDUSTRY_NOUNS = {
+    "real_estate": "real estate agents",
+    "plumbing": "plumbers",
+    "electrical": "electricians",
+    "roofing": "roofers",
+    "hvac": "HVAC companies",
+    "cleaning": "cleaning companies",
+    "landscaping": "landscapers",
+    "painting": "painters",
+    "auto": "auto shops",
+    "dental": "dental practices",
+    "legal": "law firms",
+    "wraps": "wrap shops",
+    "remodeling": "remodelers",
+    "moving": "movers",
+    "pest": "pest control companies",
+    "insurance": "insurance agencies",
+}
+
+
+def rubric_checks(rubric):
+    """Every check a rubric reads, in first-use order."""
+    names = {}
+    for _, _, rules in rubric:
+        for rule in rules:
+            for tier in rule:
+                names.setdefault(tier[1], None)
+    return list(names)
+
+
+def load_rubric():
+    """(SCORE_RUBRIC, MAX_CATEGORY_SCORE) from prospect-analyzer.py."""
+    sys.path.insert(0, TOOLS_DIR)
+    spec = importlib.util.spec_from_file_location("prospect_analyzer", ANALYZER)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules.setdefault(spec.name, module)
+    spec.loader.exec_module(module)
+    return module.SCORE_RUBRIC, module.MAX_CATEGORY_SCORE
+
+
+def rank_phrase(fraction):
+    """"bottom 20%" / "top 5%" for the share of a cohort scoring below."""
+    if fraction < 0.5:
+        return f"bottom {max(5, math.ceil(fraction * 20) * 5)}%"
+    return f"top {max(5, math.ceil((1 - fraction) * 20) * 5)}%"
+
+
+def cohort_label(industry, city):
+    noun = INDUSTRY_NOUNS.get(industry, "local businesses")
+    return f"{city} {noun}" if city else f"{noun} we've analyzed"
+
+
+# ──────────────────────────────────────
+# Cohort
+# ──────────────────────────────────────
+
+class Cohort:
+    """Every stored prospect's checks as columns, scored by one rubric."""
+
+    def __init__(self, sites, slugs, industries, cities, checks, stored, rubric, max_score):
+        self.sites = sites      # the store's keys (prospect_store.site_key())
+        self.slugs = slugs
+        self.industries = industries
+        self.cities = cities
+        self.city_keys = np.char.lower(cities)
+        self.checks = checks    # {check: int32 array}
+        self.stored = stored    # {score column: int32 array, -1 where unscored}
+        self.rubric = rubric
+        self.max_score = max_score
+        self._scores = None
+
+    def __len__(self):
+        return len(self.slugs)
+
+    @classmethod
+    def load(cls, db, rubric, max_score):
+        """The prospects in `db`, from a snapshot beside it while the store is unchanged."""
+        names = rubric_checks(rubric)
+        score_columns = ["overall_score", *CATEGORY_COLUMNS.values()]
+        conn = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+        try:
+            count, latest = conn.execute("SELECT COUNT(*), MAX(analyzed_at) FROM prospects").fetchone()
+            key = json.dumps([count, latest, names])
+            snapshot = db + ".cohort.npz"
+            try:
+                with np.load(snapshot) as saved:
+                    if str(saved["key"]) == key:
+                        return cls(saved["site"], saved["slug"], saved["industry"], saved["city"],
+                                   {n: saved["check:" + n] for n in names},
+                                   {c: saved["score:" + c] for c in score_columns}, rubric, max_score)
+            except (OSError, KeyError, ValueError):
+                pass
+            exprs = [DERIVED_CHECKS.get(n) or f"COALESCE(json_extract(checks, '$.{n}'), 0)" for n in names]
+            rows = conn.execute(
+                "SELECT site, slug, COALESCE(industry, 'general'), COALESCE(city, ''), "
+                + ", ".join(f"COALESCE({c}, -1)" for c in score_columns) + ", "
+                + ", ".join(exprs) + " FROM prospects ORDER BY site").fetchall()
+        finally:
+            conn.close()
+        columns = list(zip(*rows)) or [()] * (4 + len(score_columns) + len(names))
+        sites, slugs, industries, cities = (np.array(c, dtype=str) for c in columns[:4])
+        stored = {c: np.array(v, dtype=np.int32) for c, v in zip(score_columns, columns[4:])}
+        checks = {n: np.array(v, dtype=np.int32) for n, v in zip(names, columns[4 + len(score_columns):])}
+        try:
+            np.savez(snapshot, key=key, site=sites, slug=slugs, industry=industries, city=cities,
+                     **{"check:" + n: v for n, v in checks.items()},
+                     **{"score:" + c: v for c, v in stored.items()})
+        except OSError:
+            pass
+        return cls(sites, slugs, industries, cities, checks, stored, rubric, max_score)
+
+    def holds(self, tier):
+        """Where a rubric tier holds: flag set, or counter over its threshold."""
+        values = self.checks[tier[1]]
+        return values > tier[2] if len(tier) == 3 else values != 0
+
+    def scores(self):
+        """{category: int32 array} plus "overall", for every prospect."""
+        if self._scores is None:
+            scores = {}
+            for category, base, rules in self.rubric:
+                total = np.full(len(self), base, dtype=np.int32)
+                for rule in rules:
+                    # First tier that holds wins, as in score_categories()
+                    total += np.select([self.holds(t) for t in rule], [t[0] for t in rule], 0).astype(np.int32)
+                scores[category] = np.minimum(total, self.max_score)
+            scores["overall"] = sum(scores[c] for c, _, _ in self.rubric) * 2
+            self._scores = scores
+        return self._scores
+
+    def changed(self):
+        """Indexes of prospects whose stored scores differ from the rubric's."""
+        scores = self.scores()
+        differs = self.stored["overall_score"] != scores["overall"]
+        for name, column in CATEGORY_COLUMNS.items():
+            differs |= self.stored[column] != scores[name]
+        return np.flatnonzero(differs)
+
+    def members(self, industry, city=None, exclude=None):
+        """Mask of the prospects in an industry (and city), less the `exclude` site."""
+        mask = self.industries == industry
+        if city:
+            mask &= self.city_keys == city.lower()
+        if exclude:
+            mask &= self.sites != exclude
+        return mask
+
+    def cohort_for(self, industry, city=None, exclude=None):
+        """(mask, city) of the ranking cohort: the city's when big enough, else the industry's.
+        None when neither has MIN_COHORT prospects."""
+        for where in ([city] if city else []) + [None]:
+            mask = self.members(industry, where, exclude)
+            if np.count_nonzero(mask) >= MIN_COHORT:
+                return mask, where
+        return None
+
+    def benchmarks(self, scores, industry, city=None, exclude=None):
+        """Where one prospect's {category: score} ranks in its cohort, for generate_audit(),
+        or None when the cohort is too small to say."""
+        found = self.cohort_for(industry, city, exclude)
+        if not found:
+            return None
+        mask, where = found
+        label = cohort_label(industry, where)
+        size = int(np.count_nonzero(mask))
+        everyone = self.scores()
+
+        def standing(value, column):
+            # Share scoring below, ties counted half
+            peers = column[mask]
+            return (np.count_nonzero(peers < value) + np.count_nonzero(peers == value) / 2) / size
+
+        overall = sum(scores.values()) * 2
+        rank = standing(overall, everyone["overall"])
+        median = int(np.median(everyone["overall"][mask]))
+        categories = {}
+        for name in scores:
+            categories[name] = (f"You're in the {rank_phrase(standing(scores[name], everyone[name]))} "
+                                f"of {label} here (median {int(np.median(everyone[name][mask]))}/10).")
+        return {
+            "cohort": {"industry": industry, "city": where, "size": size,
+                       "percentile": round(rank * 100), "median": median},
+            "overall": (f"Your site scores {overall}/100 — {rank_phrase(rank)} of the {size} {label} "
+                        f"(median {median}/100)."),
+            "categories": categories,
+        }
+
+    def percentiles(self, industry=None, city=None, points=(20, 50, 80)):
+        """[(industry, city, prospects, [overall score at each point])], largest group first."""
+        mask = np.ones(len(self), dtype=bool)
+        if industry:
+            mask &= self.industries == industry
+        if city:
+            mask &= self.city_keys == city.lower()
+        overall = self.scores()["overall"][mask]
+        groups, inverse = np.unique(np.char.add(np.char.add(self.industries[mask], "\t"), self.city_keys[mask]),
+                                    return_inverse=True)
+        # Sorted by group then score, each group's scores are one contiguous run
+        order = np.lexsort((overall, inverse))
+        bounds = np.searchsorted(inverse[order], np.arange(len(groups) + 1))
+        rows = []
+        for g, group in enumerate(groups):
+            run = overall[order[bounds[g]:bounds[g + 1]]]
+            ind, cty = str(group).split("\t")
+            rows.append((ind, cty.title(), len(run), [int(v) for v in np.percentile(run, points, method="lower")]))
+        return sorted(rows, key=lambda r: -r[2])
+
+
+def write_scores(db, cohort, rows):
+    """Store the rubric's scores for the prospects at `rows` in one transaction."""
+    scores = cohort.scores()
+    columns = ["overall_score", *CATEGORY_COLUMNS.values()]
+    arrays = [scores["overall"], *(scores[name] for name in CATEGORY_COLUMNS)]
+    updates = zip(*(a[rows].tolist() for a in arrays), cohort.sites[rows].tolist())
+    conn = sqlite3.connect(db, timeout=30)
+    try:
+        with conn:
+            conn.executemany(f"UPDATE prospects SET {', '.join(f'{c} = ?' for c in columns)} WHERE site = ?",
+                             updates)
+    finally:
+        conn.close()
+    # Scores aren't part of the snapshot key, so the snapshot goes
+    try:
+        os.remove(db + ".cohort.npz")
+    except OSError:
+        pass
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Prospect Cohorts")
+    parser.add_argument("--db", default=db_path_from_env() or DEFAULT_DB,
+                        help="Database (default: $PROSPECT_DB or ~/.local/share/ace-growth/prospects.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rescore = sub.add_parser("rescore", help="Score every prospect with the analyzer's current rubric")
+    rescore.add_argument("--write", action="store_true", help="Update the stored scores that changed")
+
+    pct = sub.add_parser("percentiles", help="Overall score at the 20th/50th/80th percentile per industry and city")
+    pct.add_argument("--industry")
+    pct.add_argument("--city")
+
+    bench = sub.add_parser("benchmark", help="Where one stored prospect ranks in its cohort")
+    bench.add_argument("slug", help="Slug (the first prospect under it) or site, e.g. acmeroofing.com")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"  ❌ No prospect store at {args.db}")
+        sys.exit(1)
+    # Brings a store from an older release up to date before it's read
+    ProspectStore(args.db).close()
+    rubric, max_score = load_rubric()
+    started = time.perf_counter()
+    cohort = Cohort.load(args.db, rubric, max_score)
+    loaded = time.perf_counter()
+
+    if args.command == "rescore":
+        cohort.scores()
+        scored = time.perf_counter()
+        changed = cohort.changed()
+        print(f"  ✅ Scored {len(cohort)} prospects in {(scored - loaded) * 1000:.1f} ms "
+              f"(loaded in {(loaded - started) * 1000:.0f} ms); {len(changed)} differ from the store")
+        if args.write and len(changed):
+            write_scores(args.db, cohort, changed)
+            print(f"  ✅ Updated {len(changed)} stored scores")
+    elif args.command == "percentiles":
+        rows = cohort.percentiles(args.industry, args.city)
+        if not rows:
+            print("  No matching prospects.")
+        for industry, city, count, (p20, p50, p80) in rows:
+            print(f"  {industry:<14} {city or '—':<16} {count:>6} prospects   p20 {p20:>3}   median {p50:>3}   p80 {p80:>3}")
+    else:
+        hits = np.flatnonzero(cohort.sites == args.slug)
+        if not len(hits):
+            hits = np.flatnonzero(cohort.slugs == args.slug)
+        if not len(hits):
+            print(f"  ❌ No prospect {args.slug}")
+            sys.exit(1)
+        i = hits[0]
+        everyone = cohort.scores()
+        scores = {c: int(everyone[c][i]) for c, _, _ in rubric}
+        result = cohort.benchmarks(scores, str(cohort.industries[i]), str(cohort.cities[i]), exclude=str(cohort.sites[i]))
+        if not result:
+            print(f"  ⚠️ Fewer than {MIN_COHORT} other {cohort_label(str(cohort.industries[i]), None)} to rank against")
+            sys.exit(1)
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Demo Deploys
+
+Publishes a prospect's pages under DEPLOY_ROOT/<slug>/ as immutable releases.
+Every deploy is staged in a new release directory and then goes live in one
+rename, so a visitor sees either the old pages or the new ones, never half of
+each:
+
+  DEPLOY_ROOT/<slug>                            → symlink to the live release
+  DEPLOY_ROOT/.releases/<slug>/<release>/       pages, plus .gz/.br siblings
+  DEPLOY_ROOT/.releases/<slug>/manifest.json    releases, oldest first, with file hashes
+
+Artifacts are named explicitly (DEST=SRC). A file whose sha256 matches the live
+release is hard-linked rather than copied or recompressed, files not named are
+carried over from the live release, and a deploy that changes nothing is
+skipped. Text files get gzip siblings (and brotli ones when the brotli module
+is installed) for Caddy's `precompressed` file server. Deploys of one slug
+take a lock on it; different slugs deploy in parallel. Rolling back only
+repoints the symlink.
+
+Location: $PROSPECT_DEPLOY_ROOT, default /var/www/acemanagement.so/demos
+
+Usage:
+  python3 prospect_deploy.py deploy acme-roofing index.html=build/demo-site/index.html \\
+      growth-audit.html=build/growth-audit.html call-brief.txt=build/call-brief.txt
+  python3 prospect_deploy.py deploy-many deploys.jsonl --workers 8
+  python3 prospect_deploy.py releases acme-roofing
+  python3 prospect_deploy.py rollback acme-roofing [--to RELEASE]
+"""
+
+import argparse
+import contextlib
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import re
+import secrets
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+DEFAULT_ROOT = "/var/www/acemanagement.so/demos"
+RELEASES = ".releases"
+MANIFEST = "manifest.json"
+
+# Releases kept per slug, the live one included
+KEEP = 5
+
+# Precompressed siblings are written for these, when it saves at least 10%
+COMPRESSIBLE = {".html", ".htm", ".css", ".js", ".json", ".svg", ".txt", ".xml"}
+MIN_COMPRESS = 256
+
+SLUG_RE = re.compile(r"^[a-z0-9][a-z0-9-]*$")
+
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+RED = "\033[0;31m"
+NC = "\033[0m"
+
+
+def deploy_root_from_env():
+    """The deploy root from PROSPECT_DEPLOY_ROOT, or the production default."""
+    return os.path.expanduser(os.environ.get("PROSPECT_DEPLOY_ROOT") or DEFAULT_ROOT)
+
+
+# ──────────────────────────────────────
+# Files
+# ──────────────────────────────────────
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def check_dest(name):
+    """A release-relative path: no absolute paths, no '..', no sibling suffixes."""
+    parts = name.split("/")
+    if (not name or name.startswith("/") or any(p in ("", ".", "..") for p in parts)
+            or name.endswith((".gz", ".br")) or name == MANIFEST):
+        raise ValueError(f"invalid deploy path: {name!r}")
+    return name
+
+
+def siblings(name):
+    return [name + ".gz", name + ".br"]
+
+
+def write_file(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.chmod(path, 0o644)
+
+
+def precompress(path):
+    """Write gzip (and brotli) siblings of a text file; returns the ones written."""
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE:
+        return []
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < MIN_COMPRESS:
+        return []
+    written = []
+    encoders = [(".gz", lambda d: gzip.compress(d, 9, mtime=0))]
+    if brotli is not None:
+        encoders.append((".br", lambda d: brotli.compress(d, quality=11)))
+    for suffix, encode in encoders:
+        packed = encode(data)
+        if len(packed) <= len(data) * 0.9:
+            write_file(path + suffix, packed)
+            written.append(suffix)
+    return written
+
+
+def fsync_dir(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# ──────────────────────────────────────
+# Releases
+# ──────────────────────────────────────
+
+class Deployer:
+    """Releases for every slug under one deploy root."""
+
+    def __init__(self, root, keep=KEEP):
+        self.root = os.path.abspath(root)
+        self.keep = keep
+
+    def slug_dir(self, slug):
+        return os.path.join(self.root, RELEASES, slug)
+
+    def live_path(self, slug):
+        return os.path.join(self.root, slug)
+
+    @contextlib.contextmanager
+    def locked(self, slug):
+        """Serialize deploys and rollbacks of one slug, across processes and threads."""
+        if not SLUG_RE.match(slug):
+            raise ValueError(f"invalid slug: {slug!r}")
+        os.makedirs(self.slug_dir(slug), exist_ok=True)
+        with open(os.path.join(self.slug_dir(slug), ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # Manifest
+
+    def load_manifest(self, slug):
+        try:
+            with open(os.path.join(self.slug_dir(slug), MANIFEST)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"slug": slug, "current": None, "releases": []}
+
+    def save_manifest(self, slug, manifest):
+        path = os.path.join(self.slug_dir(slug), MANIFEST)
+        tmp = f"{path}.tmp-{os.getpid()}-{secrets.token_hex(3)}"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def current(self, manifest):
+        for release in manifest["releases"]:
+            if release["id"] == manifest["current"]:
+                return release
+        return None
+
+    def release_dir(self, slug, release_id):
+        return os.path.join(self.slug_dir(slug), release_id)
+
+    # Going live
+
+    def swap(self, slug, release_id):
+        """Point DEPLOY_ROOT/<slug> at a release: one rename over the old symlink."""
+        target = os.path.relpath(self.release_dir(slug, release_id), self.root)
+        tmp = os.path.join(self.root, f".{slug}.swap-{os.getpid()}-{secrets.token_hex(3)}")
+        os.symlink(target, tmp)
+        os.replace(tmp, self.live_path(slug))
+        fsync_dir(self.root)
+
+    def adopt_legacy(self, slug, manifest):
+        """Move a directory deployed in place (before releases) into a release of its own."""
+        live = self.live_path(slug)
+        if os.path.islink(live) or not os.path.isdir(live):
+            return
+        release_id = "legacy-" + time.strftime("%Y%m%dT%H%M%S")
+        files = {}
+        for dirpath, _, names in os.walk(live):
+            for name in names:
+                path = os.path.join(dirpath, name)
+                rel = os.path.relpath(path, live)
+                if not rel.endswith((".gz", ".br")):
+                    files[rel] = {"sha256": file_hash(path), "size": os.path.getsize(path)}
+        # Not a swap: the pages are briefly missing until the symlink is made
+        os.rename(live, self.release_dir(slug, release_id))
+        self.swap(slug, release_id)
+        manifest["releases"].append({"id": release_id, "time": time.time(), "files": files})
+        manifest["current"] = release_id
+        self.save_manifest(slug, manifest)
+
+    # Deploy / rollback
+
+    def deploy(self, slug, artifacts, replace=False):
+        """Publish {dest: source path} for a slug. Files not named stay as deployed
+        unless `replace`. Returns (release id or None when unchanged, written, reused)."""
+        artifacts = {check_dest(dest): src for dest, src in artifacts.items()}
+        for src in artifacts.values():
+            if not os.path.isfile(src):
+                raise FileNotFoundError(f"artifact not found: {src}")
+        hashes = {dest: file_hash(src) for dest, src in artifacts.items()}
+
+        with self.locked(slug):
+            manifest = self.load_manifest(slug)
+            self.adopt_legacy(slug, manifest)
+            live = self.current(manifest)
+            live_files = live["files"] if live else {}
+            files = {} if replace else dict(live_files)
+            files.update({dest: {"sha256": h, "size": os.path.getsize(artifacts[dest])}
+                          for dest, h in hashes.items()})
+            if live and files == live_files and os.path.islink(self.live_path(slug)):
+                return None, 0, len(files)
+
+            release_id = time.strftime("%Y%m%dT%H%M%S") + "-" + secrets.token_hex(3)
+            stage = os.path.join(self.slug_dir(slug), f".stage-{release_id}")
+            live_dir = self.release_dir(slug, live["id"]) if live else None
+            written = reused = 0
+            try:
+                for dest, meta in files.items():
+                    out = os.path.join(stage, dest)
+                    os.makedirs(os.path.dirname(out), exist_ok=True)
+                    if live_files.get(dest, {}).get("sha256") == meta["sha256"]:
+                        # Unchanged: share the live file and its siblings
+                        for rel in [dest] + siblings(dest):
+                            if os.path.exists(os.path.join(live_dir, rel)):
+                                os.link(os.path.join(live_dir, rel), os.path.join(stage, rel))
+                        reused += 1
+                        continue
+                    with open(artifacts[dest], "rb") as f:
+                        write_file(out, f.read())
+                    precompress(out)
+                    written += 1
+                for dirpath, _, _ in os.walk(stage):
+                    os.chmod(dirpath, 0o755)
+                fsync_dir(stage)
+                os.rename(stage, self.release_dir(slug, release_id))
+            except BaseException:
+                shutil.rmtree(stage, ignore_errors=True)
+                raise
+
+            self.swap(slug, release_id)
+            manifest["releases"].append({"id": release_id, "time": time.time(), "files": files})
+            manifest["current"] = release_id
+            self.prune(slug, manifest)
+            self.save_manifest(slug, manifest)
+        return release_id, written, reused
+
+    def rollback(self, slug, to=None):
+        """Make an earlier release live again (default: the one before the live one)."""
+        with self.locked(slug):
+            manifest = self.load_manifest(slug)
+            ids = [r["id"] for r in manifest["releases"]]
+            if to is None:
+                if manifest["current"] not in ids or ids.index(manifest["current"]) == 0:
+                    raise ValueError(f"no earlier release of {slug} to roll back to")
+                to = ids[ids.index(manifest["current"]) - 1]
+            if to not in ids or not os.path.isdir(self.release_dir(slug, to)):
+                raise ValueError(f"unknown release of {slug}: {to}")
+            self.swap(slug, to)
+            manifest["current"] = to
+            self.save_manifest(slug, manifest)
+        return to
+
+    def prune(self, slug, manifest):
+        """Drop all but the newest `keep` releases; the live one always stays."""
+        if self.keep <= 0:
+            return
+        releases = manifest["releases"]
+        stale = [r for r in releases[:-self.keep] if r["id"] != manifest["current"]]
+        for release in stale:
+            shutil.rmtree(self.release_dir(slug, release["id"]), ignore_errors=True)
+        manifest["releases"] = [r for r in releases if r not in stale]
+
+
+# ──────────────────────────────────────
+# Commands
+# ──────────────────────────────────────
+
+def parse_artifacts(specs):
+    artifacts = {}
+    for spec in specs:
+        dest, sep, src = spec.partition("=")
+        if not sep or not src:
+            raise ValueError(f"expected DEST=SRC, got {spec!r}")
+        artifacts[dest] = src
+    return artifacts
+
+
+def report(slug, result):
+    release_id, written, reused = result
+    if release_id is None:
+        print(f"{GREEN}✅ {slug}: unchanged — nothing to deploy{NC}")
+    else:
+        print(f"{GREEN}✅ {slug}: release {release_id} live ({written} updated, {reused} unchanged){NC}")
+
+
+def cmd_deploy(deployer, args):
+    try:
+        report(args.slug, deployer.deploy(args.slug, parse_artifacts(args.artifacts), args.replace))
+    except (OSError, ValueError) as e:
+        print(f"{RED}❌ {args.slug}: {e}{NC}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def read_deploys(path):
+    """Yield (line_no, job) from a deploy-many file; job is an error string for a bad line."""
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"bad JSON: {e}"
+                continue
+            if not isinstance(job, dict) or not isinstance(job.get("slug"), str) or not job["slug"]:
+                yield line_no, "needs a \"slug\""
+            elif (not isinstance(job.get("files"), dict) or not job["files"]
+                  or not all(isinstance(v, str) and v for v in job["files"].values())):
+                yield line_no, "needs \"files\": {dest: src}"
+            elif not isinstance(job.get("replace", False), bool):
+                yield line_no, "\"replace\" must be true or false"
+            else:
+                yield line_no, job
+
+
+def cmd_deploy_many(deployer, args):
+    """Deploy one slug per JSON line: {"slug": ..., "files": {dest: src}, "replace": false}.
+
+    Different slugs deploy in parallel; lines for the same slug deploy one
+    after another in file order, so the last one listed is what ends up live.
+    """
+    by_slug, failed, total = {}, 0, 0
+    for line_no, job in read_deploys(args.file):
+        total += 1
+        if isinstance(job, str):
+            print(f"{RED}❌ Line {line_no}: {job}{NC}")
+            failed += 1
+        else:
+            by_slug.setdefault(job["slug"], []).append((line_no, job))
+    if any(len(lines) > 1 for lines in by_slug.values()):
+        print(f"{YELLOW}⚠️  Same slug listed more than once — deployed in file order, later lines win{NC}")
+
+    def run(lines):
+        results = []
+        for line_no, job in lines:
+            try:
+                results.append((job["slug"], deployer.deploy(job["slug"], job["files"], job.get("replace", False)), None))
+            except (OSError, ValueError) as e:
+                results.append((job["slug"], None, e))
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for results in pool.map(run, by_slug.values()):
+            for slug, result, error in results:
+                if error:
+                    print(f"{RED}❌ {slug}: {error}{NC}")
+                    failed += 1
+                else:
+                    report(slug, result)
+    print(f"\n  {total - failed}/{total} deployed")
+    return 1 if failed else 0
+
+
+def cmd_releases(deployer, args):
+    manifest = deployer.load_manifest(args.slug)
+    if not manifest["releases"]:
+        print(f"No releases of {args.slug}")
+        return 1
+    for release in manifest["releases"]:
+        mark = "→" if release["id"] == manifest["current"] else " "
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(release["time"]))
+        print(f"  {mark} {release['id']}  {when}  {', '.join(sorted(release['files']))}")
+    return 0
+
+
+def cmd_rollback(deployer, args):
+    try:
+        release_id = deployer.rollback(args.slug, args.to)
+    except ValueError as e:
+        print(f"{RED}❌ {e}{NC}", file=sys.stderr)
+        return 1
+    print(f"{GREEN}✅ {args.slug}: rolled back to {release_id}{NC}")
+    return 0
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Demo Deploys")
+    parser.add_argument("--root", default=None,
+                        help="Deploy root (default: PROSPECT_DEPLOY_ROOT or /var/www/acemanagement.so/demos)")
+    parser.add_argument("--keep", type=int, default=KEEP,
+                        help=f"Releases kept per slug; 0 keeps all (default: {KEEP})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    deploy = sub.add_parser("deploy", help="Publish a slug's artifacts as a new release")
+    deploy.add_argument("slug")
+    deploy.add_argument("artifacts", nargs="+", metavar="DEST=SRC",
+                        help="Path in the release = file to publish")
+    deploy.add_argument("--replace", action="store_true",
+                        help="Drop files of the live release that aren't listed")
+    many = sub.add_parser("deploy-many", help="Deploy many slugs in parallel from a JSON lines file")
+    many.add_argument("file")
+    many.add_argument("--workers", type=int, default=8, help="Parallel deploys (default: 8)")
+    releases = sub.add_parser("releases", help="List a slug's releases")
+    releases.add_argument("slug")
+    rollback = sub.add_parser("rollback", help="Make an earlier release live")
+    rollback.add_argument("slug")
+    rollback.add_argument("--to", default=None, help="Release id (default: the previous one)")
+    args = parser.parse_args()
+
+    deployer = Deployer(args.root or deploy_root_from_env(), args.keep)
+    commands = {"deploy": cmd_deploy, "deploy-many": cmd_deploy_many,
+                "releases": cmd_releases, "rollback": cmd_rollback}
+    sys.exit(commands[args.command](deployer, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Prospect Fetcher
+
+Fetches everything Phase 1 of the pipeline needs, concurrently:
+  1. Domain guesses for a business name (.com/.net/.org/.biz), when there's no URL
+  2. The homepage, then a bounded crawl of the site: URLs from sitemap.xml
+     (or the sitemaps robots.txt lists) and internal links, contact/about/
+     service pages first, skipping what robots.txt disallows, until
+     --max-pages pages or --max-bytes bytes
+  3. Writes the page bundle that prospect-analyzer.py reads: each page after
+     a `<!-- ace-page: URL -->` line, homepage first, so every page is
+     analyzed as its own document
+
+Requests are in flight at once over pooled keep-alive connections; a site
+with neither a sitemap nor internal links falls back to the fixed
+about/contact/services guesses.
+
+A homepage that can't be fetched is replaced by a stub page ("Unknown
+Business") so the pipeline can go on with defaults; with --strict the
+fetcher exits 2 instead and writes nothing.
+
+Usage:
+  python3 prospect_fetch.py --url https://example.com --out website.html
+  python3 prospect_fetch.py --name "Business Name" --out website.html --url-out url.txt
+  python3 prospect_fetch.py --url https://example.com --out website.html --strict
+"""
+
+import argparse
+import asyncio
+import gzip
+import io
+import re
+import ssl
+import sys
+from html import unescape
+from urllib.parse import quote, urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+from prospect_cache import ProspectCache, cache_dir_from_env
+from prospect_metrics import metrics, metrics_path_from_env
+
+
+BROWSER_UA = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+PAGE_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+PROBE_UA = "curl/8.0"
+
+EXTRA_PAGES = ['about', 'about-us', 'contact', 'contact-us', 'services', 'our-services']
+NAME_SUFFIXES = ['.com', '.net', '.org', '.biz']
+NO_HYPHEN_SUFFIXES = ['.com', '.net', '.org']
+FOUND_CODES = (200, 301, 302)
+
+HOMEPAGE_TIMEOUT = 30
+PAGE_TIMEOUT = 15
+PROBE_TIMEOUT = 10
+MIN_HOMEPAGE_BYTES = 100
+MIN_PAGE_BYTES = 500
+MAX_REDIRECTS = 10
+
+UNKNOWN_HTML = b"<html><head><title>Unknown Business</title></head><body></body></html>\n"
+
+# Crawl budget: pages in the bundle (homepage included) and their total bytes
+MAX_PAGES = 12
+MAX_BYTES = 4 * 1024 * 1024
+# Bigger pages are dropped unread; the homepage is always kept up to
+# MAX_HOMEPAGE_BYTES (the analyzer streams oversized pages from disk)
+MAX_PAGE_BYTES = 1024 * 1024
+MAX_HOMEPAGE_BYTES = 32 * 1024 * 1024
+# Links are followed this many clicks from the homepage
+MAX_DEPTH = 2
+SITEMAP_URLS = 500          # <loc>s read from all sitemaps together
+CHILD_SITEMAPS = 3          # sitemaps followed from a sitemap index
+ROBOTS_AGENT = "AceGrowthBot"
+CRAWL_DELAY_CAP = 5.0       # seconds; a longer robots.txt Crawl-delay is capped
+
+PAGE_MARK = "<!-- ace-page: {} -->\n"
+
+
+class FetchError(Exception):
+    pass
+
+
+class BodyTooLarge(FetchError):
+    pass
+
+
+class SiteUnreachable(FetchError):
+    pass
+
+
+class Response:
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+# ──────────────────────────────────────
+# Pooled HTTP/1.1 client
+# ──────────────────────────────────────
+
+class Fetcher:
+    """Minimal asyncio HTTP/1.1 client with keep-alive pooling.
+
+    Idle connections are kept per (scheme, host, port) and reused. At most
+    `concurrency` requests are in flight overall and at most `per_host`
+    against any one host. Redirects are followed like curl -L, and any
+    response body is returned whatever the status (curl -o without -f).
+    """
+
+    def __init__(self, concurrency=16, per_host=4, ssl_context=None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts = {}
+        self._idle = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for conns in self._idle.values():
+            for _, writer in conns:
+                writer.close()
+        self._idle.clear()
+
+    async def get(self, url, timeout=PAGE_TIMEOUT, user_agent=PAGE_UA, headers=None, max_body=None):
+        """GET url following redirects; the timeout covers the whole chain.
+
+        A body longer than `max_body` bytes raises FetchError instead of being read.
+        """
+        return await asyncio.wait_for(self._get(url, user_agent, headers or {}, max_body), timeout)
+
+    async def _get(self, url, user_agent, headers, max_body):
+        for _ in range(MAX_REDIRECTS + 1):
+            resp = await self._request(url, user_agent, headers, max_body)
+            location = resp.headers.get('location')
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            return resp
+        raise FetchError(f"too many redirects: {url}")
+
+    async def _request(self, url, user_agent, headers, max_body=None):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise FetchError(f"unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        extra = ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        request = (f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {user_agent}\r\n"
+                   f"Accept: */*\r\n{extra}Connection: keep-alive\r\n\r\n").encode('latin-1')
+
+        if key not in self._hosts:
+            self._hosts[key] = asyncio.Semaphore(self.per_host)
+        async with self._global, self._hosts[key]:
+            # A pooled connection may have been closed by the server while idle;
+            # retry once on a fresh one before giving up
+            for attempt in range(2):
+                reader, writer, reused = await self._checkout(key)
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, headers, body, keep = await self._read_response(reader, max_body)
+                except (ConnectionError, asyncio.IncompleteReadError, FetchError) as e:
+                    writer.close()
+                    if reused and attempt == 0 and not isinstance(e, BodyTooLarge):
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep:
+                    self._idle.setdefault(key, []).append((reader, writer))
+                else:
+                    writer.close()
+                return Response(url, status, headers, body)
+
+    async def _checkout(self, key):
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        scheme, hostname, port = key
+        ctx = self.ssl_context if scheme == 'https' else None
+        reader, writer = await asyncio.open_connection(
+            hostname, port, ssl=ctx, server_hostname=hostname if ctx else None)
+        return reader, writer, False
+
+    @staticmethod
+    async def _read_response(reader, max_body=None):
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("connection closed before response")
+        m = re.match(rb'HTTP/(\d\.\d)\s+(\d{3})', line)
+        if not m:
+            raise FetchError(f"bad status line: {line[:80]!r}")
+        version, status = m.group(1), int(m.group(2))
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        conn = headers.get('connection', '').lower()
+        keep = conn != 'close' if version == b'1.1' else conn == 'keep-alive'
+
+        if status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            chunks, total = [], 0
+            while True:
+                size_line = await reader.readline()
+                if not size_line.endswith(b'\n'):
+                    # Closed before the last chunk: the body was cut short
+                    raise asyncio.IncompleteReadError(size_line, None)
+                try:
+                    size = int(size_line.split(b';')[0].strip(), 16)
+                except ValueError:
+                    raise FetchError(f"bad chunk size: {size_line[:40]!r}")
+                if size == 0:
+                    # Trailers, then the blank line
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                total += size
+                if max_body is not None and total > max_body:
+                    raise BodyTooLarge(f"body over {max_body} bytes")
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            if max_body is not None and length > max_body:
+                raise BodyTooLarge(f"body over {max_body} bytes")
+            body = await reader.readexactly(length)
+        else:
+            body = await reader.read(-1 if max_body is None else max_body + 1)
+            if max_body is not None and len(body) > max_body:
+                raise BodyTooLarge(f"body over {max_body} bytes")
+            keep = False
+        return status, headers, body, keep
+
+
+# ──────────────────────────────────────
+# Pipeline fetch stages
+# ──────────────────────────────────────
+
+async def _try_get(fetcher, url, timeout, user_agent, cache=None, max_body=None):
+    """GET url, or None if it can't be fetched (or is over `max_body` bytes).
+
+    With a cache, the request is conditional on the cached ETag/Last-Modified;
+    a 304 (or a failed fetch) returns the cached page instead.
+    """
+    cached = cache.get_page(url) if cache else None
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("lastModified"):
+            headers["If-Modified-Since"] = cached["lastModified"]
+    try:
+        resp = await fetcher.get(url, timeout=timeout, user_agent=user_agent, headers=headers,
+                                 max_body=max_body)
+    except (OSError, asyncio.TimeoutError, FetchError, ValueError, ssl.SSLError):
+        resp = None
+
+    if cached and (resp is None or resp.status == 304):
+        if resp is not None:
+            cache.touch_page(url)
+            # Where a redirect ended up, as on the fetch that was cached
+            return Response(resp.url, cached["status"], {}, cached["body"])
+        return Response(url, cached["status"], {}, cached["body"])
+    if resp is not None and cache:
+        cache.put_page(url, resp.body, resp.status,
+                       resp.headers.get('etag'), resp.headers.get('last-modified'))
+    return resp
+
+
+def domain_guesses(name):
+    """Candidate URLs for a business name, in the order they're preferred."""
+    lower = name.lower()
+    slug = re.sub(r'[^a-z0-9]+', '-', lower).strip('-')
+    no_hyphen = lower.replace(' ', '')
+    return ([f"https://{slug}{s}" for s in NAME_SUFFIXES] +
+            [f"https://{no_hyphen}{s}" for s in NO_HYPHEN_SUFFIXES])
+
+
+async def find_website(fetcher, name, log=print):
+    """Probe all domain guesses at once; the first guess (in order) that answers wins."""
+    guesses = domain_guesses(name)
+    tasks = [asyncio.ensure_future(_try_get(fetcher, url, PROBE_TIMEOUT, PROBE_UA)) for url in guesses]
+    try:
+        for url, task in zip(guesses, tasks):
+            resp = await task
+            if resp is not None and resp.status in FOUND_CODES:
+                log(f"  Found website: {url}")
+                return url
+    finally:
+        for task in tasks:
+            task.cancel()
+    return None
+
+
+# ──────────────────────────────────────
+# Site crawler
+# ──────────────────────────────────────
+
+HREF_RE = re.compile(rb'<a\s[^>]*?href\s*=\s*["\']([^"\'#]+)', re.IGNORECASE)
+LOC_RE = re.compile(rb'<loc>\s*([^<\s]+)\s*</loc>', re.IGNORECASE)
+SITEMAP_INDEX_RE = re.compile(rb'<sitemapindex', re.IGNORECASE)
+# Paths that hold no business info, or aren't pages at all
+SKIP_PATH_RE = re.compile(
+    r'/(wp-admin|wp-json|wp-content|wp-includes|feed|cart|checkout|my-account|login|tag|author|cdn-cgi)(/|$)'
+    r'|\.(pdf|jpe?g|png|gif|webp|svg|ico|css|js|json|xml|txt|zip|mp4|mp3|docx?|xlsx?)$', re.IGNORECASE)
+# Pages likeliest to hold contact details, services and reviews are fetched first
+PRIORITY_RE = re.compile(r'contact|about|service|review|testimonial|area|location|quote|estimate|'
+                         r'gallery|project', re.IGNORECASE)
+# ...and blog posts and archives last
+ARCHIVE_RE = re.compile(r'blog|news|post|article|categor|/\d{4}/', re.IGNORECASE)
+
+
+def site_key(host):
+    """A host without its www., so www and bare links are both internal."""
+    host = (host or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def page_key(url):
+    """One key per page: no fragment, lowercase host, no trailing slash."""
+    parts = urlsplit(url)
+    path = parts.path.rstrip('/') or '/'
+    return f"{parts.netloc.lower()}{path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def crawl_rank(url, depth):
+    """Crawl order: likely-useful pages, then fewer clicks deep, then shorter paths."""
+    path = urlsplit(url).path
+    priority = 0 if PRIORITY_RE.search(path) else 2 if ARCHIVE_RE.search(path) else 1
+    return (priority, depth, path.count('/'), len(path))
+
+
+def internal_links(body, page_url, site):
+    """Absolute URLs of the <a href>s in `body` that stay on `site`."""
+    for m in HREF_RE.finditer(body):
+        href = unescape(m.group(1).decode('utf-8', 'replace')).strip()
+        link = quote(urljoin(page_url, href), safe=":/?&=%@+,;~!$'()*")
+        parts = urlsplit(link)
+        if parts.scheme in ('http', 'https') and site_key(parts.hostname) == site:
+            yield link
+
+
+def is_page(resp):
+    """A 200 HTML response worth analyzing (cached pages carry no headers)."""
+    ctype = resp.headers.get('content-type', '').lower()
+    return resp.status == 200 and (not ctype or 'html' in ctype) and len(resp.body) > MIN_PAGE_BYTES
+
+
+async def read_robots(fetcher, base_url, cache=None):
+    """The site's robots.txt; one that allows everything when there's none."""
+    robots = RobotFileParser(f"{base_url}/robots.txt")
+    resp = await _try_get(fetcher, robots.url, PROBE_TIMEOUT, PAGE_UA, cache, MAX_PAGE_BYTES)
+    ok = resp is not None and resp.status == 200
+    robots.parse(resp.body.decode('utf-8', 'replace').splitlines() if ok else [])
+    return robots
+
+
+def _sitemap_body(body):
+    if body[:2] == b'\x1f\x8b':
+        try:
+            # Read at most the crawl budget, however far it would inflate
+            with gzip.GzipFile(fileobj=io.BytesIO(body)) as f:
+                return f.read(MAX_BYTES)
+        except (OSError, EOFError):
+            return b''
+    return body
+
+
+async def read_sitemaps(fetcher, urls, cache=None):
+    """Page URLs listed in the sitemaps at `urls`, following one level of sitemap index."""
+    pages = []
+    followed = False
+    while urls and len(pages) < SITEMAP_URLS:
+        responses = await asyncio.gather(*[_try_get(fetcher, url, PAGE_TIMEOUT, PAGE_UA, cache, MAX_PAGE_BYTES)
+                                           for url in urls])
+        children = []
+        for resp in responses:
+            if resp is None or resp.status != 200:
+                continue
+            body = _sitemap_body(resp.body)
+            locs = [unescape(m.group(1).decode('utf-8', 'replace')) for m in LOC_RE.finditer(body)]
+            if SITEMAP_INDEX_RE.search(body, 0, 4096):
+                children.extend(locs)
+            else:
+                pages.extend(locs)
+        if followed:
+            break
+        followed = True
+        # Page sitemaps before post archives
+        children.sort(key=lambda u: ('page' not in u.lower(), 'post' in u.lower()))
+        urls = children[:CHILD_SITEMAPS]
+    return pages[:SITEMAP_URLS]
+
+
+async def crawl_site(fetcher, url, log=print, cache=None, max_pages=MAX_PAGES, max_bytes=MAX_BYTES,
+                     strict=False):
+    """Fetch the homepage, then crawl the site within budget; returns the page bundle.
+
+    A homepage that can't be fetched raises SiteUnreachable when `strict`,
+    and is otherwise replaced by UNKNOWN_HTML.
+
+    Candidates come from the sitemaps and from links on fetched pages (up to
+    MAX_DEPTH clicks from the homepage). Each wave fetches the best-ranked
+    candidates in parallel, one at a time when robots.txt sets a Crawl-delay.
+    """
+    base_url = re.sub(r'(https?://[^/]+).*', r'\1', url)
+    home, robots = await asyncio.gather(_try_get(fetcher, url, HOMEPAGE_TIMEOUT, BROWSER_UA, cache,
+                                                 MAX_HOMEPAGE_BYTES),
+                                        read_robots(fetcher, base_url, cache))
+
+    if home is None or len(home.body) < MIN_HOMEPAGE_BYTES:
+        code = home.status if home is not None else "000"
+        if strict:
+            raise SiteUnreachable(f"could not fetch {url} (HTTP {code})")
+        log(f"  ⚠️ Could not fetch website (HTTP {code}). Using defaults.")
+        home_body = UNKNOWN_HTML
+    else:
+        log(f"  ✅ Fetched website (HTTP {home.status}, {len(home.body)} bytes)")
+        home_body = home.body
+    home_url = home.url if home is not None else url
+    site = site_key(urlsplit(home_url).hostname)
+    pages = [(url, home_body)]
+    total = len(home_body)
+    seen = {page_key(url), page_key(home_url)}
+    frontier = {}
+
+    def offer(link, depth):
+        key = page_key(link)
+        parts = urlsplit(link)
+        if (key in seen or key in frontier or site_key(parts.hostname) != site
+                or SKIP_PATH_RE.search(parts.path) or not robots.can_fetch(ROBOTS_AGENT, link)):
+            return
+        frontier[key] = (crawl_rank(link, depth), len(frontier), link, depth)
+
+    for link in await read_sitemaps(fetcher, robots.site_maps() or [f"{base_url}/sitemap.xml"], cache):
+        offer(link, 1)
+    for link in internal_links(home_body, home_url, site):
+        offer(link, 1)
+    if not frontier:
+        for page in EXTRA_PAGES:
+            offer(f"{base_url}/{page}", 1)
+
+    delay = min(float(robots.crawl_delay(ROBOTS_AGENT) or 0), CRAWL_DELAY_CAP)
+    while frontier and len(pages) < max_pages and total < max_bytes:
+        wave = sorted(frontier.values())[:1 if delay else max_pages - len(pages)]
+        for _, _, link, _ in wave:
+            key = page_key(link)
+            del frontier[key]
+            seen.add(key)
+        if delay:
+            await asyncio.sleep(delay)
+        responses = await asyncio.gather(*[_try_get(fetcher, link, PAGE_TIMEOUT, PAGE_UA, cache, MAX_PAGE_BYTES)
+                                           for _, _, link, _ in wave])
+        for (_, _, link, depth), resp in zip(wave, responses):
+            if resp is None or not is_page(resp) or len(pages) >= max_pages:
+                continue
+            # A redirect to another site, or to a page already fetched, adds nothing
+            final = page_key(resp.url)
+            if site_key(urlsplit(resp.url).hostname) != site or (final != page_key(link) and final in seen):
+                continue
+            seen.add(final)
+            if total + len(resp.body) > max_bytes:
+                continue
+            pages.append((resp.url, resp.body))
+            total += len(resp.body)
+            log(f"  Found {urlsplit(resp.url).path} page")
+            if depth < MAX_DEPTH:
+                for next_link in internal_links(resp.body, resp.url, site):
+                    offer(next_link, depth + 1)
+
+    log(f"  ✅ Crawled {len(pages)} page{'s' if len(pages) != 1 else ''} ({total // 1024} KB)")
+    bundle = []
+    for page_url, body in pages:
+        bundle.append(PAGE_MARK.format(page_url).encode())
+        bundle.append(body if body.endswith(b'\n') else body + b'\n')
+    return b''.join(bundle)
+
+
+async def fetch_prospect(url=None, name=None, concurrency=16, per_host=4, ssl_context=None, log=print,
+                         cache=None, max_pages=MAX_PAGES, max_bytes=MAX_BYTES, strict=False):
+    """Phase 1 fetch. Returns (website_url, page_bundle_bytes).
+
+    With only a name, the domain guesses are probed first; website_url is ""
+    when none of them answer. Pages are revalidated against `cache`
+    (a ProspectCache) when one is given.
+    """
+    async with Fetcher(concurrency, per_host, ssl_context) as fetcher:
+        if not url:
+            url = await find_website(fetcher, name, log)
+            if not url:
+                log("  ⚠️ Could not find website. Creating minimal research.")
+                return "", f"<html><head><title>{name}</title></head><body></body></html>\n".encode()
+        return url, await crawl_site(fetcher, url, log, cache, max_pages, max_bytes, strict)
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Prospect Fetcher")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Business website URL")
+    target.add_argument("--name", help="Business name, to guess the domain from")
+    parser.add_argument("--out", required=True, help="Output path for the page bundle")
+    parser.add_argument("--url-out", help="Write the resolved website URL here")
+    parser.add_argument("--concurrency", type=int, default=16, help="Max requests in flight")
+    parser.add_argument("--per-host", type=int, default=4, help="Max requests in flight per host")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES,
+                        help=f"Most pages to crawl, homepage included (default: {MAX_PAGES})")
+    parser.add_argument("--max-bytes", type=int, default=MAX_BYTES,
+                        help=f"Most bytes of pages to crawl (default: {MAX_BYTES // (1024 * 1024)} MB)")
+    parser.add_argument("--cache-dir", default=cache_dir_from_env(),
+                        help="Revalidate pages against this cache (default: $PROSPECT_CACHE_DIR)")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit 2 instead of going on with defaults when the website can't be fetched")
+    args = parser.parse_args()
+    metrics.configure(metrics_path_from_env(), "fetch")
+
+    cache = ProspectCache(args.cache_dir) if args.cache_dir else None
+    if args.url:
+        print("  Fetching website...")
+    try:
+        with metrics.phase("fetch") as phase:
+            url, html = asyncio.run(fetch_prospect(args.url, args.name, args.concurrency, args.per_host,
+                                                   cache=cache, max_pages=args.max_pages,
+                                                   max_bytes=args.max_bytes, strict=args.strict))
+            phase["bytes"] = len(html)
+    except SiteUnreachable as e:
+        print(f"  ❌ Website unreachable: {e}")
+        sys.exit(2)
+
+    with open(args.out, 'wb') as f:
+        f.write(html)
+    if args.url_out:
+        with open(args.url_out, 'w') as f:
+            f.write(url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Prospect Metrics
+
+Per-phase timing for the prospect tools, appended as JSON lines so runs in
+production can be compared afterwards. Each line is one phase:
+
+  {"run": "20250301T101500-4242", "source": "analyzer", "phase": "extract_business_info.phone",
+   "parent": "analyze", "wall_s": 0.0004, "cpu_s": 0.0004, "bytes": null,
+   "max_rss_kb": 41236, "time": 1740824100.5, "pid": 4250}
+
+wall_s/cpu_s cover the phase; max_rss_kb is the process's peak RSS when the
+phase ended. Every Python tool also writes a "process" line at exit, which is
+where the shell phases of prospect-pipeline.sh get their peak RSS from.
+"parent" is the pipeline phase that started the process, and "run" ties one
+pipeline run together.
+
+Recording is off unless PROSPECT_METRICS (or a tool's --metrics-out) names a
+file; when off, instrumented code pays one attribute check per phase.
+
+Usage:
+  python3 prospect_metrics.py report metrics.jsonl            # latest run
+  python3 prospect_metrics.py report metrics.jsonl --run ID
+  python3 prospect_metrics.py report metrics.jsonl --all
+"""
+
+import argparse
+import atexit
+import contextlib
+import functools
+import json
+import os
+import resource
+import sys
+import time
+
+
+def metrics_path_from_env():
+    """The metrics file from PROSPECT_METRICS, or None when metrics are off."""
+    value = os.environ.get("PROSPECT_METRICS", "")
+    return None if value in ("", "0", "off") else os.path.expanduser(value)
+
+
+def max_rss_kb():
+    # ru_maxrss is KB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def cpu_seconds():
+    t = os.times()
+    return t.user + t.system
+
+
+class Metrics:
+    """Buffered phase recorder for one process; disabled until configure()."""
+
+    def __init__(self):
+        self.path = None
+        self.source = None
+        self.run = None
+        self.parent = None
+        self.records = []
+        self._started = None
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def configure(self, path, source, at_exit=True):
+        """Start recording to `path` (stop, when None), and write a process line at exit."""
+        if not path:
+            self.path = None
+            return
+        self.path = path
+        self.source = source
+        self.run = os.environ.get("PROSPECT_METRICS_RUN") or f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.parent = os.environ.get("PROSPECT_METRICS_PHASE") or None
+        self._started = (time.perf_counter(), cpu_seconds())
+        if at_exit:
+            atexit.register(self._exit)
+
+    def record(self, phase, wall, cpu, nbytes=None):
+        self.records.append({
+            "run": self.run, "source": self.source, "phase": phase, "parent": self.parent,
+            "wall_s": round(wall, 6), "cpu_s": round(cpu, 6), "bytes": nbytes,
+            "max_rss_kb": max_rss_kb(), "time": round(time.time(), 3), "pid": os.getpid(),
+        })
+
+    def phase(self, name, nbytes=None):
+        """Context manager timing one phase.
+
+        It yields a dict; set its "bytes" inside the block when the size is
+        only known once the work is done.
+        """
+        if self.path is None:
+            return contextlib.nullcontext({})
+        return self._phase(name, nbytes)
+
+    @contextlib.contextmanager
+    def _phase(self, name, nbytes):
+        info = {"bytes": nbytes}
+        wall, cpu = time.perf_counter(), cpu_seconds()
+        try:
+            yield info
+        finally:
+            self.record(name, time.perf_counter() - wall, cpu_seconds() - cpu, info["bytes"])
+
+    def timed(self, name, size_arg=None):
+        """Decorator timing every call; size_arg is the positional arg whose len() is the bytes."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def timed_fn(*args, **kwargs):
+                if self.path is None:
+                    return fn(*args, **kwargs)
+                nbytes = len(args[size_arg]) if size_arg is not None and len(args) > size_arg else None
+                with self._phase(name, nbytes):
+                    return fn(*args, **kwargs)
+            return timed_fn
+        return wrap
+
+    def laps(self, prefix):
+        """A lap(name, nbytes=None) function that records the time since the previous lap.
+
+        For functions made of consecutive blocks: call lap("block") after each one.
+        """
+        if self.path is None:
+            return _no_lap
+        last = [time.perf_counter(), cpu_seconds()]
+
+        def lap(name, nbytes=None):
+            now, cpu = time.perf_counter(), cpu_seconds()
+            self.record(f"{prefix}.{name}", now - last[0], cpu - last[1], nbytes)
+            last[0], last[1] = time.perf_counter(), cpu_seconds()
+        return lap
+
+    def flush(self):
+        """Append buffered lines; one write per flush so concurrent writers don't interleave."""
+        if not self.records or self.path is None:
+            return
+        data = "".join(json.dumps(r) + "\n" for r in self.records).encode()
+        self.records = []
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def _exit(self):
+        wall, cpu = self._started
+        self.record("process", time.perf_counter() - wall, cpu_seconds() - cpu)
+        self.flush()
+
+
+def _no_lap(name, nbytes=None):
+    pass
+
+
+# The recorder the tools share; configure() it from main()
+metrics = Metrics()
+
+
+@contextlib.contextmanager
+def profiled(path):
+    """cProfile everything in the block into `path` (pstats format), if a path is given."""
+    if not path:
+        yield
+        return
+    import cProfile
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+        print(f"  ✅ Profile written to {path} (python3 -m pstats {path})", file=sys.stderr)
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def load(path):
+    records = []
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def report(records):
+    """Print one run: pipeline phases with their child processes' phases nested under them."""
+    pipeline = [r for r in records if r["source"] == "pipeline"]
+    children = {}
+    for r in records:
+        if r["source"] != "pipeline":
+            children.setdefault(r.get("parent"), []).append(r)
+
+    def line(r, indent, rss=None):
+        rss = rss if rss is not None else r.get("max_rss_kb")
+        nbytes = r.get("bytes")
+        rate = f"{nbytes / r['wall_s'] / 1e6:8.2f}" if nbytes and r["wall_s"] > 0 else f"{'':>8}"
+        size = f"{nbytes / 1024:9.0f}K" if nbytes is not None else f"{'':>10}"
+        mem = f"{rss / 1024:8.1f}" if rss else f"{'':>8}"
+        name = (" " * indent + r["phase"])[:40]
+        print(f"  {name:<40} {r['wall_s']:9.3f} {r['cpu_s']:9.3f} {size} {rate} {mem}")
+
+    print(f"  {'phase':<40} {'wall s':>9} {'cpu s':>9} {'bytes':>10} {'MB/s':>8} {'RSS MB':>8}")
+    print("  " + "─" * 88)
+    for r in pipeline:
+        kids = children.pop(r["phase"], [])
+        peak = max((k.get("max_rss_kb") or 0 for k in kids), default=None)
+        line(r, 0, peak)
+        for k in kids:
+            line(k, 2 if k["phase"] in ("process", "request") else 4)
+    for parent, kids in children.items():
+        if parent is not None or not pipeline:
+            for k in kids:
+                line(k, 0 if k["phase"] in ("process", "request") else 2)
+    total = sum(r["wall_s"] for r in pipeline) or sum(
+        r["wall_s"] for r in records if r["phase"] in ("process", "request") and not r.get("parent"))
+    print(f"\n  Total: {total:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Prospect Metrics")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rep = sub.add_parser("report", help="Summarize a metrics file by run and phase")
+    rep.add_argument("file", nargs="?", default=metrics_path_from_env())
+    rep.add_argument("--run", help="Run ID (default: the latest)")
+    rep.add_argument("--all", action="store_true", help="Every run in the file")
+    args = parser.parse_args()
+
+    if not args.file:
+        parser.error("no metrics file (pass one or set PROSPECT_METRICS)")
+    records = load(args.file)
+    if not records:
+        print(f"  ⚠️  No metrics in {args.file}")
+        return
+    runs = list(dict.fromkeys(r["run"] for r in records))
+    if args.run:
+        runs = [args.run]
+    elif not args.all:
+        runs = runs[-1:]
+    for run in runs:
+        print(f"📊 Run {run}")
+        report([r for r in records if r["run"] == run])
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,920 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Pipeline Orchestrator
+
+Runs prospect-pipeline.sh's stages for many prospects at once, from a queue
+that survives crashes, restarts and cron timeouts:
+
+  fetch ─▶ analyze ─┬─▶ audit-html ─┐
+                    ├─▶ demo-site ──┼─▶ deploy
+                    └─▶ brief ──────┘
+
+Prospects wait in a SQLite queue ($PROSPECT_QUEUE, default
+~/.local/share/ace-growth/pipeline.db). A run claims jobs (queued -> running)
+in their own transactions and starts each stage as soon as the stages it needs
+are done, in a pool of its own size: one prospect's audit and demo render
+together while the next prospects fetch. Stages run the same tools the shell
+pipeline does, with their output in the build dir's logs/.
+
+Stage outputs go to the prospect's build dir ($PROSPECT_CACHE_DIR/builds/<prospect>/,
+the one prospect-pipeline.sh uses, plus the fetched page bundle), and each stage
+is checkpointed in the queue once they're written. A job whose run died is
+picked up again by the next run and resumes at its first stage without a
+checkpoint (or whose outputs are gone); the render stages' own fingerprints
+still skip whatever is current. A job that has died MAX_ATTEMPTS times is
+failed instead, so one poison prospect can't take every run down with it.
+
+Usage:
+  python3 prospect_orchestrator.py enqueue https://example.com
+  python3 prospect_orchestrator.py enqueue "Business Name" "City" --no-deploy
+  python3 prospect_orchestrator.py enqueue --file prospects.txt     # one prospect per line
+  python3 prospect_orchestrator.py run --workers analyze=4 --jobs 16 # drain the queue (cron)
+  python3 prospect_orchestrator.py daemon                          # stay up; run jobs as they arrive
+  python3 prospect_orchestrator.py status
+  python3 prospect_orchestrator.py stats --window 3600             # depth, throughput, worker sizing
+  python3 prospect_orchestrator.py requeue 42 [--from analyze]
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import shlex
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from claims import claim_alive, new_claim
+from page_optimizer import optimize_from_env
+from prospect_brief import call_brief, field, write_brief
+from prospect_cache import cache_dir_from_env
+from prospect_stages import BuildState, file_stage_fingerprint, forced
+from prospect_store import slugify
+
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+FETCHER = os.path.join(TOOLS_DIR, "prospect_fetch.py")
+ANALYZER_CLIENT = os.path.join(TOOLS_DIR, "prospect_client.py")
+AUDIT_RENDERER = os.path.join(TOOLS_DIR, "audit_renderer.py")
+SITE_RENDERER = os.path.join(TOOLS_DIR, "site_renderer.py")
+DEPLOYER = os.path.join(TOOLS_DIR, "prospect_deploy.py")
+
+# Render stage inputs besides the JSON they render, in prospect-pipeline.sh's order,
+# so a build dir's fingerprints hold whichever of the two built it
+AUDIT_INPUTS = [AUDIT_RENDERER, os.path.join(TOOLS_DIR, "audit-generator", "generate-audit.sh"),
+                os.path.join(TOOLS_DIR, "audit-generator", "audit-template.html"),
+                os.path.join(TOOLS_DIR, "page_optimizer.py"), os.path.join(TOOLS_DIR, "page_budgets.json")]
+SITE_INPUTS = [SITE_RENDERER, os.path.join(REPO_ROOT, "templates", "contractor-site", "generate.sh"),
+               os.path.join(REPO_ROOT, "templates", "contractor-site", "index.html"),
+               os.path.join(TOOLS_DIR, "page_optimizer.py"), os.path.join(TOOLS_DIR, "page_budgets.json")]
+
+DEFAULT_QUEUE = os.path.expanduser("~/.local/share/ace-growth/pipeline.db")
+DEFAULT_CACHE_DIR = "~/.cache/ace-growth/prospects"
+DEFAULT_CITY = "Indianapolis"
+
+# Stage → the stages it needs, in an order that runs them. Stages a job leaves
+# out (--no-deploy, --audit-only, --demo-only) count as met.
+STAGES = {
+    "fetch": (),
+    "analyze": ("fetch",),
+    "audit-html": ("analyze",),
+    "demo-site": ("analyze",),
+    "brief": ("analyze",),
+    "deploy": ("audit-html", "demo-site", "brief"),
+}
+ANALYZER_FORCE = ("research", "audit", "site-config", "all")
+# Slugs of the placeholder names used when a site yields none; every nameless
+# prospect would deploy over the same demos/<slug>/
+FALLBACK_SLUGS = {"", "unknown", "unknown-business"}
+
+# Workers per stage: fetches mostly wait on the network, the rest on a core
+WORKERS = {"fetch": 8, "analyze": os.cpu_count() or 2, "audit-html": 2, "demo-site": 2,
+           "brief": 2, "deploy": 2}
+JOBS = 8            # prospects in flight at once
+LEASE = 1800        # seconds before a claim we can't check (another host's) counts as abandoned
+HEARTBEAT = 30      # running jobs' claims are renewed this often
+MAX_ATTEMPTS = 3    # runs a job may die in before it's failed instead of resumed
+LOG_TAIL = 3        # lines of a failed stage's log in its error
+ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY,
+    build_key    TEXT NOT NULL,     -- build dir name, as prospect-pipeline.sh names it
+    url          TEXT,
+    name         TEXT,
+    city         TEXT,
+    options      TEXT NOT NULL,     -- JSON: deploy, audit_only, demo_only, no_cache, force
+    status       TEXT NOT NULL DEFAULT 'queued',   -- queued, running, done, failed
+    claim        TEXT,              -- set while a run holds it
+    claimed_at   REAL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    slug         TEXT,              -- deploy slug, once analyzed
+    error        TEXT,
+    enqueued_at  REAL NOT NULL,
+    started_at   REAL,
+    finished_at  REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_build_key ON jobs (build_key, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_enqueued_at ON jobs (enqueued_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs (finished_at);
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job_id       INTEGER NOT NULL,
+    stage        TEXT NOT NULL,
+    status       TEXT NOT NULL,     -- running, done, failed
+    outcome      TEXT,              -- built, fresh, ... or the error
+    started_at   REAL NOT NULL,
+    finished_at  REAL,
+    wall_s       REAL,
+    PRIMARY KEY (job_id, stage)
+);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_finished_at ON checkpoints (finished_at);
+"""
+
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+RED = "\033[0;31m"
+CYAN = "\033[0;36m"
+BOLD = "\033[1m"
+NC = "\033[0m"
+
+
+def queue_path_from_env():
+    return os.path.expanduser(os.environ.get("PROSPECT_QUEUE") or DEFAULT_QUEUE)
+
+
+def parse_target(words):
+    """(url, name, city) from prospect-pipeline.sh's positional arguments."""
+    first = words[0]
+    if re.match(r"^https?://", first):
+        return first, "", DEFAULT_CITY
+    if re.search(r"\.[a-z]{2,}$", first):
+        return "https://" + first, "", DEFAULT_CITY
+    return "", first, words[1] if len(words) > 1 else DEFAULT_CITY
+
+
+def build_key(url, name, city):
+    return slugify(url or f"{name} {city}")
+
+
+def dependents(stage):
+    """`stage` and every stage downstream of it."""
+    out = {stage}
+    for other, needs in STAGES.items():
+        if stage in needs:
+            out |= dependents(other)
+    return out
+
+
+def job_force(options):
+    """Stages to rebuild whatever the build state says; --no-cache rebuilds them all."""
+    return ["all"] if options.get("no_cache") else options.get("force", [])
+
+
+def job_stages(options):
+    skip = set()
+    if not options.get("deploy", True):
+        skip.add("deploy")
+    if options.get("audit_only"):
+        skip.add("demo-site")
+    if options.get("demo_only"):
+        skip.add("audit-html")
+    return [stage for stage in STAGES if stage not in skip]
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def fmt_duration(seconds):
+    if seconds is None:
+        return "—"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m{int(seconds % 60):02d}s"
+    return f"{int(seconds // 3600)}h{int(seconds % 3600 // 60):02d}m"
+
+
+# ──────────────────────────────────────
+# Queue
+# ──────────────────────────────────────
+
+class JobQueue:
+    """Jobs and their stage checkpoints in one SQLite file, shared by every run."""
+
+    def __init__(self, path=DEFAULT_QUEUE):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def enqueue(self, targets, options):
+        """Queue (url, name, city) targets with `options`; returns [(job id, added)]. A prospect
+        already queued or running isn't queued twice."""
+        now = time.time()
+        out = []
+        with self.db:
+            for url, name, city in targets:
+                key = build_key(url, name, city)
+                row = self.db.execute("SELECT id FROM jobs WHERE build_key = ? AND status IN ('queued', 'running')",
+                                      (key,)).fetchone()
+                if row:
+                    out.append((row["id"], False))
+                    continue
+                cur = self.db.execute(
+                    "INSERT INTO jobs (build_key, url, name, city, options, enqueued_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, url, name, city, json.dumps(options, sort_keys=True), now))
+                out.append((cur.lastrowid, True))
+        return out
+
+    def job(self, job_id):
+        row = self.db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    # A job goes queued -> running (under a claim) -> done/failed. Each stage is
+    # checkpointed (running -> done/failed) as it goes, so whoever picks the job up
+    # next knows which stages' outputs it can keep.
+
+    def claim(self, claim):
+        """Pop the oldest queued job whose prospect isn't already running, and mark it as
+        running under `claim`; None when there's nothing to run."""
+        now = time.time()
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            row = self.db.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' AND build_key NOT IN "
+                "(SELECT build_key FROM jobs WHERE status = 'running') ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE jobs SET status = 'running', claim = ?, claimed_at = ?, "
+                            "started_at = COALESCE(started_at, ?), attempts = attempts + 1 WHERE id = ?",
+                            (claim, now, now, row["id"]))
+        return self.job(row["id"])
+
+    def renew(self, claim, job_ids):
+        with self.db:
+            self.db.executemany("UPDATE jobs SET claimed_at = ? WHERE id = ? AND claim = ?",
+                                [(time.time(), job_id, claim) for job_id in job_ids])
+
+    def checkpoints(self, job_id):
+        return {row["stage"]: dict(row) for row in
+                self.db.execute("SELECT * FROM checkpoints WHERE job_id = ?", (job_id,))}
+
+    def start_stage(self, job_id, stage):
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO checkpoints (job_id, stage, status, started_at) "
+                            "VALUES (?, ?, 'running', ?)", (job_id, stage, time.time()))
+
+    def finish_stage(self, job_id, claim, stage, status, outcome, started_at, wall, slug=None):
+        now = time.time()
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (job_id, stage, status, outcome, started_at, now, wall))
+            self.db.execute("UPDATE jobs SET claimed_at = ?, slug = COALESCE(?, slug) WHERE id = ? AND claim = ?",
+                            (now, slug, job_id, claim))
+
+    def finish(self, job_id, claim, status, error=None):
+        """Move a job from running to `status`, if `claim` still holds it."""
+        with self.db:
+            cur = self.db.execute("UPDATE jobs SET status = ?, error = ?, claim = NULL, finished_at = ? "
+                                  "WHERE id = ? AND claim = ? AND status = 'running'",
+                                  (status, error, time.time(), job_id, claim))
+        return cur.rowcount > 0
+
+    def release(self, job_id, claim):
+        """Hand a job back to the queue unfinished (a run stopping early); not a failed attempt."""
+        with self.db:
+            self.db.execute("UPDATE jobs SET status = 'queued', claim = NULL, attempts = attempts - 1 "
+                            "WHERE id = ? AND claim = ? AND status = 'running'", (job_id, claim))
+
+    def recover(self, lease=LEASE):
+        """Requeue jobs left running by a run that died (or has held them longer than `lease`
+        seconds without a checkpoint); a job on its MAX_ATTEMPTS-th attempt is failed instead.
+        Returns [(job, new status)]."""
+        settled = []
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            for job in self.db.execute("SELECT * FROM jobs WHERE status = 'running'").fetchall():
+                if claim_alive(job["claim"]) and time.time() - (job["claimed_at"] or 0) < lease:
+                    continue
+                if job["attempts"] >= MAX_ATTEMPTS:
+                    status, error = "failed", f"run died {job['attempts']} times"
+                else:
+                    status, error = "queued", None
+                self.db.execute("UPDATE jobs SET status = ?, error = ?, claim = NULL, "
+                                "finished_at = CASE WHEN ? = 'failed' THEN ? END WHERE id = ?",
+                                (status, error, status, time.time(), job["id"]))
+                settled.append((dict(job), status))
+        return settled
+
+    def requeue(self, job_id, from_stage=None):
+        """Queue a finished job again. Its checkpoints are kept, so it resumes where it
+        stopped, except for `from_stage` and everything after it."""
+        with self.db:
+            cur = self.db.execute("UPDATE jobs SET status = 'queued', attempts = 0, error = NULL, "
+                                  "finished_at = NULL WHERE id = ? AND status IN ('done', 'failed')", (job_id,))
+            if cur.rowcount and from_stage:
+                stages = sorted(dependents(from_stage))
+                self.db.execute(f"DELETE FROM checkpoints WHERE job_id = ? AND stage IN "
+                                f"({', '.join('?' * len(stages))})", (job_id, *stages))
+        return cur.rowcount > 0
+
+    def jobs(self, limit=20):
+        """Queued and running jobs, then the most recently finished, up to `limit` of those."""
+        active = self.db.execute("SELECT * FROM jobs WHERE status IN ('running', 'queued') "
+                                 "ORDER BY status = 'queued', id").fetchall()
+        recent = self.db.execute("SELECT * FROM jobs WHERE status IN ('done', 'failed') "
+                                 "ORDER BY finished_at DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in active] + [dict(row) for row in reversed(recent)]
+
+    def stats(self, window=3600, now=None):
+        now = now or time.time()
+        since = now - window
+        depth = dict(self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        oldest = self.db.execute("SELECT MIN(enqueued_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        enqueued = self.db.execute("SELECT COUNT(*) FROM jobs WHERE enqueued_at >= ?", (since,)).fetchone()[0]
+        finished = self.db.execute("SELECT status, finished_at - enqueued_at FROM jobs "
+                                   "WHERE finished_at >= ? AND status IN ('done', 'failed')", (since,)).fetchall()
+        done = [row[1] for row in finished if row[0] == "done"]
+        in_stage = dict(self.db.execute(
+            "SELECT c.stage, COUNT(*) FROM checkpoints c JOIN jobs j ON j.id = c.job_id "
+            "WHERE c.status = 'running' AND j.status = 'running' GROUP BY c.stage").fetchall())
+        walls, failures = {}, {}
+        for row in self.db.execute("SELECT stage, status, wall_s FROM checkpoints WHERE finished_at >= ?", (since,)):
+            if row["status"] == "done":
+                walls.setdefault(row["stage"], []).append(row["wall_s"])
+            else:
+                failures[row["stage"]] = failures.get(row["stage"], 0) + 1
+        stages = {}
+        for stage in STAGES:
+            w = walls.get(stage, [])
+            stages[stage] = {"running": in_stage.get(stage, 0), "runs": len(w), "failed": failures.get(stage, 0),
+                             "mean_s": sum(w) / len(w) if w else None, "p95_s": percentile(w, 0.95)}
+        return {
+            "window_s": window,
+            "depth": {status: depth.get(status, 0) for status in ("queued", "running", "done", "failed")},
+            "oldest_queued_s": now - oldest if oldest else None,
+            "enqueued": enqueued,
+            "done": len(done),
+            "failed": len(finished) - len(done),
+            "per_hour": len(done) * 3600 / window,
+            "ready_median_s": percentile(done, 0.5),
+            "ready_p95_s": percentile(done, 0.95),
+            "stages": stages,
+        }
+
+
+# ──────────────────────────────────────
+# Stages
+# Each runs one pipeline stage for a job in its build dir and
+# returns how it went ("built", "fresh", ...), or raises StageFailed
+# ──────────────────────────────────────
+
+class StageFailed(Exception):
+    pass
+
+
+class Build:
+    """A prospect's build dir: prospect-pipeline.sh's layout, plus the fetched page bundle."""
+
+    def __init__(self, root, key):
+        self.dir = os.path.join(root, key)
+        self.html = os.path.join(self.dir, "website.html")
+        self.url_file = os.path.join(self.dir, "website-url.txt")
+        self.research = os.path.join(self.dir, "research.json")
+        self.audit = os.path.join(self.dir, "audit.json")
+        self.site_config = os.path.join(self.dir, "site-config.json")
+        self.audit_html = os.path.join(self.dir, "growth-audit.html")
+        self.demo_dir = os.path.join(self.dir, "demo-site")
+        self.demo_html = os.path.join(self.demo_dir, "index.html")
+        self.brief = os.path.join(self.dir, "call-brief.txt")
+        self.state = os.path.join(self.dir, "stages.json")
+        self.logs = os.path.join(self.dir, "logs")
+        # audit-html and demo-site both record into stages.json
+        self.state_lock = threading.Lock()
+
+    def outputs(self, stage):
+        return {
+            "fetch": [self.html, self.url_file],
+            "analyze": [self.research, self.audit, self.site_config],
+            "audit-html": [self.audit_html],
+            "demo-site": [self.demo_html],
+            "brief": [self.brief],
+            "deploy": [],
+        }[stage]
+
+
+def stage_env(job, options, stage):
+    env = dict(os.environ)
+    if options.get("no_cache"):
+        env["PROSPECT_CACHE_DIR"] = "off"
+    if env.get("PROSPECT_METRICS", "") not in ("", "0", "off"):
+        started = time.strftime("%Y%m%dT%H%M%S", time.localtime(job["started_at"]))
+        env["PROSPECT_METRICS_RUN"] = f"{started}-job{job['id']}"
+        env["PROSPECT_METRICS_PHASE"] = stage
+    return env
+
+
+def log_tail(path, lines=LOG_TAIL):
+    try:
+        with open(path, "r", errors="replace") as f:
+            text = ANSI_RE.sub("", f.read())
+        tail = [line.strip() for line in text.splitlines() if line.strip()][-lines:]
+    except OSError:
+        return ""
+    return " | ".join(tail)
+
+
+def run_tool(build, stage, argv, env):
+    """Run one of the pipeline's tools with its output in logs/<stage>.log; its exit status."""
+    os.makedirs(build.logs, exist_ok=True)
+    log_path = os.path.join(build.logs, f"{stage}.log")
+    with open(log_path, "w") as log:
+        return subprocess.run(argv, stdout=log, stderr=subprocess.STDOUT, env=env,
+                              stdin=subprocess.DEVNULL).returncode
+
+
+def tool_failed(build, stage, message):
+    tail = log_tail(os.path.join(build.logs, f"{stage}.log"))
+    return StageFailed(f"{message}: {tail}" if tail else message)
+
+
+def read_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def stage_fetch(job, options, build, env):
+    # An unreachable site fails the job rather than going on as "Unknown Business"
+    argv = [sys.executable, FETCHER, "--out", build.html, "--strict"]
+    if job["url"]:
+        argv += ["--url", job["url"]]
+    else:
+        argv += ["--name", job["name"], "--url-out", build.url_file]
+    status = run_tool(build, "fetch", argv, env)
+    if status != 0 or not os.path.exists(build.html):
+        raise tool_failed(build, "fetch", f"fetch exited {status}")
+    if job["url"]:
+        with open(build.url_file, "w") as f:
+            f.write(job["url"])
+    return "fetched"
+
+
+def stage_analyze(job, options, build, env):
+    with open(build.url_file, "r") as f:
+        url = f.read().strip()
+    argv = [sys.executable, ANALYZER_CLIENT, "--html", build.html, "--url", url,
+            "--research-out", build.research, "--audit-out", build.audit,
+            "--site-config-out", build.site_config, "--state", build.state]
+    for stage in job_force(options):
+        if stage in ANALYZER_FORCE:
+            argv += ["--force-stage", stage]
+    if job["name"]:
+        argv += ["--override-name", job["name"]]
+    argv += ["--city", job["city"] or DEFAULT_CITY]
+    status = run_tool(build, "analyze", argv, env)
+    if status != 0:
+        raise tool_failed(build, "analyze", f"analyzer exited {status}")
+    return "analyzed"
+
+
+def render_stage(build, stage, inputs, output, argv, options, env):
+    """A generator stage, skipped when prospect_stages.py would call it fresh."""
+    # Same fingerprint prospect-pipeline.sh records, so the two share a build dir
+    fp = file_stage_fingerprint(stage, inputs, [f"optimize={'on' if optimize_from_env() else 'off'}"])
+    with build.state_lock:
+        fresh = not forced(stage, job_force(options)) and BuildState(build.state).is_fresh(stage, fp, [output])
+    if fresh:
+        return "fresh"
+    if os.path.exists(output):
+        os.remove(output)
+    run_tool(build, stage, argv, env)
+    if not os.path.exists(output):
+        raise tool_failed(build, stage, f"{os.path.basename(output)} not generated")
+    with build.state_lock:
+        # Reread: the other render stage may have recorded since
+        BuildState(build.state).record(stage, fp, [output])
+    return "built"
+
+
+def stage_audit_html(job, options, build, env):
+    return render_stage(build, "audit-html", [build.audit] + AUDIT_INPUTS, build.audit_html,
+                        [sys.executable, AUDIT_RENDERER, build.audit, "-o", build.audit_html], options, env)
+
+
+def stage_demo_site(job, options, build, env):
+    os.makedirs(build.demo_dir, exist_ok=True)
+    return render_stage(build, "demo-site", [build.site_config] + SITE_INPUTS, build.demo_html,
+                        [sys.executable, SITE_RENDERER, build.site_config, build.demo_dir], options, env)
+
+
+def stage_brief(job, options, build, env):
+    write_brief(build.brief, call_brief(read_json(build.research), read_json(build.audit)))
+    return "written"
+
+
+def stage_deploy(job, options, build, env):
+    slug = slugify(field(read_json(build.research), "businessName", "Unknown"))
+    if slug in FALLBACK_SLUGS:
+        raise StageFailed(f"no business name to deploy under (would be demos/{slug}/)")
+    # Only pages this job built or checked fresh: the build dir is shared
+    # with earlier jobs, and pages it skipped carry over from the live release
+    stages = job_stages(options)
+    artifacts = [f"{dest}={src}" for stage, dest, src in (("audit-html", "growth-audit.html", build.audit_html),
+                                                          ("demo-site", "index.html", build.demo_html),
+                                                          ("brief", "call-brief.txt", build.brief))
+                 if stage in stages and os.path.isfile(src)]
+    if not artifacts:
+        raise StageFailed("nothing to deploy")
+    status = run_tool(build, "deploy", [sys.executable, DEPLOYER, "deploy", slug, *artifacts], env)
+    if status != 0:
+        raise tool_failed(build, "deploy", "deploy failed — the live pages were not changed")
+    return "deployed"
+
+
+STAGE_RUNNERS = {
+    "fetch": stage_fetch,
+    "analyze": stage_analyze,
+    "audit-html": stage_audit_html,
+    "demo-site": stage_demo_site,
+    "brief": stage_brief,
+    "deploy": stage_deploy,
+}
+
+
+# ──────────────────────────────────────
+# Scheduling
+# ──────────────────────────────────────
+
+class JobRun:
+    """One claimed job's progress through its stages."""
+
+    def __init__(self, job, build_root, checkpoints):
+        self.job = job
+        self.options = json.loads(job["options"])
+        self.build = Build(build_root, job["build_key"])
+        self.stages = job_stages(self.options)
+        self.done = set()
+        # A checkpoint holds while the stage's outputs are still there and everything
+        # it was built from holds too
+        for stage in self.stages:
+            cp = checkpoints.get(stage)
+            if (cp and cp["status"] == "done" and all(need in self.done for need in STAGES[stage] if need in self.stages)
+                    and all(os.path.exists(path) for path in self.build.outputs(stage))):
+                self.done.add(stage)
+        self.resumed = sorted(self.done, key=list(STAGES).index)
+        self.running = set()
+        self.error = None
+        self.label = job["slug"] or job["build_key"]
+
+    def ready(self):
+        if self.error:
+            return []
+        return [stage for stage in self.stages if stage not in self.done and stage not in self.running
+                and all(need in self.done for need in STAGES[stage] if need in self.stages)]
+
+    def finished(self):
+        return not self.running and bool(self.error or len(self.done) == len(self.stages))
+
+
+def timed_stage(run, stage):
+    """Run a stage in a worker thread: (outcome, error, started_at, wall seconds)."""
+    started_at = time.time()
+    start = time.monotonic()
+    outcome = error = None
+    try:
+        os.makedirs(run.build.dir, exist_ok=True)
+        outcome = STAGE_RUNNERS[stage](run.job, run.options, run.build, stage_env(run.job, run.options, stage))
+    except StageFailed as e:
+        error = str(e)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return outcome, error, started_at, time.monotonic() - start
+
+
+def report_recovered(settled):
+    for job, status in settled:
+        label = job["slug"] or job["build_key"]
+        if status == "failed":
+            print(f"  {RED}❌ #{job['id']} {label} — its run died {job['attempts']} times; "
+                  f"check logs/, then: prospect_orchestrator.py requeue {job['id']}{NC}")
+        else:
+            print(f"  {CYAN}↺ #{job['id']} {label} — a previous run stopped; requeued{NC}")
+    if settled:
+        print()
+
+
+def run_queue(queue, build_root, workers, jobs=JOBS, lease=LEASE, stop=None, watch=False, poll=5.0):
+    """Claim up to `jobs` jobs at a time and run their stages, each stage in its own pool of
+    workers[stage] threads, until the queue is empty (with `watch`, until `stop` is set).
+    On `stop`, stages in flight finish and their jobs go back to the queue. Returns (done, failed)."""
+    claim = new_claim()
+    stop = stop or threading.Event()
+    pools = {stage: ThreadPoolExecutor(max_workers=max(1, workers[stage]), thread_name_prefix=stage)
+             for stage in STAGES}
+    active = {}
+    in_flight = {}
+    done = failed = 0
+    renewed = time.monotonic()
+    try:
+        while True:
+            while len(active) < jobs and not stop.is_set():
+                job = queue.claim(claim)
+                if job is None:
+                    break
+                run = JobRun(job, build_root, queue.checkpoints(job["id"]))
+                active[job["id"]] = run
+                if run.resumed:
+                    print(f"  {CYAN}↺ #{job['id']} {run.label} — resuming after {', '.join(run.resumed)}{NC}")
+            if not stop.is_set():
+                for run in active.values():
+                    for stage in run.ready():
+                        run.running.add(stage)
+                        queue.start_stage(run.job["id"], stage)
+                        in_flight[pools[stage].submit(timed_stage, run, stage)] = (run, stage)
+            for job_id, run in list(active.items()):
+                if run.finished():
+                    if run.error:
+                        queue.finish(job_id, claim, "failed", run.error)
+                        print(f"  {RED}❌ #{job_id} {run.label} — failed: {run.error}{NC}")
+                        failed += 1
+                    else:
+                        queue.finish(job_id, claim, "done")
+                        took = time.time() - run.job["started_at"]
+                        print(f"  {GREEN}{BOLD}♠️  #{job_id} {run.label} — ready ({fmt_duration(took)}){NC}")
+                        done += 1
+                    del active[job_id]
+                elif stop.is_set() and not run.running:
+                    queue.release(job_id, claim)
+                    print(f"  {YELLOW}⏸  #{job_id} {run.label} — back in the queue{NC}")
+                    del active[job_id]
+            sys.stdout.flush()
+
+            if not in_flight:
+                if not watch or stop.is_set():
+                    break
+                report_recovered(queue.recover(lease))
+                stop.wait(poll)
+                continue
+            finished, _ = wait(in_flight, timeout=HEARTBEAT, return_when=FIRST_COMPLETED)
+            for future in finished:
+                run, stage = in_flight.pop(future)
+                run.running.discard(stage)
+                outcome, error, started_at, wall = future.result()
+                job_id = run.job["id"]
+                if error:
+                    run.error = f"{stage}: {error}"
+                    queue.finish_stage(job_id, claim, stage, "failed", error, started_at, wall)
+                    print(f"  {RED}❌ #{job_id} {run.label} — {stage} failed ({fmt_duration(wall)}){NC}")
+                    continue
+                slug = None
+                if stage == "analyze":
+                    try:
+                        slug = slugify(field(read_json(run.build.research), "businessName", "Unknown"))
+                        run.label = slug
+                    except (OSError, ValueError):
+                        pass
+                run.done.add(stage)
+                queue.finish_stage(job_id, claim, stage, "done", outcome, started_at, wall, slug)
+                print(f"  ✅ #{job_id} {run.label} — {stage} {outcome} ({fmt_duration(wall)})")
+            if time.monotonic() - renewed >= HEARTBEAT:
+                queue.renew(claim, list(active))
+                renewed = time.monotonic()
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True)
+    return done, failed
+
+
+# ──────────────────────────────────────
+# Commands
+# ──────────────────────────────────────
+
+def banner(title):
+    print()
+    print(f"{BOLD}{title}{NC}")
+    print(f"{BOLD}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{NC}")
+
+
+def parse_workers(specs):
+    workers = dict(WORKERS)
+    for spec in specs:
+        for part in spec.split(","):
+            stage, _, count = part.partition("=")
+            if stage not in STAGES or not count.isdigit() or int(count) < 1:
+                raise SystemExit(f"{RED}❌ --workers takes STAGE=N with N ≥ 1; stages: {', '.join(STAGES)}{NC}")
+            workers[stage] = int(count)
+    return workers
+
+
+def build_root_from(args, queue_path):
+    if args.build_root:
+        return os.path.expanduser(args.build_root)
+    cache = cache_dir_from_env()
+    return os.path.join(cache, "builds") if cache else os.path.join(os.path.dirname(queue_path), "builds")
+
+
+def cmd_enqueue(queue, args):
+    targets = []
+    if args.file:
+        with open(args.file, "r") as f:
+            for line in f:
+                words = shlex.split(line, comments=True)
+                if words:
+                    targets.append(parse_target(words))
+    if args.target:
+        targets.append(parse_target(args.target))
+    if not targets:
+        print(f"{RED}❌ Nothing to enqueue: give a URL, \"Business Name\" \"City\", or --file{NC}")
+        return 1
+    options = {"deploy": not args.no_deploy, "audit_only": args.audit_only, "demo_only": args.demo_only,
+               "no_cache": args.no_cache, "force": args.force_stage}
+    added = 0
+    for (job_id, new), (url, name, city) in zip(queue.enqueue(targets, options), targets):
+        label = url or f"{name} ({city})"
+        if new:
+            added += 1
+            if len(targets) <= 20:
+                print(f"  {GREEN}✅ #{job_id} {label}{NC}")
+        else:
+            print(f"  {YELLOW}⚠️  #{job_id} {label} — already queued{NC}")
+    print(f"\n  {added} job(s) queued")
+    return 0
+
+
+def cmd_run(queue, args):
+    stop = threading.Event()
+
+    def stopping(*_):
+        if not stop.is_set():
+            print(f"\n  {YELLOW}Stopping — finishing the stages in flight (jobs resume next run){NC}")
+        stop.set()
+
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, stopping)
+    workers = parse_workers(args.workers)
+    build_root = build_root_from(args, queue.path)
+    watch = args.command == "daemon"
+    banner("♠️  ACE GROWTH — PIPELINE ORCHESTRATOR")
+    print(f"  {args.jobs} job(s) at a time; workers: "
+          + ", ".join(f"{stage} {count}" for stage, count in workers.items()))
+    print(f"  Builds in {build_root}")
+    print()
+    report_recovered(queue.recover(args.lease))
+    start = time.monotonic()
+    done, failed = run_queue(queue, build_root, workers, args.jobs, args.lease, stop, watch, args.poll)
+    took = time.monotonic() - start
+    print()
+    if done or failed:
+        rate = done * 3600 / took if took else 0
+        print(f"  {GREEN}{done} ready, {failed} failed in {fmt_duration(took)} ({rate:.1f}/h){NC}")
+    else:
+        print(f"  {GREEN}Queue empty.{NC}")
+    print()
+    return 1 if failed else 0
+
+
+def cmd_status(queue, args):
+    jobs = queue.jobs(args.limit)
+    if not jobs:
+        print("  Queue empty.")
+        return 0
+    icons = {"done": "✅", "failed": "❌", "running": "⏳"}
+    for job in jobs:
+        checkpoints = queue.checkpoints(job["id"])
+        stages = job_stages(json.loads(job["options"]))
+        progress = " ".join(f"{stage} {icons.get(checkpoints[stage]['status'], '·')}" if stage in checkpoints
+                            else f"{stage} ·" for stage in stages)
+        label = job["slug"] or job["build_key"]
+        print(f"  #{job['id']:<5} {job['status']:<8} {label:<32} {progress}")
+        if job["status"] == "failed" and job["error"]:
+            print(f"         {RED}{job['error'][:160]}{NC}")
+    return 0
+
+
+def cmd_stats(queue, args):
+    stats = queue.stats(args.window)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return 0
+    depth = stats["depth"]
+    banner("♠️  Pipeline Queue")
+    oldest = f" (oldest {fmt_duration(stats['oldest_queued_s'])})" if stats["oldest_queued_s"] else ""
+    print(f"  Queued: {depth['queued']}{oldest}   Running: {depth['running']}   "
+          f"Done: {depth['done']}   Failed: {depth['failed']}")
+    running = ", ".join(f"{stage} {s['running']}" for stage, s in stats["stages"].items() if s["running"])
+    if running:
+        print(f"  In progress: {running}")
+    print()
+    print(f"  Last {fmt_duration(args.window)}: {stats['enqueued']} queued, {stats['done']} ready, "
+          f"{stats['failed']} failed — {stats['per_hour']:.1f} prospects/h")
+    if stats["done"]:
+        print(f"  Queued to ready: median {fmt_duration(stats['ready_median_s'])}, "
+              f"p95 {fmt_duration(stats['ready_p95_s'])}")
+    # Little's law: a stage needs (arrivals per second × seconds per run) busy workers
+    rate = args.rate if args.rate is not None else max(stats["enqueued"], stats["done"]) * 3600 / args.window
+    print()
+    print(f"  {'Stage':<12} {'Runs':>5} {'Failed':>7} {'Mean':>8} {'p95':>8} {'Per worker':>11} "
+          f"{f'Workers for {rate:.0f}/h':>17}")
+    for stage, s in stats["stages"].items():
+        mean = s["mean_s"]
+        per_worker = f"{3600 / mean:.0f}/h" if mean else "—"
+        needed = str(max(1, math.ceil(rate * mean / 3600))) if mean and rate else "—"
+        print(f"  {stage:<12} {s['runs']:>5} {s['failed']:>7} {fmt_duration(mean):>8} "
+              f"{fmt_duration(s['p95_s']):>8} {per_worker:>11} {needed:>17}")
+    print()
+    return 0
+
+
+def cmd_requeue(queue, args):
+    if not queue.requeue(args.job_id, args.from_stage):
+        print(f"{RED}❌ No finished job #{args.job_id}{NC}")
+        return 1
+    note = f", redoing {args.from_stage} onward" if args.from_stage else ""
+    print(f"{GREEN}✅ #{args.job_id} requeued{note}{NC}")
+    return 0
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Pipeline Orchestrator")
+    parser.add_argument("--queue", default=queue_path_from_env(),
+                        help="Queue database (default: PROSPECT_QUEUE or ~/.local/share/ace-growth/pipeline.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="Queue prospects: a URL, or \"Business Name\" \"City\"")
+    enqueue.add_argument("target", nargs="*", help="URL, domain, or business name and city")
+    enqueue.add_argument("--file", help="Queue one prospect per line, quoted as on the command line")
+    enqueue.add_argument("--no-deploy", action="store_true", help="Generate but don't deploy")
+    enqueue.add_argument("--audit-only", action="store_true", help="Only generate the audit")
+    enqueue.add_argument("--demo-only", action="store_true", help="Only generate the demo site")
+    enqueue.add_argument("--no-cache", action="store_true", help="Refetch and rebuild every stage")
+    enqueue.add_argument("--force-stage", action="append", default=[],
+                         choices=["research", "audit", "site-config", "audit-html", "demo-site", "all"],
+                         help="Rebuild a stage even if it's current (repeatable)")
+
+    run = sub.add_parser("run", help="Run queued jobs until the queue is empty")
+    daemon = sub.add_parser("daemon", help="Keep running and start jobs as they're queued")
+    daemon.add_argument("--poll", type=float, default=5.0, help="Seconds between queue checks when idle (default: 5)")
+    run.set_defaults(poll=5.0)
+    for p in (run, daemon):
+        p.add_argument("--jobs", type=int, default=JOBS, help=f"Prospects in flight at once (default: {JOBS})")
+        p.add_argument("--workers", action="append", default=[], metavar="STAGE=N",
+                       help="Workers for a stage (repeatable or comma-separated; default: "
+                            + ", ".join(f"{stage}={count}" for stage, count in WORKERS.items()) + ")")
+        p.add_argument("--lease", type=float, default=LEASE,
+                       help=f"Seconds before another host's claim counts as abandoned (default: {LEASE})")
+        p.add_argument("--build-root", default=None,
+                       help="Build dirs (default: $PROSPECT_CACHE_DIR/builds, as prospect-pipeline.sh)")
+
+    status = sub.add_parser("status", help="List queued, running and recent jobs with their stages")
+    status.add_argument("--limit", type=int, default=20, help="Finished jobs to show (default: 20)")
+    stats = sub.add_parser("stats", help="Queue depth, throughput and per-stage timings")
+    stats.add_argument("--window", type=float, default=3600, help="Seconds of history (default: 3600)")
+    stats.add_argument("--rate", type=float, default=None,
+                       help="Size workers for this many prospects/hour (default: the window's arrival rate)")
+    stats.add_argument("--json", action="store_true", help="Print the stats as JSON")
+    requeue = sub.add_parser("requeue", help="Queue a finished or failed job again")
+    requeue.add_argument("job_id", type=int)
+    requeue.add_argument("--from", dest="from_stage", choices=list(STAGES), default=None,
+                         help="Redo this stage and everything after it (default: resume where it stopped)")
+    args = parser.parse_args()
+
+    # Same default as prospect-pipeline.sh, so both share build dirs and the cache
+    if not os.environ.get("PROSPECT_CACHE_DIR"):
+        os.environ["PROSPECT_CACHE_DIR"] = os.path.expanduser(DEFAULT_CACHE_DIR)
+    commands = {"enqueue": cmd_enqueue, "run": cmd_run, "daemon": cmd_run, "status": cmd_status,
+                "stats": cmd_stats, "requeue": cmd_requeue}
+    with JobQueue(args.queue) as queue:
+        sys.exit(commands[args.command](queue, args))
+
+
+if __name__ == "__main__":
+    main()
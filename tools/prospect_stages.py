@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Prospect Build Stages
+
+Tracks the pipeline as a small build graph so re-runs only redo stale stages:
+
+  html ─▶ research ─┬─▶ audit ───────▶ audit-html
+                    └─▶ site-config ─▶ demo-site
+
+Each stage has a fingerprint made of its inputs (content hashes), its code
+version and its parameters. A stage is fresh when its recorded fingerprint
+matches and its outputs still hash to what it wrote. Build state is a JSON
+file per prospect; stage results are also kept in the prospect cache under
+their fingerprint, so a fresh build dir (or a batch worker) can reuse them.
+
+The analyzer stages run inside prospect-analyzer.py. The shell generator
+stages use the CLI:
+
+  python3 prospect_stages.py check  --state stages.json --stage audit-html \\
+      --input audit.json --input generate-audit.sh --output out.html   # exit 0 = fresh
+  python3 prospect_stages.py record --state stages.json --stage audit-html \\
+      --input audit.json --input generate-audit.sh --output out.html
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+
+
+ANALYZER_STAGES = ["research", "audit", "site-config"]
+RENDER_STAGES = ["audit-html", "demo-site"]
+ALL = "all"
+
+
+def fingerprint(*parts):
+    """Stable hash of a stage's inputs, code version and parameters."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def hash_file(path):
+    """sha256 of a file's bytes, or None if it doesn't exist."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def section_versions(path):
+    """Hash each box-header section of a source file.
+
+    Sections are the `# ────` / `# Title` / `# ────` blocks this repo's tools
+    are organized in. Hashing sections instead of the whole file lets a stage
+    go stale only when code it depends on changes.
+    """
+    with open(path, "r") as f:
+        source = f.read()
+    parts = re.split(r'^# ─+\n# (.+)\n# ─+\n', source, flags=re.M)
+    versions = {"": hashlib.sha256(parts[0].encode()).hexdigest()}
+    for title, body in zip(parts[1::2], parts[2::2]):
+        versions[title.strip()] = hashlib.sha256(body.encode()).hexdigest()
+    return versions
+
+
+def forced(stage, force):
+    return bool(force) and (stage in force or ALL in force)
+
+
+class BuildState:
+    """Recorded fingerprints and output hashes for one prospect's build."""
+
+    def __init__(self, path):
+        self.path = path
+        self.stages = {}
+        try:
+            with open(path, "r") as f:
+                self.stages = json.load(f)
+        except (OSError, ValueError):
+            self.stages = {}
+
+    def is_fresh(self, stage, fp, outputs=()):
+        entry = self.stages.get(stage)
+        if not entry or entry.get("fingerprint") != fp:
+            return False
+        recorded = entry.get("outputs", {})
+        return all(path in recorded and hash_file(path) == recorded[path] for path in outputs)
+
+    def record(self, stage, fp, outputs=()):
+        self.stages[stage] = {
+            "fingerprint": fp,
+            "outputs": {path: hash_file(path) for path in outputs},
+        }
+        self.save()
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".stages-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.stages, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+def run_json_stage(stage, fp, compute, out_path=None, state=None, cache=None, force=()):
+    """Run one JSON-producing stage unless it's fresh.
+
+    Order of preference: the output already on disk (per `state`), then the
+    cache entry under `fp`, then `compute()`. Returns (data, how) where how
+    is "fresh", "cached" or "built". A result marked "partial" (its scan ran
+    out of time) is written but not cached or recorded, so the next build
+    tries again.
+    """
+    if not forced(stage, force):
+        if state and out_path and state.is_fresh(stage, fp, [out_path]):
+            with open(out_path, "r") as f:
+                return json.load(f), "fresh"
+        data = cache.get_result(fp) if cache else None
+        how = "cached"
+    else:
+        data = None
+    if data is None:
+        data = compute()
+        how = "built"
+        if cache and not data.get("partial"):
+            cache.put_result(fp, data)
+    if out_path:
+        with open(out_path, "w") as f:
+            json.dump(data, f, indent=2)
+        if state and not data.get("partial"):
+            state.record(stage, fp, [out_path])
+    return data, how
+
+
+def run_file_stage(stage, fp, render, out_path, state=None, force=()):
+    """Run a stage that renders out_path via render(out_path), unless it's fresh.
+
+    Returns "fresh" or "built".
+    """
+    if not forced(stage, force) and state and state.is_fresh(stage, fp, [out_path]):
+        return "fresh"
+    render(out_path)
+    if state:
+        state.record(stage, fp, [out_path])
+    return "built"
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def file_stage_fingerprint(stage, inputs, params):
+    return fingerprint(stage, [hash_file(p) for p in inputs], sorted(params))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Prospect Build Stages")
+    parser.add_argument("command", choices=["check", "record"])
+    parser.add_argument("--state", required=True, help="Build state JSON for this prospect")
+    parser.add_argument("--stage", required=True, help="Stage name")
+    parser.add_argument("--input", action="append", default=[], help="Input file (repeatable)")
+    parser.add_argument("--param", action="append", default=[], help="KEY=VALUE parameter (repeatable)")
+    parser.add_argument("--output", action="append", default=[], help="Output file (repeatable)")
+    parser.add_argument("--force-stage", action="append", default=[],
+                        help="Treat this stage as stale (repeatable, or 'all')")
+    args = parser.parse_args()
+
+    state = BuildState(args.state)
+    fp = file_stage_fingerprint(args.stage, args.input, args.param)
+    if args.command == "check":
+        fresh = not forced(args.stage, args.force_stage) and state.is_fresh(args.stage, fp, args.output)
+        sys.exit(0 if fresh else 1)
+    state.record(args.stage, fp, args.output)
+
+
+if __name__ == "__main__":
+    main()
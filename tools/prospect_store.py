@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Prospect Store
+
+Every analyzed prospect, kept in one SQLite database so the call list is a
+query instead of a walk over /tmp JSON files. prospect-analyzer.py upserts a
+row per site (keyed by its URL's host and path; slugs aren't unique — many
+sites are titled "Home") with its research, site checks, scores and
+industry; batch runs insert in bulk, one transaction per chunk.
+
+Each prospect's page SimHash is indexed too, split into eight 8-bit bands:
+two fingerprints within 7 bits of each other share at least one band, so a
+near-duplicate lookup is eight indexed equality matches, not a table scan.
+
+Location: $PROSPECT_DB, default ~/.local/share/ace-growth/prospects.db
+(set PROSPECT_DB=off to skip storing).
+
+Usage:
+  python3 prospect_store.py query --industry hvac --city Carmel --max-score 40
+  python3 prospect_store.py query --since-days 7 --order recent --limit 20
+  python3 prospect_store.py show acme-roofing           # or acmeroofing.com
+  python3 prospect_store.py stats
+  python3 prospect_store.py duplicates                # near-duplicate site clusters
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+DEFAULT_DB = os.path.expanduser("~/.local/share/ace-growth/prospects.db")
+
+# Audit category name → score column
+CATEGORY_COLUMNS = {
+    "First Impressions": "first_impressions",
+    "Mobile Experience": "mobile",
+    "Trust & Credibility": "trust",
+    "Lead Capture": "lead_capture",
+    "SEO & Visibility": "seo",
+}
+
+COLUMNS = [
+    "site", "slug", "business_name", "url", "phone", "email", "address", "city", "industry",
+    "industry_confidence", "overall_score", *CATEGORY_COLUMNS.values(),
+    "checks", "research", "analyzed_at",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prospects (
+    site                TEXT PRIMARY KEY,  -- site_key(): host and path, or name:<slug> without a URL
+    slug                TEXT NOT NULL,
+    business_name       TEXT NOT NULL,
+    url                 TEXT,
+    phone               TEXT,
+    email               TEXT,
+    address             TEXT,
+    city                TEXT,
+    industry            TEXT,
+    industry_confidence REAL,
+    overall_score       INTEGER,
+    first_impressions   INTEGER,
+    mobile              INTEGER,
+    trust               INTEGER,
+    lead_capture        INTEGER,
+    seo                 INTEGER,
+    checks              TEXT,     -- research.siteChecks as JSON
+    research            TEXT,     -- full research JSON
+    analyzed_at         REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_prospects_slug ON prospects (slug);
+CREATE INDEX IF NOT EXISTS idx_prospects_industry ON prospects (industry);
+CREATE INDEX IF NOT EXISTS idx_prospects_city ON prospects (city COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_prospects_score ON prospects (overall_score);
+CREATE INDEX IF NOT EXISTS idx_prospects_analyzed_at ON prospects (analyzed_at);
+CREATE INDEX IF NOT EXISTS idx_prospects_call_list ON prospects (industry, city COLLATE NOCASE, overall_score);
+
+CREATE TABLE IF NOT EXISTS fingerprints (
+    site          TEXT PRIMARY KEY,
+    simhash       INTEGER NOT NULL,  -- 64-bit page SimHash, stored signed
+    band0         INTEGER NOT NULL,  -- its 8-bit slices, low to high
+    band1         INTEGER NOT NULL,
+    band2         INTEGER NOT NULL,
+    band3         INTEGER NOT NULL,
+    band4         INTEGER NOT NULL,
+    band5         INTEGER NOT NULL,
+    band6         INTEGER NOT NULL,
+    band7         INTEGER NOT NULL,
+    version       TEXT,              -- analyzer research-stage version
+    duplicate_of  TEXT               -- slug whose research was reused; NULL when analyzed in full
+);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band0 ON fingerprints (band0);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band1 ON fingerprints (band1);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band2 ON fingerprints (band2);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band3 ON fingerprints (band3);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band4 ON fingerprints (band4);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band5 ON fingerprints (band5);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band6 ON fingerprints (band6);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band7 ON fingerprints (band7);
+"""
+
+# SimHash bands; lookups find every match up to SIMHASH_BANDS - 1 bits apart
+SIMHASH_BANDS = 8
+BAND_COLUMNS = [f"band{i}" for i in range(SIMHASH_BANDS)]
+
+ORDERS = {
+    "score": "overall_score ASC, analyzed_at DESC",
+    "recent": "analyzed_at DESC",
+    "name": "business_name COLLATE NOCASE",
+}
+
+
+def db_path_from_env():
+    """The database from PROSPECT_DB, the default when unset, or None when off."""
+    value = os.environ.get("PROSPECT_DB")
+    if value is None or value == "":
+        return DEFAULT_DB
+    return None if value in ("0", "off") else os.path.expanduser(value)
+
+
+def slugify(name):
+    """Same slug the pipeline deploys under: acegrowth.net/demos/<slug>/"""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def site_key(url, slug):
+    """The store's key for a prospect: its URL's host and path, lowercased, without
+    scheme, "www." or trailing slash ("acme.com/roofing"); "name:<slug>" without a URL."""
+    url = (url or "").strip()
+    if not url:
+        return f"name:{slug}"
+    parts = urlsplit(url if "//" in url else "//" + url)
+    host = (parts.hostname or "").removeprefix("www.")
+    return (host + parts.path.rstrip("/")).lower() or f"name:{slug}"
+
+
+def simhash_bands(simhash):
+    """The SIMHASH_BANDS equal slices of a 64-bit SimHash, low bits first."""
+    width = 64 // SIMHASH_BANDS
+    return [(simhash >> (i * width)) & ((1 << width) - 1) for i in range(SIMHASH_BANDS)]
+
+
+def _signed(value):
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+def prospect_row(research, audit, config=None, city=None, analyzed_at=None, simhash=None, version=None):
+    """One prospects row (as a dict) from the analyzer's three outputs, with the
+    page's SimHash and the research version when it's to be indexed. A partial
+    analysis (its scan ran out of time) isn't indexed for reuse."""
+    config = config or {}
+    scores = {c.get("name"): c.get("score") for c in audit.get("categories", [])}
+    slug = slugify(research["businessName"])
+    row = {
+        "site": site_key(research.get("url"), slug),
+        "slug": slug,
+        "business_name": research["businessName"],
+        "url": research.get("url") or None,
+        "phone": research.get("phone"),
+        "email": research.get("email"),
+        "address": research.get("address"),
+        "city": city,
+        "industry": config.get("industry"),
+        "industry_confidence": config.get("industryConfidence"),
+        "overall_score": audit.get("overallScore"),
+        "checks": json.dumps(research.get("siteChecks", {}), sort_keys=True),
+        "research": json.dumps(research, sort_keys=True),
+        "analyzed_at": analyzed_at if analyzed_at is not None else time.time(),
+    }
+    for name, column in CATEGORY_COLUMNS.items():
+        row[column] = scores.get(name)
+    if simhash is not None and not research.get("partial"):
+        row["simhash"] = simhash
+        row["version"] = version
+        row["duplicate_of"] = (research.get("duplicateOf") or {}).get("slug")
+    return row
+
+
+class ProspectStore:
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        # WAL lets the query CLI read while a batch is writing
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._migrate()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _migrate(self):
+        # Stores from before rows were keyed by site were keyed by slug. Rows are
+        # copied oldest first, so where two slugs shared a site the latest wins.
+        if "site" in self._columns("prospects"):
+            return
+        self.db.create_function("site_key", 2, site_key, deterministic=True)
+        indexes = [row["name"] for row in self.db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            "AND tbl_name IN ('prospects', 'fingerprints')")]
+        copied = ", ".join(COLUMNS[1:])
+        indexed = ["simhash", *BAND_COLUMNS, "version", "duplicate_of"]
+        try:
+            self.db.executescript(
+                "BEGIN IMMEDIATE;"
+                "ALTER TABLE prospects RENAME TO prospects_by_slug;"
+                "ALTER TABLE fingerprints RENAME TO fingerprints_by_slug;"
+                + "".join(f"DROP INDEX {name};" for name in indexes)
+                + SCHEMA
+                + f"INSERT OR REPLACE INTO prospects (site, {copied}) "
+                  f"SELECT site_key(url, slug), {copied} FROM prospects_by_slug ORDER BY analyzed_at;"
+                  f"INSERT OR REPLACE INTO fingerprints (site, {', '.join(indexed)}) "
+                  f"SELECT site_key(p.url, p.slug), {', '.join('f.' + c for c in indexed)} "
+                  "FROM fingerprints_by_slug f JOIN prospects_by_slug p USING (slug) ORDER BY p.analyzed_at;"
+                  "DROP TABLE fingerprints_by_slug;"
+                  "DROP TABLE prospects_by_slug;"
+                  "COMMIT;")
+        except sqlite3.Error:
+            if self.db.in_transaction:
+                self.db.rollback()
+            # Another process opening the old store may have migrated it first
+            if "site" not in self._columns("prospects"):
+                raise
+
+    def _columns(self, table):
+        return {row["name"] for row in self.db.execute(f"PRAGMA table_info({table})")}
+
+    # -- writes --
+
+    def upsert(self, rows):
+        """Insert or replace rows (dicts from prospect_row) in one transaction.
+
+        Returns the number of rows written.
+        """
+        placeholders = ", ".join(f":{c}" for c in COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in COLUMNS if c != "site")
+        sql = (f"INSERT INTO prospects ({', '.join(COLUMNS)}) VALUES ({placeholders}) "
+               f"ON CONFLICT(site) DO UPDATE SET {updates}")
+        rows = list(rows)
+        fingerprints = [(r["site"], _signed(r["simhash"]), *simhash_bands(r["simhash"]), r["version"],
+                         r["duplicate_of"]) for r in rows if r.get("simhash") is not None]
+        # A row stored without its fingerprint no longer matches the one indexed
+        unindexed = [(r["site"],) for r in rows if r.get("simhash") is None]
+        with self.db:
+            self.db.executemany(sql, rows)
+            self.db.executemany("INSERT OR REPLACE INTO fingerprints VALUES "
+                                f"({', '.join('?' * (SIMHASH_BANDS + 4))})", fingerprints)
+            self.db.executemany("DELETE FROM fingerprints WHERE site = ?", unindexed)
+        return len(rows)
+
+    # -- reads --
+
+    def query(self, industry=None, city=None, min_score=None, max_score=None, since=None,
+              order="score", limit=None):
+        """Prospects matching every given filter; `since` is an epoch time."""
+        where, params = [], []
+        if industry:
+            where.append("industry = ?")
+            params.append(industry)
+        if city:
+            where.append("city = ? COLLATE NOCASE")
+            params.append(city)
+        if min_score is not None:
+            where.append("overall_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            where.append("overall_score <= ?")
+            params.append(max_score)
+        if since is not None:
+            where.append("analyzed_at >= ?")
+            params.append(since)
+        sql = "SELECT * FROM prospects"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {ORDERS[order]}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+    def get(self, key):
+        """The prospect at a site (see site_key()), else the latest analyzed under a slug."""
+        row = (self.db.execute("SELECT * FROM prospects WHERE site = ?", (key,)).fetchone()
+               or self.db.execute("SELECT * FROM prospects WHERE slug = ? ORDER BY analyzed_at DESC LIMIT 1",
+                                  (key,)).fetchone())
+        return dict(row) if row else None
+
+    def near_duplicates(self, simhash, version, max_distance=SIMHASH_BANDS - 1, limit=5):
+        """Up to `limit` prospects analyzed in full by research `version` whose page SimHash
+        is within max_distance bits of `simhash`, nearest first, with their site, slug, url and research."""
+        if not 0 <= max_distance < SIMHASH_BANDS:
+            raise ValueError(f"near-duplicate distance must be 0-{SIMHASH_BANDS - 1}")
+        candidates = self.db.execute(
+            "SELECT site, simhash FROM fingerprints WHERE version = ? AND duplicate_of IS NULL AND ("
+            + " OR ".join(f"{c} = ?" for c in BAND_COLUMNS) + ")", (version, *simhash_bands(simhash)))
+        near = sorted((d, site) for site, value in candidates
+                      if (d := (_unsigned(value) ^ simhash).bit_count()) <= max_distance)
+        matches = []
+        for distance, site in near[:limit]:
+            row = self.db.execute("SELECT site, slug, url, research FROM prospects WHERE site = ?",
+                                  (site,)).fetchone()
+            if row:
+                matches.append(dict(row, distance=distance))
+        return matches
+
+    def duplicate_clusters(self, max_distance=SIMHASH_BANDS - 1):
+        """Groups of 2+ prospects whose pages are near duplicates, largest first; each a
+        list of {slug, business_name, url, duplicate_of}, fully analyzed ones first."""
+        rows = [dict(r) for r in self.db.execute(
+            "SELECT p.slug, f.simhash, f.duplicate_of, p.business_name, p.url "
+            "FROM fingerprints f JOIN prospects p USING (site) ORDER BY p.analyzed_at")]
+        by_hash = {}
+        for i, row in enumerate(rows):
+            by_hash.setdefault(_unsigned(row.pop("simhash")), []).append(i)
+        hashes = list(by_hash)
+        parent = list(range(len(hashes)))
+
+        def root(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Within max_distance bits, two hashes still share this many whole bands,
+        # so only hashes that share them are compared
+        shared = min(2, SIMHASH_BANDS - max_distance)
+        band = (1 << (64 // SIMHASH_BANDS)) - 1
+        masks = [sum(band << (b * 64 // SIMHASH_BANDS) for b in combo)
+                 for combo in itertools.combinations(range(SIMHASH_BANDS), shared)]
+        tables = [{} for _ in masks]
+        for i, value in enumerate(hashes):
+            for table, mask in zip(tables, masks):
+                bucket = table.setdefault(value & mask, [])
+                for j in bucket:
+                    if (value ^ hashes[j]).bit_count() <= max_distance and root(i) != root(j):
+                        parent[root(i)] = root(j)
+                bucket.append(i)
+        clusters = {}
+        for i, value in enumerate(hashes):
+            clusters.setdefault(root(i), []).extend(rows[k] for k in by_hash[value])
+        groups = [sorted(c, key=lambda r: r["duplicate_of"] is not None) for c in clusters.values() if len(c) > 1]
+        return sorted(groups, key=len, reverse=True)
+
+    def stats(self):
+        """[(industry, prospects, average score)], largest industry first."""
+        return [tuple(row) for row in self.db.execute(
+            "SELECT COALESCE(industry, 'unknown'), COUNT(*), ROUND(AVG(overall_score), 1) "
+            "FROM prospects GROUP BY industry ORDER BY COUNT(*) DESC")]
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def print_rows(rows):
+    if not rows:
+        print("  No matching prospects.")
+        return
+    for r in rows:
+        when = time.strftime("%Y-%m-%d", time.localtime(r["analyzed_at"]))
+        score = "—" if r["overall_score"] is None else r["overall_score"]
+        print(f"  {score:>3}  {r['business_name'][:32]:<32}  {(r['industry'] or ''):<12}  "
+              f"{(r['city'] or ''):<14}  {r['phone'] or '':<15}  {when}  {r['url'] or ''}")
+    print(f"\n  {len(rows)} prospect{'s' if len(rows) != 1 else ''}")
+
+
+def print_clusters(clusters):
+    if not clusters:
+        print("  No near-duplicate sites.")
+        return
+    for n, cluster in enumerate(clusters, 1):
+        print(f"  🔁 Cluster {n} — {len(cluster)} sites")
+        for r in cluster:
+            how = f"reused {r['duplicate_of']}" if r["duplicate_of"] else "analyzed"
+            print(f"     {r['business_name'][:32]:<32}  {(r['url'] or '')[:40]:<40}  {how}")
+    sites = sum(len(c) for c in clusters)
+    print(f"\n  {len(clusters)} cluster{'s' if len(clusters) != 1 else ''}, {sites} sites")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Prospect Store")
+    parser.add_argument("--db", default=db_path_from_env() or DEFAULT_DB,
+                        help="Database (default: $PROSPECT_DB or ~/.local/share/ace-growth/prospects.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    q = sub.add_parser("query", help="List prospects, lowest score first")
+    q.add_argument("--industry")
+    q.add_argument("--city")
+    q.add_argument("--min-score", type=int)
+    q.add_argument("--max-score", type=int)
+    q.add_argument("--since-days", type=float, help="Only prospects analyzed in the last N days")
+    q.add_argument("--order", choices=list(ORDERS), default="score")
+    q.add_argument("--limit", type=int)
+    q.add_argument("--json", action="store_true", help="Print JSON lines instead of a table")
+
+    show = sub.add_parser("show", help="Print one prospect as JSON")
+    show.add_argument("slug", help="Slug (the latest prospect under it) or site, e.g. acmeroofing.com")
+
+    sub.add_parser("stats", help="Prospects and average score per industry")
+
+    dup = sub.add_parser("duplicates", help="Clusters of near-duplicate (template or franchise) sites")
+    dup.add_argument("--distance", type=int, default=6, choices=range(SIMHASH_BANDS), metavar="BITS",
+                     help=f"Most differing SimHash bits, 0-{SIMHASH_BANDS - 1} (default: 6, as the analyzer)")
+    dup.add_argument("--json", action="store_true", help="Print one JSON line per cluster")
+    args = parser.parse_args()
+
+    with ProspectStore(args.db) as store:
+        if args.command == "query":
+            since = time.time() - args.since_days * 86400 if args.since_days is not None else None
+            rows = store.query(args.industry, args.city, args.min_score, args.max_score, since,
+                               args.order, args.limit)
+            if args.json:
+                for row in rows:
+                    print(json.dumps(row))
+            else:
+                print_rows(rows)
+        elif args.command == "show":
+            row = store.get(args.slug)
+            if not row:
+                print(f"  ❌ No prospect {args.slug}")
+                sys.exit(1)
+            row["checks"] = json.loads(row["checks"] or "{}")
+            row["research"] = json.loads(row["research"] or "{}")
+            print(json.dumps(row, indent=2))
+        elif args.command == "duplicates":
+            clusters = store.duplicate_clusters(args.distance)
+            if args.json:
+                for cluster in clusters:
+                    print(json.dumps(cluster))
+            else:
+                print_clusters(clusters)
+        else:
+            for industry, count, avg in store.stats():
+                print(f"  {industry:<14} {count:>6} prospects   avg score {avg}")
+
+
+if __name__ == "__main__":
+    main()
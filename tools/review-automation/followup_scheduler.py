@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Follow-up Scheduler
+
+Sends due review follow-ups from the tracker store's queue: pending follow-ups
+indexed by (status, followup_date) in data/review-tracker.db, so each pop is
+one index lookup however many follow-ups have ever been scheduled.
+
+Each follow-up is claimed (pending -> sending) in its own transaction before it
+is sent, its send is logged to the tracker CSV as fu_<request id>, and only
+then is it marked sent or failed. Claims left behind by a run that crashed are
+settled at the start of the next one: if the send was logged it is marked
+from that, otherwise it becomes "unconfirmed" and is never re-sent on its
+own — check the Twilio/SMTP logs, then `tracker.sh requeue ID` to send again.
+
+Deliveries reuse review_sender.py: pooled SMTP/Twilio connections, rate limits
+and --concurrency parallel sends.
+
+Usage:
+  python3 followup_scheduler.py run-due                  # send everything due today (cron)
+  python3 followup_scheduler.py run-due --dry-run        # list what is due
+  python3 followup_scheduler.py daemon --at 10:00        # stay up; send each day at 10:00
+"""
+
+import argparse
+import datetime
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from review_sender import CONFIG_FILE, Sender, load_config
+from tracker_store import (BLUE, GOLD, GREEN, NC, RED, TrackerStore, banner, followup_outcome,
+                           new_claim, today)
+
+
+# ──────────────────────────────────────
+# Dispatch
+# ──────────────────────────────────────
+
+def customer_from(fu):
+    return {"name": fu["name"] or "", "phone": fu["phone"] or "", "email": fu["email"] or "",
+            "company": fu["company"] or "", "review_link": fu["review_link"] or "",
+            "method": fu["method"] or "both", "job_id": ""}
+
+
+def report_recovered(settled):
+    for fu, status in settled:
+        if status == "unconfirmed":
+            print(f"  {RED}⚠️  Unconfirmed: {fu['name']} ({fu['company']}) — a previous run stopped "
+                  f"mid-send; check, then: tracker.sh requeue {fu['request_id']}{NC}")
+        else:
+            print(f"  {BLUE}↺ Recovered: {fu['name']} ({fu['company']}) — {status}{NC}")
+    if settled:
+        print()
+
+
+def run_due(store, sender, on=None, limit=None, stop=None):
+    """Pop follow-ups due by `on` and send up to sender.concurrency at a time; returns
+    (sent, failed). `stop` (an Event) ends the run after the sends in flight."""
+    claim = new_claim()
+    sent = failed = claimed = 0
+    in_flight = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, sender.concurrency)) as pool:
+            while True:
+                # Claim just enough to keep every worker busy
+                while (len(in_flight) < max(1, sender.concurrency) and not (stop and stop.is_set())
+                       and (limit is None or claimed < limit)):
+                    fu = store.claim_due(claim, on)
+                    if fu is None:
+                        break
+                    claimed += 1
+                    in_flight[pool.submit(sender.send_one, customer_from(fu))] = fu
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fu = in_flight.pop(future)
+                    try:
+                        row, _, notes = future.result()
+                    except Exception as e:
+                        # Unknown whether it went out, so never retried on its own
+                        store.finish_followup(fu["request_id"], claim, "unconfirmed")
+                        print(f"  {RED}❌ {fu['name']} ({fu['company']}) — {type(e).__name__}: {e}{NC}")
+                        failed += 1
+                        continue
+                    status = followup_outcome(row["status"])
+                    store.finish_followup(fu["request_id"], claim, status, row)
+                    icon = "✅" if status == "sent" else "⚠️ "
+                    print(f"  {icon} {fu['name']} ({fu['company']}) — {row['status']}  [due {fu['followup_date']}]")
+                    for note in notes:
+                        print(f"     {note}")
+                    sent += status == "sent"
+                    failed += status != "sent"
+    finally:
+        sender.twilio.close()
+        sender.smtp.close()
+    return sent, failed
+
+
+def cmd_run_due(store, sender, args):
+    day = args.on or today()
+    banner(f"📅 Processing Follow-ups ({day})")
+    report_recovered(store.recover_claims(args.lease))
+    if args.dry_run:
+        due = store.due(day)
+        for fu in due[:args.limit]:
+            print(f"  {GOLD}⏰ Due: {fu['name']} ({fu['company']}) — {fu['followup_date']}{NC}")
+        print()
+        print(f"  {BLUE}{len(due)} follow-up(s) due — dry run, nothing sent.{NC}")
+        print()
+        return 0
+    start = time.monotonic()
+    sent, failed = run_due(store, sender, day, args.limit)
+    if sent or failed:
+        print()
+        print(f"  {GREEN}Processed {sent + failed} follow-up(s) in {time.monotonic() - start:.1f}s.{NC}")
+        if failed:
+            print(f"  {RED}Failed: {failed} (tracker.sh requeue ID to retry){NC}")
+    else:
+        print(f"  {GREEN}No follow-ups due today.{NC}")
+    print()
+    return 1 if failed else 0
+
+
+def cmd_daemon(store, sender, args):
+    """Send due follow-ups every day at --at, sleeping until the next one is due."""
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    send_at = datetime.time.fromisoformat(args.at)
+    print(f"{GOLD}  ⏰ Follow-up scheduler running — sends at {args.at}{NC}")
+    while not stop.is_set():
+        now = datetime.datetime.now()
+        # A follow-up dated D is due at D --at, not at midnight
+        day = now.date() if now.time() >= send_at else now.date() - datetime.timedelta(days=1)
+        store.sync()
+        report_recovered(store.recover_claims(args.lease))
+        sent, failed = run_due(store, sender, day.isoformat(), stop=stop)
+        if sent or failed:
+            print(f"  {GREEN}{now:%Y-%m-%d %H:%M} — {sent} sent, {failed} failed{NC}")
+        sys.stdout.flush()
+        next_day = store.next_due()
+        delay = args.poll
+        if next_day:
+            due_at = datetime.datetime.combine(datetime.date.fromisoformat(next_day), send_at)
+            delay = min(args.poll, max(1.0, (due_at - datetime.datetime.now()).total_seconds()))
+        stop.wait(delay)
+    print(f"{GOLD}  Scheduler stopped{NC}")
+    return 0
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Follow-up Scheduler")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run-due", help="Send every follow-up due now and exit")
+    run.add_argument("--on", help="Treat this date as today (YYYY-MM-DD)")
+    run.add_argument("--limit", type=int, default=None, help="Send at most N follow-ups")
+    run.add_argument("--dry-run", action="store_true", help="List due follow-ups; send nothing")
+    daemon = sub.add_parser("daemon", help="Keep running and send follow-ups as they come due")
+    daemon.add_argument("--at", default="10:00", help="Time of day follow-ups go out (default: 10:00)")
+    daemon.add_argument("--poll", type=float, default=300,
+                        help="Longest sleep in seconds, to pick up new follow-ups (default: 300)")
+    for p in (run, daemon):
+        p.add_argument("--concurrency", type=int, default=4, help="Parallel deliveries (default: 4)")
+        p.add_argument("--sms-rate", type=float, default=None, help="SMS per second (default: SMS_RATE or 1)")
+        p.add_argument("--email-rate", type=float, default=None,
+                       help="Emails per second (default: EMAIL_RATE or 2)")
+        p.add_argument("--lease", type=float, default=900,
+                       help="Seconds before another run's claim counts as abandoned (default: 900)")
+        p.add_argument("--config", default=CONFIG_FILE, help="Config file (default: config.env)")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    sms_rate = args.sms_rate if args.sms_rate is not None else float(config.get("SMS_RATE") or 1)
+    email_rate = args.email_rate if args.email_rate is not None else float(config.get("EMAIL_RATE") or 2)
+    sender = Sender(config, args.concurrency, sms_rate, email_rate)
+    with TrackerStore() as store:
+        if args.command == "run-due":
+            sys.exit(cmd_run_due(store, sender, args))
+        sys.exit(cmd_daemon(store, sender, args))
+
+
+if __name__ == "__main__":
+    main()
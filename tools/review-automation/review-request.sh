@@ -12,6 +12,9 @@
 #                        [--method sms|email|both] \
 #                        [--schedule-followup]
 #
+#    ./review-request.sh --bulk customers.csv [--method sms|email|both] \
+#                        [--schedule-followup]
+#
 #  © 2025 Ace Growth (acegrowth.net)
 # ═══════════════════════════════════════════════════════════
 
@@ -19,7 +22,7 @@ set -euo pipefail
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 TRACKER_CSV="${SCRIPT_DIR}/data/review-tracker.csv"
-FOLLOWUP_DIR="${SCRIPT_DIR}/data/followups"
+TRACKER_STORE="${SCRIPT_DIR}/tracker_store.py"
 SMS_TEMPLATE="${SCRIPT_DIR}/templates/sms-template.txt"
 EMAIL_TEMPLATE="${SCRIPT_DIR}/templates/email-template.html"
 CONFIG_FILE="${SCRIPT_DIR}/config.env"
@@ -58,6 +61,7 @@ REVIEW_LINK="${DEFAULT_REVIEW_LINK}"
 METHOD="both"
 SCHEDULE_FOLLOWUP=false
 JOB_ID=""
+BULK_FILE=""
 
 usage() {
   echo -e "${GOLD}═══════════════════════════════════════════${NC}"
@@ -79,11 +83,13 @@ usage() {
   echo "  --method METHOD       sms, email, or both (default: both)"
   echo "  --schedule-followup   Schedule a 3-day follow-up reminder"
   echo "  --job-id ID           Job/invoice reference number"
+  echo "  --bulk FILE           Send to every customer in a CSV/JSONL file (see README)"
   echo "  --help                Show this help"
   echo ""
   echo "Examples:"
   echo "  $0 --name 'John Smith' --phone '+13175551234' --review-link 'https://g.page/r/xxx/review'"
   echo "  $0 --name 'Jane Doe' --email 'jane@example.com' --method email --schedule-followup"
+  echo "  $0 --bulk customers.csv --schedule-followup"
   exit 0
 }
 
@@ -97,11 +103,21 @@ while [[ $# -gt 0 ]]; do
     --method) METHOD="$2"; shift 2;;
     --schedule-followup) SCHEDULE_FOLLOWUP=true; shift;;
     --job-id) JOB_ID="$2"; shift 2;;
+    --bulk) BULK_FILE="$2"; shift 2;;
     --help) usage;;
     *) echo -e "${RED}Unknown option: $1${NC}"; usage;;
   esac
 done
 
+# ─── Bulk mode: one process, pooled connections ───
+if [[ -n "$BULK_FILE" ]]; then
+  BULK_ARGS=(--method "$METHOD")
+  [[ -n "$COMPANY" ]] && BULK_ARGS+=(--company "$COMPANY")
+  [[ -n "$REVIEW_LINK" ]] && BULK_ARGS+=(--review-link "$REVIEW_LINK")
+  [[ "$SCHEDULE_FOLLOWUP" == true ]] && BULK_ARGS+=(--schedule-followup)
+  exec python3 "${SCRIPT_DIR}/review_sender.py" "$BULK_FILE" "${BULK_ARGS[@]}" --config "$CONFIG_FILE"
+fi
+
 # ─── Validate ───
 if [[ -z "$NAME" ]]; then
   echo -e "${RED}Error: --name is required${NC}"
@@ -119,12 +135,7 @@ if [[ -z "$REVIEW_LINK" ]]; then
 fi
 
 # ─── Setup directories ───
-mkdir -p "$(dirname "$TRACKER_CSV")" "$FOLLOWUP_DIR"
-
-# Initialize CSV if it doesn't exist
-if [[ ! -f "$TRACKER_CSV" ]]; then
-  echo "id,timestamp,name,phone,email,company,review_link,method,status,followup_scheduled,followup_sent,job_id" > "$TRACKER_CSV"
-fi
+mkdir -p "$(dirname "$TRACKER_CSV")"
 
 # ─── Generate request ID ───
 REQUEST_ID="req_$(date +%s)_$(head -c 4 /dev/urandom | xxd -p)"
@@ -292,31 +303,30 @@ fi
 
 # ─── Schedule follow-up ───
 FOLLOWUP_SCHEDULED="no"
+FOLLOWUP_DATE=""
 if [[ "$SCHEDULE_FOLLOWUP" == true ]]; then
   FOLLOWUP_DATE=$(date -d "+3 days" +"%Y-%m-%d" 2>/dev/null || date -v+3d +"%Y-%m-%d" 2>/dev/null || echo "")
   if [[ -n "$FOLLOWUP_DATE" ]]; then
-    cat > "${FOLLOWUP_DIR}/${REQUEST_ID}.json" << EOF
-{
-  "request_id": "${REQUEST_ID}",
-  "name": "${NAME}",
-  "first_name": "${FIRST_NAME}",
-  "phone": "${PHONE}",
-  "email": "${EMAIL}",
-  "company": "${COMPANY}",
-  "review_link": "${REVIEW_LINK}",
-  "method": "${METHOD}",
-  "followup_date": "${FOLLOWUP_DATE}",
-  "original_date": "${TIMESTAMP}",
-  "status": "pending"
-}
-EOF
     FOLLOWUP_SCHEDULED="yes (${FOLLOWUP_DATE})"
     echo -e "${GREEN}📅 Follow-up scheduled for ${FOLLOWUP_DATE}${NC}"
   fi
 fi
 
-# ─── Log to tracker CSV ───
-echo "${REQUEST_ID},${TIMESTAMP},\"${NAME}\",\"${PHONE}\",\"${EMAIL}\",\"${COMPANY}\",\"${REVIEW_LINK}\",${METHOD},sms:${SMS_STATUS}/email:${EMAIL_STATUS},${FOLLOWUP_SCHEDULED},no,\"${JOB_ID}\"" >> "$TRACKER_CSV"
+# ─── Log to tracker (CSV log + indexed store) ───
+python3 "$TRACKER_STORE" add \
+  --id "$REQUEST_ID" \
+  --timestamp "$TIMESTAMP" \
+  --name "$NAME" \
+  --phone "$PHONE" \
+  --email "$EMAIL" \
+  --company "$COMPANY" \
+  --review-link "$REVIEW_LINK" \
+  --method "$METHOD" \
+  --status "sms:${SMS_STATUS}/email:${EMAIL_STATUS}" \
+  --followup-scheduled "$FOLLOWUP_SCHEDULED" \
+  --followup-sent no \
+  --job-id "$JOB_ID" \
+  ${FOLLOWUP_DATE:+--followup-date "$FOLLOWUP_DATE" --first-name "$FIRST_NAME"}
 
 # ─── Summary ───
 echo ""
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Bulk Review Requests
+
+Sends review requests to a whole customer list in one run, with the same
+messages, statuses and tracker rows as review-request.sh:
+
+  - templates/sms-template.txt and email-template.html are compiled once
+  - each worker thread keeps one SMTP connection (STARTTLS + login once) and
+    one keep-alive HTTPS connection to Twilio for the whole run
+  - --concurrency bounds the workers; SMS and email each have a token-bucket
+    rate limit (--sms-rate / --email-rate, messages per second)
+  - tracker rows (and follow-ups) are written in batches as results come in,
+    and whatever is left when the run stops, so a run cut short is still logged
+    and --resume skips who it already reached
+
+Customers come from a CSV with a header row or from JSONL, with the fields
+name, phone, email, company, review_link, method, job_id (company, review
+link and method default as in review-request.sh).
+
+config.env also takes TWILIO_API_URL (default https://api.twilio.com) and
+SMTP_TLS (starttls, ssl or none), so a run can be pointed at a mock HTTP
+endpoint and a local SMTP sink.
+
+Usage:
+  python3 review_sender.py customers.csv
+  python3 review_sender.py jobs.jsonl --schedule-followup --concurrency 8 --sms-rate 1
+  python3 review_sender.py customers.csv --dry-run        # render and log previews, send nothing
+  python3 review_sender.py customers.csv --resume         # after a run was cut short
+"""
+
+import argparse
+import base64
+import csv
+import datetime
+import http.client
+import io
+import json
+import os
+import re
+import secrets
+import shlex
+import smtplib
+import ssl
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from urllib.parse import urlencode, urlsplit
+
+from tracker_store import BLUE, GOLD, GREEN, NC, RED, TRACKER_CSV, TrackerStore
+
+
+# Tracker rows are flushed every FLUSH_ROWS results or FLUSH_SECONDS, whichever comes first
+FLUSH_ROWS = 25
+FLUSH_SECONDS = 5
+
+# --resume skips customers reached this recently
+RESUME_HOURS = 24
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(SCRIPT_DIR, "config.env")
+SMS_TEMPLATE = os.path.join(SCRIPT_DIR, "templates", "sms-template.txt")
+EMAIL_TEMPLATE = os.path.join(SCRIPT_DIR, "templates", "email-template.html")
+
+# review-request.sh's defaults; config.env overrides the environment, as `source` does
+DEFAULTS = {
+    "TWILIO_SID": "", "TWILIO_TOKEN": "", "TWILIO_FROM": "",
+    "TWILIO_API_URL": "https://api.twilio.com",
+    "SMTP_HOST": "smtp.gmail.com", "SMTP_PORT": "587", "SMTP_USER": "", "SMTP_PASS": "",
+    "SMTP_TLS": "starttls",
+    "FROM_EMAIL": "", "FROM_NAME": "Ace Growth",
+    "DEFAULT_COMPANY": "Our Company", "DEFAULT_REVIEW_LINK": "",
+}
+
+# Used when a template file is missing, as in review-request.sh
+SMS_FALLBACK = ("Hey {{NAME}}, thanks for choosing {{COMPANY}}! If you loved the work, "
+                "a Google review would mean the world to us: {{REVIEW_LINK}}")
+EMAIL_FALLBACK = ("<html><body><h1>Thanks, {{NAME}}!</h1><p>If you loved working with {{COMPANY}}, "
+                  "please leave us a review!</p><a href='{{REVIEW_LINK}}'>Leave a Review</a></body></html>")
+FOLLOWUP_DAYS = 3
+
+
+def load_config(path=CONFIG_FILE):
+    """KEY="value" lines from config.env over the environment over the defaults."""
+    config = {key: os.environ.get(key) or value for key, value in DEFAULTS.items()}
+    try:
+        with open(path, "r") as f:
+            lines = f.readlines()
+    except OSError:
+        return config
+    for line in lines:
+        m = re.match(r'\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)=(.*)', line)
+        if m:
+            try:
+                words = shlex.split(m.group(2), comments=True)
+            except ValueError:
+                continue
+            config[m.group(1)] = words[0] if words else ""
+    return config
+
+
+class Template:
+    """A message template with {{PLACEHOLDER}} slots, split once and filled per customer."""
+
+    def __init__(self, text):
+        parts = re.split(r'\{\{([A-Z_]+)\}\}', text)
+        self.segments = parts[0::2]
+        self.slots = parts[1::2]
+
+    @classmethod
+    def load(cls, path, fallback):
+        try:
+            with open(path, "r") as f:
+                return cls(f.read())
+        except OSError:
+            return cls(fallback)
+
+    def render(self, values):
+        out = [self.segments[0]]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            out.append(values.get(slot, "{{%s}}" % slot))
+            out.append(segment)
+        # review-request.sh reads the rendered text through $(...), which drops trailing newlines
+        return "".join(out).rstrip("\n")
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, in bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# ──────────────────────────────────────
+# Delivery
+# ──────────────────────────────────────
+
+class TwilioClient:
+    """Twilio Messages API over one keep-alive connection per thread."""
+
+    def __init__(self, config, bucket, timeout=30):
+        self.sid, self.token, self.sender = config["TWILIO_SID"], config["TWILIO_TOKEN"], config["TWILIO_FROM"]
+        api = urlsplit(config["TWILIO_API_URL"])
+        self.scheme, self.host, self.prefix = api.scheme, api.netloc, api.path.rstrip("/")
+        self.auth = "Basic " + base64.b64encode(f"{self.sid}:{self.token}".encode()).decode()
+        self.bucket = bucket
+        self.timeout = timeout
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    @property
+    def configured(self):
+        return bool(self.sid and self.token and self.sender)
+
+    def _connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = self.local.conn = cls(self.host, timeout=self.timeout)
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    def send(self, to, body):
+        """(True, message SID) or (False, error)."""
+        path = f"{self.prefix}/2010-04-01/Accounts/{self.sid}/Messages.json"
+        form = urlencode({"Body": body, "From": self.sender, "To": to})
+        headers = {"Authorization": self.auth, "Content-Type": "application/x-www-form-urlencoded"}
+        for attempt in range(3):
+            self.bucket.acquire()
+            conn = self._connection()
+            try:
+                conn.request("POST", path, form, headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                # The server dropped an idle keep-alive connection before taking
+                # the request: reconnect and retry. Other errors (timeouts) may
+                # have sent the message, so they aren't retried.
+                conn.close()
+                if attempt == 2:
+                    return False, f"{type(e).__name__}: {e}"
+                continue
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                return False, f"{type(e).__name__}: {e}"
+            if resp.status == 429 and attempt < 2:
+                time.sleep(float(resp.getheader("Retry-After") or 1))
+                continue
+            try:
+                sid = json.loads(data).get("sid")
+            except (ValueError, AttributeError):
+                sid = None
+            if sid:
+                return True, sid
+            return False, f"HTTP {resp.status}: {data[:200].decode(errors='replace')}"
+        return False, "rate limited"
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+        self.connections = []
+
+
+class SmtpClient:
+    """One logged-in SMTP connection per thread, reused for every message."""
+
+    def __init__(self, config, bucket, timeout=30):
+        self.host, self.port = config["SMTP_HOST"], int(config["SMTP_PORT"] or 587)
+        self.user, self.password = config["SMTP_USER"], config["SMTP_PASS"]
+        self.tls = config["SMTP_TLS"].lower()
+        self.bucket = bucket
+        self.timeout = timeout
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    @property
+    def configured(self):
+        return bool(self.user and self.password)
+
+    def _connect(self):
+        if self.tls == "ssl":
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout,
+                                    context=ssl.create_default_context())
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.tls == "starttls":
+                smtp.starttls(context=ssl.create_default_context())
+        smtp.ehlo_or_helo_if_needed()
+        if self.tls != "none" or smtp.has_extn("auth"):
+            smtp.login(self.user, self.password)
+        with self.lock:
+            self.connections.append(smtp)
+        return smtp
+
+    def send(self, message):
+        """(True, "") or (False, error)."""
+        self.bucket.acquire()
+        for attempt in range(2):
+            try:
+                smtp = getattr(self.local, "smtp", None)
+                if smtp is None:
+                    smtp = self.local.smtp = self._connect()
+                smtp.send_message(message)
+                return True, ""
+            except smtplib.SMTPServerDisconnected as e:
+                self.local.smtp = None
+                if attempt == 1:
+                    return False, f"disconnected: {e}"
+            except (smtplib.SMTPException, OSError) as e:
+                self.local.smtp = None
+                return False, f"{type(e).__name__}: {e}"
+        return False, "disconnected"
+
+    def close(self):
+        for smtp in self.connections:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+        self.connections = []
+
+
+# ──────────────────────────────────────
+# Customers
+# ──────────────────────────────────────
+
+FIELDS = ["name", "phone", "email", "company", "review_link", "method", "job_id"]
+
+
+def read_customers(path):
+    """[(line, record dict)] from a CSV with a header row or a JSONL file."""
+    with open(path, "r", newline="") as f:
+        text = f.read()
+    records = []
+    if path.endswith((".jsonl", ".json")) or text.lstrip().startswith("{"):
+        for line_no, line in enumerate(text.splitlines(), 1):
+            if line.strip():
+                try:
+                    records.append((line_no, json.loads(line)))
+                except ValueError as e:
+                    records.append((line_no, f"invalid JSON: {e}"))
+        return records
+    reader = csv.DictReader(io.StringIO(text))
+    for row in reader:
+        record = {re.sub(r'[\s-]+', '_', (k or "").strip().lower()): (v or "").strip() for k, v in row.items()}
+        records.append((reader.line_num, record))
+    return records
+
+
+def normalize(record, defaults):
+    """Fill defaults and validate like review-request.sh; returns (customer, error)."""
+    if not isinstance(record, dict):
+        return None, record
+    customer = {field: str(record.get(field) or "").strip() for field in FIELDS}
+    customer["company"] = customer["company"] or defaults["company"]
+    customer["review_link"] = customer["review_link"] or defaults["review_link"]
+    customer["method"] = (customer["method"] or defaults["method"]).lower()
+    if not customer["name"]:
+        return None, "name is required"
+    if not customer["phone"] and not customer["email"]:
+        return None, "phone or email is required"
+    if not customer["review_link"]:
+        return None, "review link is required"
+    if customer["method"] not in ("sms", "email", "both"):
+        return None, f"unknown method {customer['method']!r}"
+    return customer, None
+
+
+# ──────────────────────────────────────
+# Sending
+# ──────────────────────────────────────
+
+class Sender:
+    def __init__(self, config, concurrency=4, sms_rate=1.0, email_rate=2.0, dry_run=False):
+        self.config = config
+        self.sms_template = Template.load(SMS_TEMPLATE, SMS_FALLBACK)
+        self.email_template = Template.load(EMAIL_TEMPLATE, EMAIL_FALLBACK)
+        self.text_template = Template(SMS_FALLBACK)  # plain-text part of the email
+        self.twilio = TwilioClient(config, TokenBucket(sms_rate, burst=max(1, sms_rate)))
+        self.smtp = SmtpClient(config, TokenBucket(email_rate, burst=max(1, email_rate)))
+        self.concurrency = concurrency
+        self.dry_run = dry_run
+
+    def email_message(self, customer, values):
+        msg = EmailMessage()
+        msg["From"] = f"{self.config['FROM_NAME']} <{self.config['FROM_EMAIL']}>"
+        msg["To"] = customer["email"]
+        msg["Subject"] = f"Thanks for choosing {customer['company']}! 🏠"
+        msg.set_content(self.text_template.render(values))
+        msg.add_alternative(self.email_template.render(values), subtype="html")
+        return msg
+
+    def send_one(self, customer):
+        """Deliver one request; returns its tracker row plus a note per channel."""
+        values = {
+            "NAME": customer["name"].split()[0] if customer["name"].split() else "",
+            "FULL_NAME": customer["name"],
+            "COMPANY": customer["company"],
+            "REVIEW_LINK": customer["review_link"],
+            "PHONE": self.config["TWILIO_FROM"],
+        }
+        sms_status = email_status = "skipped"
+        notes = []
+        if customer["method"] in ("sms", "both") and customer["phone"]:
+            body = self.sms_template.render(values)
+            if self.dry_run or not self.twilio.configured:
+                sms_status = "preview"
+            else:
+                ok, detail = self.twilio.send(customer["phone"], body)
+                sms_status = "sent" if ok else "failed"
+                if not ok:
+                    notes.append(f"SMS failed: {detail}")
+        if customer["method"] in ("email", "both") and customer["email"]:
+            message = self.email_message(customer, values)
+            if self.dry_run or not self.smtp.configured:
+                email_status = "preview"
+            else:
+                ok, detail = self.smtp.send(message)
+                email_status = "sent" if ok else "failed"
+                if not ok:
+                    notes.append(f"email failed: {detail}")
+        row = {
+            "id": f"req_{int(time.time())}_{secrets.token_hex(4)}",
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "name": customer["name"], "phone": customer["phone"], "email": customer["email"],
+            "company": customer["company"], "review_link": customer["review_link"],
+            "method": customer["method"], "status": f"sms:{sms_status}/email:{email_status}",
+            "followup_scheduled": "no", "followup_sent": "no", "job_id": customer["job_id"],
+        }
+        return row, values["NAME"], notes
+
+    def send_all(self, customers):
+        """Send every customer's request; results come back in input order."""
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+                yield from pool.map(self.send_one, customers)
+        finally:
+            self.twilio.close()
+            self.smtp.close()
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Bulk Review Requests")
+    parser.add_argument("customers", help="CSV (with header) or JSONL of customers")
+    parser.add_argument("--method", choices=["sms", "email", "both"], default="both",
+                        help="Default method for rows without one (default: both)")
+    parser.add_argument("--company", help="Default company (default: DEFAULT_COMPANY)")
+    parser.add_argument("--review-link", help="Default review link (default: DEFAULT_REVIEW_LINK)")
+    parser.add_argument("--schedule-followup", action="store_true",
+                        help=f"Schedule a {FOLLOWUP_DAYS}-day follow-up for every request")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel deliveries (default: 4)")
+    parser.add_argument("--sms-rate", type=float, default=None,
+                        help="SMS per second (default: SMS_RATE or 1; 0 = unlimited)")
+    parser.add_argument("--email-rate", type=float, default=None,
+                        help="Emails per second (default: EMAIL_RATE or 2; 0 = unlimited)")
+    parser.add_argument("--dry-run", action="store_true", help="Render and log previews; send nothing")
+    parser.add_argument("--resume", action="store_true",
+                        help=f"Skip customers already sent a request by the same company in the last {RESUME_HOURS}h")
+    parser.add_argument("--config", default=CONFIG_FILE, help="Config file (default: config.env)")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    sms_rate = args.sms_rate if args.sms_rate is not None else float(config.get("SMS_RATE") or 1)
+    email_rate = args.email_rate if args.email_rate is not None else float(config.get("EMAIL_RATE") or 2)
+    defaults = {"company": args.company or config["DEFAULT_COMPANY"],
+                "review_link": args.review_link or config["DEFAULT_REVIEW_LINK"],
+                "method": args.method}
+
+    customers, skipped = [], 0
+    for line_no, record in read_customers(args.customers):
+        customer, error = normalize(record, defaults)
+        if error:
+            print(f"  {RED}❌ Line {line_no}: {error}{NC}")
+            skipped += 1
+        else:
+            customers.append(customer)
+
+    resumed = 0
+    if args.resume:
+        since = (datetime.datetime.now(datetime.timezone.utc)
+                 - datetime.timedelta(hours=RESUME_HOURS)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        with TrackerStore() as store:
+            reached = store.delivered_since(since)
+        remaining = []
+        for customer in customers:
+            company = customer["company"].lower()
+            if (company, customer["phone"]) in reached or (company, customer["email"].lower()) in reached:
+                resumed += 1
+            else:
+                remaining.append(customer)
+        customers = remaining
+
+    sender = Sender(config, args.concurrency, sms_rate, email_rate, args.dry_run)
+    print(f"{GOLD}═══════════════════════════════════════════{NC}")
+    print(f"{GOLD}  📋 Sending {len(customers)} Review Request(s){NC}")
+    print(f"{GOLD}═══════════════════════════════════════════{NC}")
+    if resumed:
+        print(f"  {BLUE}Resuming — {resumed} customer(s) already reached, skipped{NC}")
+    if args.dry_run:
+        print(f"  {BLUE}Dry run — nothing will be sent{NC}")
+    else:
+        if not sender.twilio.configured:
+            print(f"  {GOLD}⚠️  Twilio not configured — SMS logged as preview{NC}")
+        if not sender.smtp.configured:
+            print(f"  {GOLD}⚠️  SMTP not configured — email logged as preview{NC}")
+    print()
+
+    followup_date = ""
+    if args.schedule_followup:
+        followup_date = (datetime.date.today() + datetime.timedelta(days=FOLLOWUP_DAYS)).isoformat()
+
+    rows, followups = [], []
+    counts = {"sms:sent": 0, "email:sent": 0, "failed": 0, "logged": 0}
+    start = last_flush = time.monotonic()
+    interrupted = False
+    store = TrackerStore()
+
+    def flush():
+        # One append and one transaction per batch
+        store.add_many(rows, followups)
+        counts["logged"] += len(rows)
+        rows.clear()
+        followups.clear()
+
+    try:
+        for row, first_name, notes in sender.send_all(customers):
+            failed = "failed" in row["status"]
+            icon = "⚠️ " if failed else "✅"
+            print(f"  {icon} {row['name']} ({row['company']}) — {row['status']}")
+            for note in notes:
+                print(f"     {note}")
+            counts["sms:sent"] += "sms:sent" in row["status"]
+            counts["email:sent"] += "email:sent" in row["status"]
+            counts["failed"] += failed
+            if followup_date:
+                row["followup_scheduled"] = f"yes ({followup_date})"
+                followups.append({"request_id": row["id"], "followup_date": followup_date, "name": row["name"],
+                                  "first_name": first_name, "phone": row["phone"], "email": row["email"],
+                                  "company": row["company"], "review_link": row["review_link"],
+                                  "method": row["method"], "original_date": row["timestamp"]})
+            rows.append(row)
+            if len(rows) >= FLUSH_ROWS or time.monotonic() - last_flush >= FLUSH_SECONDS:
+                flush()
+                last_flush = time.monotonic()
+    except KeyboardInterrupt:
+        interrupted = True
+    finally:
+        flush()
+        store.close()
+
+    print()
+    if interrupted:
+        print(f"{GOLD}═══════════════════════════════════════════{NC}")
+        print(f"{GOLD}  ⚠️  Interrupted — rerun with --resume for the rest{NC}")
+        print(f"{GOLD}═══════════════════════════════════════════{NC}")
+    else:
+        print(f"{GREEN}═══════════════════════════════════════════{NC}")
+        print(f"{GREEN}  ✅ Bulk Review Requests Complete{NC}")
+        print(f"{GREEN}═══════════════════════════════════════════{NC}")
+    print(f"  Requests:    {counts['logged']} in {time.monotonic() - start:.1f}s")
+    print(f"  SMS sent:    {counts['sms:sent']}")
+    print(f"  Emails sent: {counts['email:sent']}")
+    if counts["failed"]:
+        print(f"  {RED}Failed:      {counts['failed']}{NC}")
+    if skipped:
+        print(f"  {RED}Skipped:     {skipped} invalid row(s){NC}")
+    if followup_date:
+        print(f"  Follow-up:   {followup_date}")
+    print(f"  Logged to:   {TRACKER_CSV}")
+    print()
+    sys.exit(1 if counts["failed"] or skipped or interrupted else 0)
+
+
+if __name__ == "__main__":
+    main()
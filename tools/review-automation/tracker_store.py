@@ -0,0 +1,637 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Review Tracker Store
+
+Indexed storage behind tracker.sh and review-request.sh. data/review-tracker.csv
+stays the append-only log of every request; data/review-tracker.db indexes it:
+
+  requests   — one row per request, indexed by id, name, company, status, time
+  search     — full-text index over name, company, email, phone and job id
+  followups  — scheduled follow-ups, indexed by (status, followup_date); the
+               index is the queue followup_scheduler.py pops due items from
+  counters / companies / daily — stats kept current by triggers on insert
+  client_daily — per-company, per-day counts of requests, follow-ups, SMS and
+               emails sent, and reviews marked, kept by triggers as each is
+               written; monthly client reports read only these
+
+The store remembers how far into the CSV it has read, so each command only
+ingests rows appended since the last one (including rows written by older
+scripts). Follow-up files left in data/followups/ are imported once.
+
+Usage:
+  python3 tracker_store.py add --id ID --timestamp TS --name NAME ... [--followup-date YYYY-MM-DD]
+  python3 tracker_store.py list [--pending]
+  python3 tracker_store.py stats
+  python3 tracker_store.py search QUERY
+  python3 tracker_store.py due             # due follow-ups as JSON lines
+  python3 tracker_store.py mark-reviewed ID
+  python3 tracker_store.py requeue ID       # retry a failed/unconfirmed follow-up
+"""
+
+import argparse
+import csv
+import datetime
+import glob
+import io
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Claim tokens are shared with the prospect orchestrator's queue (tools/claims.py)
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+from claims import claim_alive, new_claim
+
+DATA_DIR = os.path.join(SCRIPT_DIR, "data")
+TRACKER_CSV = os.path.join(DATA_DIR, "review-tracker.csv")
+TRACKER_DB = os.path.join(DATA_DIR, "review-tracker.db")
+FOLLOWUP_DIR = os.path.join(DATA_DIR, "followups")
+
+CSV_HEADER = ["id", "timestamp", "name", "phone", "email", "company", "review_link", "method",
+              "status", "followup_scheduled", "followup_sent", "job_id"]
+# Columns review-request.sh has always written inside quotes
+QUOTED = {"name", "phone", "email", "company", "review_link", "job_id"}
+
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+GOLD = "\033[0;33m"
+BLUE = "\033[0;34m"
+CYAN = "\033[0;36m"
+BOLD = "\033[1m"
+NC = "\033[0m"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    id                 TEXT PRIMARY KEY,
+    seq                INTEGER NOT NULL,     -- position in the CSV log
+    timestamp          TEXT NOT NULL,
+    name               TEXT NOT NULL COLLATE NOCASE,
+    phone              TEXT,
+    email              TEXT,
+    company            TEXT COLLATE NOCASE,
+    review_link        TEXT,
+    method             TEXT,
+    status             TEXT,
+    followup_scheduled TEXT,
+    followup_sent      TEXT,
+    job_id             TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_requests_seq ON requests (seq);
+CREATE INDEX IF NOT EXISTS idx_requests_name ON requests (name);
+CREATE INDEX IF NOT EXISTS idx_requests_company ON requests (company);
+CREATE INDEX IF NOT EXISTS idx_requests_status ON requests (status);
+CREATE INDEX IF NOT EXISTS idx_requests_timestamp ON requests (timestamp);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5 (
+    id UNINDEXED, name, company, email, phone, job_id, tokenize = 'unicode61'
+);
+
+CREATE TABLE IF NOT EXISTS followups (
+    request_id    TEXT PRIMARY KEY,
+    followup_date TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    name          TEXT,
+    first_name    TEXT,
+    phone         TEXT,
+    email         TEXT,
+    company       TEXT,
+    review_link   TEXT,
+    method        TEXT,
+    original_date TEXT,
+    claim         TEXT,     -- set while a scheduler is sending it
+    claimed_at    REAL,
+    finished_at   REAL
+);
+CREATE INDEX IF NOT EXISTS idx_followups_due ON followups (status, followup_date);
+
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS companies (company TEXT PRIMARY KEY, requests INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS daily (day TEXT PRIMARY KEY, requests INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS client_daily (
+    day           TEXT NOT NULL,     -- UTC, as request timestamps are
+    company       TEXT NOT NULL COLLATE NOCASE,
+    requests      INTEGER NOT NULL DEFAULT 0,
+    followups     INTEGER NOT NULL DEFAULT 0,     -- follow-up sends (logged as fu_<request id>)
+    sms_sent      INTEGER NOT NULL DEFAULT 0,
+    email_sent    INTEGER NOT NULL DEFAULT 0,
+    reviews       INTEGER NOT NULL DEFAULT 0,     -- marked reviewed
+    PRIMARY KEY (day, company)
+);
+
+INSERT OR IGNORE INTO counters (name) VALUES
+    ('total'), ('sms_sent'), ('email_sent'), ('pending_followups'), ('companies'),
+    ('csv_offset'), ('csv_rows'), ('followup_files_imported');
+
+CREATE TRIGGER IF NOT EXISTS requests_stats AFTER INSERT ON requests BEGIN
+    UPDATE counters SET value = value + 1 WHERE name = 'total';
+    UPDATE counters SET value = value + 1 WHERE name = 'sms_sent' AND instr(NEW.status, 'sms:sent') > 0;
+    UPDATE counters SET value = value + 1 WHERE name = 'email_sent' AND instr(NEW.status, 'email:sent') > 0;
+    INSERT INTO companies (company, requests) VALUES (COALESCE(NEW.company, ''), 1)
+        ON CONFLICT (company) DO UPDATE SET requests = requests + 1;
+    INSERT INTO daily (day, requests) VALUES (substr(NEW.timestamp, 1, 10), 1)
+        ON CONFLICT (day) DO UPDATE SET requests = requests + 1;
+    INSERT INTO search (id, name, company, email, phone, job_id)
+        VALUES (NEW.id, NEW.name, NEW.company, NEW.email, NEW.phone, NEW.job_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS requests_client_daily AFTER INSERT ON requests BEGIN
+    INSERT INTO client_daily (day, company, requests, followups, sms_sent, email_sent)
+        VALUES (substr(NEW.timestamp, 1, 10), COALESCE(NEW.company, ''), substr(NEW.id, 1, 3) != 'fu_',
+                substr(NEW.id, 1, 3) = 'fu_', instr(NEW.status, 'sms:sent') > 0, instr(NEW.status, 'email:sent') > 0)
+        ON CONFLICT (day, company) DO UPDATE SET
+            requests = requests + excluded.requests, followups = followups + excluded.followups,
+            sms_sent = sms_sent + excluded.sms_sent, email_sent = email_sent + excluded.email_sent;
+END;
+
+CREATE TRIGGER IF NOT EXISTS companies_count AFTER INSERT ON companies BEGIN
+    UPDATE counters SET value = value + 1 WHERE name = 'companies';
+END;
+
+CREATE TRIGGER IF NOT EXISTS followups_added AFTER INSERT ON followups WHEN NEW.status = 'pending' BEGIN
+    UPDATE counters SET value = value + 1 WHERE name = 'pending_followups';
+END;
+
+CREATE TRIGGER IF NOT EXISTS followups_status AFTER UPDATE OF status ON followups BEGIN
+    UPDATE counters
+       SET value = value + (NEW.status = 'pending') - (OLD.status = 'pending')
+     WHERE name = 'pending_followups';
+END;
+
+CREATE TRIGGER IF NOT EXISTS followups_reviewed AFTER UPDATE OF status ON followups
+WHEN NEW.status = 'reviewed' AND OLD.status != 'reviewed' BEGIN
+    INSERT INTO client_daily (day, company, reviews) VALUES (date('now'), COALESCE(NEW.company, ''), 1)
+        ON CONFLICT (day, company) DO UPDATE SET reviews = reviews + 1;
+END;
+
+-- Follow-ups that arrive already reviewed (legacy data/followups files), dated as rebuild_rollups() dates them
+CREATE TRIGGER IF NOT EXISTS followups_imported_reviewed AFTER INSERT ON followups
+WHEN NEW.status = 'reviewed' BEGIN
+    INSERT INTO client_daily (day, company, reviews)
+        VALUES (COALESCE(date(NEW.finished_at, 'unixepoch'), NEW.followup_date), COALESCE(NEW.company, ''), 1)
+        ON CONFLICT (day, company) DO UPDATE SET reviews = reviews + 1;
+END;
+"""
+
+
+def today():
+    return datetime.date.today().isoformat()
+
+
+def followup_send_id(request_id):
+    """The tracker id a follow-up's send is logged under."""
+    return f"fu_{request_id}"
+
+
+def followup_outcome(status):
+    """A follow-up's status from its send's tracker status ("sms:sent/email:failed"): failed
+    only if nothing went out; previews count as sent, as review-request.sh logs them."""
+    channels = re.findall(r":(\w+)", status or "")
+    return "failed" if "failed" in channels and "sent" not in channels else "sent"
+
+
+def csv_line(row):
+    """A tracker CSV line in review-request.sh's layout (free-text columns always quoted)."""
+    out = []
+    for column in CSV_HEADER:
+        value = str(row.get(column) or "")
+        if column in QUOTED or any(c in value for c in ',"\n'):
+            value = '"' + value.replace('"', '""') + '"'
+        out.append(value)
+    return ",".join(out) + "\n"
+
+
+class TrackerStore:
+    def __init__(self, db_path=TRACKER_DB, csv_path=TRACKER_CSV, followup_dir=FOLLOWUP_DIR):
+        self.csv_path = csv_path
+        self.followup_dir = followup_dir
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db = sqlite3.connect(db_path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._migrate()
+        self.sync()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _migrate(self):
+        # Columns added after the first release of the store
+        columns = {row["name"] for row in self.db.execute("PRAGMA table_info(followups)")}
+        for column, kind in (("claim", "TEXT"), ("claimed_at", "REAL"), ("finished_at", "REAL")):
+            if column not in columns:
+                self.db.execute(f"ALTER TABLE followups ADD COLUMN {column} {kind}")
+        # Stores from before client_daily: count the history once, triggers take it from there
+        if ((self.db.execute("SELECT 1 FROM requests LIMIT 1").fetchone()
+             or self.db.execute("SELECT 1 FROM followups LIMIT 1").fetchone())
+                and not self.db.execute("SELECT 1 FROM client_daily LIMIT 1").fetchone()):
+            self.rebuild_rollups()
+
+    def rebuild_rollups(self):
+        """Recount client_daily from every request and follow-up in the store."""
+        with self.db:
+            self.db.execute("DELETE FROM client_daily")
+            self.db.execute(
+                "INSERT INTO client_daily (day, company, requests, followups, sms_sent, email_sent) "
+                "SELECT substr(timestamp, 1, 10), COALESCE(company, ''), SUM(substr(id, 1, 3) != 'fu_'), "
+                "SUM(substr(id, 1, 3) = 'fu_'), SUM(instr(status, 'sms:sent') > 0), "
+                "SUM(instr(status, 'email:sent') > 0) FROM requests WHERE true GROUP BY 1, 2 "
+                "ON CONFLICT (day, company) DO UPDATE SET requests = requests + excluded.requests, "
+                "followups = followups + excluded.followups, sms_sent = sms_sent + excluded.sms_sent, "
+                "email_sent = email_sent + excluded.email_sent")
+            # Reviews marked before finished_at was kept count on their follow-up date
+            self.db.execute(
+                "INSERT INTO client_daily (day, company, reviews) "
+                "SELECT COALESCE(date(finished_at, 'unixepoch'), followup_date), COALESCE(company, ''), COUNT(*) "
+                "FROM followups WHERE status = 'reviewed' GROUP BY 1, 2 "
+                "ON CONFLICT (day, company) DO UPDATE SET reviews = reviews + excluded.reviews")
+
+    def counter(self, name):
+        return self.db.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()[0]
+
+    def _set_counter(self, name, value):
+        self.db.execute("UPDATE counters SET value = ? WHERE name = ?", (value, name))
+
+    # -- ingest --
+
+    def sync(self):
+        """Index CSV rows appended since the last sync, and legacy follow-up files once."""
+        with self.db:
+            self._sync_csv()
+            if not self.counter("followup_files_imported"):
+                self._import_followup_files()
+                self._set_counter("followup_files_imported", 1)
+
+    def _sync_csv(self):
+        try:
+            size = os.path.getsize(self.csv_path)
+        except OSError:
+            return
+        offset, seq = self.counter("csv_offset"), self.counter("csv_rows")
+        if size < offset:
+            offset = seq = 0  # rewritten; existing ids are kept, new ones added
+        if size == offset:
+            return
+        # Offsets are bytes, so the file is read as bytes and decoded after
+        with open(self.csv_path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        # Only whole records; a writer may be mid-append, and a quoted field
+        # can hold a newline, so a record ends at a newline outside quotes
+        end = len(data)
+        while True:
+            end = data.rfind(b"\n", 0, end) + 1
+            if end == 0 or data.count(b'"', 0, end) % 2 == 0:
+                break
+            end -= 1
+        rows = []
+        for fields in csv.reader(io.StringIO(data[:end].decode("utf-8", errors="replace"), newline="")):
+            if not fields or fields[0] == "id":
+                continue
+            row = dict(zip(CSV_HEADER, fields + [""] * (len(CSV_HEADER) - len(fields))))
+            seq += 1
+            row["seq"] = seq
+            rows.append(row)
+        self.db.executemany(
+            "INSERT OR IGNORE INTO requests (id, seq, timestamp, name, phone, email, company, review_link, "
+            "method, status, followup_scheduled, followup_sent, job_id) VALUES (:id, :seq, :timestamp, "
+            ":name, :phone, :email, :company, :review_link, :method, :status, :followup_scheduled, "
+            ":followup_sent, :job_id)", rows)
+        self._set_counter("csv_offset", offset + end)
+        self._set_counter("csv_rows", seq)
+
+    def _import_followup_files(self):
+        for path in glob.glob(os.path.join(self.followup_dir, "*.json")):
+            try:
+                with open(path, "r") as f:
+                    fu = json.load(f)
+            except (OSError, ValueError):
+                continue
+            self._insert_followup(fu)
+
+    def _insert_followup(self, fu):
+        fu = dict(fu, status=fu.get("status") or "pending")
+        self.db.execute(
+            "INSERT OR IGNORE INTO followups (request_id, followup_date, status, name, first_name, phone, "
+            "email, company, review_link, method, original_date) VALUES (:request_id, :followup_date, "
+            ":status, :name, :first_name, :phone, :email, :company, :review_link, :method, :original_date)",
+            {k: fu.get(k) for k in ("request_id", "followup_date", "status", "name", "first_name", "phone",
+                                    "email", "company", "review_link", "method", "original_date")})
+
+    # -- writes --
+
+    def add(self, request, followup=None):
+        """Log a request to the CSV, index it, and schedule its follow-up if given."""
+        self.add_many([request], [followup] if followup else [])
+
+    def _append_csv(self, requests):
+        lines = "".join(csv_line(r) for r in requests)
+        if not lines:
+            return False
+        if not os.path.exists(self.csv_path):
+            lines = ",".join(CSV_HEADER) + "\n" + lines
+        os.makedirs(os.path.dirname(os.path.abspath(self.csv_path)), exist_ok=True)
+        with open(self.csv_path, "a") as f:
+            f.write(lines)
+        return True
+
+    def add_many(self, requests, followups=()):
+        """Log requests with one CSV append and index them in one transaction."""
+        if not self._append_csv(requests):
+            return
+        with self.db:
+            self._sync_csv()
+            for followup in followups:
+                self._insert_followup(followup)
+
+    def set_followup_status(self, request_id, status, only_from="pending"):
+        """Move a follow-up from `only_from` to `status`; True if it was there."""
+        finished_at = None if status == "pending" else time.time()
+        with self.db:
+            cur = self.db.execute("UPDATE followups SET status = ?, finished_at = ? WHERE request_id = ? AND status = ?",
+                                  (status, finished_at, request_id, only_from))
+            if cur.rowcount and status == "sent":
+                self.db.execute("UPDATE requests SET followup_sent = 'yes' WHERE id = ?", (request_id,))
+        return cur.rowcount > 0
+
+    # -- follow-up queue --
+    #
+    # A follow-up goes pending -> sending (under a claim) -> sent/failed. The
+    # claim is taken in its own transaction before anything is sent, and the
+    # send is logged to the CSV under followup_send_id() before the claim is
+    # released, so a crash never leaves a follow-up that looks unsent but was.
+
+    def claim_due(self, claim, on=None):
+        """Pop the earliest pending follow-up due by `on` (default today) and mark it as
+        sending under `claim`; None when nothing is due."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            row = self.db.execute(
+                "SELECT * FROM followups WHERE status = 'pending' AND followup_date <= ? "
+                "ORDER BY followup_date LIMIT 1", (on or today(),)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE followups SET status = 'sending', claim = ?, claimed_at = ? "
+                            "WHERE request_id = ?", (claim, time.time(), row["request_id"]))
+        return dict(row, status="sending", claim=claim)
+
+    def finish_followup(self, request_id, claim, status, row=None):
+        """Log the follow-up's send (`row`) and move it from sending to `status`, if `claim`
+        still holds it."""
+        if row is not None:
+            self._append_csv([dict(row, id=followup_send_id(request_id))])
+        with self.db:
+            self._sync_csv()
+            cur = self.db.execute(
+                "UPDATE followups SET status = ?, finished_at = ? "
+                "WHERE request_id = ? AND claim = ? AND status = 'sending'",
+                (status, time.time(), request_id, claim))
+            if cur.rowcount and status == "sent":
+                self.db.execute("UPDATE requests SET followup_sent = 'yes' WHERE id = ?", (request_id,))
+        return cur.rowcount > 0
+
+    def recover_claims(self, lease=900):
+        """Settle follow-ups left "sending" by a scheduler that died (or has held them longer
+        than `lease` seconds): "sent"/"failed" if the send was logged, otherwise
+        "unconfirmed" — it may have gone out, so it is never re-sent automatically."""
+        settled = []
+        with self.db:
+            self._sync_csv()
+            for fu in self.db.execute("SELECT * FROM followups WHERE status = 'sending'").fetchall():
+                if claim_alive(fu["claim"]) and time.time() - (fu["claimed_at"] or 0) < lease:
+                    continue
+                logged = self.get(followup_send_id(fu["request_id"]))
+                status = "unconfirmed" if logged is None else followup_outcome(logged["status"])
+                self.db.execute("UPDATE followups SET status = ?, finished_at = ? "
+                                "WHERE request_id = ? AND status = 'sending'",
+                                (status, time.time(), fu["request_id"]))
+                if status == "sent":
+                    self.db.execute("UPDATE requests SET followup_sent = 'yes' WHERE id = ?",
+                                    (fu["request_id"],))
+                settled.append((dict(fu), status))
+        return settled
+
+    def next_due(self):
+        """The earliest pending follow-up date, or None."""
+        return self.db.execute("SELECT MIN(followup_date) FROM followups WHERE status = 'pending'").fetchone()[0]
+
+    # -- reads --
+
+    def get(self, request_id):
+        row = self.db.execute("SELECT * FROM requests WHERE id = ?", (request_id,)).fetchone()
+        return dict(row) if row else None
+
+    def requests(self, pending=False):
+        """All requests in log order, or only those with a pending follow-up."""
+        if pending:
+            sql = ("SELECT r.* FROM followups f JOIN requests r ON r.id = f.request_id "
+                   "WHERE f.status = 'pending' ORDER BY r.seq")
+        else:
+            sql = "SELECT * FROM requests ORDER BY seq"
+        return [dict(row) for row in self.db.execute(sql)]
+
+    def search(self, query):
+        """Requests whose id matches, or whose name, company, email, phone or job id has a word
+        starting with each word of the query."""
+        exact = self.get(query.strip())
+        if exact:
+            return [exact]
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+        match = " ".join('"%s"*' % w for w in words)
+        return [dict(row) for row in self.db.execute(
+            "SELECT r.* FROM search s JOIN requests r ON r.id = s.id WHERE search MATCH ? ORDER BY r.seq",
+            (match,))]
+
+    def delivered_since(self, since):
+        """{(company, phone or email)} of requests logged since `since` (an ISO UTC
+        timestamp) with at least one channel sent; company and email lowercased."""
+        contacts = set()
+        for row in self.db.execute("SELECT company, phone, email FROM requests WHERE timestamp >= ? "
+                                   "AND status LIKE '%:sent%'", (since,)):
+            company = (row["company"] or "").lower()
+            contacts.update((company, c) for c in (row["phone"], (row["email"] or "").lower()) if c)
+        return contacts
+
+    def followup(self, request_id):
+        row = self.db.execute("SELECT * FROM followups WHERE request_id = ?", (request_id,)).fetchone()
+        return dict(row) if row else None
+
+    def due(self, on=None):
+        """Pending follow-ups scheduled on or before `on` (default today), oldest first."""
+        return [dict(row) for row in self.db.execute(
+            "SELECT * FROM followups WHERE status = 'pending' AND followup_date <= ? "
+            "ORDER BY followup_date, request_id", (on or today(),))]
+
+    def client_days(self, start, end):
+        """client_daily rows for days from `start` up to but not including `end` (YYYY-MM-DD)."""
+        return [dict(row) for row in self.db.execute(
+            "SELECT * FROM client_daily WHERE day >= ? AND day < ?", (start, end))]
+
+    def stats(self, since_day=None):
+        stats = {name: self.counter(name) for name in
+                 ("total", "sms_sent", "email_sent", "pending_followups", "companies")}
+        if since_day:
+            stats["since"] = self.db.execute(
+                "SELECT COALESCE(SUM(requests), 0) FROM daily WHERE day >= ?", (since_day,)).fetchone()[0]
+        return stats
+
+
+# ──────────────────────────────────────
+# Commands (tracker.sh output)
+# ──────────────────────────────────────
+
+def banner(title, wide=False):
+    bar = "═" * (63 if wide else 43)
+    print(f"{GOLD}{bar}{NC}")
+    print(f"{GOLD}  {title}{NC}")
+    print(f"{GOLD}{bar}{NC}")
+    print()
+
+
+def cmd_list(store, pending):
+    if not store.counter("total"):
+        return no_requests()
+    banner("📋 Review Requests", wide=True)
+    for r in store.requests(pending):
+        ts = r["timestamp"]
+        print(f"  {BOLD}{r['name']}{NC}  {CYAN}{ts[:10]} {ts[11:16]}{NC}")
+        print(f"  │ Phone: {r['phone'] or 'n/a'}  |  Email: {r['email'] or 'n/a'}")
+        print(f"  │ Company: {r['company']}  |  Method: {r['method']}")
+        print(f"  │ Status: {r['status']}")
+        if r["job_id"]:
+            print(f"  │ Job: {r['job_id']}")
+        print(f"  │ Follow-up: {r['followup_scheduled']}  |  Follow-up Sent: {r['followup_sent']}")
+        print(f"  │ ID: {r['id']}")
+        print("  └─────────────────────────────────────────")
+        print()
+    print(f"  {BLUE}Total: {store.counter('total')} request(s){NC}")
+
+
+def cmd_stats(store):
+    if not store.counter("total"):
+        return no_requests()
+    week_ago = (datetime.date.today() - datetime.timedelta(days=7)).isoformat()
+    s = store.stats(since_day=week_ago)
+    banner("📊 Review Request Statistics")
+    print(f"  Total Requests:      {BOLD}{s['total']}{NC}")
+    print(f"  SMS Sent:            {GREEN}{s['sms_sent']}{NC}")
+    print(f"  Emails Sent:         {GREEN}{s['email_sent']}{NC}")
+    print(f"  Pending Follow-ups:  {GOLD}{s['pending_followups']}{NC}")
+    print(f"  Companies:           {BLUE}{s['companies']}{NC}")
+    print()
+    print(f"  Last 7 Days:         {CYAN}{s['since']} request(s){NC}")
+    print()
+
+
+def cmd_search(store, query):
+    if not store.counter("total"):
+        return no_requests()
+    print(f'{GOLD}  🔍 Search: "{query}"{NC}')
+    print()
+    results = store.search(query)
+    if not results:
+        print(f"  {RED}No results found.{NC}")
+        return
+    for r in results:
+        print(f"  {BOLD}{r['name']}{NC} — {r['company']}")
+        print(f"  │ {r['phone'] or 'n/a'} | {r['email'] or 'n/a'} | {r['status']}")
+        print(f"  │ {r['id']} — {r['timestamp'][:10]}")
+        print()
+
+
+def cmd_mark_reviewed(store, request_id):
+    fu = store.followup(request_id)
+    if fu:
+        # Customers often review after the follow-up went out, not only before
+        if fu["status"] != "reviewed":
+            store.set_followup_status(request_id, "reviewed", fu["status"])
+        print(f"{GREEN}✅ Marked {request_id} as reviewed{NC}")
+    else:
+        print(f"{RED}Request ID not found: {request_id}{NC}")
+
+
+def cmd_requeue(store, request_id):
+    fu = store.followup(request_id)
+    if fu is None:
+        print(f"{RED}Request ID not found: {request_id}{NC}")
+    elif fu["status"] in ("failed", "unconfirmed") and store.set_followup_status(request_id, "pending", fu["status"]):
+        print(f"{GREEN}✅ Follow-up for {request_id} will be sent on the next run{NC}")
+    else:
+        print(f"{GOLD}Follow-up for {request_id} is {fu['status']}; only failed or unconfirmed ones can be requeued{NC}")
+
+
+def no_requests():
+    print(f"{GOLD}No review requests yet.{NC}")
+    print("Run review-request.sh to create your first request.")
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Ace Growth Review Tracker Store")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="Log a sent request (used by review-request.sh)")
+    for column in CSV_HEADER:
+        add.add_argument("--" + column.replace("_", "-"), dest=column, default="")
+    add.add_argument("--followup-date", help="Schedule a follow-up on this date (YYYY-MM-DD)")
+    add.add_argument("--first-name", default="")
+
+    lst = sub.add_parser("list")
+    lst.add_argument("filter", nargs="?", default="all", help="'--pending' or 'pending' for pending follow-ups")
+    sub.add_parser("stats")
+    search = sub.add_parser("search")
+    search.add_argument("query")
+    sub.add_parser("due", help="Print due follow-ups as JSON lines")
+    reviewed = sub.add_parser("mark-reviewed")
+    reviewed.add_argument("request_id")
+    requeue = sub.add_parser("requeue", help="Send a failed or unconfirmed follow-up again")
+    requeue.add_argument("request_id")
+    args, extra = parser.parse_known_args()
+    if args.command == "list" and extra in (["--pending"], ["pending"]):
+        args.filter = "pending"
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    with TrackerStore() as store:
+        if args.command == "add":
+            request = {c: getattr(args, c) for c in CSV_HEADER}
+            followup = None
+            if args.followup_date:
+                followup = {"request_id": args.id, "followup_date": args.followup_date, "name": args.name,
+                            "first_name": args.first_name, "phone": args.phone, "email": args.email,
+                            "company": args.company, "review_link": args.review_link,
+                            "method": args.method, "original_date": args.timestamp}
+            store.add(request, followup)
+        elif args.command == "list":
+            cmd_list(store, args.filter.lstrip("-") == "pending")
+        elif args.command == "stats":
+            cmd_stats(store)
+        elif args.command == "search":
+            cmd_search(store, args.query)
+        elif args.command == "due":
+            for fu in store.due():
+                print(json.dumps(fu))
+        elif args.command == "requeue":
+            cmd_requeue(store, args.request_id)
+        else:
+            cmd_mark_reviewed(store, args.request_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Ace Growth — Contractor Site Renderer
+
+In-process replacement for templates/contractor-site/generate.sh. The
+template is compiled once into literal segments plus slots, with the
+placeholder and DYNAMIC block offsets resolved up front. After that,
+rendering a site from a site config dict (what generate_site_config returns,
+or a config.json) is one join and one write. No jq, sed or subprocesses.
+
+render_site's output is byte-identical to generate.sh. That includes its quirks: sed's
+`&` and backslash handling in scalar values, and the Python string-literal
+and re.sub escape handling its DYNAMIC step applies to the services,
+testimonials and areas HTML. The SVGs (get_icon's library, stars, Google
+badge, map pin) are read from generate.sh itself, so there is one library.
+
+Usage:
+  python3 site_renderer.py <config.json> <output-directory>
+
+  from site_renderer import render_site, write_site
+  html = render_site(config)
+
+write_site then runs the page through page_optimizer.py (SVG sprites, unused
+CSS, minification) and fails if it's over the contractor-site budget.
+"""
+
+import ast
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+
+from page_optimizer import finish_page, optimizer_version
+from prospect_metrics import metrics, metrics_path_from_env
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SITE_DIR = os.path.join(REPO_ROOT, "templates", "contractor-site")
+TEMPLATE = os.path.join(SITE_DIR, "index.html")
+GENERATOR = os.path.join(SITE_DIR, "generate.sh")
+
+# (placeholder, config path, default), in generate.sh's sed order.
+# PHONE_RAW is derived from PHONE.
+SCALARS = [
+    ("BUSINESS_NAME", ("businessName",), "Business Name"),
+    ("TAGLINE", ("tagline",), "Your Trusted Local Contractor"),
+    ("PHONE", ("phone",), "(555) 000-0000"),
+    ("PHONE_RAW", None, None),
+    ("EMAIL", ("email",), "info@example.com"),
+    ("WEBSITE", ("website",), ""),
+    ("ADDRESS", ("address",), "123 Main St"),
+    ("HOURS", ("hours",), "Mon-Fri 8AM-5PM"),
+    ("YEARS_IN_BUSINESS", ("yearsInBusiness",), "10"),
+    ("PROJECTS_COMPLETED", ("projectsCompleted",), "100+"),
+    ("REVIEW_COUNT", ("reviewCount",), "50+"),
+    ("LICENSE_NUMBER", ("licenseNumber",), "LIC-00000"),
+    ("COLOR_PRIMARY", ("colors", "primary"), "#1a2332"),
+    ("COLOR_ACCENT", ("colors", "accent"), "#ff6b35"),
+    ("COLOR_LIGHT", ("colors", "light"), "#f8f9fa"),
+    ("FORM_ACTION", ("formAction",), "#"),
+    ("MAP_EMBED", ("mapEmbed",), ""),
+]
+
+# DYNAMIC blocks in generate.sh's replacement order, with the indent it
+# puts before the closing marker
+BLOCKS = [
+    ("SERVICES", "services", "                "),
+    ("SERVICE_OPTIONS", "options", "                            "),
+    ("CONTACT_SERVICE_OPTIONS", "options", "                                "),
+    ("TESTIMONIALS", "testimonials", "                "),
+    ("SERVICE_AREAS", "areas", "                "),
+]
+
+# ──────────────────────────────────────
+# Shell parity helpers
+# ──────────────────────────────────────
+
+def _jq_text(value):
+    """What `jq -r` prints for a value, minus the newlines $(...) strips."""
+    if isinstance(value, str):
+        text = value
+    elif value is None:
+        text = "null"
+    elif isinstance(value, bool):
+        text = "true" if value else "false"
+    elif isinstance(value, int):
+        text = str(value)
+    elif isinstance(value, float):
+        text = str(int(value)) if value.is_integer() and abs(value) < 1e17 else repr(value)
+    else:
+        text = json.dumps(value, indent=2, ensure_ascii=False)
+    return text.rstrip("\n")
+
+
+def _jq(obj, path, default=None):
+    """`jq -r '.a.b // default'` (no default: null prints as "null")."""
+    value = obj
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    if default is not None and (value is None or value is False):
+        return default
+    return _jq_text(value)
+
+
+def _sed_replacement(value, placeholder):
+    """A value as GNU sed's s||value|g inserts it: & is the match, \\ escapes."""
+    if "&" not in value and "\\" not in value:
+        return value
+    out = []
+    i = 0
+    while i < len(value):
+        c = value[i]
+        if c == "&":
+            out.append(placeholder)
+        elif c == "\\" and i + 1 < len(value):
+            i += 1
+            out.append({"n": "\n", "t": "\t"}.get(value[i], value[i]))
+        else:
+            out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def _dynamic_block(open_marker, html, close):
+    """A DYNAMIC block as generate.sh's embedded python3 -c produces it.
+
+    The HTML is spliced into a '''...''' literal, and the result goes through
+    re.sub's replacement-template expansion. If either step fails (the shell
+    script would crash), the HTML is used as-is.
+    """
+    if "\\" not in html and "'" not in html and "\r" not in html:
+        return open_marker + html + close
+    try:
+        html = ast.literal_eval("'''" + html + "'''")
+        return _expand(open_marker + html + close)
+    except (SyntaxError, ValueError, re.error):
+        return open_marker + html + close
+
+
+def _expand(repl):
+    return re.compile("").sub(repl, "", count=1)
+
+
+def _initials(name):
+    """sed 's/\\([A-Za-z]\\)[^ ]*/\\1/g' | tr -d ' .' | head -c 2 | tr a-z A-Z"""
+    squeezed = re.sub(r"([A-Za-z])[^ \n]*", r"\1", name)
+    raw = squeezed.replace(" ", "").replace(".", "").encode("utf-8")[:2]
+    return raw.upper().decode("utf-8", "ignore")
+
+
+def _seq_count(rating):
+    """How many numbers `seq 1 RATING` prints."""
+    try:
+        n = float(rating)
+    except ValueError:
+        return 0
+    return max(0, math.floor(n)) if math.isfinite(n) else 0
+
+
+def _universal_newlines(text):
+    return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+
+def load_svgs(generator=GENERATOR):
+    """The SVG library from generate.sh: get_icon's case arms and the *_SVG/MAP_PIN constants.
+
+    Returns ({icon_name: svg}, default_icon, {constant: svg}).
+    """
+    with open(generator, "r") as f:
+        source = f.read()
+    body = source[source.index("get_icon() {"):]
+    icons, default = {}, None
+    for names, svg in re.findall(r"^\s*([a-z*|]+)\)\s*\n(?:\s*#.*\n)*\s*echo '([^']*)'", body, re.M):
+        if names == "*":
+            default = svg
+            break
+        for name in names.split("|"):
+            icons[name] = svg
+    constants = dict(re.findall(r"^([A-Z_]+)='(<svg[^']*)'$", source, re.M))
+    return icons, default, constants
+
+
+# ──────────────────────────────────────
+# Compiled template
+# ──────────────────────────────────────
+
+class SiteTemplate:
+    """index.html split once into literal segments and slots.
+
+    Slots are ("scalar", NAME) for {{NAME}} placeholders outside DYNAMIC
+    blocks, and ("block", index) for each DYNAMIC block.
+    """
+
+    def __init__(self, template=TEMPLATE, generator=GENERATOR):
+        with open(template, "r") as f:
+            source = f.read()
+        self.icons, self.default_icon, svgs = load_svgs(generator)
+        self.star_svg = svgs["STAR_SVG"]
+        self.google_svg = svgs["GOOGLE_SVG"]
+        self.map_pin = svgs["MAP_PIN"]
+        self.parts = self._compile(source)
+
+    @staticmethod
+    def _compile(source):
+        # Block spans, located the way the re.sub calls find them
+        spans = []
+        for i, (name, _, _) in enumerate(BLOCKS):
+            pattern = re.compile(r"<!-- DYNAMIC:%s -->.*?<!-- /DYNAMIC:%s -->" % (name, name), re.S)
+            for m in pattern.finditer(source):
+                spans.append((m.start(), m.end(), i))
+        spans.sort()
+
+        names = [name for name, _, _ in SCALARS]
+        scalar_re = re.compile(r"\{\{(%s)\}\}" % "|".join(names))
+        parts = []
+
+        def add_text(text):
+            pos = 0
+            for m in scalar_re.finditer(text):
+                parts.append(_universal_newlines(text[pos:m.start()]))
+                parts.append(("scalar", m.group(1)))
+                pos = m.end()
+            parts.append(_universal_newlines(text[pos:]))
+
+        pos = 0
+        for start, end, i in spans:
+            if start < pos:
+                continue
+            add_text(source[pos:start])
+            parts.append(("block", i))
+            pos = end
+        add_text(source[pos:])
+        return [p for p in parts if p != ""]
+
+    # -- values --
+
+    def scalar_values(self, config):
+        raw = {}
+        for name, path, default in SCALARS:
+            if path is not None:
+                raw[name] = _jq(config, path, default)
+        raw["PHONE_RAW"] = re.sub(r"[() -]", "", raw["PHONE"])
+
+        # sed runs one placeholder at a time over the whole file, so a value
+        # also gets every later substitution applied to it
+        values = {}
+        order = [name for name, _, _ in SCALARS]
+        for k, name in enumerate(order):
+            value = _sed_replacement(raw[name], "{{%s}}" % name)
+            for later in order[k + 1:]:
+                token = "{{%s}}" % later
+                if token in value:
+                    value = value.replace(token, _sed_replacement(raw[later], token))
+            values[name] = _universal_newlines(value)
+        return values
+
+    def dynamic_html(self, config):
+        services = config.get("services") if isinstance(config, dict) else None
+        services = services if isinstance(services, list) else []
+        services_html, options_html = [], []
+        for svc in services:
+            svc = svc if isinstance(svc, dict) else {}
+            name = _jq(svc, ("name",))
+            desc = _jq(svc, ("description",))
+            icon = self.icons.get(_jq(svc, ("icon",), "general"), self.default_icon)
+            services_html.append(f"""
+                <div class="service-card reveal">
+                    <div class="service-icon">
+                        {icon}
+                    </div>
+                    <h3>{name}</h3>
+                    <p>{desc}</p>
+                </div>""")
+            options_html.append(f"""
+                            <option value="{name}">{name}</option>""")
+
+        testimonials = config.get("testimonials") if isinstance(config, dict) else None
+        testimonials = testimonials if isinstance(testimonials, list) else []
+        testimonials_html = []
+        for t in testimonials:
+            t = t if isinstance(t, dict) else {}
+            t_name = _jq(t, ("name",))
+            t_text = _jq(t, ("text",))
+            stars = self.star_svg * _seq_count(_jq(t, ("rating",), "5"))
+            t_date = _jq(t, ("date",), "Recently")
+            t_project = _jq(t, ("project",), "")
+            project_tag = f" · {t_project}" if t_project and t_project != "null" else ""
+            testimonials_html.append(f"""
+                <div class="testimonial-card reveal">
+                    <div class="testimonial-stars">
+                        {stars}
+                    </div>
+                    <p class="testimonial-text">"{t_text}"</p>
+                    <div class="testimonial-author">
+                        <div class="testimonial-avatar">{_initials(t_name)}</div>
+                        <div class="testimonial-meta">
+                            <h4>{t_name}</h4>
+                            <p>{t_date}{project_tag}</p>
+                            <div class="testimonial-badge">
+                                {self.google_svg}
+                                <span>Google Review</span>
+                            </div>
+                        </div>
+                    </div>
+                </div>""")
+
+        areas = config.get("serviceAreas") if isinstance(config, dict) else None
+        areas = areas if isinstance(areas, list) else []
+        areas_html = [f"""
+                <div class="area-tag">{self.map_pin} {_jq_text(area)}</div>""" for area in areas]
+
+        return {
+            "services": "".join(services_html),
+            "options": "".join(options_html),
+            "testimonials": "".join(testimonials_html),
+            "areas": "".join(areas_html),
+        }
+
+    # -- render --
+
+    def render(self, config):
+        values = self.scalar_values(config)
+        dynamic = self.dynamic_html(config)
+        blocks = []
+        for name, key, indent in BLOCKS:
+            blocks.append(_dynamic_block(f"<!-- DYNAMIC:{name} -->", dynamic[key],
+                                         f"\n{indent}<!-- /DYNAMIC:{name} -->"))
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+            elif part[0] == "scalar":
+                out.append(values[part[1]])
+            else:
+                out.append(blocks[part[1]])
+        return "".join(out)
+
+
+_template = None
+_version = None
+
+
+def renderer_version():
+    """Hash of everything a written site depends on besides its config."""
+    global _version
+    if _version is None:
+        digest = hashlib.sha256()
+        for path in (os.path.abspath(__file__), TEMPLATE, GENERATOR):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        digest.update(optimizer_version().encode())
+        _version = digest.hexdigest()
+    return _version
+
+
+def get_template():
+    """The compiled template, built on first use and shared by later renders."""
+    global _template
+    if _template is None:
+        _template = SiteTemplate()
+    return _template
+
+
+def render_site(config):
+    """Render a site config dict to the demo site's index.html text."""
+    return get_template().render(config)
+
+
+def write_site(config, output_dir):
+    """Render and optimize config to <output_dir>/index.html; returns the path.
+    Raises BudgetError (nothing written) if the page is over budget."""
+    html = finish_page("contractor-site", render_site(config))
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, "index.html")
+    with open(path, "w") as f:
+        f.write(html)
+    return path
+
+
+# ──────────────────────────────────────
+# Main
+# ──────────────────────────────────────
+
+def main():
+    if len(sys.argv) < 3:
+        print(f"Usage: {sys.argv[0]} <config.json> <output-directory>")
+        sys.exit(1)
+    config_path, output_dir = sys.argv[1], sys.argv[2]
+    try:
+        with open(config_path, "r") as f:
+            config = json.load(f)
+    except OSError:
+        print(f"Error: Config file not found: {config_path}")
+        sys.exit(1)
+
+    metrics.configure(metrics_path_from_env(), "site-renderer")
+    try:
+        with metrics.phase("render-site") as phase:
+            path = write_site(config, output_dir)
+            phase["bytes"] = os.path.getsize(path)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ Site generated: {path}")
+
+
+if __name__ == "__main__":
+    main()